@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Compares the volume estimators with the previous `calculate_audio_volume()`,
+which created a pyloudnorm meter for every chunk (pyloudnorm needs to be
+installed). For each estimator it reports how many chunks per second (in one
+core) it can process and the error (normalized volume, from 0 to 1) with
+respect to pyloudnorm. The audio is noise with a varying level, including
+silent parts.
+
+    python benchmarks/audio_volume.py
+
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from pipecat.utils.audio import (
+    AudioVolumeEstimator,
+    VolumeMode,
+    calculate_audio_volume,
+    normalize_value)
+
+
+def legacy_calculate_audio_volume(audio: bytes, sample_rate: int) -> float:
+    import pyloudnorm as pyln
+
+    audio_np = np.frombuffer(audio, dtype=np.int16)
+    audio_float = audio_np.astype(np.float64)
+
+    block_size = audio_np.size / sample_rate
+    meter = pyln.Meter(sample_rate, block_size=block_size)
+    loudness = meter.integrated_loudness(audio_float)
+
+    return normalize_value(loudness, -20, 80)
+
+
+def make_chunks(seconds: float, sample_rate: int, chunk_size: int):
+    rng = np.random.default_rng(1234)
+    num_chunks = int(seconds * sample_rate / chunk_size)
+    # One level per 200ms, from silence to loud.
+    levels = rng.choice([0, 10, 100, 1000, 5000], size=num_chunks * chunk_size // (sample_rate // 5) + 1)
+    envelope = np.repeat(levels, sample_rate // 5)[:num_chunks * chunk_size]
+    audio = rng.standard_normal(num_chunks * chunk_size) * envelope
+    audio = np.clip(audio, -32768, 32767).astype(np.int16)
+    return [audio[i * chunk_size:(i + 1) * chunk_size].tobytes() for i in range(num_chunks)]
+
+
+def run(volume, chunks):
+    start_time = time.perf_counter()
+    volumes = [volume(chunk) for chunk in chunks]
+    elapsed = time.perf_counter() - start_time
+    return (len(chunks) / elapsed, np.array(volumes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audio volume benchmark")
+    parser.add_argument("-s", "--seconds", type=float, default=60,
+                        help="seconds of audio to analyze")
+    parser.add_argument("-r", "--sample-rate", type=int, default=16000,
+                        help="audio sample rate")
+    args = parser.parse_args()
+
+    try:
+        import pyloudnorm  # noqa: F401
+        has_pyloudnorm = True
+    except ModuleNotFoundError:
+        has_pyloudnorm = False
+        print("pyloudnorm is not installed, only measuring the new estimators")
+
+    for chunk_ms in [20, 32]:
+        chunk_size = int(args.sample_rate * chunk_ms / 1000)
+        chunks = make_chunks(args.seconds, args.sample_rate, chunk_size)
+        print(f"{chunk_ms}ms chunks ({len(chunks)} chunks)")
+
+        estimators = {
+            "stateless": lambda c: calculate_audio_volume(c, args.sample_rate),
+            "streaming": AudioVolumeEstimator(args.sample_rate).volume,
+            "streaming rms": AudioVolumeEstimator(args.sample_rate, VolumeMode.RMS).volume,
+        }
+        reference = None
+        if has_pyloudnorm:
+            (cps, reference) = run(lambda c: legacy_calculate_audio_volume(c, args.sample_rate), chunks)
+            print(f"  {'pyloudnorm':<14} {cps:>12,.0f} chunks/s")
+
+        for (name, volume) in estimators.items():
+            (cps, volumes) = run(volume, chunks)
+            line = f"  {name:<14} {cps:>12,.0f} chunks/s"
+            if reference is not None:
+                error = np.abs(volumes - reference)
+                line += f"  (error: mean {error.mean():.4f}, max {error.max():.4f})"
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures the upstream frame rate and the CPU used while the bot speaks.
+Each session has an output transport (paced, with writes that don't block), a
+`UserIdleProcessor` and a few pass-through processors, and plays TTS audio in
+real time.
+
+The "before" numbers push a `BotSpeakingFrame` for every 20ms chunk written (as
+output transports used to do), the "after" numbers push
+`BotStartedSpeakingFrame`, `BotStoppedSpeakingFrame` and a `BotSpeakingFrame`
+every `--interval` seconds.
+
+    python benchmarks/bot_speaking.py
+    python benchmarks/bot_speaking.py --sessions 50 --interval 0.5
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from pipecat.frames.frames import AudioRawFrame, BotSpeakingFrame, EndFrame, Frame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.user_idle_processor import UserIdleProcessor
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+
+from loguru import logger
+
+SAMPLE_RATE = 16000
+
+
+class UpstreamCounter(FrameProcessor):
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.UPSTREAM:
+            self.count += 1
+        await self.push_frame(frame, direction)
+
+
+class PassThrough(FrameProcessor):
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+
+class OutputTransport(BaseOutputTransport):
+
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
+        pass
+
+
+class LegacyOutputTransport(OutputTransport):
+
+    async def _bot_speaking_audio_written(self):
+        await self.push_frame(BotSpeakingFrame(), FrameDirection.UPSTREAM)
+
+
+async def user_idle_callback(user_idle: UserIdleProcessor):
+    pass
+
+
+async def run_session(output_class, interval: float, seconds: float) -> int:
+    params = TransportParams(
+        audio_out_enabled=True,
+        audio_out_sample_rate=SAMPLE_RATE,
+        bot_speaking_frame_interval=interval)
+    counter = UpstreamCounter()
+    processors = [counter, UserIdleProcessor(callback=user_idle_callback, timeout=10)]
+    processors += [PassThrough() for _ in range(5)]
+    task = PipelineTask(Pipeline(processors + [output_class(params)]))
+
+    # TTS services usually send 100ms (or bigger) frames.
+    frame = AudioRawFrame(b"\x00" * int(SAMPLE_RATE * 0.1) * 2, SAMPLE_RATE, 1)
+    runner = asyncio.create_task(task.run())
+    await task.queue_frames([frame] * int(seconds / 0.1))
+    # `UserIdleProcessor` pushes frames from its own task, so the pipeline
+    # doesn't wait for the audio to be played when it gets an EndFrame.
+    await asyncio.sleep(seconds + 0.5)
+    await task.queue_frame(EndFrame())
+    await runner
+    return counter.count
+
+
+async def run(output_class, num_sessions: int, interval: float, seconds: float):
+    cpu_time = time.process_time()
+    counts = await asyncio.gather(*[run_session(output_class, interval, seconds) for _ in range(num_sessions)])
+    cpu_time = time.process_time() - cpu_time
+    return (sum(counts) / num_sessions / seconds, cpu_time / seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bot speaking frames benchmark")
+    parser.add_argument("-n", "--sessions", type=int, default=20, help="number of sessions")
+    parser.add_argument("-s", "--seconds", type=float, default=5, help="seconds of audio per session")
+    parser.add_argument("-i", "--interval", type=float, default=0.2, help="BotSpeakingFrame interval (seconds)")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    print(f"{args.sessions} sessions, {args.seconds:.0f}s of audio each")
+    for (name, output_class) in [("before", LegacyOutputTransport), ("after", OutputTransport)]:
+        (rate, cpu) = asyncio.run(run(output_class, args.sessions, args.interval, args.seconds))
+        print(f"  {name:<7} upstream frames per session: {rate:5.1f}/s  CPU: {cpu * 100:5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
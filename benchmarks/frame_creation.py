@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures how many frames per second we can create.
+
+The "before" numbers use the previous frame identity implementation (a global
+lock for ids and counts plus an eagerly built name), the "after" numbers use
+the current `Frame` class.
+
+    python benchmarks/frame_creation.py
+
+"""
+
+import argparse
+import time
+
+from dataclasses import dataclass, field
+from threading import Lock
+
+from pipecat.frames.frames import AudioRawFrame, TextFrame
+
+_COUNTS = {}
+_COUNTS_MUTEX = Lock()
+
+_ID = 0
+_ID_MUTEX = Lock()
+
+
+def legacy_obj_id() -> int:
+    global _ID
+    with _ID_MUTEX:
+        _ID += 1
+        return _ID
+
+
+def legacy_obj_count(obj) -> int:
+    name = obj.__class__.__name__
+    with _COUNTS_MUTEX:
+        if name not in _COUNTS:
+            _COUNTS[name] = 0
+        else:
+            _COUNTS[name] += 1
+        return _COUNTS[name]
+
+
+@dataclass
+class LegacyFrame:
+    id: int = field(init=False)
+    name: str = field(init=False)
+
+    def __post_init__(self):
+        self.id: int = legacy_obj_id()
+        self.name: str = f"{self.__class__.__name__}#{legacy_obj_count(self)}"
+
+
+@dataclass
+class LegacyAudioRawFrame(LegacyFrame):
+    audio: bytes
+    sample_rate: int
+    num_channels: int
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+
+
+@dataclass
+class LegacyTextFrame(LegacyFrame):
+    text: str
+
+
+def frames_per_second(create, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        create()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame creation benchmark")
+    parser.add_argument("-n", "--count", type=int, default=500_000,
+                        help="number of frames to create per run")
+    args = parser.parse_args()
+
+    audio = b"\x00" * 640  # 20ms of 16kHz mono audio
+
+    runs = [
+        ("AudioRawFrame",
+         lambda: LegacyAudioRawFrame(audio, 16000, 1),
+         lambda: AudioRawFrame(audio, 16000, 1)),
+        ("TextFrame",
+         lambda: LegacyTextFrame("Hello"),
+         lambda: TextFrame("Hello")),
+    ]
+
+    for name, before, after in runs:
+        before_fps = frames_per_second(before, args.count)
+        after_fps = frames_per_second(after, args.count)
+        print(f"{name:<15} before: {before_fps:>12,.0f} frames/s  "
+              f"after: {after_fps:>12,.0f} frames/s  ({after_fps / before_fps:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
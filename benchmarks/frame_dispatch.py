@@ -0,0 +1,135 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures the per-frame cost of pushing audio frames through a 10-processor
+`Pipeline`.
+
+The "isinstance" processors check the frame against a chain of frame types
+(like `BaseOutputTransport` used to do), the "dispatch" processors register the
+same handlers with `@frame_handler`. Audio frames are the most common frames
+and they used to fall through most of the chain.
+
+    python benchmarks/frame_dispatch.py
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    CancelFrame,
+    EndFrame,
+    Frame,
+    ImageRawFrame,
+    MetricsFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    StopInterruptionFrame,
+    SystemFrame,
+    TextFrame)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, frame_handler
+
+
+class IsInstanceProcessor(FrameProcessor):
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+
+        if isinstance(frame, StartFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, CancelFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, StartInterruptionFrame) or isinstance(frame, StopInterruptionFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, MetricsFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, SystemFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, EndFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, TextFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, ImageRawFrame):
+            await self.push_frame(frame, direction)
+        elif isinstance(frame, AudioRawFrame):
+            await self.push_frame(frame, direction)
+        else:
+            await self.push_frame(frame, direction)
+
+
+class DispatchProcessor(FrameProcessor):
+
+    @frame_handler(StartFrame)
+    async def _handle_start_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(CancelFrame)
+    async def _handle_cancel_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(StartInterruptionFrame, StopInterruptionFrame)
+    async def _handle_interruption_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(MetricsFrame)
+    async def _handle_metrics_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(SystemFrame)
+    async def _handle_system_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(EndFrame)
+    async def _handle_end_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(TextFrame)
+    async def _handle_text_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(ImageRawFrame)
+    async def _handle_image_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(AudioRawFrame)
+    async def _handle_audio_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+
+async def usecs_per_frame(processor_class, num_processors: int, count: int) -> float:
+    pipeline = Pipeline([processor_class() for _ in range(num_processors)])
+    frames = [AudioRawFrame(b"\x00" * 640, 16000, 1) for _ in range(count)]
+
+    start = time.perf_counter()
+    for frame in frames:
+        await pipeline.process_frame(frame, FrameDirection.DOWNSTREAM)
+    return (time.perf_counter() - start) * 1_000_000 / count
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Frame dispatch benchmark")
+    parser.add_argument("-n", "--count", type=int, default=50_000,
+                        help="number of audio frames to push")
+    parser.add_argument("-p", "--processors", type=int, default=10,
+                        help="number of processors in the pipeline")
+    args = parser.parse_args()
+
+    before = await usecs_per_frame(IsInstanceProcessor, args.processors, args.count)
+    after = await usecs_per_frame(DispatchProcessor, args.processors, args.count)
+    print(f"{args.processors} processors, AudioRawFrame")
+    print(f"  isinstance: {before:.2f} us/frame")
+    print(f"  dispatch:   {after:.2f} us/frame ({before / after:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
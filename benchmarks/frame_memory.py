@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures bytes allocated per frame and frames created per second for
+`AudioRawFrame`, `TextFrame` and `ImageRawFrame`.
+
+The "before" numbers use plain dataclasses with a per-instance `__dict__` (how
+frames used to be declared), the "after" numbers use the current slotted
+frames. Frame payloads are shared between all frames, so only the frame object
+overhead is measured.
+
+    python benchmarks/frame_memory.py
+
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from dataclasses import dataclass, field
+from typing import Tuple
+
+from pipecat.frames.frames import AudioRawFrame, ImageRawFrame, TextFrame
+from pipecat.utils.utils import obj_count, obj_id
+
+
+@dataclass
+class LegacyFrame:
+    id: int = field(init=False)
+    name: str = field(init=False)
+
+    def __post_init__(self):
+        self.id: int = obj_id()
+        self.name: str = f"{self.__class__.__name__}#{obj_count(self)}"
+
+
+@dataclass
+class LegacyAudioRawFrame(LegacyFrame):
+    audio: bytes
+    sample_rate: int
+    num_channels: int
+
+    def __post_init__(self):
+        super().__post_init__()
+        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+
+
+@dataclass
+class LegacyTextFrame(LegacyFrame):
+    text: str
+
+
+@dataclass
+class LegacyImageRawFrame(LegacyFrame):
+    image: bytes
+    size: Tuple[int, int]
+    format: str | None
+
+
+def bytes_per_frame(create, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    frames = [create() for _ in range(count)]
+    (current, _) = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # Don't count the list holding the frames.
+    return (current - frames.__sizeof__()) / count
+
+
+def frames_per_second(create, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        create()
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frame memory benchmark")
+    parser.add_argument("-n", "--count", type=int, default=200_000,
+                        help="number of frames to create per run")
+    args = parser.parse_args()
+
+    audio = b"\x00" * 640  # 20ms of 16kHz mono audio
+    image = b"\x00" * (64 * 64 * 3)
+    size = (64, 64)
+
+    runs = [
+        ("AudioRawFrame",
+         lambda: LegacyAudioRawFrame(audio, 16000, 1),
+         lambda: AudioRawFrame(audio, 16000, 1)),
+        ("TextFrame",
+         lambda: LegacyTextFrame("Hello"),
+         lambda: TextFrame("Hello")),
+        ("ImageRawFrame",
+         lambda: LegacyImageRawFrame(image, size, "RGB"),
+         lambda: ImageRawFrame(image, size, "RGB")),
+    ]
+
+    for name, before, after in runs:
+        before_bytes = bytes_per_frame(before, args.count)
+        after_bytes = bytes_per_frame(after, args.count)
+        before_fps = frames_per_second(before, args.count)
+        after_fps = frames_per_second(after, args.count)
+        print(f"{name:<15} "
+              f"before: {before_bytes:>6.0f} bytes/frame {before_fps:>12,.0f} frames/s  "
+              f"after: {after_bytes:>6.0f} bytes/frame {after_fps:>12,.0f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
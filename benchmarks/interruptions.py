@@ -0,0 +1,113 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures how long an output transport takes to handle an interruption and
+how long it keeps writing audio after it. The bot is interrupted `--count`
+times while it's speaking, writes take 20ms (like an audio device).
+
+The "before" numbers cancel the sink and push tasks and create new ones (and
+new queues) on every interruption, as output transports used to do. The
+"after" numbers clear the queues (in O(1)) and keep the same tasks.
+
+    python benchmarks/interruptions.py
+    python benchmarks/interruptions.py --count 200 --queued 500
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame, StartInterruptionFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+
+from loguru import logger
+
+SAMPLE_RATE = 16000
+
+
+class OutputTransport(BaseOutputTransport):
+
+    def __init__(self, params: TransportParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self.last_write_time = 0.0
+
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
+        await asyncio.sleep(0.02)
+        self.last_write_time = time.monotonic()
+
+
+class LegacyOutputTransport(OutputTransport):
+
+    async def _handle_interruptions(self, frame):
+        if not self.interruptions_allowed:
+            return
+
+        if isinstance(frame, StartInterruptionFrame):
+            await self._sink_worker.stop()
+            self._sink_queue.clear()
+            self._audio_chunker.reset()
+            self._create_sink_task()
+            if self._bot_speaking:
+                await self._bot_stopped_speaking()
+            await self._push_worker.stop()
+            self._push_queue.clear()
+            self._create_push_task()
+
+
+async def run(output_class, count: int, queued: int):
+    params = TransportParams(
+        audio_out_enabled=True,
+        audio_out_sample_rate=SAMPLE_RATE,
+        audio_out_paced=False,
+        bot_speaking_frame_interval=None)
+    output = output_class(params)
+    task = PipelineTask(Pipeline([output]), PipelineParams(allow_interruptions=True))
+    runner = asyncio.create_task(task.run())
+    await asyncio.sleep(0.1)
+
+    # TTS services usually send 100ms (or bigger) frames.
+    frame = AudioRawFrame(b"\x00" * int(SAMPLE_RATE * 0.1) * 2, SAMPLE_RATE, 1)
+    handle_time = 0.0
+    stale_time = 0.0
+    for _ in range(count):
+        for _ in range(queued):
+            await output.process_frame(frame, FrameDirection.DOWNSTREAM)
+        # Let the bot speak for a bit.
+        await asyncio.sleep(0.05)
+
+        start_time = time.monotonic()
+        await output.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        handle_time += time.monotonic() - start_time
+        await asyncio.sleep(0.05)
+        stale_time += max(0.0, output.last_write_time - start_time)
+
+    await task.queue_frame(EndFrame())
+    await runner
+    return (handle_time / count, stale_time / count)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Output transport interruptions benchmark")
+    parser.add_argument("-c", "--count", type=int, default=100, help="number of interruptions")
+    parser.add_argument("-q", "--queued", type=int, default=100, help="audio frames queued before interrupting")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    print(f"{args.count} interruptions, {args.queued} audio frames queued")
+    for (name, output_class) in [("before", LegacyOutputTransport), ("after", OutputTransport)]:
+        (handle_time, stale_time) = asyncio.run(run(output_class, args.count, args.queued))
+        print(f"  {name:<7} interruption handled in: {handle_time * 1000:6.3f} ms"
+              f"  audio written after interruption: {stale_time * 1000:5.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures the bytes copied and the CPU time per second of audio played by
+`BaseOutputTransport` when it receives TTS audio frames and writes them in 20ms
+chunks (pacing is disabled and the transport writes don't block, so only the
+output path is measured).
+
+The "before" numbers use the previous output path: each frame was split into
+20ms `AudioRawFrame`s that were accumulated in a `bytearray` and copied again
+before being written. The "after" numbers use the current transport, which
+writes memoryview slices of the original frames.
+
+    python benchmarks/output_audio.py
+    python benchmarks/output_audio.py --frame-ms 45 --seconds 600
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from pipecat.frames.frames import AudioRawFrame, BotSpeakingFrame, EndFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+
+from loguru import logger
+
+SAMPLE_RATE = 24000
+
+
+class OutputTransport(BaseOutputTransport):
+
+    def __init__(self, **kwargs):
+        super().__init__(
+            TransportParams(
+                audio_out_enabled=True,
+                audio_out_sample_rate=SAMPLE_RATE,
+                audio_out_paced=False),
+            **kwargs)
+        self.bytes_written = 0
+
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
+        self.bytes_written += len(frames)
+
+    def bytes_copied(self) -> int:
+        return self._audio_chunker.bytes_copied
+
+
+class LegacyOutputTransport(OutputTransport):
+    """The output audio path before chunks were memoryview slices."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._copied = 0
+        self._buffer = bytearray()
+
+    def bytes_copied(self) -> int:
+        return self._copied
+
+    async def _handle_audio(self, frame: AudioRawFrame):
+        audio = frame.audio
+        for i in range(0, len(audio), self._audio_chunk_size):
+            chunk = AudioRawFrame(audio[i: i + self._audio_chunk_size],
+                                  sample_rate=frame.sample_rate, num_channels=frame.num_channels)
+            self._copied += len(chunk.audio)
+            await self._sink_queue.put(chunk)
+
+    async def _write_audio(self, frame: AudioRawFrame):
+        self._buffer.extend(frame.audio)
+        self._copied += len(frame.audio)
+        if len(self._buffer) >= self._audio_chunk_size:
+            # `buffer[:size]` and `bytes()` both copy.
+            await self.write_raw_audio_frames(bytes(self._buffer[:self._audio_chunk_size]))
+            self._copied += 2 * self._audio_chunk_size
+            self._buffer = self._buffer[self._audio_chunk_size:]
+            self._copied += len(self._buffer)
+            await self.push_frame(BotSpeakingFrame(), FrameDirection.UPSTREAM)
+
+
+async def run(output_class, frame_ms: int, seconds: float):
+    output = output_class()
+    frame_size = int(SAMPLE_RATE * frame_ms / 1000) * 2
+    audio = b"\x01" * frame_size
+    num_frames = int(seconds * 1000 / frame_ms)
+
+    task = PipelineTask(Pipeline([output]))
+    frames = [AudioRawFrame(audio, SAMPLE_RATE, 1) for _ in range(num_frames)]
+    await task.queue_frames(frames + [EndFrame()])
+
+    cpu_time = time.process_time()
+    await task.run()
+    cpu_time = time.process_time() - cpu_time
+
+    played = output.bytes_written / (SAMPLE_RATE * 2)
+    return (output.bytes_copied() / output.bytes_written, cpu_time / played)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Output transport audio benchmark")
+    parser.add_argument("-f", "--frame-ms", type=int, default=45, help="TTS frame duration (ms)")
+    parser.add_argument("-s", "--seconds", type=float, default=300, help="seconds of audio")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    print(f"{args.seconds:.0f}s of {SAMPLE_RATE} Hz audio in {args.frame_ms}ms frames")
+    for (name, output_class) in [("before", LegacyOutputTransport), ("after", OutputTransport)]:
+        (copied, cpu) = asyncio.run(run(output_class, args.frame_ms, args.seconds))
+        print(f"  {name:<7} bytes copied per byte played: {copied:5.2f}"
+              f"  CPU per second of audio: {cpu * 1000:6.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
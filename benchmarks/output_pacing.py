@@ -0,0 +1,95 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures how much audio a client has buffered when the bot is interrupted,
+with an output transport whose writes don't block (like the websocket
+transports). TTS audio arrives faster than real time and the bot is
+interrupted after `--interrupt-after` seconds. The client plays audio in real
+time, so everything it has received and not played yet will still be heard
+after the interruption.
+
+Without pacing everything is written right away. With pacing audio is written
+at most `--lead` seconds ahead of real time, and the pacer jitter and underrun
+metrics are also reported.
+
+    python benchmarks/output_pacing.py
+    python benchmarks/output_pacing.py --lead 0.04 --interrupt-after 2
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame, StartInterruptionFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+
+from loguru import logger
+
+SAMPLE_RATE = 16000
+
+
+class NonBlockingOutputTransport(BaseOutputTransport):
+
+    def __init__(self, params: TransportParams, **kwargs):
+        super().__init__(params, **kwargs)
+        self.bytes_written = 0
+
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
+        self.bytes_written += len(frames)
+
+
+async def run(paced: bool, lead: float, seconds: float, interrupt_after: float):
+    params = TransportParams(
+        audio_out_enabled=True,
+        audio_out_sample_rate=SAMPLE_RATE,
+        audio_out_paced=paced,
+        audio_out_lead_secs=lead)
+    output = NonBlockingOutputTransport(params)
+    task = PipelineTask(Pipeline([output]), PipelineParams(allow_interruptions=True))
+    runner = asyncio.create_task(task.run())
+
+    # TTS services usually send 100ms (or bigger) frames.
+    frame = AudioRawFrame(b"\x00" * int(SAMPLE_RATE * 0.1) * 2, SAMPLE_RATE, 1)
+    start_time = time.monotonic()
+    await task.queue_frames([frame] * int(seconds / 0.1))
+
+    await asyncio.sleep(interrupt_after)
+    await output.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+    elapsed = time.monotonic() - start_time
+    written = output.bytes_written / (SAMPLE_RATE * 2)
+
+    await task.queue_frame(EndFrame())
+    await runner
+    playout = output._audio_pacer.metrics() if output._audio_pacer else None
+    return (max(0.0, written - elapsed), playout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Output transport pacing benchmark")
+    parser.add_argument("-l", "--lead", type=float, default=0.08, help="pacing lead (seconds)")
+    parser.add_argument("-s", "--seconds", type=float, default=10, help="seconds of TTS audio")
+    parser.add_argument("-i", "--interrupt-after", type=float, default=1, help="interrupt after (seconds)")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    print(f"{args.seconds:.0f}s of TTS audio, interrupted after {args.interrupt_after:.1f}s")
+    for paced in [False, True]:
+        (buffered, playout) = asyncio.run(run(paced, args.lead, args.seconds, args.interrupt_after))
+        line = f"  {'paced' if paced else 'not paced':<10} audio played after interruption: {buffered * 1000:7.1f} ms"
+        if playout:
+            line += (f"  jitter: {playout['avg_jitter'] * 1000:.1f} ms (max {playout['max_jitter'] * 1000:.1f} ms)"
+                     f"  underruns: {playout['underruns']}")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
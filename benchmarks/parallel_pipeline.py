@@ -0,0 +1,92 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Simulates a session with 20ms audio frames (50 frames per second) going
+through a `ParallelPipeline` with two pipelines (one of them dropping audio)
+and reports throughput and memory for both the default mode (one
+`asyncio.gather` per frame) and the worker mode.
+
+    python benchmarks/parallel_pipeline.py --minutes 60
+
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame, Frame, StartFrame
+from pipecat.pipeline.parallel_pipeline import ParallelPipeline
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.processors.filters.frame_filter import FrameFilter
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from loguru import logger
+
+
+class FrameCounter(FrameProcessor):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.count = 0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        self.count += 1
+
+
+async def run_session(use_workers: bool, num_frames: int, track_memory: bool):
+    counter = FrameCounter()
+    parallel = ParallelPipeline(
+        [FrameFilter([EndFrame])],
+        [],
+        use_workers=use_workers)
+    pipeline = Pipeline([parallel, counter])
+    audio = b"\x00" * 640
+
+    gc.collect()
+    if track_memory:
+        tracemalloc.start()
+
+    start = time.perf_counter()
+    await pipeline.process_frame(StartFrame(), FrameDirection.DOWNSTREAM)
+    for _ in range(num_frames):
+        await pipeline.process_frame(AudioRawFrame(audio, 16000, 1), FrameDirection.DOWNSTREAM)
+    elapsed = time.perf_counter() - start
+
+    memory = 0
+    if track_memory:
+        gc.collect()
+        (memory, _) = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    await pipeline.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
+    await pipeline.cleanup()
+
+    return (num_frames / elapsed, memory, len(parallel._down_tracker))
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="ParallelPipeline benchmark")
+    parser.add_argument("-m", "--minutes", type=float, default=60,
+                        help="simulated session length in minutes")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    num_frames = int(args.minutes * 60 * 50)
+    print(f"{num_frames} audio frames ({args.minutes} minutes at 50 frames/s)")
+    for use_workers in [False, True]:
+        (fps, _, _) = await run_session(use_workers, num_frames, track_memory=False)
+        (_, memory, tracked) = await run_session(use_workers, num_frames, track_memory=True)
+        mode = "workers" if use_workers else "gather"
+        print(f"  {mode:<8} {fps:>10,.0f} frames/s  "
+              f"memory after session: {memory / 1024:>8,.0f} KiB  tracked frame ids: {tracked}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,88 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Runs an increasing number of simulated sessions in a single
+`PipelineRunner` (i.e. in one process and one core) and reports the event loop
+lag for each number of sessions. Each session receives 20ms audio frames in
+real time and sends them through a few frame processors. The number of
+sessions per core is the largest number of sessions that keeps the loop lag
+under `--max-lag`.
+
+    python benchmarks/runner_sessions.py --seconds 5 --max-lag 0.02
+
+"""
+
+import argparse
+import asyncio
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame, Frame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+
+from loguru import logger
+
+
+class Passthrough(FrameProcessor):
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+
+async def feed_audio(task: PipelineTask, seconds: float):
+    audio = b"\x00" * 640
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+    for i in range(int(seconds * 50)):
+        await task.queue_frame(AudioRawFrame(audio, 16000, 1))
+        # Keep real-time pace even if we get delayed.
+        await asyncio.sleep(max(start_time + (i + 1) * 0.02 - loop.time(), 0))
+    await task.queue_frame(EndFrame())
+
+
+async def run_sessions(num_sessions: int, num_processors: int, seconds: float):
+    runner = PipelineRunner(handle_sigint=False)
+    feeders = []
+    for _ in range(num_sessions):
+        task = PipelineTask(Pipeline([Passthrough() for _ in range(num_processors)]))
+        await runner.start_task(task)
+        feeders.append(feed_audio(task, seconds))
+
+    await asyncio.gather(*feeders)
+    lag = (runner.loop_lag, runner.health()["max_loop_lag"])
+    await runner.wait()
+    return lag
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="PipelineRunner sessions benchmark")
+    parser.add_argument("-s", "--seconds", type=float, default=5, help="session length")
+    parser.add_argument("-p", "--processors", type=int, default=10,
+                        help="number of processors per session")
+    parser.add_argument("-l", "--max-lag", type=float, default=0.02,
+                        help="maximum acceptable loop lag (seconds)")
+    parser.add_argument("-m", "--max-sessions", type=int, default=1024)
+    args = parser.parse_args()
+
+    logger.remove()
+
+    sessions_per_core = 0
+    num_sessions = 1
+    while num_sessions <= args.max_sessions:
+        (lag, max_lag) = await run_sessions(num_sessions, args.processors, args.seconds)
+        print(f"{num_sessions:>5} sessions: loop lag {lag * 1000:>8.2f} ms (max {max_lag * 1000:.2f} ms)")
+        if lag > args.max_lag:
+            break
+        sessions_per_core = num_sessions
+        num_sessions *= 2
+
+    print(f"Sessions per core (loop lag < {args.max_lag * 1000:.0f} ms): {sessions_per_core}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,123 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures the time to first audio of `TTSService.say()` prompts with and
+without a `TTSCache`. The bot says `--prompts` prompts picked from a few fixed
+phrases (some much more frequent than others, like greetings and idle
+prompts) and a mock TTS service takes `--latency` seconds to convert each of
+them.
+
+The "disk" run uses a cache that starts empty in memory but shares its
+directory with a previous run, like a new worker process would.
+
+    python benchmarks/tts_cache.py
+    python benchmarks/tts_cache.py --prompts 500 --latency 0.3
+
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+from typing import AsyncGenerator
+
+from pipecat.frames.frames import AudioRawFrame, Frame, StartFrame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+from pipecat.utils.tts_cache import TTSCache
+
+from loguru import logger
+
+SAMPLE_RATE = 16000
+
+PHRASES = [
+    "Hi there! How can I help you today?",
+    "One moment, please.",
+    "Are you still there?",
+    "Sorry, I didn't catch that.",
+    "Let me check that for you.",
+    "Thanks for calling, goodbye!",
+]
+WEIGHTS = [8, 6, 4, 2, 2, 1]
+
+
+class MockTTSService(TTSService):
+
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self._voice = "voice"
+        self._latency = latency
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        await asyncio.sleep(self._latency)
+        # Roughly 60ms of audio per character, in 100ms frames.
+        for _ in range(int(len(text) * 0.6)):
+            yield AudioRawFrame(b"\x00" * int(SAMPLE_RATE * 0.1) * 2, SAMPLE_RATE, 1)
+
+
+class FirstAudio(FrameProcessor):
+
+    def __init__(self):
+        super().__init__()
+        self.time = 0.0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, AudioRawFrame) and not self.time:
+            self.time = time.monotonic()
+
+
+async def run(cache: TTSCache | None, prompts, latency: float) -> float:
+    tts = MockTTSService(latency, tts_cache=cache)
+    first_audio = FirstAudio()
+    tts.link(first_audio)
+    await tts.process_frame(StartFrame(), FrameDirection.DOWNSTREAM)
+
+    total = 0.0
+    for prompt in prompts:
+        first_audio.time = 0.0
+        start_time = time.monotonic()
+        await tts.say(prompt)
+        total += first_audio.time - start_time
+    return total / len(prompts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS cache benchmark")
+    parser.add_argument("-n", "--prompts", type=int, default=100, help="number of prompts")
+    parser.add_argument("-l", "--latency", type=float, default=0.2, help="TTS latency (seconds)")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    prompts = random.Random(0).choices(PHRASES, WEIGHTS, k=args.prompts)
+
+    print(f"{args.prompts} prompts, {len(PHRASES)} different phrases, {args.latency * 1000:.0f}ms TTS latency")
+    with tempfile.TemporaryDirectory() as cache_dir:
+        runs = [
+            ("no cache", None),
+            ("memory", TTSCache()),
+            ("disk", TTSCache(cache_dir=cache_dir)),
+        ]
+        # Fill the disk tier from another "process".
+        filler = TTSCache(cache_dir=cache_dir)
+        asyncio.run(run(filler, PHRASES, args.latency))
+        filler.wait_disk_writes()
+
+        for (name, cache) in runs:
+            first_audio = asyncio.run(run(cache, prompts, args.latency))
+            line = f"  {name:<9} first audio: {first_audio * 1000:6.1f} ms"
+            if cache:
+                stats = cache.stats()
+                line += (f"  hit rate: {stats['hit_rate'] * 100:5.1f}%"
+                         f"  audio not converted again: {stats['bytes_saved'] / (SAMPLE_RATE * 2):5.1f} s")
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
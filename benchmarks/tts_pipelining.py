@@ -0,0 +1,163 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures the silence between sentences when an HTTP TTS service converts
+a multi-sentence response. A local HTTP server stands in for the TTS service:
+it answers after `--latency` seconds and then streams the audio faster than
+real time. The client plays audio in real time, so any time it has nothing
+to play after the first audio is a gap heard by the user.
+
+Each run uses a different `TTSService` `lookahead`: with 0 (the default)
+sentences are converted one after the other, so every sentence pays a full
+round trip. With a lookahead, the next sentences are converted while the
+current one is still streaming.
+
+    python benchmarks/tts_pipelining.py
+    python benchmarks/tts_pipelining.py --latency 0.5 --sentences 10
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from typing import AsyncGenerator
+
+import aiohttp
+
+from aiohttp import web
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    EndFrame,
+    ErrorFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    StartFrame,
+    TextFrame)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+
+from loguru import logger
+
+SAMPLE_RATE = 16000
+# Audio generated for each character of text.
+SECS_PER_CHAR = 0.06
+# How much faster than real time the server streams audio.
+STREAMING_SPEEDUP = 5
+
+SENTENCES = [
+    "Sure.",
+    "It opens at nine.",
+    "Tickets are twenty dollars.",
+    "Kids get in free.",
+    "Buy them online.",
+    "Anything else?",
+]
+
+
+async def tts_handler(request: web.Request) -> web.StreamResponse:
+    latency = request.app["latency"]
+    payload = await request.json()
+    await asyncio.sleep(latency)
+
+    response = web.StreamResponse()
+    await response.prepare(request)
+    chunk_secs = 0.1
+    chunk = b"\x00" * int(SAMPLE_RATE * chunk_secs) * 2
+    for _ in range(int(len(payload["text"]) * SECS_PER_CHAR / chunk_secs) + 1):
+        await response.write(chunk)
+        await asyncio.sleep(chunk_secs / STREAMING_SPEEDUP)
+    await response.write_eof()
+    return response
+
+
+class HTTPTTSService(TTSService):
+
+    def __init__(self, *, aiohttp_session: aiohttp.ClientSession, url: str, **kwargs):
+        super().__init__(**kwargs)
+        self._aiohttp_session = aiohttp_session
+        self._url = url
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        async with self._aiohttp_session.post(self._url, json={"text": text}) as r:
+            if r.status != 200:
+                yield ErrorFrame(f"Error getting audio (status: {r.status})")
+                return
+            async for chunk in r.content.iter_chunked(3200):
+                yield AudioRawFrame(chunk, SAMPLE_RATE, 1)
+
+
+class RealTimePlayer(FrameProcessor):
+    """Plays audio in real time (on paper) and adds up the gaps."""
+
+    def __init__(self):
+        super().__init__()
+        self.first_audio_time = 0.0
+        self.playout_end = 0.0
+        self.gaps = 0.0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if not isinstance(frame, AudioRawFrame):
+            return
+        now = time.monotonic()
+        if not self.first_audio_time:
+            self.first_audio_time = now
+            self.playout_end = now
+        elif now > self.playout_end:
+            self.gaps += now - self.playout_end
+            self.playout_end = now
+        self.playout_end += len(frame.audio) / (SAMPLE_RATE * 2)
+
+
+async def run(lookahead: int, latency: float, num_sentences: int):
+    app = web.Application()
+    app["latency"] = latency
+    app.router.add_post("/tts", tts_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    async with aiohttp.ClientSession() as session:
+        tts = HTTPTTSService(aiohttp_session=session, url=f"http://127.0.0.1:{port}/tts", lookahead=lookahead)
+        player = RealTimePlayer()
+        tts.link(player)
+        await tts.process_frame(StartFrame(), FrameDirection.DOWNSTREAM)
+
+        start_time = time.monotonic()
+        await tts.process_frame(LLMFullResponseStartFrame(), FrameDirection.DOWNSTREAM)
+        for i in range(num_sentences):
+            await tts.process_frame(TextFrame(SENTENCES[i % len(SENTENCES)] + " "), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
+        await tts.cleanup()
+
+    await runner.cleanup()
+    return (player.first_audio_time - start_time, player.gaps, player.playout_end - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS pipelining benchmark")
+    parser.add_argument("-l", "--latency", type=float, default=0.5, help="TTS server latency (seconds)")
+    parser.add_argument("-s", "--sentences", type=int, default=6, help="sentences in the response")
+    parser.add_argument("--lookaheads", type=int, nargs="+", default=[0, 1, 2], help="lookaheads to compare")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    print(f"{args.sentences} sentences, {args.latency * 1000:.0f}ms TTS latency")
+    for lookahead in args.lookaheads:
+        (first_audio, gaps, total) = asyncio.run(run(lookahead, args.latency, args.sentences))
+        print(f"  lookahead {lookahead}  first audio: {first_audio * 1000:5.0f} ms"
+              f"  silence between sentences: {gaps * 1000:6.0f} ms  response played in: {total:5.2f} s")
+
+
+if __name__ == "__main__":
+    main()
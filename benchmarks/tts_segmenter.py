@@ -0,0 +1,168 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures how long a TTS service takes to produce the first audio of an LLM
+response, and the CPU time spent splitting text into sentences.
+
+LLM tokens arrive every `--token-interval` seconds and the TTS service takes
+`--tts-ttfb` seconds to produce the first audio of each segment. The "before"
+numbers use the old sentence aggregation (the whole sentence is concatenated
+and checked on every token), "sentences" uses `SentenceSegmenter` and "first
+clause" uses `SentenceSegmenter(first_clause_fast=True)`.
+
+    python benchmarks/tts_segmenter.py
+    python benchmarks/tts_segmenter.py --token-interval 0.01 --tts-ttfb 0.3
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from typing import AsyncGenerator
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    MetricsFrame,
+    StartFrame,
+    TextFrame)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+from pipecat.utils.text_segmenter import SentenceSegmenter
+
+from loguru import logger
+
+RESPONSE = (
+    "Well, that's a great question, and honestly the answer depends on a few "
+    "things, like how much time you have, what you already know about the "
+    "topic and what you want to get out of it in the end. Let's go over them "
+    "one by one. First, time. ")
+
+
+class FirstAudioCollector(FrameProcessor):
+
+    def __init__(self):
+        super().__init__()
+        self.values = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, MetricsFrame) and frame.first_audio:
+            self.values.append(frame.first_audio[0]["value"])
+
+
+class MockTTSService(TTSService):
+
+    def __init__(self, tts_ttfb: float, **kwargs):
+        super().__init__(**kwargs)
+        self._tts_ttfb = tts_ttfb
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        await asyncio.sleep(self._tts_ttfb)
+        yield AudioRawFrame(b"\x00" * 320, 16000, 1)
+
+
+class LegacyTTSService(MockTTSService):
+
+    def __init__(self, tts_ttfb: float, **kwargs):
+        super().__init__(tts_ttfb, **kwargs)
+        self._current_sentence = ""
+
+    async def _process_text_frame(self, frame: TextFrame):
+        if self._first_audio_armed:
+            self._first_audio_armed = False
+            self._first_text_time = time.monotonic()
+
+        self._current_sentence += frame.text
+        if self._current_sentence.strip().endswith(
+                (".", "?", "!")) and not self._current_sentence.strip().endswith(
+                ("Mr,", "Mrs.", "Ms.", "Dr.")):
+            text = self._current_sentence
+            self._current_sentence = ""
+            await self._push_tts_frames(text)
+
+    async def _flush_text(self):
+        text = self._current_sentence
+        self._current_sentence = ""
+        await self._push_tts_frames(text)
+
+
+def tokens(text: str):
+    # Roughly how LLMs tokenize: words with their leading space, punctuation
+    # on its own.
+    result = []
+    for word in text.split(" "):
+        if not word:
+            continue
+        if word[-1] in ",.?!":
+            result += [" " + word[:-1], word[-1]]
+        else:
+            result.append(" " + word)
+    return result
+
+
+async def first_audio(tts_factory, tts_ttfb: float, token_interval: float) -> float:
+    tts = tts_factory(tts_ttfb)
+    collector = FirstAudioCollector()
+    tts.link(collector)
+    await tts.process_frame(StartFrame(enable_metrics=True), FrameDirection.DOWNSTREAM)
+
+    async def llm():
+        await tts.process_frame(LLMFullResponseStartFrame(), FrameDirection.DOWNSTREAM)
+        for token in tokens(RESPONSE):
+            await asyncio.sleep(token_interval)
+            await tts.process_frame(TextFrame(token), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+
+    await llm()
+    return collector.values[0]
+
+
+def segmentation_cpu(tts_factory, num_tokens: int) -> float:
+    # A long text without sentence ends, e.g. a list or code.
+    async def run():
+        tts = tts_factory(0)
+        tts.link(FrameProcessor())
+        frame = TextFrame(" word")
+        start_time = time.process_time()
+        for _ in range(num_tokens):
+            await tts.process_frame(frame, FrameDirection.DOWNSTREAM)
+        return (time.process_time() - start_time) / num_tokens
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS text segmentation benchmark")
+    parser.add_argument("-i", "--token-interval", type=float, default=0.03, help="seconds between LLM tokens")
+    parser.add_argument("-t", "--tts-ttfb", type=float, default=0.2, help="TTS time to first byte (seconds)")
+    parser.add_argument("-n", "--tokens", type=int, default=20000, help="tokens for the CPU measurement")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    services = [
+        ("before", lambda ttfb: LegacyTTSService(ttfb)),
+        ("sentences", lambda ttfb: MockTTSService(ttfb)),
+        ("first clause", lambda ttfb: MockTTSService(
+            ttfb, text_segmenter=SentenceSegmenter(first_clause_fast=True))),
+    ]
+    print(f"{args.token_interval * 1000:.0f}ms between tokens, {args.tts_ttfb * 1000:.0f}ms TTS TTFB")
+    for (name, factory) in services:
+        value = asyncio.run(first_audio(factory, args.tts_ttfb, args.token_interval))
+        cpu = segmentation_cpu(factory, args.tokens)
+        print(f"  {name:<13} first audio: {value * 1000:6.0f} ms"
+              f"  CPU per token ({args.tokens} tokens without a sentence end): {cpu * 1e6:6.1f} us")
+
+
+if __name__ == "__main__":
+    main()
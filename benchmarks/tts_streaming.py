@@ -0,0 +1,205 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Compares converting LLM responses sentence by sentence with HTTP requests
+against streaming the tokens over a persistent websocket (`TTSService`
+`connection`, e.g. `ElevenLabsTTSService(streaming=True)`).
+
+A local server stands in for the TTS service. Every HTTP request pays
+`--setup` seconds (connection, TLS and model spin-up) plus `--latency`
+seconds before its first audio. The websocket is opened once, and each
+context only pays `--latency` before its first audio. LLM tokens (words)
+arrive every `--token-interval` seconds and audio is played in real time, so
+any time there's nothing to play after the first audio is a gap heard by the
+user.
+
+    python benchmarks/tts_streaming.py
+    python benchmarks/tts_streaming.py --setup 0.3 --latency 0.1 --token-interval 0.05
+
+"""
+
+import argparse
+import asyncio
+import base64
+import time
+
+from typing import AsyncGenerator
+
+import aiohttp
+
+from aiohttp import web
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    EndFrame,
+    ErrorFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    StartFrame,
+    TextFrame)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+from pipecat.services.elevenlabs import ElevenLabsWebsocketConnection
+
+from loguru import logger
+
+SAMPLE_RATE = 16000
+# Audio generated for each character of text.
+SECS_PER_CHAR = 0.06
+# How much faster than real time the server generates audio.
+STREAMING_SPEEDUP = 5
+
+RESPONSE = ("Sure. The museum opens at nine in the morning. Tickets are twenty dollars, "
+            "and kids under twelve get in free. You can buy them online or at the door. "
+            "Anything else I can help you with?")
+
+
+async def stream_audio(text: str, write):
+    chunk_secs = 0.1
+    chunk_size = int(SAMPLE_RATE * chunk_secs) * 2
+    audio = b"\x00" * (int(len(text) * SECS_PER_CHAR * SAMPLE_RATE) * 2)
+    for i in range(0, len(audio), chunk_size):
+        await write(audio[i:i + chunk_size])
+        await asyncio.sleep(chunk_secs / STREAMING_SPEEDUP)
+
+
+async def http_handler(request: web.Request) -> web.StreamResponse:
+    payload = await request.json()
+    await asyncio.sleep(request.app["setup"] + request.app["latency"])
+    response = web.StreamResponse()
+    await response.prepare(request)
+    await stream_audio(payload["text"], response.write)
+    await response.write_eof()
+    return response
+
+
+async def websocket_handler(request: web.Request) -> web.WebSocketResponse:
+    ws = web.WebSocketResponse()
+    await ws.prepare(request)
+    started = set()
+    async for message in ws:
+        message = message.json()
+        if message.get("close_socket"):
+            break
+        context_id = message["context_id"]
+        if message.get("close_context"):
+            await ws.send_json({"contextId": context_id, "isFinal": True})
+            continue
+
+        async def write(chunk: bytes):
+            data = base64.b64encode(chunk).decode()
+            await ws.send_json({"contextId": context_id, "audio": data, "isFinal": None})
+
+        if context_id not in started:
+            started.add(context_id)
+            await asyncio.sleep(request.app["latency"])
+        if message.get("text"):
+            await stream_audio(message["text"], write)
+    return ws
+
+
+class HTTPTTSService(TTSService):
+
+    def __init__(self, *, aiohttp_session: aiohttp.ClientSession, url: str, **kwargs):
+        super().__init__(**kwargs)
+        self._aiohttp_session = aiohttp_session
+        self._url = url
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        async with self._aiohttp_session.post(self._url, json={"text": text}) as r:
+            if r.status != 200:
+                yield ErrorFrame(f"Error getting audio (status: {r.status})")
+                return
+            async for chunk in r.content.iter_chunked(3200):
+                yield AudioRawFrame(chunk, SAMPLE_RATE, 1)
+
+
+class RealTimePlayer(FrameProcessor):
+    """Plays audio in real time (on paper) and adds up the gaps."""
+
+    def __init__(self):
+        super().__init__()
+        self.first_audio_time = 0.0
+        self.playout_end = 0.0
+        self.gaps = 0.0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if not isinstance(frame, AudioRawFrame):
+            return
+        now = time.monotonic()
+        if not self.first_audio_time:
+            self.first_audio_time = now
+            self.playout_end = now
+        elif now > self.playout_end:
+            self.gaps += now - self.playout_end
+            self.playout_end = now
+        self.playout_end += len(frame.audio) / (SAMPLE_RATE * 2)
+
+
+async def run(mode: str, args):
+    app = web.Application()
+    app["setup"] = args.setup
+    app["latency"] = args.latency
+    app.router.add_post("/tts", http_handler)
+    app.router.add_get("/v1/text-to-speech/{voice_id}/multi-stream-input", websocket_handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    async with aiohttp.ClientSession() as session:
+        if mode == "websocket":
+            connection = ElevenLabsWebsocketConnection(
+                api_key="",
+                voice_id="voice",
+                model="",
+                sample_rate=SAMPLE_RATE,
+                url=f"http://127.0.0.1:{port}/v1/text-to-speech",
+                aiohttp_session=session)
+            tts = HTTPTTSService(aiohttp_session=session, url="", connection=connection)
+            await tts.warmup()
+        else:
+            lookahead = 1 if mode == "http lookahead" else 0
+            tts = HTTPTTSService(aiohttp_session=session, url=f"http://127.0.0.1:{port}/tts", lookahead=lookahead)
+        player = RealTimePlayer()
+        tts.link(player)
+        await tts.process_frame(StartFrame(), FrameDirection.DOWNSTREAM)
+
+        start_time = time.monotonic()
+        await tts.process_frame(LLMFullResponseStartFrame(), FrameDirection.DOWNSTREAM)
+        for (i, word) in enumerate(RESPONSE.split()):
+            await tts.process_frame(TextFrame(word if i == 0 else f" {word}"), FrameDirection.DOWNSTREAM)
+            await asyncio.sleep(args.token_interval)
+        await tts.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
+        await tts.cleanup()
+
+    await runner.cleanup()
+    return (player.first_audio_time - start_time, player.gaps, player.playout_end - start_time)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS websocket streaming benchmark")
+    parser.add_argument("--setup", type=float, default=0.2, help="per HTTP request setup time (seconds)")
+    parser.add_argument("-l", "--latency", type=float, default=0.1, help="TTS first audio latency (seconds)")
+    parser.add_argument("-t", "--token-interval", type=float, default=0.03, help="time between LLM tokens (seconds)")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    print(f"{args.setup * 1000:.0f}ms request setup, {args.latency * 1000:.0f}ms TTS latency, "
+          f"{args.token_interval * 1000:.0f}ms between tokens")
+    for mode in ["http", "http lookahead", "websocket"]:
+        (first_audio, gaps, total) = asyncio.run(run(mode, args))
+        print(f"  {mode:<15} first audio: {first_audio * 1000:5.0f} ms"
+              f"  silence after first audio: {gaps * 1000:6.0f} ms  response played in: {total:5.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Replays labeled WAV files through `VADAnalyzer.analyze_audio()` and reports
+the accuracy and the CPU cost of each analyzer.
+
+WAV files need to be 16-bit mono. Speech segments are read from a label file
+with the same name and a .txt extension, with one segment per line as
+`<start secs> <end secs> [label]` (e.g. Audacity labels). If no files are
+given, a synthetic labeled file is generated (harmonic "speech" over a noise
+floor that changes level).
+
+Two accuracies are reported: per window (voice confidence and volume above
+the `VADParams` thresholds) and per speaking state (user speaking from
+`SPEAKING` until `QUIET`, as the transports report it, which includes the
+start and stop delays).
+
+    python benchmarks/vad_accuracy.py
+    python benchmarks/vad_accuracy.py --analyzer energy silero -r 8000
+    python benchmarks/vad_accuracy.py recordings/*.wav
+
+"""
+
+import argparse
+import os
+import time
+import wave
+
+from typing import List, Tuple
+
+import numpy as np
+
+from pipecat.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+from loguru import logger
+
+Segments = List[Tuple[float, float]]
+
+
+def create_analyzer(name: str, sample_rate: int) -> VADAnalyzer:
+    match name:
+        case "energy":
+            from pipecat.vad.energy import EnergyVADAnalyzer
+            return EnergyVADAnalyzer(sample_rate=sample_rate)
+        case "silero":
+            from pipecat.vad.silero import SileroVADAnalyzer
+            return SileroVADAnalyzer(sample_rate=sample_rate)
+        case "webrtc":
+            from pipecat.transports.services.daily import WebRTCVADAnalyzer
+            return WebRTCVADAnalyzer(sample_rate=sample_rate)
+    raise ValueError(f"Unknown analyzer {name}")
+
+
+def read_labeled_wav(path: str) -> Tuple[bytes, int, Segments]:
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError(f"{path} needs to be 16-bit mono")
+        audio = wf.readframes(wf.getnframes())
+        sample_rate = wf.getframerate()
+
+    segments = []
+    with open(os.path.splitext(path)[0] + ".txt") as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) >= 2:
+                segments.append((float(fields[0]), float(fields[1])))
+    return (audio, sample_rate, segments)
+
+
+def synthetic_labeled_audio(sample_rate: int) -> Tuple[bytes, int, Segments]:
+    rng = np.random.default_rng(1234)
+
+    def speech(secs: float, level: float) -> np.ndarray:
+        t = np.arange(int(secs * sample_rate)) / sample_rate
+        f0 = 110 + 30 * np.sin(2 * np.pi * 0.7 * t)
+        phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+        signal = sum(np.sin(k * phase) / k for k in range(1, 23))
+        envelope = 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t) ** 2
+        return signal * envelope * level / np.std(signal)
+
+    # (seconds, noise level, speech level)
+    parts = [(2, 30, 0), (1.5, 30, 3000), (2, 30, 0), (2, 300, 0), (1, 300, 1500),
+             (1.5, 300, 0), (3, 100, 2000), (2, 100, 0)]
+    audio = []
+    segments = []
+    offset = 0.0
+    for (secs, noise_level, speech_level) in parts:
+        chunk = rng.standard_normal(int(secs * sample_rate)) * noise_level
+        if speech_level:
+            chunk += speech(secs, speech_level)
+            segments.append((offset, offset + secs))
+        audio.append(chunk)
+        offset += secs
+    audio = np.clip(np.concatenate(audio), -32768, 32767).astype(np.int16)
+    return (audio.tobytes(), sample_rate, segments)
+
+
+def is_speech(segments: Segments, t: float) -> bool:
+    return any(start <= t < end for (start, end) in segments)
+
+
+def evaluate(analyzer: VADAnalyzer, audio: bytes, segments: Segments):
+    params = VADParams()
+    window_bytes = analyzer.num_frames_required() * 2
+    window_secs = analyzer.num_frames_required() / analyzer.sample_rate
+
+    # Keep the confidence of each window.
+    confidences = []
+    voice_confidence = analyzer.voice_confidence
+
+    def recorded_voice_confidence(buffer) -> float:
+        confidence = voice_confidence(buffer)
+        confidences.append(confidence)
+        return confidence
+
+    analyzer.voice_confidence = recorded_voice_confidence
+
+    labels = []
+    window_predictions = []
+    state_predictions = []
+    speaking = False
+    elapsed = 0.0
+    for (i, offset) in enumerate(range(0, len(audio) - window_bytes + 1, window_bytes)):
+        start_time = time.perf_counter()
+        state = analyzer.analyze_audio(audio[offset:offset + window_bytes])
+        elapsed += time.perf_counter() - start_time
+
+        if state == VADState.SPEAKING:
+            speaking = True
+        elif state == VADState.QUIET:
+            speaking = False
+
+        labels.append(is_speech(segments, (i + 0.5) * window_secs))
+        window_predictions.append(confidences[-1] >= params.confidence
+                                  and analyzer._prev_volume >= params.min_volume)
+        state_predictions.append(speaking)
+
+    audio_secs = len(labels) * window_secs
+    return (np.array(labels), np.array(window_predictions), np.array(state_predictions),
+            len(labels), elapsed, audio_secs)
+
+
+def scores(labels: np.ndarray, predictions: np.ndarray) -> str:
+    tp = np.count_nonzero(labels & predictions)
+    precision = tp / max(1, np.count_nonzero(predictions))
+    recall = tp / max(1, np.count_nonzero(labels))
+    accuracy = np.count_nonzero(labels == predictions) / max(1, labels.size)
+    return f"accuracy {accuracy:.3f}  precision {precision:.3f}  recall {recall:.3f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAD accuracy and throughput benchmark")
+    parser.add_argument("files", nargs="*", help="labeled 16-bit mono WAV files")
+    parser.add_argument("-a", "--analyzer", nargs="+", default=["energy"],
+                        choices=["energy", "silero", "webrtc"], help="analyzers to evaluate")
+    parser.add_argument("-r", "--sample-rate", type=int, default=16000,
+                        help="sample rate of the synthetic audio")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    if args.files:
+        inputs = [(path, *read_labeled_wav(path)) for path in args.files]
+    else:
+        inputs = [("synthetic", *synthetic_labeled_audio(args.sample_rate))]
+
+    for name in args.analyzer:
+        print(f"{name}:")
+        for (path, audio, sample_rate, segments) in inputs:
+            analyzer = create_analyzer(name, sample_rate)
+            (labels, windows, states, num_windows, elapsed, audio_secs) = evaluate(
+                analyzer, audio, segments)
+            print(f"  {path} ({sample_rate} Hz, {audio_secs:.1f}s)")
+            print(f"    windows: {scores(labels, windows)}")
+            print(f"    states:  {scores(labels, states)}")
+            print(f"    {num_windows / elapsed:,.0f} windows/s, {100 * elapsed / audio_secs:.3f}% of a core per stream")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures how many VAD windows per second (in one core) `VADAnalyzer` can
+analyze, excluding the model itself (the voice confidence is constant). It
+compares the current ring buffer with the previous implementation, which
+copied the whole `bytes` buffer on every call and only analyzed one window per
+call. Audio is sent in 20ms chunks and also in 1 second chunks (i.e. when the
+stream is behind).
+
+    python benchmarks/vad_analyzer.py
+
+"""
+
+import argparse
+import time
+
+from pipecat.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+
+class ConstantVADAnalyzer(VADAnalyzer):
+
+    def __init__(self, with_volume: bool):
+        super().__init__(sample_rate=16000, num_channels=1, params=VADParams())
+        self._with_volume = with_volume
+
+    def num_frames_required(self) -> int:
+        return 512
+
+    def voice_confidence(self, buffer) -> float:
+        return 1.0
+
+    def _get_smoothed_volume(self, audio) -> float:
+        if self._with_volume:
+            return super()._get_smoothed_volume(audio)
+        return 1.0
+
+
+class LegacyVADAnalyzer(ConstantVADAnalyzer):
+    """The previous buffering: immutable bytes and one window per call."""
+
+    def __init__(self, with_volume: bool):
+        super().__init__(with_volume)
+        self._legacy_buffer = b""
+
+    def analyze_audio(self, buffer) -> VADState:
+        self._legacy_buffer += buffer
+
+        num_required_bytes = self._vad_frames_num_bytes
+        if len(self._legacy_buffer) < num_required_bytes:
+            return self._vad_state
+
+        audio_frames = self._legacy_buffer[:num_required_bytes]
+        self._legacy_buffer = self._legacy_buffer[num_required_bytes:]
+
+        return self._analyze_window(audio_frames)
+
+
+def run(analyzer: VADAnalyzer, chunk_ms: int, seconds: float) -> float:
+    chunk = b"\x01\x00" * (16 * chunk_ms)
+    num_chunks = int(seconds * 1000 / chunk_ms)
+    start_time = time.perf_counter()
+    for _ in range(num_chunks):
+        analyzer.analyze_audio(chunk)
+    elapsed = time.perf_counter() - start_time
+    # Only count the windows that were actually analyzed.
+    windows = (num_chunks * len(chunk) - pending_bytes(analyzer)) // analyzer._vad_frames_num_bytes
+    return windows / elapsed, windows
+
+
+def pending_bytes(analyzer: VADAnalyzer) -> int:
+    if isinstance(analyzer, LegacyVADAnalyzer):
+        return len(analyzer._legacy_buffer)
+    return analyzer._vad_buffer_end - analyzer._vad_buffer_start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VADAnalyzer benchmark")
+    parser.add_argument("-s", "--seconds", type=float, default=600,
+                        help="seconds of audio to analyze")
+    parser.add_argument("--volume", action="store_true",
+                        help="also compute the volume of each window")
+    args = parser.parse_args()
+
+    print(f"{args.seconds} seconds of audio ({int(args.seconds * 16000 / 512)} windows)")
+    for chunk_ms in [20, 1000]:
+        for cls in [LegacyVADAnalyzer, ConstantVADAnalyzer]:
+            (wps, windows) = run(cls(args.volume), chunk_ms, args.seconds)
+            name = "legacy" if cls == LegacyVADAnalyzer else "ring buffer"
+            print(f"  {chunk_ms:>4}ms chunks  {name:<12} {wps:>12,.0f} windows/s  ({windows} windows analyzed)")
+
+
+if __name__ == "__main__":
+    main()
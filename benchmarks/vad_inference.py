@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Estimates how many VAD streams (sessions) one core can handle, analyzing
+each stream with its own model (one model call per window) and with a shared
+`VADInferenceService` (one batched model call per window of all streams).
+Streams per core is the number of streams divided by the fraction of real
+time needed to analyze them.
+
+By default it uses Silero VAD (`pip install pipecat-ai[silero]`), which runs
+on CPU with a single thread. With `--mock` it uses a small numpy model instead
+to measure the overhead of the service itself.
+
+    python benchmarks/vad_inference.py
+    python benchmarks/vad_inference.py --mock
+
+"""
+
+import argparse
+import time
+
+from typing import Any, List, Sequence, Tuple
+
+import numpy as np
+
+from pipecat.vad.vad_inference import VADBatchModel, VADInferenceService
+
+from loguru import logger
+
+WINDOW_SIZE = 512
+WINDOW_SECS = WINDOW_SIZE / 16000
+
+
+class MockBatchModel(VADBatchModel):
+    """A tiny recurrent model with a similar shape to Silero (512 samples in,
+    128 state values).
+
+    """
+
+    def __init__(self):
+        rng = np.random.default_rng(0)
+        self._w_in = rng.standard_normal((WINDOW_SIZE, 128)).astype(np.float32) / 32
+        self._w_state = rng.standard_normal((128, 128)).astype(np.float32) / 16
+        self._w_out = rng.standard_normal(128).astype(np.float32)
+
+    def new_state(self) -> Any:
+        return np.zeros(128, dtype=np.float32)
+
+    def infer(self, windows: np.ndarray, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        state = np.tanh(windows @ self._w_in + np.stack(states) @ self._w_state)
+        confidences = 1 / (1 + np.exp(-(state @ self._w_out)))
+        return (confidences, list(state))
+
+
+def load_model(mock: bool) -> VADBatchModel:
+    if mock:
+        return MockBatchModel()
+
+    from pipecat.vad.silero import get_silero_vad_model
+    return get_silero_vad_model(version="v5.0", sample_rate=16000, allow_download=True)
+
+
+def make_windows(num_streams: int, num_ticks: int) -> np.ndarray:
+    rng = np.random.default_rng(1234)
+    audio = rng.standard_normal((num_ticks, num_streams, WINDOW_SIZE)) * 1000
+    return audio.astype(np.int16)
+
+
+def run_per_stream(model: VADBatchModel, windows: np.ndarray) -> float:
+    (num_ticks, num_streams, _) = windows.shape
+    states = [model.new_state() for _ in range(num_streams)]
+    start_time = time.perf_counter()
+    for tick in range(num_ticks):
+        for stream in range(num_streams):
+            window = windows[tick, stream].astype(np.float32)[np.newaxis] / 32768.0
+            (_, [states[stream]]) = model.infer(window, [states[stream]])
+    return time.perf_counter() - start_time
+
+
+def run_batched(model: VADBatchModel, windows: np.ndarray) -> Tuple[float, float]:
+    (num_ticks, num_streams, _) = windows.shape
+    service = VADInferenceService(model, max_batch_size=num_streams)
+    streams = [service.open_stream() for _ in range(num_streams)]
+    start_time = time.perf_counter()
+    for tick in range(num_ticks):
+        futures = [service.submit(stream, windows[tick, i]) for (i, stream) in enumerate(streams)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start_time
+    avg_batch_size = service.stats()["avg_batch_size"]
+    service.stop()
+    return (elapsed, avg_batch_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAD inference benchmark")
+    parser.add_argument("-s", "--seconds", type=float, default=10,
+                        help="seconds of audio per stream")
+    parser.add_argument("--streams", type=int, nargs="+", default=[1, 10, 50, 100, 200],
+                        help="number of concurrent streams")
+    parser.add_argument("--mock", action="store_true",
+                        help="use a numpy mock model instead of Silero VAD")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    model = load_model(args.mock)
+    num_ticks = int(args.seconds / WINDOW_SECS)
+
+    print(f"{args.seconds} seconds of audio per stream ({num_ticks} windows)")
+    for num_streams in args.streams:
+        windows = make_windows(num_streams, num_ticks)
+
+        elapsed = run_per_stream(model, windows)
+        per_stream = num_streams * args.seconds / elapsed
+
+        (elapsed, avg_batch_size) = run_batched(model, windows)
+        batched = num_streams * args.seconds / elapsed
+
+        print(f"  {num_streams:>4} streams  per stream: {per_stream:>8,.0f} streams/core"
+              f"  batched: {batched:>8,.0f} streams/core  (avg batch size {avg_batch_size:.1f})")
+
+
+if __name__ == "__main__":
+    main()
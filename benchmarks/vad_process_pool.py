@@ -0,0 +1,114 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Simulates many concurrent streams analyzing 20ms audio chunks in real
+time, like `BaseInputTransport` does, and reports the event loop lag and how
+late chunks are analyzed. It compares running the analyzers in executor
+threads (a `ThreadPoolExecutor` of 5 threads per stream, as the transports do)
+with running them in a `VADProcessPool` (shared memory ring buffers, no
+executor threads).
+
+    python benchmarks/vad_process_pool.py --streams 200
+    python benchmarks/vad_process_pool.py --streams 200 --analyzer silero
+
+"""
+
+import argparse
+import asyncio
+import functools
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from pipecat.utils.loop_lag import LoopLagMonitor
+from pipecat.vad.vad_process_pool import ProcessVADAnalyzer, VADProcessPool
+
+from loguru import logger
+
+SAMPLE_RATE = 16000
+CHUNK_SECS = 0.02
+
+
+def analyzer_factory(name: str):
+    match name:
+        case "energy":
+            from pipecat.vad.energy import EnergyVADAnalyzer
+            return functools.partial(EnergyVADAnalyzer, sample_rate=SAMPLE_RATE)
+        case "silero":
+            from pipecat.vad.silero import SileroVADAnalyzer
+            return functools.partial(SileroVADAnalyzer, sample_rate=SAMPLE_RATE)
+    raise ValueError(f"Unknown analyzer {name}")
+
+
+async def run_stream(analyzer, executor, seconds: float, delays):
+    rng = np.random.default_rng()
+    chunk = (rng.standard_normal(int(SAMPLE_RATE * CHUNK_SECS)) * 1000).astype(np.int16).tobytes()
+    loop = asyncio.get_running_loop()
+    # Streams don't all start at the same time.
+    await asyncio.sleep(rng.random() * CHUNK_SECS)
+    start_time = loop.time()
+    num_chunks = int(seconds / CHUNK_SECS)
+    for i in range(num_chunks):
+        await analyzer.analyze_audio_windows_async(chunk, executor)
+        # How late we are with respect to real time.
+        delays.append(max(0.0, loop.time() - (start_time + (i + 1) * CHUNK_SECS)))
+        next_time = start_time + (i + 1) * CHUNK_SECS
+        await asyncio.sleep(max(0.0, next_time - loop.time()))
+
+
+async def run(backend: str, factory, num_streams: int, seconds: float, pool: VADProcessPool | None):
+    if backend == "threads":
+        analyzers = [factory() for _ in range(num_streams)]
+        executors = [ThreadPoolExecutor(max_workers=5) for _ in range(num_streams)]
+    else:
+        analyzers = [ProcessVADAnalyzer(pool, factory) for _ in range(num_streams)]
+        executors = [None] * num_streams
+
+    monitor = LoopLagMonitor(interval=0.01)
+    monitor.start()
+    delays = []
+    cpu_time = time.process_time()
+    await asyncio.gather(*[run_stream(a, e, seconds, delays) for (a, e) in zip(analyzers, executors)])
+    cpu_time = time.process_time() - cpu_time
+    await monitor.stop()
+
+    for executor in executors:
+        if executor:
+            executor.shutdown()
+    for analyzer in analyzers:
+        if isinstance(analyzer, ProcessVADAnalyzer):
+            analyzer.close()
+
+    return (monitor.lag, monitor.max_lag, np.percentile(delays, 99), cpu_time / seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VAD process pool benchmark")
+    parser.add_argument("-n", "--streams", type=int, default=200, help="number of streams")
+    parser.add_argument("-s", "--seconds", type=float, default=5, help="seconds of audio per stream")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-a", "--analyzer", default="energy", choices=["energy", "silero"])
+    args = parser.parse_args()
+
+    logger.remove()
+
+    factory = analyzer_factory(args.analyzer)
+    pool = VADProcessPool(num_workers=args.workers)
+    pool.start()
+
+    print(f"{args.streams} streams, {args.analyzer} analyzer")
+    for backend in ["threads", "process pool"]:
+        (lag, max_lag, delay, cpu) = asyncio.run(run(backend, factory, args.streams, args.seconds, pool))
+        print(f"  {backend:<13} loop lag: {lag * 1000:6.1f} ms (max {max_lag * 1000:6.1f} ms)"
+              f"  p99 chunk delay: {delay * 1000:7.1f} ms  main process CPU: {cpu * 100:5.1f}%")
+
+    pool.stop()
+
+
+if __name__ == "__main__":
+    main()
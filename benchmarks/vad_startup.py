@@ -0,0 +1,77 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures the time to create a `SileroVADAnalyzer` (i.e. the VAD part of a
+session startup) and the resident memory used by all of them, with the shared
+model registry (`get_silero_vad_model()`) and with a model per analyzer. Each
+case runs in a new process. Requires `pip install pipecat-ai[silero]` and the
+model already in the torch hub cache (it's downloaded the first time).
+
+    python benchmarks/vad_startup.py
+
+"""
+
+import argparse
+import multiprocessing
+import time
+
+from loguru import logger
+
+
+def run(shared_model: bool, num_sessions: int, results):
+    logger.remove()
+
+    try:
+        from pipecat.utils.shared_models import resident_memory, shared_model_stats
+        from pipecat.vad.silero import SileroVADAnalyzer
+    except Exception as e:
+        results.put({"error": str(e)})
+        return
+
+    start_memory = resident_memory()
+    startup_times = []
+    analyzers = []
+    for _ in range(num_sessions):
+        start_time = time.perf_counter()
+        analyzers.append(SileroVADAnalyzer(shared_model=shared_model))
+        startup_times.append(time.perf_counter() - start_time)
+
+    results.put({
+        "first": startup_times[0],
+        "rest": sum(startup_times[1:]) / max(1, num_sessions - 1),
+        "memory": resident_memory() - start_memory,
+        "models": shared_model_stats(),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Silero VAD startup benchmark")
+    parser.add_argument("-n", "--sessions", type=int, default=50,
+                        help="number of analyzers (sessions) to create")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    for shared_model in [False, True]:
+        results = context.Queue()
+        process = context.Process(target=run, args=(shared_model, args.sessions, results))
+        process.start()
+        result = results.get()
+        process.join()
+        if "error" in result:
+            print(f"Error: {result['error']}")
+            return
+
+        name = "shared model" if shared_model else "model per session"
+        print(f"{name}:")
+        print(f"  first session: {result['first'] * 1000:>10.1f} ms")
+        print(f"  other sessions: {result['rest'] * 1000:>9.3f} ms")
+        print(f"  memory ({args.sessions} sessions): {result['memory'] / 1e6:>8.1f} MB")
+        for (key, stats) in result["models"].items():
+            print(f"  {key}: loaded in {stats['load_time']:.3f}s ({stats['memory'] / 1e6:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
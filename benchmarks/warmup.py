@@ -0,0 +1,110 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+"""Measures the startup time of a session and the latency of its first turn
+(the bot's greeting) with and without warming up the TTS service.
+
+The mock TTS service needs `--connect` seconds to open a connection and fetch
+its voice, which happens on its first request unless it's warmed up, and then
+`--latency` seconds per request. The "phrases" run also converts the greeting
+into the TTS cache while warming up.
+
+    python benchmarks/warmup.py
+    python benchmarks/warmup.py --connect 0.8 --latency 0.3
+
+"""
+
+import argparse
+import asyncio
+import time
+
+from typing import AsyncGenerator
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame, Frame, MetricsFrame, TextFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+from pipecat.utils.tts_cache import TTSCache
+
+from loguru import logger
+
+GREETING = "Hi there! How can I help you today?"
+
+
+class MockTTSService(TTSService):
+
+    def __init__(self, connect: float, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self._voice = "voice"
+        self._connect = connect
+        self._latency = latency
+        self._connected = False
+
+    async def warmup(self):
+        await self._connect_once()
+        await super().warmup()
+
+    async def _connect_once(self):
+        if not self._connected:
+            await asyncio.sleep(self._connect)
+            self._connected = True
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        await self._connect_once()
+        await asyncio.sleep(self._latency)
+        yield AudioRawFrame(b"\x00" * 3200, 16000, 1)
+
+
+class FirstAudio(FrameProcessor):
+
+    def __init__(self):
+        super().__init__()
+        self.first_audio_time = 0.0
+        self.startup = 0.0
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, AudioRawFrame) and not self.first_audio_time:
+            self.first_audio_time = time.monotonic()
+        elif isinstance(frame, MetricsFrame) and frame.startup:
+            self.startup = frame.startup[-1]["value"]
+
+
+async def run(enable_warmup: bool, phrases: bool, connect: float, latency: float):
+    cache = TTSCache()
+    tts = MockTTSService(connect, latency, tts_cache=cache, warmup_phrases=[GREETING] if phrases else [])
+    first_audio = FirstAudio()
+    task = PipelineTask(
+        Pipeline([tts, first_audio]),
+        PipelineParams(enable_metrics=True, enable_warmup=enable_warmup))
+
+    # The greeting is queued right away, as bots usually do.
+    start_time = time.monotonic()
+    await task.queue_frames([TextFrame(GREETING), EndFrame()])
+    await task.run()
+    # The greeting can't be said before the pipeline has started.
+    first_turn = first_audio.first_audio_time - start_time - first_audio.startup
+    return (first_audio.startup, first_turn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Service warm-up benchmark")
+    parser.add_argument("-c", "--connect", type=float, default=0.5, help="TTS connection time (seconds)")
+    parser.add_argument("-l", "--latency", type=float, default=0.2, help="TTS latency (seconds)")
+    args = parser.parse_args()
+
+    logger.remove()
+
+    print(f"{args.connect * 1000:.0f}ms to connect, {args.latency * 1000:.0f}ms TTS latency")
+    for (name, enable_warmup, phrases) in [("no warm-up", False, False), ("warm-up", True, False),
+                                           ("phrases", True, True)]:
+        (startup, first_turn) = asyncio.run(run(enable_warmup, phrases, args.connect, args.latency))
+        print(f"  {name:<11} startup: {startup * 1000:5.0f} ms  first turn: {first_turn * 1000:5.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,25 +11,41 @@ from dataclasses import dataclass, field
 from pipecat.utils.utils import obj_count, obj_id
 
 
-@dataclass
+@dataclass(slots=True)
 class Frame:
+    """Base class of all frames. Frames are created very often (e.g. audio
+    frames every few milliseconds), so all frames use slots to avoid a
+    per-instance `__dict__`. Subclasses should also be declared with
+    `@dataclass(slots=True)`.
+
+    """
     id: int = field(init=False)
     name: str = field(init=False)
+    _count: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         self.id: int = obj_id()
-        self.name: str = f"{self.__class__.__name__}#{obj_count(self)}"
+        # Frame names are mostly used for logging, so we only keep the count
+        # here and build the name the first time it's accessed.
+        self._count: int = obj_count(self)
+
+    def __getattr__(self, attr: str):
+        # This is only called if `name` has not been set yet.
+        if attr == "name":
+            self.name = f"{self.__class__.__name__}#{self._count}"
+            return self.name
+        raise AttributeError(f"'{self.__class__.__name__}' object has no attribute '{attr}'")
 
     def __str__(self):
         return self.name
 
 
-@dataclass
+@dataclass(slots=True)
 class DataFrame(Frame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioRawFrame(DataFrame):
     """A chunk of audio. Will be played by the transport if the transport's
     microphone has been enabled.
@@ -39,15 +55,15 @@ class AudioRawFrame(DataFrame):
     sample_rate: int
     num_channels: int
 
-    def __post_init__(self):
-        super().__post_init__()
-        self.num_frames = int(len(self.audio) / (self.num_channels * 2))
+    @property
+    def num_frames(self) -> int:
+        return len(self.audio) // (self.num_channels * 2)
 
     def __str__(self):
         return f"{self.name}(size: {len(self.audio)}, frames: {self.num_frames}, sample_rate: {self.sample_rate}, channels: {self.num_channels})"
 
 
-@dataclass
+@dataclass(slots=True)
 class ImageRawFrame(DataFrame):
     """An image. Will be shown by the transport if the transport's camera is
     enabled.
@@ -61,7 +77,7 @@ class ImageRawFrame(DataFrame):
         return f"{self.name}(size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class URLImageRawFrame(ImageRawFrame):
     """An image with an associated URL. Will be shown by the transport if the
     transport's camera is enabled.
@@ -73,7 +89,7 @@ class URLImageRawFrame(ImageRawFrame):
         return f"{self.name}(url: {self.url}, size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class VisionImageRawFrame(ImageRawFrame):
     """An image with an associated text to ask for a description of it. Will be
     shown by the transport if the transport's camera is enabled.
@@ -85,7 +101,7 @@ class VisionImageRawFrame(ImageRawFrame):
         return f"{self.name}(text: {self.text}, size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class UserImageRawFrame(ImageRawFrame):
     """An image associated to a user. Will be shown by the transport if the
     transport's camera is enabled.
@@ -97,7 +113,7 @@ class UserImageRawFrame(ImageRawFrame):
         return f"{self.name}(user: {self.user_id}, size: {self.size}, format: {self.format})"
 
 
-@dataclass
+@dataclass(slots=True)
 class SpriteFrame(Frame):
     """An animated sprite. Will be shown by the transport if the transport's
     camera is enabled. Will play at the framerate specified in the transport's
@@ -110,7 +126,7 @@ class SpriteFrame(Frame):
         return f"{self.name}(size: {len(self.images)})"
 
 
-@dataclass
+@dataclass(slots=True)
 class TextFrame(DataFrame):
     """A chunk of text. Emitted by LLM services, consumed by TTS services, can
     be used to send text through pipelines.
@@ -122,7 +138,7 @@ class TextFrame(DataFrame):
         return f"{self.name}(text: {self.text})"
 
 
-@dataclass
+@dataclass(slots=True)
 class TranscriptionFrame(TextFrame):
     """A text frame with transcription-specific data. Will be placed in the
     transport's receive queue when a participant speaks.
@@ -135,7 +151,7 @@ class TranscriptionFrame(TextFrame):
         return f"{self.name}(user: {self.user_id}, text: {self.text}, timestamp: {self.timestamp})"
 
 
-@dataclass
+@dataclass(slots=True)
 class InterimTranscriptionFrame(TextFrame):
     """A text frame with interim transcription-specific data. Will be placed in
     the transport's receive queue when a participant speaks."""
@@ -146,7 +162,7 @@ class InterimTranscriptionFrame(TextFrame):
         return f"{self.name}(user: {self.user_id}, text: {self.text}, timestamp: {self.timestamp})"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMMessagesFrame(DataFrame):
     """A frame containing a list of LLM messages. Used to signal that an LLM
     service should run a chat completion and emit an LLMStartFrames, TextFrames
@@ -158,7 +174,7 @@ class LLMMessagesFrame(DataFrame):
     messages: List[dict]
 
 
-@dataclass
+@dataclass(slots=True)
 class TransportMessageFrame(DataFrame):
     message: Any
 
@@ -170,7 +186,7 @@ class TransportMessageFrame(DataFrame):
 #
 
 
-@dataclass
+@dataclass(slots=True)
 class AppFrame(Frame):
     pass
 
@@ -179,26 +195,28 @@ class AppFrame(Frame):
 #
 
 
-@dataclass
+@dataclass(slots=True)
 class SystemFrame(Frame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StartFrame(SystemFrame):
     """This is the first frame that should be pushed down a pipeline."""
     allow_interruptions: bool = False
     enable_metrics: bool = False
     report_only_initial_ttfb: bool = False
+    # A LatencyTracer if tracing is enabled (see `PipelineParams`).
+    tracer: Any = None
 
 
-@dataclass
+@dataclass(slots=True)
 class CancelFrame(SystemFrame):
     """Indicates that a pipeline needs to stop right away."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class ErrorFrame(SystemFrame):
     """This is used notify upstream that an error has occurred downstream the
     pipeline."""
@@ -208,7 +226,7 @@ class ErrorFrame(SystemFrame):
         return f"{self.name}(error: {self.error})"
 
 
-@dataclass
+@dataclass(slots=True)
 class StopTaskFrame(SystemFrame):
     """Indicates that a pipeline task should be stopped. This should inform the
     pipeline processors that they should stop pushing frames but that they
@@ -218,7 +236,7 @@ class StopTaskFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StartInterruptionFrame(SystemFrame):
     """Emitted by VAD to indicate that a user has started speaking (i.e. is
     interruption). This is similar to UserStartedSpeakingFrame except that it
@@ -229,7 +247,7 @@ class StartInterruptionFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class StopInterruptionFrame(SystemFrame):
     """Emitted by VAD to indicate that a user has stopped speaking (i.e. no more
     interruptions). This is similar to UserStoppedSpeakingFrame except that it
@@ -240,9 +258,28 @@ class StopInterruptionFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
+class BotStartedSpeakingFrame(SystemFrame):
+    """Emitted upstream by transport outputs when they start writing audio
+    (i.e. the bot starts speaking).
+
+    """
+    pass
+
+
+@dataclass(slots=True)
+class BotStoppedSpeakingFrame(SystemFrame):
+    """Emitted upstream by transport outputs when they stop writing audio (i.e.
+    the bot stops speaking or is interrupted).
+
+    """
+    pass
+
+
+@dataclass(slots=True)
 class BotSpeakingFrame(SystemFrame):
-    """Emitted by transport outputs while the bot is still speaking. This can be
+    """Emitted by transport outputs periodically while the bot is still
+    speaking (see `TransportParams.bot_speaking_frame_interval`). This can be
     used, for example, to detect when a user is idle. That is, while the bot is
     speaking we don't want to trigger any user idle timeout since the user might
     be listening.
@@ -251,24 +288,32 @@ class BotSpeakingFrame(SystemFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class MetricsFrame(SystemFrame):
     """Emitted by processor that can compute metrics like latencies.
     """
     ttfb: List[Mapping[str, Any]] | None = None
     processing: List[Mapping[str, Any]] | None = None
+    queues: List[Mapping[str, Any]] | None = None
+    latency: List[Mapping[str, Any]] | None = None
+    loop_health: List[Mapping[str, Any]] | None = None
+    executors: List[Mapping[str, Any]] | None = None
+    playout: List[Mapping[str, Any]] | None = None
+    first_audio: List[Mapping[str, Any]] | None = None
+    tts_cache: List[Mapping[str, Any]] | None = None
+    startup: List[Mapping[str, Any]] | None = None
 
 #
 # Control frames
 #
 
 
-@dataclass
+@dataclass(slots=True)
 class ControlFrame(Frame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class EndFrame(ControlFrame):
     """Indicates that a pipeline has ended and frame processors and pipelines
     should be shut down. If the transport receives this frame, it will stop
@@ -280,7 +325,7 @@ class EndFrame(ControlFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMFullResponseStartFrame(ControlFrame):
     """Used to indicate the beginning of a full LLM response. Following
     LLMResponseStartFrame, TextFrame and LLMResponseEndFrame for each sentence
@@ -288,26 +333,26 @@ class LLMFullResponseStartFrame(ControlFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMFullResponseEndFrame(ControlFrame):
     """Indicates the end of a full LLM response."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponseStartFrame(ControlFrame):
     """Used to indicate the beginning of an LLM response. Following TextFrames
     are part of the LLM response until an LLMResponseEndFrame"""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMResponseEndFrame(ControlFrame):
     """Indicates the end of an LLM response."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStartedSpeakingFrame(ControlFrame):
     """Emitted by VAD to indicate that a user has started speaking. This can be
     used for interruptions or other times when detecting that someone is
@@ -318,13 +363,13 @@ class UserStartedSpeakingFrame(ControlFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserStoppedSpeakingFrame(ControlFrame):
     """Emitted by the VAD to indicate that a user stopped speaking."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSStartedFrame(ControlFrame):
     """Used to indicate the beginning of a TTS response. Following
     AudioRawFrames are part of the TTS response until an TTSEndFrame. These
@@ -336,13 +381,13 @@ class TTSStartedFrame(ControlFrame):
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class TTSStoppedFrame(ControlFrame):
     """Indicates the end of a TTS response."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class UserImageRequestFrame(ControlFrame):
     """A frame user to request an image from the given user."""
     user_id: str
@@ -4,12 +4,16 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
-from abc import abstractmethod
+import asyncio
+import time
 
-from typing import List
+from abc import abstractmethod
+from typing import Any, Iterable, List, Mapping
 
 from pipecat.processors.frame_processor import FrameProcessor
 
+from loguru import logger
+
 
 class BasePipeline(FrameProcessor):
 
@@ -19,3 +23,62 @@ class BasePipeline(FrameProcessor):
     @abstractmethod
     def processors_with_metrics(self) -> List[FrameProcessor]:
         pass
+
+    @abstractmethod
+    async def warmup(self, timeout: float | None = None) -> List[Mapping[str, Any]]:
+        """Warms up all the processors in the pipeline concurrently (see
+        `warmup_processors()`) and returns their warm-up times."""
+        pass
+
+
+async def warmup_processors(
+        processors: Iterable[FrameProcessor],
+        timeout: float | None = None) -> List[Mapping[str, Any]]:
+    """Calls `warmup()` on all the given processors (and the processors of
+    nested pipelines) concurrently. Errors are logged, they don't stop other
+    processors from warming up. Returns the warm-up time of each processor that
+    has a warm-up. Warm-ups that don't finish after `timeout` seconds are
+    canceled and reported with `"timeout": True`.
+
+    """
+    async def warmup(processor: FrameProcessor) -> List[Mapping[str, Any]]:
+        if isinstance(processor, BasePipeline):
+            return await processor.warmup(timeout) or []
+        if type(processor).warmup is FrameProcessor.warmup:
+            return []
+        start_time = time.monotonic()
+        try:
+            await processor.warmup()
+        except Exception as e:
+            logger.exception(f"{processor} warm-up error: {e}")
+        value = time.monotonic() - start_time
+        logger.debug(f"{processor} warm-up time: {value}")
+        return [{"processor": processor.name, "value": value}]
+
+    start_time = time.monotonic()
+    processors = list(processors)
+    tasks = [asyncio.create_task(warmup(p)) for p in processors]
+
+    try:
+        # Nested pipelines apply the timeout to their own processors, so we
+        # only wait for the rest.
+        timed_tasks = [t for (p, t) in zip(processors, tasks) if not isinstance(p, BasePipeline)]
+        if timed_tasks:
+            (_, pending) = await asyncio.wait(timed_tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results = []
+        for (processor, task) in zip(processors, tasks):
+            if not task.cancelled():
+                results += await task
+                continue
+            value = time.monotonic() - start_time
+            logger.warning(f"{processor} warm-up didn't finish after {timeout} seconds")
+            results.append({"processor": processor.name, "value": value, "timeout": True})
+        return results
+    finally:
+        # In case we are canceled.
+        for task in tasks:
+            task.cancel()
@@ -6,13 +6,22 @@
 
 import asyncio
 
+from collections import OrderedDict
 from itertools import chain
-from typing import List
+from typing import Any, List, Mapping
 
-from pipecat.pipeline.base_pipeline import BasePipeline
+from pipecat.pipeline.base_pipeline import BasePipeline, warmup_processors
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
-from pipecat.frames.frames import CancelFrame, EndFrame, Frame, StartFrame
+from pipecat.frames.frames import (
+    CancelFrame,
+    EndFrame,
+    Frame,
+    StartFrame,
+    StartInterruptionFrame,
+    SystemFrame)
+from pipecat.utils.frame_queue import FrameQueue, FrameQueueParams
+from pipecat.utils.frame_worker import FrameQueueWorker
 
 from loguru import logger
 
@@ -49,8 +58,63 @@ class Sink(FrameProcessor):
                 await self._down_queue.put(frame)
 
 
+class FanOutTracker:
+    """Keeps track of the frames that have been sent to all the parallel
+    pipelines, so they are only pushed once when they come out of them. Frames
+    created inside the pipelines are not tracked. Only the last `max_frames`
+    frames are remembered, which bounds memory if a pipeline drops frames.
+
+    """
+
+    def __init__(self, num_pipelines: int, max_frames: int):
+        self._num_pipelines = num_pipelines
+        self._max_frames = max_frames
+        # Frame id -> number of pipelines the frame has not come out of yet.
+        self._pending: OrderedDict[int, int] = OrderedDict()
+
+    def __len__(self):
+        return len(self._pending)
+
+    def add(self, frame: Frame):
+        self._pending[frame.id] = self._num_pipelines
+        if len(self._pending) > self._max_frames:
+            self._pending.popitem(last=False)
+
+    def should_push(self, frame: Frame) -> bool:
+        remaining = self._pending.get(frame.id)
+        if remaining is None:
+            return True
+        if remaining == 1:
+            del self._pending[frame.id]
+        else:
+            self._pending[frame.id] = remaining - 1
+        # Only push the first one that comes out.
+        return remaining == self._num_pipelines
+
+
 class ParallelPipeline(BasePipeline):
-    def __init__(self, *args):
+    """Sends frames to multiple pipelines in parallel.
+
+    By default, each downstream frame is processed by all the pipelines
+    concurrently (with `asyncio.gather`) before the next frame is
+    processed. If `use_workers` is True, each pipeline gets a long-lived worker
+    task that reads frames from a queue of at most `max_queue_size` frames
+    instead, so we don't need to create tasks for every frame. System frames
+    are still sent to all pipelines right away, and a `StartInterruptionFrame`
+    discards the frames queued for the workers (and cancels the ones being
+    processed) before it's sent.
+
+    `max_tracked_frames` is the number of frames we remember to make sure
+    frames that come out of multiple pipelines are only pushed once.
+
+    """
+
+    def __init__(
+            self,
+            *args,
+            use_workers: bool = False,
+            max_queue_size: int = 64,
+            max_tracked_frames: int = 4096):
         super().__init__()
 
         if len(args) == 0:
@@ -64,6 +128,14 @@ class ParallelPipeline(BasePipeline):
         self._up_task: asyncio.Task | None = None
         self._down_task: asyncio.Task | None = None
 
+        self._up_tracker = FanOutTracker(len(args), max_tracked_frames)
+        self._down_tracker = FanOutTracker(len(args), max_tracked_frames)
+
+        self._use_workers = use_workers
+        self._max_queue_size = max_queue_size
+        self._worker_queues: List[FrameQueue] = []
+        self._workers: List[FrameQueueWorker] = []
+
         self._pipelines = []
 
         logger.debug(f"Creating {self} pipelines")
@@ -92,17 +164,41 @@ class ParallelPipeline(BasePipeline):
     def processors_with_metrics(self) -> List[FrameProcessor]:
         return list(chain.from_iterable(p.processors_with_metrics() for p in self._pipelines))
 
+    async def warmup(self, timeout: float | None = None) -> List[Mapping[str, Any]]:
+        return await warmup_processors(self._pipelines, timeout)
+
     #
     # Frame processor
     #
 
     async def cleanup(self):
+        await self._stop_workers()
         await asyncio.gather(*[p.cleanup() for p in self._pipelines])
 
     async def _start_tasks(self):
         loop = self.get_event_loop()
         self._up_task = loop.create_task(self._process_up_queue())
         self._down_task = loop.create_task(self._process_down_queue())
+        if self._use_workers:
+            for (i, source) in enumerate(self._sources):
+                queue = FrameQueue(
+                    FrameQueueParams(max_size=self._max_queue_size),
+                    processor=self.name,
+                    name=f"worker{i}")
+                worker = FrameQueueWorker(
+                    queue,
+                    lambda frame, source=source: source.process_frame(
+                        frame, FrameDirection.DOWNSTREAM),
+                    name=f"{self} worker{i}",
+                    loop=loop)
+                worker.start()
+                self._worker_queues.append(queue)
+                self._workers.append(worker)
+
+    async def _stop_workers(self):
+        await asyncio.gather(*[w.stop() for w in self._workers])
+        self._workers = []
+        self._worker_queues = []
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         await super().process_frame(frame, direction)
@@ -112,17 +208,29 @@ class ParallelPipeline(BasePipeline):
 
         if direction == FrameDirection.UPSTREAM:
             # If we get an upstream frame we process it in each sink.
+            self._up_tracker.add(frame)
             await asyncio.gather(*[s.process_frame(frame, direction) for s in self._sinks])
         elif direction == FrameDirection.DOWNSTREAM:
             # If we get a downstream frame we process it in each source.
-            # TODO(aleix): We are creating task for each frame. For real-time
-            # video/audio this might be too slow. We should use an already
-            # created task instead.
-            await asyncio.gather(*[s.process_frame(frame, direction) for s in self._sources])
+            self._down_tracker.add(frame)
+            if self._workers and isinstance(frame, StartInterruptionFrame):
+                # Frames queued before the interruption are stale.
+                await asyncio.gather(*[w.interrupt() for w in self._workers])
+            if self._workers and isinstance(frame, EndFrame):
+                # Make sure the workers have processed everything before the
+                # EndFrame, so it doesn't come out of a pipeline before the
+                # frames still queued for the other ones.
+                await asyncio.gather(*[q.join() for q in self._worker_queues])
+            if self._worker_queues and not isinstance(frame, (SystemFrame, EndFrame)):
+                for queue in self._worker_queues:
+                    await queue.put(frame)
+            else:
+                await asyncio.gather(*[s.process_frame(frame, direction) for s in self._sources])
 
         # If we get an EndFrame we stop our queue processing tasks and wait on
         # all the pipelines to finish.
         if isinstance(frame, CancelFrame) or isinstance(frame, EndFrame):
+            await self._stop_workers()
             # Use None to indicate when queues should be done processing.
             await self._up_queue.put(None)
             await self._down_queue.put(None)
@@ -133,22 +241,18 @@ class ParallelPipeline(BasePipeline):
 
     async def _process_up_queue(self):
         running = True
-        seen_ids = set()
         while running:
             frame = await self._up_queue.get()
-            if frame and frame.id not in seen_ids:
+            if frame and self._up_tracker.should_push(frame):
                 await self.push_frame(frame, FrameDirection.UPSTREAM)
-                seen_ids.add(frame.id)
             running = frame is not None
             self._up_queue.task_done()
 
     async def _process_down_queue(self):
         running = True
-        seen_ids = set()
         while running:
             frame = await self._down_queue.get()
-            if frame and frame.id not in seen_ids:
+            if frame and self._down_tracker.should_push(frame):
                 await self.push_frame(frame, FrameDirection.DOWNSTREAM)
-                seen_ids.add(frame.id)
             running = frame is not None
             self._down_queue.task_done()
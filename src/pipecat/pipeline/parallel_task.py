@@ -7,9 +7,9 @@
 import asyncio
 
 from itertools import chain
-from typing import List
+from typing import Any, List, Mapping
 
-from pipecat.pipeline.base_pipeline import BasePipeline
+from pipecat.pipeline.base_pipeline import BasePipeline, warmup_processors
 from pipecat.pipeline.pipeline import Pipeline
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 from pipecat.frames.frames import Frame
@@ -88,6 +88,9 @@ class ParallelTask(BasePipeline):
     def processors_with_metrics(self) -> List[FrameProcessor]:
         return list(chain.from_iterable(p.processors_with_metrics() for p in self._pipelines))
 
+    async def warmup(self, timeout: float | None = None) -> List[Mapping[str, Any]]:
+        return await warmup_processors(self._pipelines, timeout)
+
     #
     # Frame processor
     #
@@ -4,10 +4,10 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
-from typing import Callable, Coroutine, List
+from typing import Any, Callable, Coroutine, List, Mapping
 
 from pipecat.frames.frames import Frame
-from pipecat.pipeline.base_pipeline import BasePipeline
+from pipecat.pipeline.base_pipeline import BasePipeline, warmup_processors
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
 
@@ -69,6 +69,9 @@ class Pipeline(BasePipeline):
                 services.append(p)
         return services
 
+    async def warmup(self, timeout: float | None = None) -> List[Mapping[str, Any]]:
+        return await warmup_processors(self._processors, timeout)
+
     #
     # Frame processor
     #
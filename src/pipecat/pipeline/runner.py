@@ -7,30 +7,137 @@
 import asyncio
 import signal
 
+from typing import Any, Dict, Mapping
+
 from pipecat.pipeline.task import PipelineTask
+from pipecat.utils.executors import (
+    acquire_executors,
+    executor_metrics,
+    release_executors,
+    shutdown_executors)
+from pipecat.utils.loop_health import (
+    LoopHealthMonitor,
+    acquire_loop_health_monitor,
+    release_loop_health_monitor)
 from pipecat.utils.utils import obj_count, obj_id
 
 from loguru import logger
 
 
 class PipelineRunner:
+    """Runs pipeline tasks. A runner can run a single task (`run()`) or host
+    many tasks (i.e. sessions) concurrently in the same process and event loop
+    (`start_task()`). In the latter case, a task that fails is canceled
+    without affecting the other ones, and new tasks are only accepted while
+    there are less than `max_tasks` tasks and the event loop lag is below
+    `max_loop_lag` seconds. If `slow_callback_threshold` is given, callbacks
+    that block the event loop for longer than that are also tracked. See
+    `health()`. The event loop is only monitored while there are tasks started
+    with `start_task()`.
+
+    The runner also shuts down the process-wide executors (see
+    `get_executor()`) when it finishes, unless other runners are still using
+    them.
+
+    """
 
-    def __init__(self, *, name: str | None = None, handle_sigint: bool = True):
+    def __init__(
+            self,
+            *,
+            name: str | None = None,
+            handle_sigint: bool = True,
+            max_tasks: int | None = None,
+            max_loop_lag: float | None = None,
+            slow_callback_threshold: float | None = None):
         self.id: int = obj_id()
         self.name: str = name or f"{self.__class__.__name__}#{obj_count(self)}"
 
+        self._max_tasks = max_tasks
+        self._max_loop_lag = max_loop_lag
+
         self._tasks = {}
+        self._running_tasks: Dict[str, asyncio.Task] = {}
+
+        # Acquired when the first task starts, since it needs the event loop.
+        self._slow_callback_threshold = slow_callback_threshold
+        self._health_monitor: LoopHealthMonitor | None = None
+        self._using_executors = False
 
         if handle_sigint:
             self._setup_sigint()
 
+    @property
+    def num_tasks(self) -> int:
+        return len(self._tasks)
+
+    @property
+    def loop_lag(self) -> float:
+        return self._health_monitor.lag if self._health_monitor else 0.0
+
+    def health(self) -> Mapping[str, Any]:
+        """Returns a snapshot of the event loop health (see
+        `LoopHealthMonitor.snapshot()`, only while the event loop is monitored)
+        and the number of tasks in the runner.
+
+        """
+        snapshot = self._health_monitor.snapshot() if self._health_monitor else {}
+        return {
+            **snapshot,
+            "pipeline_tasks": len(self._tasks),
+            "executors": executor_metrics(),
+        }
+
     async def run(self, task: PipelineTask):
         logger.debug(f"Runner {self} started running {task}")
+        self._acquire_executors()
         self._tasks[task.name] = task
-        await task.run()
-        del self._tasks[task.name]
+        try:
+            await task.run()
+        finally:
+            del self._tasks[task.name]
+            await self._release_executors()
         logger.debug(f"Runner {self} finished running {task}")
 
+    def can_accept_task(self) -> bool:
+        if self._max_tasks is not None and len(self._tasks) >= self._max_tasks:
+            return False
+        if self._max_loop_lag is not None and self.loop_lag > self._max_loop_lag:
+            return False
+        return True
+
+    async def start_task(self, task: PipelineTask) -> bool:
+        """Starts running the given task in the background and returns
+        True, or returns False if the runner can't accept more tasks.
+
+        """
+        if not self.can_accept_task():
+            logger.warning(
+                f"Runner {self} rejected {task} "
+                f"(tasks: {len(self._tasks)}, loop lag: {self.loop_lag:.3f}s)")
+            return False
+
+        if not self._health_monitor:
+            self._health_monitor = acquire_loop_health_monitor(
+                slow_callback_threshold=self._slow_callback_threshold)
+        self._acquire_executors()
+        self._tasks[task.name] = task
+        self._running_tasks[task.name] = asyncio.create_task(self._run_isolated(task))
+        logger.debug(f"Runner {self} started running {task} ({len(self._tasks)} tasks)")
+        return True
+
+    async def wait_for_task(self, task: PipelineTask):
+        """Waits for a task started with `start_task()` to finish."""
+        running_task = self._running_tasks.get(task.name)
+        if running_task:
+            await running_task
+
+    async def wait(self):
+        """Waits for all the tasks started with `start_task()` to finish."""
+        while self._running_tasks:
+            await asyncio.gather(*self._running_tasks.values())
+        await self._release_health_monitor()
+        await self._release_executors()
+
     async def stop_when_done(self):
         logger.debug(f"Runner {self} scheduled to stop when all tasks are done")
         await asyncio.gather(*[t.stop_when_done() for t in self._tasks.values()])
@@ -39,6 +146,42 @@ class PipelineRunner:
         logger.debug(f"Canceling runner {self}")
         await asyncio.gather(*[t.cancel() for t in self._tasks.values()])
 
+    async def _run_isolated(self, task: PipelineTask):
+        try:
+            await task.run()
+        except Exception as e:
+            # Don't let one failed task take down the rest of the tasks.
+            logger.exception(f"Runner {self} task {task} failed: {e}")
+            try:
+                await task.cancel()
+            except Exception as e:
+                logger.exception(f"Runner {self} error canceling {task}: {e}")
+        finally:
+            del self._tasks[task.name]
+            del self._running_tasks[task.name]
+            logger.debug(f"Runner {self} finished running {task} ({len(self._tasks)} tasks)")
+            await self._release_health_monitor()
+
+    async def _release_health_monitor(self):
+        if self._health_monitor and not self._tasks:
+            # Cleared before releasing, so a task started in the meantime
+            # acquires the monitor again.
+            monitor = self._health_monitor
+            self._health_monitor = None
+            await release_loop_health_monitor(monitor)
+
+    def _acquire_executors(self):
+        if not self._using_executors:
+            self._using_executors = True
+            acquire_executors()
+
+    async def _release_executors(self):
+        if self._using_executors and not self._tasks:
+            self._using_executors = False
+            if release_executors():
+                # Wait for pending work without blocking the event loop.
+                await asyncio.to_thread(shutdown_executors)
+
     def _setup_sigint(self):
         loop = asyncio.get_running_loop()
         loop.add_signal_handler(
@@ -5,14 +5,22 @@
 #
 
 import asyncio
+import time
 
-from typing import AsyncIterable, Iterable
+from typing import Any, AsyncIterable, Iterable, Mapping
 
 from pydantic import BaseModel
 
 from pipecat.frames.frames import CancelFrame, EndFrame, ErrorFrame, Frame, MetricsFrame, StartFrame, StopTaskFrame
 from pipecat.pipeline.base_pipeline import BasePipeline
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.utils.frame_queue import FrameQueue, FrameQueueParams
+from pipecat.utils.executors import executor_metrics
+from pipecat.utils.loop_health import (
+    LoopHealthMonitor,
+    acquire_loop_health_monitor,
+    release_loop_health_monitor)
+from pipecat.utils.tracing import LatencyTracer
 from pipecat.utils.utils import obj_count, obj_id
 
 from loguru import logger
@@ -22,6 +30,21 @@ class PipelineParams(BaseModel):
     allow_interruptions: bool = False
     enable_metrics: bool = False
     report_only_initial_ttfb: bool = False
+    # Trace frames through the pipeline and report per-turn latencies. See
+    # `LatencyTracer`.
+    enable_tracing: bool = False
+    # Report event loop health metrics (lag, slow callbacks and tasks per
+    # processor) every `health_metrics_interval` seconds. See
+    # `LoopHealthMonitor`.
+    enable_health_metrics: bool = False
+    health_metrics_interval: float = 5.0
+    slow_callback_threshold: float = 0.05
+    # Bounds and overflow policies of the queue used by `queue_frame()`.
+    queue_params: FrameQueueParams = FrameQueueParams()
+    # Warm up processors (see `FrameProcessor.warmup()`) before sending the
+    # StartFrame, for at most `warmup_timeout` seconds.
+    enable_warmup: bool = True
+    warmup_timeout: float | None = 10.0
 
 
 class Source(FrameProcessor):
@@ -49,13 +72,26 @@ class PipelineTask:
         self._pipeline = pipeline
         self._params = params
         self._finished = False
+        self._tracer = LatencyTracer() if params.enable_tracing else None
+        self._health_monitor: LoopHealthMonitor | None = None
 
-        self._down_queue = asyncio.Queue()
+        self._down_queue = FrameQueue(params.queue_params, processor=self.name, name="down")
         self._up_queue = asyncio.Queue()
 
         self._source = Source(self._up_queue)
         self._source.link(pipeline)
 
+    @property
+    def tracer(self) -> LatencyTracer | None:
+        return self._tracer
+
+    def health(self) -> Mapping[str, Any] | None:
+        """Returns a snapshot of the event loop health if health metrics are
+        enabled (see `LoopHealthMonitor.snapshot()`).
+
+        """
+        return self._health_monitor.snapshot() if self._health_monitor else None
+
     def has_finished(self):
         return self._finished
 
@@ -77,8 +113,19 @@ class PipelineTask:
     async def run(self):
         self._process_up_task = asyncio.create_task(self._process_up_queue())
         self._process_down_task = asyncio.create_task(self._process_down_queue())
-        await asyncio.gather(self._process_up_task, self._process_down_task)
-        self._finished = True
+        if self._params.enable_health_metrics:
+            # Tasks in the same event loop share the monitor.
+            self._health_monitor = acquire_loop_health_monitor(
+                slow_callback_threshold=self._params.slow_callback_threshold)
+            self._health_task = asyncio.create_task(self._health_task_handler())
+        try:
+            await asyncio.gather(self._process_up_task, self._process_down_task)
+            self._finished = True
+        finally:
+            if self._health_monitor:
+                self._health_task.cancel()
+                await self._health_task
+                await release_loop_health_monitor(self._health_monitor)
 
     async def queue_frame(self, frame: Frame):
         await self._down_queue.put(frame)
@@ -99,20 +146,33 @@ class PipelineTask:
         processing = [{"name": p.name, "time": 0.0} for p in processors]
         return MetricsFrame(ttfb=ttfb, processing=processing)
 
+    async def _warmup(self) -> MetricsFrame:
+        start_time = time.monotonic()
+        startup = await self._pipeline.warmup(self._params.warmup_timeout)
+        value = time.monotonic() - start_time
+        logger.debug(f"{self} warm-up time: {value}")
+        return MetricsFrame(startup=startup + [{"processor": self.name, "value": value}])
+
     async def _process_down_queue(self):
+        startup_metrics = await self._warmup() if self._params.enable_warmup else None
+
         start_frame = StartFrame(
             allow_interruptions=self._params.allow_interruptions,
             enable_metrics=self._params.enable_metrics,
-            report_only_initial_ttfb=self._params.report_only_initial_ttfb
+            report_only_initial_ttfb=self._params.report_only_initial_ttfb,
+            tracer=self._tracer
         )
         await self._source.process_frame(start_frame, FrameDirection.DOWNSTREAM)
         await self._source.process_frame(self._initial_metrics_frame(), FrameDirection.DOWNSTREAM)
+        if startup_metrics and self._params.enable_metrics:
+            await self._source.process_frame(startup_metrics, FrameDirection.DOWNSTREAM)
 
         running = True
         should_cleanup = True
         while running:
             try:
                 frame = await self._down_queue.get()
+                await self._maybe_push_queue_metrics()
                 await self._source.process_frame(frame, FrameDirection.DOWNSTREAM)
                 running = not (isinstance(frame, StopTaskFrame) or isinstance(frame, EndFrame))
                 should_cleanup = not isinstance(frame, StopTaskFrame)
@@ -127,6 +187,23 @@ class PipelineTask:
         self._process_up_task.cancel()
         await self._process_up_task
 
+    async def _maybe_push_queue_metrics(self):
+        if self._params.enable_metrics:
+            frame = self._down_queue.metrics_frame()
+            if frame:
+                await self._source.process_frame(frame, FrameDirection.DOWNSTREAM)
+
+    async def _health_task_handler(self):
+        while True:
+            try:
+                await asyncio.sleep(self._params.health_metrics_interval)
+                health = {"processor": self.name, **self._health_monitor.snapshot()}
+                await self._source.process_frame(
+                    MetricsFrame(loop_health=[health], executors=executor_metrics()),
+                    FrameDirection.DOWNSTREAM)
+            except asyncio.CancelledError:
+                break
+
     async def _process_up_queue(self):
         while True:
             try:
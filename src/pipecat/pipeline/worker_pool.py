@@ -0,0 +1,308 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import itertools
+import multiprocessing
+import signal
+
+from multiprocessing.connection import Connection
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Set
+
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.utils.utils import obj_count, obj_id
+
+from loguru import logger
+
+# Creates the pipeline task of a session from the session arguments. This is
+# called inside the worker process.
+SessionFactory = Callable[[Any], Awaitable[PipelineTask]]
+
+
+class _Worker:
+
+    def __init__(self, worker_id: int):
+        self.id = worker_id
+        self.process: multiprocessing.Process | None = None
+        self.conn: Connection | None = None
+        self.sessions: Set[str] = set()
+        self.pending: Dict[str, asyncio.Future] = {}
+        self.loop_lag = 0.0
+        self.restarts = 0
+
+    @property
+    def alive(self) -> bool:
+        return self.conn is not None and self.process is not None and self.process.is_alive()
+
+    @property
+    def load(self) -> int:
+        return len(self.sessions) + len(self.pending)
+
+
+class PipelineWorkerPool:
+    """Runs sessions in a pool of pre-forked worker processes, each of them
+    running many sessions with a `PipelineRunner`. This allows using more than
+    one core, since each process has its own event loop (and GIL).
+
+    The pool is created with a `session_factory` that builds the
+    `PipelineTask` of a session inside the worker. Sessions are started with
+    `start_session()` in the least loaded worker. Anything loaded by `preload`
+    (e.g. models registered with `get_shared_model()`) is loaded once in the
+    parent process before forking the workers, so workers share it (copy on
+    write). If a worker dies it is restarted, the sessions in the other
+    workers are not affected.
+
+    This requires the "fork" start method, so it's only available on Unix.
+
+    """
+
+    def __init__(
+            self,
+            session_factory: SessionFactory,
+            *,
+            num_workers: int | None = None,
+            preload: Callable[[], None] | None = None,
+            max_sessions_per_worker: int | None = None,
+            max_loop_lag: float | None = None,
+            report_interval: float = 1.0,
+            supervise_interval: float = 1.0,
+            name: str | None = None):
+        self.id: int = obj_id()
+        self.name: str = name or f"{self.__class__.__name__}#{obj_count(self)}"
+
+        self._session_factory = session_factory
+        self._num_workers = num_workers or multiprocessing.cpu_count()
+        self._preload = preload
+        self._max_sessions_per_worker = max_sessions_per_worker
+        self._max_loop_lag = max_loop_lag
+        self._report_interval = report_interval
+        self._supervise_interval = supervise_interval
+
+        self._context = multiprocessing.get_context("fork")
+        self._workers: List[_Worker] = [_Worker(i) for i in range(self._num_workers)]
+        self._session_ids = itertools.count()
+        self._supervisor_task: asyncio.Task | None = None
+
+    async def start(self):
+        if self._preload:
+            logger.debug(f"{self} preloading")
+            self._preload()
+
+        for worker in self._workers:
+            self._start_worker(worker)
+
+        self._supervisor_task = asyncio.create_task(self._supervisor_task_handler())
+
+    async def stop(self):
+        if self._supervisor_task:
+            self._supervisor_task.cancel()
+            await self._supervisor_task
+            self._supervisor_task = None
+
+        for worker in self._workers:
+            if worker.alive:
+                worker.conn.send(("stop",))
+        for worker in self._workers:
+            if worker.process:
+                await asyncio.to_thread(worker.process.join)
+            self._close_worker(worker)
+
+    async def start_session(self, args: Any = None) -> str | None:
+        """Starts a new session in the least loaded worker and returns the
+        session id, or None if no worker could accept it.
+
+        """
+        workers = sorted([w for w in self._workers if w.alive], key=lambda w: (w.load, w.loop_lag))
+        for worker in workers:
+            max_sessions = self._max_sessions_per_worker
+            if max_sessions is not None and worker.load >= max_sessions:
+                continue
+            if self._max_loop_lag is not None and worker.loop_lag > self._max_loop_lag:
+                continue
+
+            session_id = f"{worker.id}-{next(self._session_ids)}"
+            future = asyncio.get_running_loop().create_future()
+            worker.pending[session_id] = future
+            worker.conn.send(("start", session_id, args))
+            if await future:
+                return session_id
+
+        logger.warning(f"{self} could not start session, all workers are busy")
+        return None
+
+    def stats(self) -> List[Mapping[str, Any]]:
+        """Returns the current load of each worker."""
+        return [{
+            "worker": w.id,
+            "pid": w.process.pid if w.process else None,
+            "alive": w.alive,
+            "sessions": len(w.sessions),
+            "loop_lag": w.loop_lag,
+            "restarts": w.restarts,
+        } for w in self._workers]
+
+    def worker_of(self, session_id: str) -> int | None:
+        for worker in self._workers:
+            if session_id in worker.sessions:
+                return worker.id
+        return None
+
+    #
+    # Worker management (parent process)
+    #
+
+    def _start_worker(self, worker: _Worker):
+        (parent_conn, child_conn) = self._context.Pipe()
+        process = self._context.Process(
+            target=_worker_main,
+            name=f"{self.name}-worker-{worker.id}",
+            args=(worker.id, child_conn, self._session_factory,
+                  self._max_sessions_per_worker, self._max_loop_lag, self._report_interval),
+            daemon=True)
+        process.start()
+        child_conn.close()
+
+        worker.process = process
+        worker.conn = parent_conn
+        asyncio.get_running_loop().add_reader(parent_conn.fileno(), self._on_worker_message, worker)
+        logger.debug(f"{self} started worker {worker.id} (pid {process.pid})")
+
+    def _close_worker(self, worker: _Worker):
+        if worker.conn:
+            asyncio.get_running_loop().remove_reader(worker.conn.fileno())
+            worker.conn.close()
+            worker.conn = None
+        for future in worker.pending.values():
+            if not future.done():
+                future.set_result(False)
+        worker.pending.clear()
+
+    def _on_worker_message(self, worker: _Worker):
+        try:
+            message = worker.conn.recv()
+        except (EOFError, OSError):
+            # The worker died, the supervisor will restart it.
+            self._close_worker(worker)
+            return
+
+        match message:
+            case ("started", session_id, ok):
+                future = worker.pending.pop(session_id, None)
+                if ok:
+                    worker.sessions.add(session_id)
+                if future and not future.done():
+                    future.set_result(ok)
+            case ("finished", session_id):
+                worker.sessions.discard(session_id)
+            case ("load", loop_lag):
+                worker.loop_lag = loop_lag
+
+    async def _supervisor_task_handler(self):
+        while True:
+            try:
+                await asyncio.sleep(self._supervise_interval)
+                for worker in self._workers:
+                    if not worker.alive:
+                        self._restart_worker(worker)
+            except asyncio.CancelledError:
+                break
+
+    def _restart_worker(self, worker: _Worker):
+        exitcode = worker.process.exitcode if worker.process else None
+        logger.error(
+            f"{self} worker {worker.id} died (exit code: {exitcode}), "
+            f"lost {len(worker.sessions)} sessions, restarting")
+        self._close_worker(worker)
+        if worker.process:
+            worker.process.join()
+        worker.sessions.clear()
+        worker.loop_lag = 0.0
+        worker.restarts += 1
+        self._start_worker(worker)
+
+    def __str__(self):
+        return self.name
+
+
+#
+# Worker process
+#
+
+def _worker_main(
+        worker_id: int,
+        conn: Connection,
+        session_factory: SessionFactory,
+        max_tasks: int | None,
+        max_loop_lag: float | None,
+        report_interval: float):
+    # The parent process handles signals and tells us when to stop.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.set_wakeup_fd(-1)
+    asyncio.run(_worker_run(worker_id, conn, session_factory,
+                max_tasks, max_loop_lag, report_interval))
+
+
+async def _worker_run(
+        worker_id: int,
+        conn: Connection,
+        session_factory: SessionFactory,
+        max_tasks: int | None,
+        max_loop_lag: float | None,
+        report_interval: float):
+    runner = PipelineRunner(
+        name=f"Worker#{worker_id}",
+        handle_sigint=False,
+        max_tasks=max_tasks,
+        max_loop_lag=max_loop_lag)
+
+    loop = asyncio.get_running_loop()
+    commands = asyncio.Queue()
+
+    def on_command():
+        try:
+            commands.put_nowait(conn.recv())
+        except (EOFError, OSError):
+            # The parent is gone.
+            loop.remove_reader(conn.fileno())
+            commands.put_nowait(("stop",))
+
+    loop.add_reader(conn.fileno(), on_command)
+
+    async def report_load():
+        while True:
+            conn.send(("load", runner.loop_lag))
+            await asyncio.sleep(report_interval)
+
+    async def run_session(session_id: str, task: PipelineTask):
+        await runner.wait_for_task(task)
+        conn.send(("finished", session_id))
+
+    async def start_session(session_id: str, args: Any):
+        ok = False
+        try:
+            task = await session_factory(args)
+            ok = await runner.start_task(task)
+            if ok:
+                loop.create_task(run_session(session_id, task))
+        except Exception as e:
+            logger.exception(f"Worker {worker_id} error starting session {session_id}: {e}")
+        conn.send(("started", session_id, ok))
+
+    report_task = loop.create_task(report_load())
+    running = True
+    while running:
+        command = await commands.get()
+        match command:
+            case ("start", session_id, args):
+                await start_session(session_id, args)
+            case ("stop",):
+                running = False
+
+    report_task.cancel()
+    await runner.cancel()
+    await runner.wait()
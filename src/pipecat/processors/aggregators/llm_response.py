@@ -8,7 +8,7 @@ from typing import List
 
 from pipecat.services.openai import OpenAILLMContextFrame, OpenAILLMContext
 
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, frame_handler
 from pipecat.frames.frames import (
     Frame,
     InterimTranscriptionFrame,
@@ -47,6 +47,17 @@ class LLMResponseAggregator(FrameProcessor):
         self._interim_accumulator_frame = interim_accumulator_frame
         self._handle_interruptions = handle_interruptions
 
+        # The frames we aggregate are only known at this point, so we register
+        # the handlers for this instance.
+        self.register_frame_handler(start_frame, self._handle_start_frame)
+        self.register_frame_handler(end_frame, self._handle_end_frame)
+        self.register_frame_handler(accumulator_frame, self._handle_accumulator_frame)
+        if interim_accumulator_frame:
+            self.register_frame_handler(
+                interim_accumulator_frame, self._handle_interim_accumulator_frame)
+        if handle_interruptions:
+            self.register_frame_handler(StartInterruptionFrame, self._handle_interruption_frame)
+
         # Reset our accumulator state.
         self._reset()
 
@@ -80,54 +91,60 @@ class LLMResponseAggregator(FrameProcessor):
     #
     # and T2 would be dropped.
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        await super().process_frame(frame, direction)
+    async def _handle_start_frame(self, frame: Frame, direction: FrameDirection):
+        self._aggregation = ""
+        self._aggregating = True
+        self._seen_start_frame = True
+        self._seen_end_frame = False
+        self._seen_interim_results = False
+        await self.push_frame(frame, direction)
 
-        send_aggregation = False
+    async def _handle_end_frame(self, frame: Frame, direction: FrameDirection):
+        self._seen_end_frame = True
+        self._seen_start_frame = False
 
-        if isinstance(frame, self._start_frame):
-            self._aggregation = ""
-            self._aggregating = True
-            self._seen_start_frame = True
-            self._seen_end_frame = False
-            self._seen_interim_results = False
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, self._end_frame):
-            self._seen_end_frame = True
-            self._seen_start_frame = False
-
-            # We might have received the end frame but we might still be
-            # aggregating (i.e. we have seen interim results but not the final
-            # text).
-            self._aggregating = self._seen_interim_results or len(self._aggregation) == 0
-
-            # Send the aggregation if we are not aggregating anymore (i.e. no
-            # more interim results received).
-            send_aggregation = not self._aggregating
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, self._accumulator_frame):
-            if self._aggregating:
-                self._aggregation += f" {frame.text}"
-                # We have recevied a complete sentence, so if we have seen the
-                # end frame and we were still aggregating, it means we should
-                # send the aggregation.
-                send_aggregation = self._seen_end_frame
-
-            # We just got our final result, so let's reset interim results.
-            self._seen_interim_results = False
-        elif self._interim_accumulator_frame and isinstance(frame, self._interim_accumulator_frame):
-            self._seen_interim_results = True
-        elif self._handle_interruptions and isinstance(frame, StartInterruptionFrame):
+        # We might have received the end frame but we might still be
+        # aggregating (i.e. we have seen interim results but not the final
+        # text).
+        self._aggregating = self._seen_interim_results or len(self._aggregation) == 0
+
+        # Send the aggregation if we are not aggregating anymore (i.e. no
+        # more interim results received).
+        send_aggregation = not self._aggregating
+        await self.push_frame(frame, direction)
+
+        if send_aggregation:
             await self._push_aggregation()
-            # Reset anyways
-            self._reset()
-            await self.push_frame(frame, direction)
-        else:
-            await self.push_frame(frame, direction)
+
+    async def _handle_accumulator_frame(self, frame: TextFrame, direction: FrameDirection):
+        send_aggregation = False
+        if self._aggregating:
+            self._aggregation += f" {frame.text}"
+            # We have recevied a complete sentence, so if we have seen the
+            # end frame and we were still aggregating, it means we should
+            # send the aggregation.
+            send_aggregation = self._seen_end_frame
+
+        # We just got our final result, so let's reset interim results.
+        self._seen_interim_results = False
 
         if send_aggregation:
             await self._push_aggregation()
 
+    async def _handle_interim_accumulator_frame(self, frame: TextFrame, direction: FrameDirection):
+        self._seen_interim_results = True
+
+    async def _handle_interruption_frame(
+            self, frame: StartInterruptionFrame, direction: FrameDirection):
+        await self._push_aggregation()
+        # Reset anyways
+        self._reset()
+        await self.push_frame(frame, direction)
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
     async def _push_aggregation(self):
         if len(self._aggregation) > 0:
             self._messages.append({"role": self._role, "content": self._aggregation})
@@ -104,7 +104,7 @@ class OpenAILLMContext:
         self.tools = tools
 
 
-@dataclass
+@dataclass(slots=True)
 class OpenAILLMContextFrame(Frame):
     """Like an LLMMessagesFrame, but with extra context specific to the OpenAI
     API. The context in this message is also mutable, and will be changed by the
@@ -6,8 +6,10 @@
 
 import asyncio
 
-from pipecat.frames.frames import EndFrame, Frame, StartInterruptionFrame
+from pipecat.frames.frames import Frame, StartInterruptionFrame
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.utils.frame_queue import FrameQueue, FrameQueueParams
+from pipecat.utils.frame_worker import FrameQueueWorker
 
 
 class AsyncFrameProcessor(FrameProcessor):
@@ -17,9 +19,12 @@ class AsyncFrameProcessor(FrameProcessor):
             *,
             name: str | None = None,
             loop: asyncio.AbstractEventLoop | None = None,
+            queue_params: FrameQueueParams = FrameQueueParams(),
             **kwargs):
         super().__init__(name=name, loop=loop, **kwargs)
 
+        self._queue_params = queue_params
+
         self._create_push_task()
 
     async def process_frame(self, frame: Frame, direction: FrameDirection):
@@ -35,29 +40,26 @@ class AsyncFrameProcessor(FrameProcessor):
         await self._push_queue.put((frame, direction))
 
     async def cleanup(self):
-        self._push_frame_task.cancel()
-        await self._push_frame_task
+        await self._push_worker.stop()
 
     async def _handle_interruptions(self, frame: Frame):
-        # Cancel the task. This will stop pushing frames downstream.
-        self._push_frame_task.cancel()
-        await self._push_frame_task
+        # Discard queued frames and cancel the frame being pushed (if any). The
+        # push task keeps running.
+        await self._push_worker.interrupt()
         # Push an out-of-band frame (i.e. not using the ordered push
         # frame task).
         await self.push_frame(frame)
-        # Create a new queue and task.
-        self._create_push_task()
 
     def _create_push_task(self):
-        self._push_queue = asyncio.Queue()
-        self._push_frame_task = self.get_event_loop().create_task(self._push_frame_task_handler())
-
-    async def _push_frame_task_handler(self):
-        running = True
-        while running:
-            try:
-                (frame, direction) = await self._push_queue.get()
-                await self.push_frame(frame, direction)
-                running = not isinstance(frame, EndFrame)
-            except asyncio.CancelledError:
-                break
+        self._push_queue = FrameQueue(self._queue_params, processor=self.name, name="push")
+        self._push_worker = FrameQueueWorker(
+            self._push_queue,
+            self._push_frame_task_handler,
+            name=f"{self} push",
+            loop=self.get_event_loop())
+        self._push_worker.start()
+
+    async def _push_frame_task_handler(self, item):
+        (frame, direction) = item
+        await self.push_queue_metrics(self._push_queue)
+        await self.push_frame(frame, direction)
@@ -8,8 +8,10 @@ import asyncio
 import time
 
 from enum import Enum
+from typing import Awaitable, Callable, Dict, Type
 
 from pipecat.frames.frames import ErrorFrame, Frame, MetricsFrame, StartFrame, StartInterruptionFrame, UserStoppedSpeakingFrame
+from pipecat.utils.frame_queue import FrameQueue
 from pipecat.utils.utils import obj_count, obj_id
 
 from loguru import logger
@@ -20,6 +22,31 @@ class FrameDirection(Enum):
     UPSTREAM = 2
 
 
+def frame_handler(*frame_types: Type[Frame]):
+    """Registers a FrameProcessor method as the handler of the given frame
+    types (and their subclasses). Handlers are called by
+    `FrameProcessor.process_frame()` with the frame and its direction. If more
+    than one handler matches a frame, the handler registered for the closest
+    type in the frame's MRO wins. Subclasses can override a handler by
+    redefining the method with the same name.
+
+        class UpperCaseProcessor(FrameProcessor):
+
+            @frame_handler(TextFrame)
+            async def _handle_text_frame(self, frame, direction):
+                await self.push_frame(TextFrame(frame.text.upper()), direction)
+
+            @frame_handler(Frame)
+            async def _handle_frame(self, frame, direction):
+                await self.push_frame(frame, direction)
+
+    """
+    def decorator(handler):
+        handler._handled_frame_types = frame_types
+        return handler
+    return decorator
+
+
 class FrameProcessorMetrics:
     def __init__(self, name: str):
         self._name = name
@@ -29,14 +56,14 @@ class FrameProcessorMetrics:
 
     async def start_ttfb_metrics(self, report_only_initial_ttfb):
         if self._should_report_ttfb:
-            self._start_ttfb_time = time.time()
+            self._start_ttfb_time = time.monotonic()
             self._should_report_ttfb = not report_only_initial_ttfb
 
     async def stop_ttfb_metrics(self):
         if self._start_ttfb_time == 0:
             return None
 
-        value = time.time() - self._start_ttfb_time
+        value = time.monotonic() - self._start_ttfb_time
         logger.debug(f"{self._name} TTFB: {value}")
         ttfb = {
             "processor": self._name,
@@ -46,13 +73,13 @@ class FrameProcessorMetrics:
         return MetricsFrame(ttfb=[ttfb])
 
     async def start_processing_metrics(self):
-        self._start_processing_time = time.time()
+        self._start_processing_time = time.monotonic()
 
     async def stop_processing_metrics(self):
         if self._start_processing_time == 0:
             return None
 
-        value = time.time() - self._start_processing_time
+        value = time.monotonic() - self._start_processing_time
         logger.debug(f"{self._name} processing time: {value}")
         processing = {
             "processor": self._name,
@@ -64,6 +91,19 @@ class FrameProcessorMetrics:
 
 class FrameProcessor:
 
+    # Frame type -> name of the method that handles it. This is built for each
+    # subclass from the methods decorated with @frame_handler.
+    _frame_handlers: Dict[type, str] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        handlers = {}
+        for klass in reversed(cls.__mro__):
+            for attr, value in vars(klass).items():
+                for frame_type in getattr(value, "_handled_frame_types", ()):
+                    handlers[frame_type] = attr
+        cls._frame_handlers = handlers
+
     def __init__(
             self,
             *,
@@ -81,9 +121,19 @@ class FrameProcessor:
         self._enable_metrics = False
         self._report_only_initial_ttfb = False
 
+        # Tracing (see LatencyTracer). Only set if tracing is enabled.
+        self._tracer = None
+
         # Metrics
         self._metrics = FrameProcessorMetrics(name=self.name)
 
+        # Frame handlers. Handlers are resolved once for each concrete frame
+        # type and cached, so we don't need to walk the frame's MRO every time.
+        self._instance_frame_handlers: Dict[
+            type, Callable[[Frame, FrameDirection], Awaitable[None]]] = {}
+        self._frame_handlers_cache: Dict[
+            type, Callable[[Frame, FrameDirection], Awaitable[None]] | None] = {}
+
     @property
     def interruptions_allowed(self):
         return self._allow_interruptions
@@ -123,6 +173,21 @@ class FrameProcessor:
         await self.stop_ttfb_metrics()
         await self.stop_processing_metrics()
 
+    async def push_queue_metrics(self, queue: FrameQueue):
+        if self.metrics_enabled:
+            frame = queue.metrics_frame()
+            if frame:
+                await self.push_frame(frame)
+
+    async def warmup(self):
+        """Called before the pipeline starts (i.e. before the StartFrame), for
+        all processors concurrently. Processors can override this to do slow
+        setup work (e.g. open connections, fetch voices or load models) so it
+        doesn't delay the first user turn.
+
+        """
+        pass
+
     async def cleanup(self):
         pass
 
@@ -134,26 +199,66 @@ class FrameProcessor:
     def get_event_loop(self) -> asyncio.AbstractEventLoop:
         return self._loop
 
+    def register_frame_handler(
+            self,
+            frame_type: Type[Frame],
+            handler: Callable[[Frame, FrameDirection], Awaitable[None]]):
+        """Registers a handler for the given frame type only for this
+        processor instance. This is useful when the frame types are not known
+        until the processor is created. Instance handlers take precedence over
+        @frame_handler methods registered for the same frame type.
+
+        """
+        self._instance_frame_handlers[frame_type] = handler
+        self._frame_handlers_cache.clear()
+
+    def _resolve_frame_handler(self, frame_type: type):
+        handler = None
+        for t in frame_type.__mro__:
+            handler = self._instance_frame_handlers.get(t)
+            if handler:
+                break
+            name = self._frame_handlers.get(t)
+            if name:
+                handler = getattr(self, name)
+                break
+        self._frame_handlers_cache[frame_type] = handler
+        return handler
+
     async def process_frame(self, frame: Frame, direction: FrameDirection):
         if isinstance(frame, StartFrame):
             self._allow_interruptions = frame.allow_interruptions
             self._enable_metrics = frame.enable_metrics
             self._report_only_initial_ttfb = frame.report_only_initial_ttfb
+            self._tracer = frame.tracer
         elif isinstance(frame, StartInterruptionFrame):
             await self.stop_all_metrics()
         elif isinstance(frame, UserStoppedSpeakingFrame):
             self._should_report_ttfb = True
 
+        # Dispatch the frame to the registered handler, if any.
+        frame_type = type(frame)
+        try:
+            handler = self._frame_handlers_cache[frame_type]
+        except KeyError:
+            handler = self._resolve_frame_handler(frame_type)
+        if handler:
+            await handler(frame, direction)
+
     async def push_error(self, error: ErrorFrame):
         await self.push_frame(error, FrameDirection.UPSTREAM)
 
     async def push_frame(self, frame: Frame, direction: FrameDirection = FrameDirection.DOWNSTREAM):
+        if self._tracer:
+            self._tracer.frame_pushed(self, frame, direction)
         try:
+            # Use loguru's formatting so the message is only built if trace
+            # logging is enabled, this is called for every frame.
             if direction == FrameDirection.DOWNSTREAM and self._next:
-                logger.trace(f"Pushing {frame} from {self} to {self._next}")
+                logger.trace("Pushing {} from {} to {}", frame, self, self._next)
                 await self._next.process_frame(frame, direction)
             elif direction == FrameDirection.UPSTREAM and self._prev:
-                logger.trace(f"Pushing {frame} upstream from {self} to {self._prev}")
+                logger.trace("Pushing {} upstream from {} to {}", frame, self, self._prev)
                 await self._prev.process_frame(frame, direction)
         except Exception as e:
             logger.exception(f"Uncaught exception in {self}: {e}")
@@ -8,9 +8,16 @@ import asyncio
 
 from typing import Awaitable, Callable
 
-from pipecat.frames.frames import BotSpeakingFrame, Frame, StartInterruptionFrame, StopInterruptionFrame, SystemFrame
+from pipecat.frames.frames import (
+    BotSpeakingFrame,
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    Frame,
+    StartInterruptionFrame,
+    StopInterruptionFrame,
+    SystemFrame)
 from pipecat.processors.async_frame_processor import AsyncFrameProcessor
-from pipecat.processors.frame_processor import FrameDirection
+from pipecat.processors.frame_processor import FrameDirection, frame_handler
 
 
 class UserIdleProcessor(AsyncFrameProcessor):
@@ -35,6 +42,7 @@ class UserIdleProcessor(AsyncFrameProcessor):
         self._timeout = timeout
 
         self._interrupted = False
+        self._bot_speaking = False
 
         self._create_idle_task()
 
@@ -46,15 +54,37 @@ class UserIdleProcessor(AsyncFrameProcessor):
         else:
             await self.queue_frame(frame, direction)
 
-        # We shouldn't call the idle callback if the user or the bot are speaking.
-        if isinstance(frame, StartInterruptionFrame):
-            self._interrupted = True
-            self._idle_event.set()
-        elif isinstance(frame, StopInterruptionFrame):
-            self._interrupted = False
-            self._idle_event.set()
-        elif isinstance(frame, BotSpeakingFrame):
-            self._idle_event.set()
+    #
+    # We shouldn't call the idle callback if the user or the bot are speaking.
+    #
+
+    @frame_handler(StartInterruptionFrame)
+    async def _handle_start_interruption_frame(
+            self, frame: StartInterruptionFrame, direction: FrameDirection):
+        self._interrupted = True
+        self._idle_event.set()
+
+    @frame_handler(StopInterruptionFrame)
+    async def _handle_stop_interruption_frame(
+            self, frame: StopInterruptionFrame, direction: FrameDirection):
+        self._interrupted = False
+        self._idle_event.set()
+
+    @frame_handler(BotStartedSpeakingFrame)
+    async def _handle_bot_started_speaking_frame(
+            self, frame: BotStartedSpeakingFrame, direction: FrameDirection):
+        self._bot_speaking = True
+        self._idle_event.set()
+
+    @frame_handler(BotStoppedSpeakingFrame)
+    async def _handle_bot_stopped_speaking_frame(
+            self, frame: BotStoppedSpeakingFrame, direction: FrameDirection):
+        self._bot_speaking = False
+        self._idle_event.set()
+
+    @frame_handler(BotSpeakingFrame)
+    async def _handle_bot_speaking_frame(self, frame: BotSpeakingFrame, direction: FrameDirection):
+        self._idle_event.set()
 
     async def cleanup(self):
         self._idle_task.cancel()
@@ -69,7 +99,7 @@ class UserIdleProcessor(AsyncFrameProcessor):
             try:
                 await asyncio.wait_for(self._idle_event.wait(), timeout=self._timeout)
             except asyncio.TimeoutError:
-                if not self._interrupted:
+                if not self._interrupted and not self._bot_speaking:
                     await self._callback(self)
             except asyncio.CancelledError:
                 break
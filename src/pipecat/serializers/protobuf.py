@@ -35,6 +35,9 @@ class ProtobufFrameSerializer(FrameSerializer):
         # ignoring linter errors; we check that type(frame) is in this dict above
         proto_optional_name = self.SERIALIZABLE_TYPES[type(frame)]  # type: ignore
         for field in dataclasses.fields(frame):  # type: ignore
+            # Skip internal fields (e.g. the frame count used to build names).
+            if field.name.startswith("_"):
+                continue
             setattr(getattr(proto_frame, proto_optional_name), field.name,
                     getattr(frame, field.name))
 
@@ -4,11 +4,14 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import asyncio
+import collections
 import io
+import time
 import wave
 
 from abc import abstractmethod
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Deque, Dict, List, Tuple
 
 from pipecat.frames.frames import (
     AudioRawFrame,
@@ -17,23 +20,45 @@ from pipecat.frames.frames import (
     ErrorFrame,
     Frame,
     LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    MetricsFrame,
     StartFrame,
     StartInterruptionFrame,
+    SystemFrame,
     TTSStartedFrame,
     TTSStoppedFrame,
     TextFrame,
     VisionImageRawFrame,
 )
 from pipecat.processors.async_frame_processor import AsyncFrameProcessor
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
-from pipecat.utils.audio import calculate_audio_volume
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, frame_handler
+from pipecat.services.websocket_tts import WebsocketTTSConnection, WebsocketTTSContext
+from pipecat.utils.audio import AudioVolumeEstimator
+from pipecat.utils.frame_queue import FrameQueue
+from pipecat.utils.frame_worker import FrameQueueWorker
+from pipecat.utils.text_segmenter import SentenceSegmenter, TextSegmenter
+from pipecat.utils.tts_cache import TTSCache, TTSCacheMetrics
 from pipecat.utils.utils import exp_smoothing
 
+from loguru import logger
+
+# TTS service attributes that are part of the cache key by default (see
+# `TTSService.cache_key_params()`).
+CACHE_KEY_ATTRIBUTES = ["_voice_id", "_voice", "_model", "_model_id", "_language"]
+
 
 class AIService(FrameProcessor):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+    async def warmup(self):
+        """Called before the StartFrame (see `FrameProcessor.warmup()`).
+        Services should open connections, fetch voices, etc. here instead of
+        waiting for the first request.
+
+        """
+        pass
+
     async def start(self, frame: StartFrame):
         pass
 
@@ -43,15 +68,21 @@ class AIService(FrameProcessor):
     async def cancel(self, frame: CancelFrame):
         pass
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        await super().process_frame(frame, direction)
+    # These handlers don't push the frames, services are responsible for
+    # pushing them (either by overriding these handlers or by overriding
+    # process_frame()).
 
-        if isinstance(frame, StartFrame):
-            await self.start(frame)
-        elif isinstance(frame, CancelFrame):
-            await self.cancel(frame)
-        elif isinstance(frame, EndFrame):
-            await self.stop(frame)
+    @frame_handler(StartFrame)
+    async def _handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        await self.start(frame)
+
+    @frame_handler(CancelFrame)
+    async def _handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await self.cancel(frame)
+
+    @frame_handler(EndFrame)
+    async def _handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        await self.stop(frame)
 
     async def process_generator(self, generator: AsyncGenerator[Frame, None]):
         async for f in generator:
@@ -118,63 +149,448 @@ class LLMService(AIService):
 
 
 class TTSService(AIService):
-    def __init__(self, *, aggregate_sentences: bool = True, **kwargs):
+    """Base class for text-to-speech services.
+
+    Text is split into segments with `text_segmenter` (sentences by default,
+    see `SentenceSegmenter`) and each segment is converted to audio with
+    `run_tts()`. If `aggregate_sentences` is False text is converted as it
+    arrives. If metrics are enabled, the time from the first text of a response
+    to its first audio is reported in `MetricsFrame.first_audio`.
+
+    By default a segment is converted only after the previous one has been
+    converted. If `lookahead` is greater than 0, up to `lookahead` upcoming
+    segments are converted while the current one is still streaming (i.e.
+    `run_tts()` is called concurrently). Audio is still pushed in order, and
+    all the conversions are cancelled on interruptions.
+
+    If a `tts_cache` is given, converted audio is cached (see `TTSCache`) and
+    repeated text (e.g. greetings or `say()` prompts) is not converted again.
+    Cache hits and misses are reported in `MetricsFrame.tts_cache`. Services
+    should override `cache_key_params()` if their audio depends on settings
+    other than the voice, model and language. `warmup_phrases` are converted
+    and cached when the service warms up (see `warmup()`).
+
+    Services with a streaming text input can give a `connection` (see
+    `WebsocketTTSConnection`). Text is then sent to the service as it arrives,
+    without segmenting or caching it, and each LLM response is converted in
+    its own context over a single persistent websocket. The context is ended
+    at the end of the response and cancelled on interruptions.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            aggregate_sentences: bool = True,
+            text_segmenter: TextSegmenter | None = None,
+            lookahead: int = 0,
+            tts_cache: TTSCache | None = None,
+            warmup_phrases: List[str] | None = None,
+            connection: WebsocketTTSConnection | None = None,
+            **kwargs):
         super().__init__(**kwargs)
         self._aggregate_sentences: bool = aggregate_sentences
-        self._current_sentence: str = ""
+        self._text_segmenter: TextSegmenter | None = None
+        if aggregate_sentences:
+            self._text_segmenter = text_segmenter or SentenceSegmenter()
+        # First audio metrics. The time of the first text of a response is
+        # handed to the first conversion (or streamed context) of the
+        # response, which reports the metrics when its audio is played out.
+        self._first_audio_armed = True
+        self._first_text_time = 0.0
+        self._context_first_text_times: Dict[WebsocketTTSContext, float] = {}
+
+        # Pipelined conversions (if lookahead > 0 or text is streamed).
+        # Requests (and the frames that go after them) are played out in order
+        # by the playout worker. `_active_requests` are being converted or
+        # played out, `_waiting_requests` will be converted when there's room.
+        # Streamed contexts are played out the same way.
+        self._lookahead = lookahead
+        self._active_requests: List[_TTSRequest | WebsocketTTSContext] = []
+        self._waiting_requests: Deque[_TTSRequest] = collections.deque()
+        self._playout_worker: FrameQueueWorker | None = None
+        if lookahead > 0 or connection:
+            self._playout_queue = FrameQueue(processor=self.name, name="playout")
+            self._playout_worker = FrameQueueWorker(
+                self._playout_queue,
+                self._playout_task_handler,
+                name=f"{self} playout",
+                loop=self.get_event_loop())
+            self._playout_worker.start()
+
+        self._tts_cache = tts_cache
+        self._tts_cache_metrics = TTSCacheMetrics(processor=self.name)
+        self._warmup_phrases = warmup_phrases or []
+
+        # Streaming conversions (the context of the current response, if any).
+        self._connection = connection
+        self._context: WebsocketTTSContext | None = None
+        if connection and tts_cache:
+            logger.warning(f"{self} TTS cache is not used when text is streamed")
+
+    @property
+    def lookahead(self) -> int:
+        return self._lookahead
+
+    @property
+    def tts_cache(self) -> TTSCache | None:
+        return self._tts_cache
+
+    @property
+    def streaming(self) -> bool:
+        return self._connection is not None
+
+    def cache_key_params(self) -> Tuple:
+        """Returns the settings that change the audio generated for a given
+        text. They are part of the cache key, together with the text.
+
+        """
+        params = [type(self).__name__]
+        for name in CACHE_KEY_ATTRIBUTES:
+            value = getattr(self, name, None)
+            if isinstance(value, (str, int, float)):
+                params.append((name, value))
+        return tuple(params)
 
     # Converts the text to audio.
     @abstractmethod
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         pass
 
+    async def warmup(self):
+        """Converts `warmup_phrases` that are not cached yet. Subclasses that
+        open connections in `warmup()` should call this afterwards.
+
+        """
+        await super().warmup()
+        if self._connection:
+            # There are no segments to cache when text is streamed.
+            await self._connection.connect()
+            return
+        if not self._warmup_phrases:
+            return
+        if not self._tts_cache:
+            logger.warning(f"{self} warm-up phrases are ignored, there's no TTS cache")
+            return
+        texts = []
+        for phrase in self._warmup_phrases:
+            if self._text_segmenter:
+                # Cache the same segments `say()` would convert.
+                texts += self._text_segmenter.push(phrase)
+                texts.append(self._text_segmenter.flush())
+            else:
+                texts.append(phrase)
+        texts = [t.strip() for t in texts if t.strip()]
+        await asyncio.gather(*[self._warmup_phrase(t) for t in texts])
+
+    async def _warmup_phrase(self, text: str):
+        key = self._tts_cache.key(self.cache_key_params(), text)
+        if self._tts_cache.contains(key):
+            return
+        async for _ in self._run_and_cache_tts(key, text):
+            pass
+
     async def say(self, text: str):
         await self.process_frame(TextFrame(text=text), FrameDirection.DOWNSTREAM)
+        # Don't wait for more text to finish the last sentence.
+        await self._flush_text()
 
     async def _process_text_frame(self, frame: TextFrame):
-        text: str | None = None
-        if not self._aggregate_sentences:
-            text = frame.text
-        else:
-            self._current_sentence += frame.text
-            if self._current_sentence.strip().endswith(
-                    (".", "?", "!")) and not self._current_sentence.strip().endswith(
-                    ("Mr,", "Mrs.", "Ms.", "Dr.")):
-                text = self._current_sentence
-                self._current_sentence = ""
-
-        if text:
+        if self._first_audio_armed:
+            self._first_audio_armed = False
+            self._first_text_time = time.monotonic()
+
+        if self._connection:
+            await self._stream_text(frame.text)
+            return
+
+        if not self._text_segmenter:
+            await self._push_tts_frames(frame.text)
+            return
+
+        for text in self._text_segmenter.push(frame.text):
             await self._push_tts_frames(text)
 
+    async def _flush_text(self):
+        if self._connection:
+            await self._end_context()
+        elif self._text_segmenter:
+            await self._push_tts_frames(self._text_segmenter.flush())
+
+    async def _reset_text(self):
+        if self._text_segmenter:
+            self._text_segmenter.reset()
+        self._first_audio_armed = True
+        self._first_text_time = 0.0
+
     async def _push_tts_frames(self, text: str):
         text = text.strip()
         if not text:
             return
 
-        await self.push_frame(TTSStartedFrame())
-        await self.start_processing_metrics()
-        await self.process_generator(self.run_tts(text))
-        await self.stop_processing_metrics()
-        await self.push_frame(TTSStoppedFrame())
+        first_text_time = self._take_first_text_time()
+        if self._playout_worker:
+            request = _TTSRequest(text, first_text_time)
+            self._waiting_requests.append(request)
+            self._start_requests()
+            await self._playout_queue.put(request)
+        else:
+            await self._push_tts_audio(text, self._run_tts(text), first_text_time)
+
+    def _take_first_text_time(self) -> float:
+        # Only the first conversion of a response reports first audio metrics.
+        first_text_time = self._first_text_time
+        self._first_text_time = 0.0
+        return first_text_time
+
+    async def _run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        # Like `run_tts()`, but going through the cache (if any).
+        if not self._tts_cache:
+            async for f in self.run_tts(text):
+                yield f
+            return
+
+        key = self._tts_cache.key(self.cache_key_params(), text)
+        cached = self._tts_cache.get(key)
+        if cached:
+            self._tts_cache_metrics.hit(len(cached))
+            await self._push_tts_cache_metrics()
+            for f in cached.frames(self._tts_cache.chunk_secs):
+                yield f
+            return
+
+        self._tts_cache_metrics.miss()
+        await self._push_tts_cache_metrics()
+        async for f in self._run_and_cache_tts(key, text):
+            yield f
+
+    async def _run_and_cache_tts(self, key: str, text: str) -> AsyncGenerator[Frame, None]:
+        # Only complete conversions with audio in a single format are cached.
+        chunks = []
+        audio_format = None
+        cacheable = True
+        async for f in self.run_tts(text):
+            if isinstance(f, AudioRawFrame):
+                if audio_format is None:
+                    audio_format = (f.sample_rate, f.num_channels)
+                cacheable = cacheable and audio_format == (f.sample_rate, f.num_channels)
+                chunks.append(f.audio)
+            elif isinstance(f, ErrorFrame):
+                cacheable = False
+            yield f
+        if cacheable and audio_format:
+            self._tts_cache.put(key, b"".join(chunks), *audio_format)
+
+    async def _push_tts_cache_metrics(self):
+        if self.metrics_enabled:
+            frame = self._tts_cache_metrics.metrics_frame()
+            if frame:
+                await self.push_frame(frame)
+
+    async def _stream_text(self, text: str):
+        if not text:
+            return
+        if not self._context:
+            self._context = await self._connection.create_context()
+            self._context_first_text_times[self._context] = self._take_first_text_time()
+            self._active_requests.append(self._context)
+            await self.start_ttfb_metrics()
+            await self._playout_queue.put(self._context)
+        await self._connection.send_text(self._context, text)
+
+    async def _end_context(self):
+        if self._context:
+            await self._connection.end_context(self._context)
+            self._context = None
+
+    async def _context_frames(self, context: WebsocketTTSContext) -> AsyncGenerator[Frame, None]:
+        async for f in context.frames():
+            if isinstance(f, AudioRawFrame):
+                await self.stop_ttfb_metrics()
+            yield f
+
+    async def _push_tts_audio(
+            self, text: str, generator: AsyncGenerator[Frame, None], first_text_time: float = 0.0):
+        await self._push_audio_frames(generator, first_text_time)
         # We send the original text after the audio. This way, if we are
         # interrupted, the text is not added to the assistant context.
         await self.push_frame(TextFrame(text))
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        await super().process_frame(frame, direction)
+    async def _push_audio_frames(
+            self, generator: AsyncGenerator[Frame, None], first_text_time: float = 0.0):
+        await self.push_frame(TTSStartedFrame())
+        await self.start_processing_metrics()
+        async for f in generator:
+            if isinstance(f, ErrorFrame):
+                await self.push_error(f)
+                continue
+            if isinstance(f, AudioRawFrame) and first_text_time:
+                await self._stop_first_audio_metrics(first_text_time)
+                first_text_time = 0.0
+            await self.push_frame(f)
+        await self.stop_processing_metrics()
+        await self.push_frame(TTSStoppedFrame())
 
-        if isinstance(frame, TextFrame):
-            await self._process_text_frame(frame)
-        elif isinstance(frame, StartInterruptionFrame):
-            self._current_sentence = ""
+    async def _stop_first_audio_metrics(self, first_text_time: float):
+        value = time.monotonic() - first_text_time
+        if self.can_generate_metrics() and self.metrics_enabled:
+            logger.debug(f"{self.name} first audio: {value}")
+            await self.push_frame(
+                MetricsFrame(first_audio=[{"processor": self.name, "value": value}]))
+
+    async def _push_ordered_frame(self, frame: Frame, direction: FrameDirection):
+        # With pipelined conversions, frames that arrive after some text need
+        # to wait until that text has been played out.
+        if (self._playout_worker and
+                direction == FrameDirection.DOWNSTREAM and
+                not isinstance(frame, SystemFrame)):
+            await self._playout_queue.put((frame, direction))
+        else:
             await self.push_frame(frame, direction)
-        elif isinstance(frame, LLMFullResponseEndFrame) or isinstance(frame, EndFrame):
-            self._current_sentence = ""
-            await self._push_tts_frames(self._current_sentence)
-            await self.push_frame(frame)
+
+    def _start_requests(self):
+        while self._waiting_requests and len(self._active_requests) <= self._lookahead:
+            request = self._waiting_requests.popleft()
+            request.start(self.get_event_loop(), self._run_tts(request.text))
+            self._active_requests.append(request)
+
+    async def _playout_task_handler(self, item):
+        if isinstance(item, (_TTSRequest, WebsocketTTSContext)):
+            try:
+                if isinstance(item, _TTSRequest):
+                    await self._push_tts_audio(item.text, item.frames(), item.first_text_time)
+                else:
+                    first_text_time = self._context_first_text_times.pop(item, 0.0)
+                    await self._push_audio_frames(self._context_frames(item), first_text_time)
+                    # The text is complete once all the audio has been received.
+                    await self.push_frame(TextFrame(item.text))
+            finally:
+                if item in self._active_requests:
+                    self._active_requests.remove(item)
+                    self._start_requests()
         else:
+            (frame, direction) = item
             await self.push_frame(frame, direction)
 
+    async def _cancel_requests(self):
+        if not self._playout_worker:
+            return
+        requests = self._active_requests
+        self._active_requests = []
+        self._waiting_requests.clear()
+        self._context = None
+        self._context_first_text_times.clear()
+        await self._playout_worker.interrupt()
+        for request in requests:
+            await request.cancel()
+
+    async def cleanup(self):
+        await super().cleanup()
+        if self._playout_worker:
+            await self._cancel_requests()
+            await self._playout_worker.stop()
+        if self._connection:
+            await self._connection.close()
+
+    async def _handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        await super()._handle_start_frame(frame, direction)
+        if self._connection:
+            # In case we were not warmed up.
+            await self._connection.connect()
+        await self.push_frame(frame, direction)
+
+    async def _handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await super()._handle_cancel_frame(frame, direction)
+        if self._connection:
+            await self._cancel_requests()
+            await self._connection.close()
+        await self.push_frame(frame, direction)
+
+    async def _handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        await super()._handle_end_frame(frame, direction)
+        await self._handle_response_end_frame(frame, direction)
+        if self._playout_worker:
+            # The pipeline is cleaned up after the EndFrame, so wait until
+            # everything has been played out.
+            await self._playout_queue.join()
+        if self._connection:
+            await self._connection.close()
+
+    @frame_handler(TextFrame)
+    async def _handle_text_frame(self, frame: TextFrame, direction: FrameDirection):
+        await self._process_text_frame(frame)
+
+    @frame_handler(StartInterruptionFrame)
+    async def _handle_interruption_frame(
+            self, frame: StartInterruptionFrame, direction: FrameDirection):
+        await self._reset_text()
+        await self._cancel_requests()
+        await self.push_frame(frame, direction)
+
+    @frame_handler(LLMFullResponseStartFrame)
+    async def _handle_response_start_frame(
+            self, frame: LLMFullResponseStartFrame, direction: FrameDirection):
+        await self._reset_text()
+        await self._push_ordered_frame(frame, direction)
+
+    @frame_handler(LLMFullResponseEndFrame)
+    async def _handle_response_end_frame(self, frame: Frame, direction: FrameDirection):
+        await self._flush_text()
+        await self._reset_text()
+        await self._push_ordered_frame(frame, FrameDirection.DOWNSTREAM)
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        await self._push_ordered_frame(frame, direction)
+
+
+class _TTSRequest:
+    """A segment of text being converted to audio concurrently with other
+    segments. Frames generated by `run_tts()` are buffered until the segment is
+    played out.
+
+    """
+
+    def __init__(self, text: str, first_text_time: float = 0.0):
+        self.text = text
+        # Time of the first text of the response, if this is its first
+        # conversion (see `TTSService` first audio metrics).
+        self.first_text_time = first_text_time
+        self._frames: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self, loop: asyncio.AbstractEventLoop, generator: AsyncGenerator[Frame, None]):
+        self._task = loop.create_task(self._convert(generator))
+
+    async def cancel(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                # The task was cancelled before it started.
+                pass
+            self._task = None
+
+    async def frames(self) -> AsyncGenerator[Frame, None]:
+        while True:
+            frame = await self._frames.get()
+            if frame is None:
+                break
+            yield frame
+
+    async def _convert(self, generator: AsyncGenerator[Frame, None]):
+        try:
+            async for frame in generator:
+                self._frames.put_nowait(frame)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.exception(f"error converting text to audio: {e}")
+            self._frames.put_nowait(ErrorFrame(f"Error converting text to audio: {e}"))
+        finally:
+            self._frames.put_nowait(None)
+
 
 class STTService(AIService):
     """STTService is a base class for speech-to-text services."""
@@ -196,6 +612,7 @@ class STTService(AIService):
         (self._content, self._wave) = self._new_wave()
         self._silence_num_frames = 0
         # Volume exponential smoothing
+        self._volume_estimator = AudioVolumeEstimator(sample_rate)
         self._smoothing_factor = 0.2
         self._prev_volume = 0
 
@@ -213,7 +630,9 @@ class STTService(AIService):
         return (content, ww)
 
     def _get_smoothed_volume(self, frame: AudioRawFrame) -> float:
-        volume = calculate_audio_volume(frame.audio, frame.sample_rate)
+        if frame.sample_rate != self._volume_estimator.sample_rate:
+            self._volume_estimator = AudioVolumeEstimator(frame.sample_rate)
+        volume = self._volume_estimator.volume(frame.audio)
         return exp_smoothing(volume, self._prev_volume, self._smoothing_factor)
 
     async def _append_audio(self, frame: AudioRawFrame):
@@ -241,19 +660,29 @@ class STTService(AIService):
             await self.stop_processing_metrics()
             (self._content, self._wave) = self._new_wave()
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        """Processes a frame of audio data, either buffering or transcribing it."""
-        await super().process_frame(frame, direction)
-
-        if isinstance(frame, CancelFrame) or isinstance(frame, EndFrame):
-            self._wave.close()
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, AudioRawFrame):
-            # In this service we accumulate audio internally and at the end we
-            # push a TextFrame. We don't really want to push audio frames down.
-            await self._append_audio(frame)
-        else:
-            await self.push_frame(frame, direction)
+    async def _handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        await super()._handle_start_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+    async def _handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await super()._handle_cancel_frame(frame, direction)
+        self._wave.close()
+        await self.push_frame(frame, direction)
+
+    async def _handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        await super()._handle_end_frame(frame, direction)
+        self._wave.close()
+        await self.push_frame(frame, direction)
+
+    @frame_handler(AudioRawFrame)
+    async def _handle_audio_frame(self, frame: AudioRawFrame, direction: FrameDirection):
+        # In this service we accumulate audio internally and at the end we
+        # push a TextFrame. We don't really want to push audio frames down.
+        await self._append_audio(frame)
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
 
 
 class ImageGenService(AIService):
@@ -4,17 +4,81 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import base64
+import functools
+
 from cartesia import AsyncCartesia
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, List, Mapping, Tuple
+from urllib.parse import urlencode
 
 from pipecat.frames.frames import AudioRawFrame, CancelFrame, EndFrame, Frame, StartFrame
 from pipecat.services.ai_services import TTSService
+from pipecat.services.websocket_tts import WebsocketTTSConnection
+from pipecat.utils.executors import BLOCKING_SDK_EXECUTOR, get_executor
 
 from loguru import logger
 
 
+class CartesiaWebsocketConnection(WebsocketTTSConnection):
+    """Cartesia websocket API. Text is sent as continuations of the context
+    transcript, and an empty transcript without `continue` ends it.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            api_key: str,
+            voice_id: str,
+            model_id: str,
+            output_format: Mapping[str, Any],
+            url: str = "wss://api.cartesia.ai/tts/websocket",
+            version: str = "2024-06-10",
+            **kwargs):
+        query = urlencode({"api_key": api_key, "cartesia_version": version})
+        super().__init__(
+            url=f"{url}?{query}", sample_rate=output_format["sample_rate"], **kwargs)
+        self._voice_id = voice_id
+        self._model_id = model_id
+        self._output_format = dict(output_format)
+
+    def _context_message(self, context_id: str, transcript: str, cont: bool) -> Mapping[str, Any]:
+        return {
+            "context_id": context_id,
+            "model_id": self._model_id,
+            "transcript": transcript,
+            "voice": {"mode": "id", "id": self._voice_id},
+            "output_format": self._output_format,
+            "continue": cont,
+        }
+
+    def _text_message(self, context_id: str, text: str) -> Mapping[str, Any]:
+        return self._context_message(context_id, text, True)
+
+    def _end_messages(self, context_id: str) -> List[Mapping[str, Any]]:
+        return [self._context_message(context_id, "", False)]
+
+    def _cancel_message(self, context_id: str) -> Mapping[str, Any]:
+        return {"context_id": context_id, "cancel": True}
+
+    def _parse_message(
+            self, message: Mapping[str, Any]) -> Tuple[str | None, bytes | None, bool, str | None]:
+        context_id = message.get("context_id")
+        if message.get("type") == "error":
+            return (context_id, None, True, message.get("error", "unknown error"))
+        audio = None
+        if message.get("type") == "chunk" and message.get("data"):
+            audio = base64.b64decode(message["data"])
+        return (context_id, audio, bool(message.get("done")), None)
+
+
 class CartesiaTTSService(TTSService):
+    """Cartesia TTS. By default each segment of text is converted with its
+    own request. If `streaming` is enabled, text is streamed over a single
+    websocket as it arrives (see `CartesiaWebsocketConnection`).
+
+    """
 
     def __init__(
             self,
@@ -24,26 +88,54 @@ class CartesiaTTSService(TTSService):
             model_id: str = "sonic-english",
             encoding: str = "pcm_s16le",
             sample_rate: int = 16000,
+            streaming: bool = False,
             **kwargs):
-        super().__init__(**kwargs)
-
-        self._api_key = api_key
-        self._voice_id = voice_id
-        self._model_id = model_id
-        self._output_format = {
+        output_format = {
             "container": "raw",
             "encoding": encoding,
             "sample_rate": sample_rate,
         }
+        connection = None
+        if streaming:
+            connection = CartesiaWebsocketConnection(
+                api_key=api_key,
+                voice_id=voice_id,
+                model_id=model_id,
+                output_format=output_format)
+        super().__init__(connection=connection, **kwargs)
+
+        self._api_key = api_key
+        self._voice_id = voice_id
+        self._model_id = model_id
+        self._output_format = output_format
         self._client = None
 
     def can_generate_metrics(self) -> bool:
         return True
 
+    def cache_key_params(self) -> Tuple:
+        return (type(self).__name__, self._voice_id, self._model_id,
+                self._output_format["encoding"], self._output_format["sample_rate"])
+
+    async def warmup(self):
+        # The websocket (if streaming) is opened by `TTSService`.
+        if not self.streaming:
+            await self._connect()
+        await super().warmup()
+
     async def start(self, frame: StartFrame):
+        # In case we were not warmed up.
+        if not self.streaming and not self._client:
+            await self._connect()
+
+    async def _connect(self):
         try:
-            self._client = AsyncCartesia(api_key=self._api_key)
-            self._voice = self._client.voices.get(id=self._voice_id)
+            client = AsyncCartesia(api_key=self._api_key)
+            # Fetching the voice blocks.
+            self._voice = await self.get_event_loop().run_in_executor(
+                get_executor(BLOCKING_SDK_EXECUTOR),
+                functools.partial(client.voices.get, id=self._voice_id))
+            self._client = client
         except Exception as e:
             logger.exception(f"{self} initialization error: {e}")
 
@@ -59,6 +59,17 @@ class DeepgramTTSService(TTSService):
     def can_generate_metrics(self) -> bool:
         return True
 
+    async def warmup(self):
+        # Open a connection before the first request, we don't care about the
+        # response.
+        headers = {"authorization": f"token {self._api_key}"}
+        try:
+            async with self._aiohttp_session.head(self._base_url, headers=headers) as r:
+                await r.read()
+        except Exception as e:
+            logger.warning(f"{self} unable to open a connection: {e}")
+        await super().warmup()
+
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         logger.debug(f"Generating TTS: [{text}]")
 
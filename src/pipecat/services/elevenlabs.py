@@ -4,17 +4,78 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import base64
+
 import aiohttp
 
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator, List, Mapping, Tuple
+from urllib.parse import urlencode
 
 from pipecat.frames.frames import AudioRawFrame, ErrorFrame, Frame
 from pipecat.services.ai_services import TTSService
+from pipecat.services.websocket_tts import WebsocketTTSConnection
 
 from loguru import logger
 
 
+class ElevenLabsWebsocketConnection(WebsocketTTSConnection):
+    """ElevenLabs multi-context websocket API. Text is buffered by the service
+    until it has enough to generate audio, `flush` generates the rest and
+    `close_context` ends the context.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            api_key: str,
+            voice_id: str,
+            model: str,
+            sample_rate: int = 16000,
+            url: str = "wss://api.elevenlabs.io/v1/text-to-speech",
+            inactivity_timeout: int = 180,
+            **kwargs):
+        query = urlencode({
+            "model_id": model,
+            "output_format": f"pcm_{sample_rate}",
+            "inactivity_timeout": inactivity_timeout,
+        })
+        super().__init__(
+            url=f"{url}/{voice_id}/multi-stream-input?{query}",
+            sample_rate=sample_rate,
+            headers={"xi-api-key": api_key},
+            **kwargs)
+
+    def _text_message(self, context_id: str, text: str) -> Mapping[str, Any]:
+        return {"context_id": context_id, "text": text}
+
+    def _end_messages(self, context_id: str) -> List[Mapping[str, Any]]:
+        return [
+            {"context_id": context_id, "text": "", "flush": True},
+            {"context_id": context_id, "close_context": True},
+        ]
+
+    def _cancel_message(self, context_id: str) -> Mapping[str, Any]:
+        return {"context_id": context_id, "close_context": True}
+
+    def _parse_message(
+            self, message: Mapping[str, Any]) -> Tuple[str | None, bytes | None, bool, str | None]:
+        context_id = message.get("contextId", message.get("context_id"))
+        if message.get("error"):
+            return (context_id, None, True, message.get("message") or message["error"])
+        audio = base64.b64decode(message["audio"]) if message.get("audio") else None
+        return (context_id, audio, bool(message.get("isFinal")), None)
+
+    async def _send_close(self, websocket: aiohttp.ClientWebSocketResponse):
+        await websocket.send_json({"close_socket": True})
+
+
 class ElevenLabsTTSService(TTSService):
+    """ElevenLabs TTS. By default each segment of text is converted with its
+    own HTTP request. If `streaming` is enabled, text is streamed over a single
+    websocket as it arrives (see `ElevenLabsWebsocketConnection`).
+
+    """
 
     def __init__(
             self,
@@ -23,8 +84,16 @@ class ElevenLabsTTSService(TTSService):
             api_key: str,
             voice_id: str,
             model: str = "eleven_turbo_v2",
+            streaming: bool = False,
             **kwargs):
-        super().__init__(**kwargs)
+        connection = None
+        if streaming:
+            connection = ElevenLabsWebsocketConnection(
+                api_key=api_key,
+                voice_id=voice_id,
+                model=model,
+                aiohttp_session=aiohttp_session)
+        super().__init__(connection=connection, **kwargs)
 
         self._api_key = api_key
         self._voice_id = voice_id
@@ -34,6 +103,23 @@ class ElevenLabsTTSService(TTSService):
     def can_generate_metrics(self) -> bool:
         return True
 
+    async def warmup(self):
+        if self.streaming:
+            # `TTSService` opens the websocket.
+            await super().warmup()
+            return
+        # Open a connection (and check the voice) before the first request.
+        url = f"https://api.elevenlabs.io/v1/voices/{self._voice_id}"
+        try:
+            async with self._aiohttp_session.get(url, headers={"xi-api-key": self._api_key}) as r:
+                if r.status != 200:
+                    logger.warning(
+                        f"{self} unable to get voice {self._voice_id} (status: {r.status})")
+                await r.read()
+        except Exception as e:
+            logger.warning(f"{self} unable to get voice {self._voice_id}: {e}")
+        await super().warmup()
+
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         logger.debug(f"Generating TTS: [{text}]")
 
@@ -309,6 +309,14 @@ class OpenAITTSService(TTSService):
     def can_generate_metrics(self) -> bool:
         return True
 
+    async def warmup(self):
+        # Open a connection (and check the model) before the first request.
+        try:
+            await self._client.models.retrieve(self._model)
+        except Exception as e:
+            logger.warning(f"{self} unable to get model {self._model}: {e}")
+        await super().warmup()
+
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         logger.debug(f"Generating TTS: [{text}]")
 
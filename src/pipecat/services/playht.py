@@ -7,7 +7,7 @@
 import io
 import struct
 
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Tuple
 
 from pipecat.frames.frames import AudioRawFrame, Frame
 from pipecat.services.ai_services import TTSService
@@ -46,6 +46,13 @@ class PlayHTTTSService(TTSService):
     def can_generate_metrics(self) -> bool:
         return True
 
+    def cache_key_params(self) -> Tuple:
+        return (
+            type(self).__name__,
+            self._options.voice,
+            self._options.sample_rate,
+            self._options.quality)
+
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         logger.debug(f"Generating TTS: [{text}]")
 
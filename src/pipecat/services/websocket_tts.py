@@ -0,0 +1,273 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import json
+import uuid
+
+from abc import ABC, abstractmethod
+from typing import Any, AsyncGenerator, Dict, List, Mapping, Tuple
+
+import aiohttp
+
+from pipecat.frames.frames import AudioRawFrame, ErrorFrame, Frame
+
+from loguru import logger
+
+
+class WebsocketTTSContext:
+    """A TTS conversion streamed over a `WebsocketTTSConnection`. Text is sent
+    as it arrives and the audio for this context is received in `frames()`,
+    which ends when the service is done with the context (or it's cancelled).
+
+    """
+
+    def __init__(self, connection: "WebsocketTTSConnection", context_id: str):
+        self.context_id = context_id
+        self._connection = connection
+        self._parts: List[str] = []
+        self._frames: asyncio.Queue = asyncio.Queue()
+        self._done = False
+
+    @property
+    def text(self) -> str:
+        """The text sent so far."""
+        return "".join(self._parts).strip()
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    async def cancel(self):
+        await self._connection.cancel_context(self)
+
+    async def frames(self) -> AsyncGenerator[Frame, None]:
+        while True:
+            frame = await self._frames.get()
+            if frame is None:
+                break
+            yield frame
+
+    def _add_text(self, text: str):
+        self._parts.append(text)
+
+    def _put_frame(self, frame: Frame):
+        if not self._done:
+            self._frames.put_nowait(frame)
+
+    def _finish(self):
+        if not self._done:
+            self._done = True
+            self._frames.put_nowait(None)
+
+
+class WebsocketTTSConnection(ABC):
+    """A persistent websocket to a TTS service that supports streamed text
+    input and multiple contexts per connection.
+
+    Each response uses its own context (see `create_context()`). Text is sent
+    incrementally with `send_text()` and `end_context()` tells the service
+    there's no more text. Audio received from the service is demultiplexed by
+    context id, and audio of contexts that are not active any more (e.g. audio
+    that was in flight when the context was cancelled) is discarded. If the
+    connection is lost, the active contexts finish with an `ErrorFrame` and
+    the next context opens a new connection.
+
+    Subclasses implement the service messages.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            url: str,
+            sample_rate: int,
+            num_channels: int = 1,
+            headers: Mapping[str, str] = {},
+            aiohttp_session: aiohttp.ClientSession | None = None):
+        self._url = url
+        self._sample_rate = sample_rate
+        self._num_channels = num_channels
+        self._headers = dict(headers)
+        self._aiohttp_session = aiohttp_session
+        self._own_session: aiohttp.ClientSession | None = None
+        self._websocket: aiohttp.ClientWebSocketResponse | None = None
+        self._receive_task: asyncio.Task | None = None
+        self._connect_lock = asyncio.Lock()
+        self._contexts: Dict[str, WebsocketTTSContext] = {}
+
+    @property
+    def connected(self) -> bool:
+        return self._websocket is not None and not self._websocket.closed
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    async def connect(self) -> bool:
+        """Opens the websocket if it's not open yet. Returns whether it's
+        connected.
+
+        """
+        async with self._connect_lock:
+            if self.connected:
+                return True
+            session = self._aiohttp_session
+            if not session:
+                if not self._own_session:
+                    self._own_session = aiohttp.ClientSession()
+                session = self._own_session
+            try:
+                self._websocket = await session.ws_connect(self._url, headers=self._headers)
+            except Exception as e:
+                logger.error(f"{self} unable to connect: {e}")
+                return False
+            self._receive_task = asyncio.get_running_loop().create_task(
+                self._receive_task_handler(self._websocket))
+            return True
+
+    async def close(self):
+        websocket = self._websocket
+        self._websocket = None
+        if websocket and not websocket.closed:
+            try:
+                await self._send_close(websocket)
+            except Exception:
+                pass
+            await websocket.close()
+        if self._receive_task:
+            self._receive_task.cancel()
+            try:
+                await self._receive_task
+            except asyncio.CancelledError:
+                pass
+            self._receive_task = None
+        self._finish_contexts()
+        if self._own_session:
+            await self._own_session.close()
+            self._own_session = None
+
+    async def create_context(self) -> WebsocketTTSContext:
+        """Creates a context, connecting if needed. If we can't connect the
+        context is finished with an `ErrorFrame` right away.
+
+        """
+        context = WebsocketTTSContext(self, uuid.uuid4().hex)
+        if await self.connect():
+            self._contexts[context.context_id] = context
+        else:
+            context._put_frame(ErrorFrame(f"Unable to connect to {self._url}"))
+            context._finish()
+        return context
+
+    async def send_text(self, context: WebsocketTTSContext, text: str):
+        if context.done or not text:
+            return
+        context._add_text(text)
+        await self._send(context, [self._text_message(context.context_id, text)])
+
+    async def end_context(self, context: WebsocketTTSContext):
+        """Indicates there's no more text for the context. The remaining audio
+        is still received.
+
+        """
+        if not context.done:
+            await self._send(context, self._end_messages(context.context_id))
+
+    async def cancel_context(self, context: WebsocketTTSContext):
+        """Cancels the context. No more audio is received for it."""
+        if context.done:
+            return
+        self._contexts.pop(context.context_id, None)
+        context._finish()
+        if self.connected:
+            try:
+                await self._websocket.send_json(self._cancel_message(context.context_id))
+            except Exception as e:
+                logger.warning(f"{self} unable to cancel context {context.context_id}: {e}")
+
+    @abstractmethod
+    def _text_message(self, context_id: str, text: str) -> Mapping[str, Any]:
+        pass
+
+    @abstractmethod
+    def _end_messages(self, context_id: str) -> List[Mapping[str, Any]]:
+        pass
+
+    @abstractmethod
+    def _cancel_message(self, context_id: str) -> Mapping[str, Any]:
+        pass
+
+    @abstractmethod
+    def _parse_message(
+            self, message: Mapping[str, Any]) -> Tuple[str | None, bytes | None, bool, str | None]:
+        """Returns the context id, audio, whether the context is done and the
+        error (if any) of a received message.
+
+        """
+        pass
+
+    async def _send_close(self, websocket: aiohttp.ClientWebSocketResponse):
+        # Some services expect a message before the websocket is closed.
+        pass
+
+    async def _send(self, context: WebsocketTTSContext, messages: List[Mapping[str, Any]]):
+        try:
+            for message in messages:
+                await self._websocket.send_json(message)
+        except Exception as e:
+            logger.error(f"{self} error sending text: {e}")
+            self._contexts.pop(context.context_id, None)
+            context._put_frame(ErrorFrame(f"Error sending text: {e}"))
+            context._finish()
+
+    async def _receive_task_handler(self, websocket: aiohttp.ClientWebSocketResponse):
+        try:
+            async for message in websocket:
+                if message.type == aiohttp.WSMsgType.TEXT:
+                    self._handle_message(json.loads(message.data))
+                elif message.type == aiohttp.WSMsgType.ERROR:
+                    break
+        except Exception as e:
+            logger.error(f"{self} error receiving audio: {e}")
+        finally:
+            if websocket is self._websocket:
+                # The service closed the connection, the next context will
+                # open a new one.
+                self._websocket = None
+                self._finish_contexts(ErrorFrame("TTS websocket connection closed"))
+
+    def _handle_message(self, message: Mapping[str, Any]):
+        (context_id, audio, done, error) = self._parse_message(message)
+        if error and context_id is None:
+            logger.error(f"{self} error: {error}")
+            self._finish_contexts(ErrorFrame(f"TTS error: {error}"))
+            return
+
+        context = self._contexts.get(context_id)
+        if not context:
+            # E.g. audio of a cancelled context.
+            return
+        if error:
+            logger.error(f"{self} error in context {context_id}: {error}")
+            context._put_frame(ErrorFrame(f"TTS error: {error}"))
+            done = True
+        if audio:
+            context._put_frame(AudioRawFrame(audio, self._sample_rate, self._num_channels))
+        if done:
+            del self._contexts[context_id]
+            context._finish()
+
+    def _finish_contexts(self, error: ErrorFrame | None = None):
+        contexts = self._contexts
+        self._contexts = {}
+        for context in contexts.values():
+            if error:
+                context._put_frame(error)
+            context._finish()
+
+    def __str__(self):
+        return type(self).__name__
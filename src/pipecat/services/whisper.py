@@ -16,6 +16,7 @@ import numpy as np
 
 from pipecat.frames.frames import ErrorFrame, Frame, TranscriptionFrame
 from pipecat.services.ai_services import STTService
+from pipecat.utils.shared_models import get_shared_model
 
 from loguru import logger
 
@@ -62,13 +63,20 @@ class WhisperSTTService(STTService):
 
     def _load(self):
         """Loads the Whisper model. Note that if this is the first time
-        this model is being run, it will take time to download."""
-        logger.debug("Loading Whisper model...")
-        self._model = WhisperModel(
-            self._model_name.value if isinstance(self._model_name, Enum) else self._model_name,
-            device=self._device,
-            compute_type=self._compute_type)
-        logger.debug("Loaded Whisper model")
+        this model is being run, it will take time to download. The model is
+        shared by all the services in the process with the same settings."""
+        model_name = self._model_name
+        if isinstance(model_name, Enum):
+            model_name = model_name.value
+
+        def load_model():
+            logger.debug("Loading Whisper model...")
+            model = WhisperModel(model_name, device=self._device, compute_type=self._compute_type)
+            logger.debug("Loaded Whisper model")
+            return model
+
+        self._model = get_shared_model(
+            ("whisper", model_name, self._device, self._compute_type), load_model)
 
     async def run_stt(self, audio: bytes) -> AsyncGenerator[Frame, None]:
         """Transcribes given audio using Whisper"""
@@ -13,8 +13,6 @@ from pipecat.services.ai_services import TTSService
 
 from loguru import logger
 
-import requests
-
 import numpy as np
 
 try:
@@ -49,13 +47,34 @@ class XTTSService(TTSService):
         self._language = language
         self._base_url = base_url
         self._aiohttp_session = aiohttp_session
-        self._studio_speakers = requests.get(self._base_url + "/studio_speakers").json()
+        # Fetched on warm-up (or on the first request).
+        self._studio_speakers = None
 
     def can_generate_metrics(self) -> bool:
         return True
 
+    async def warmup(self):
+        try:
+            await self._fetch_studio_speakers()
+        except Exception as e:
+            # We'll try again on the first request.
+            logger.warning(f"{self} unable to get studio speakers: {e}")
+        await super().warmup()
+
+    async def _fetch_studio_speakers(self):
+        async with self._aiohttp_session.get(self._base_url + "/studio_speakers") as r:
+            r.raise_for_status()
+            self._studio_speakers = await r.json()
+
     async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
         logger.debug(f"Generating TTS: [{text}]")
+        if self._studio_speakers is None:
+            try:
+                await self._fetch_studio_speakers()
+            except Exception as e:
+                logger.error(f"{self} unable to get studio speakers: {e}")
+                yield ErrorFrame(f"Unable to get studio speakers: {e}")
+                return
         embeddings = self._studio_speakers[self._voice_id]
 
         url = self._base_url + "/tts_stream"
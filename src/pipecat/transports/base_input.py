@@ -6,9 +6,9 @@
 
 import asyncio
 
-from concurrent.futures import ThreadPoolExecutor
+from typing import List
 
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, frame_handler
 from pipecat.frames.frames import (
     AudioRawFrame,
     CancelFrame,
@@ -20,6 +20,9 @@ from pipecat.frames.frames import (
     UserStartedSpeakingFrame,
     UserStoppedSpeakingFrame)
 from pipecat.transports.base_transport import TransportParams
+from pipecat.utils.executors import VAD_EXECUTOR, get_executor
+from pipecat.utils.frame_queue import FrameQueue
+from pipecat.utils.frame_worker import FrameQueueWorker
 from pipecat.vad.vad_analyzer import VADAnalyzer, VADState
 
 from loguru import logger
@@ -32,8 +35,6 @@ class BaseInputTransport(FrameProcessor):
 
         self._params = params
 
-        self._executor = ThreadPoolExecutor(max_workers=5)
-
         # Create push frame task. This is the task that will push frames in
         # order. We also guarantee that all frames are pushed in the same task.
         self._create_push_task()
@@ -41,7 +42,8 @@ class BaseInputTransport(FrameProcessor):
     async def start(self, frame: StartFrame):
         # Create audio input queue and task if needed.
         if self._params.audio_in_enabled or self._params.vad_enabled:
-            self._audio_in_queue = asyncio.Queue()
+            self._audio_in_queue = FrameQueue(
+                self._params.audio_in_queue_params, processor=self.name, name="audio_in")
             self._audio_task = self.get_event_loop().create_task(self._audio_task_handler())
 
     async def stop(self):
@@ -62,33 +64,44 @@ class BaseInputTransport(FrameProcessor):
     #
 
     async def cleanup(self):
-        self._push_frame_task.cancel()
-        await self._push_frame_task
-
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        await super().process_frame(frame, direction)
-
-        if isinstance(frame, CancelFrame):
-            await self.stop()
-            # We don't queue a CancelFrame since we want to stop ASAP.
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, StartFrame):
-            await self.start(frame)
-            await self._internal_push_frame(frame, direction)
-        elif isinstance(frame, EndFrame):
-            await self._internal_push_frame(frame, direction)
-            await self.stop()
-        else:
-            await self._internal_push_frame(frame, direction)
+        await self._push_worker.stop()
+        vad_analyzer = self.vad_analyzer()
+        if vad_analyzer:
+            vad_analyzer.close()
+
+    @frame_handler(CancelFrame)
+    async def _handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await self.stop()
+        # We don't queue a CancelFrame since we want to stop ASAP.
+        await self.push_frame(frame, direction)
+
+    @frame_handler(StartFrame)
+    async def _handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        await self.start(frame)
+        await self._internal_push_frame(frame, direction)
+
+    @frame_handler(EndFrame)
+    async def _handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        await self._internal_push_frame(frame, direction)
+        await self.stop()
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        await self._internal_push_frame(frame, direction)
 
     #
     # Push frames task
     #
 
     def _create_push_task(self):
-        loop = self.get_event_loop()
-        self._push_queue = asyncio.Queue()
-        self._push_frame_task = loop.create_task(self._push_frame_task_handler())
+        self._push_queue = FrameQueue(
+            self._params.push_queue_params, processor=self.name, name="push")
+        self._push_worker = FrameQueueWorker(
+            self._push_queue,
+            self._push_frame_task_handler,
+            name=f"{self} push",
+            loop=self.get_event_loop())
+        self._push_worker.start()
 
     async def _internal_push_frame(
             self,
@@ -96,13 +109,10 @@ class BaseInputTransport(FrameProcessor):
             direction: FrameDirection | None = FrameDirection.DOWNSTREAM):
         await self._push_queue.put((frame, direction))
 
-    async def _push_frame_task_handler(self):
-        while True:
-            try:
-                (frame, direction) = await self._push_queue.get()
-                await self.push_frame(frame, direction)
-            except asyncio.CancelledError:
-                break
+    async def _push_frame_task_handler(self, item):
+        (frame, direction) = item
+        await self.push_queue_metrics(self._push_queue)
+        await self.push_frame(frame, direction)
 
     #
     # Handle interruptions
@@ -113,15 +123,13 @@ class BaseInputTransport(FrameProcessor):
             # Make sure we notify about interruptions quickly out-of-band
             if isinstance(frame, UserStartedSpeakingFrame):
                 logger.debug("User started speaking")
-                # Cancel the task. This will stop pushing frames downstream.
-                self._push_frame_task.cancel()
-                await self._push_frame_task
+                # Discard queued frames and cancel the frame being pushed (if
+                # any). The push task keeps running.
+                await self._push_worker.interrupt()
                 # Push an out-of-band frame (i.e. not using the ordered push
                 # frame task) to stop everything, specially at the output
                 # transport.
                 await self.push_frame(StartInterruptionFrame())
-                # Create a new queue and task.
-                self._create_push_task()
             elif isinstance(frame, UserStoppedSpeakingFrame):
                 logger.debug("User stopped speaking")
                 await self.push_frame(StopInterruptionFrame())
@@ -131,27 +139,33 @@ class BaseInputTransport(FrameProcessor):
     # Audio input
     #
 
-    async def _vad_analyze(self, audio_frames: bytes) -> VADState:
-        state = VADState.QUIET
+    async def _vad_analyze(self, audio_frames: bytes) -> List[VADState]:
+        states = []
         vad_analyzer = self.vad_analyzer()
         if vad_analyzer:
-            state = await self.get_event_loop().run_in_executor(
-                self._executor, vad_analyzer.analyze_audio, audio_frames)
-        return state
+            states = await vad_analyzer.analyze_audio_windows_async(
+                audio_frames, get_executor(VAD_EXECUTOR))
+        return states
 
     async def _handle_vad(self, audio_frames: bytes, vad_state: VADState):
-        new_vad_state = await self._vad_analyze(audio_frames)
-        if new_vad_state != vad_state and new_vad_state != VADState.STARTING and new_vad_state != VADState.STOPPING:
-            frame = None
-            if new_vad_state == VADState.SPEAKING:
-                frame = UserStartedSpeakingFrame()
-            elif new_vad_state == VADState.QUIET:
-                frame = UserStoppedSpeakingFrame()
-
-            if frame:
-                await self._handle_interruptions(frame)
-
-            vad_state = new_vad_state
+        # We might get multiple windows analyzed at once, so check all the
+        # states to make sure we don't miss a transition.
+        for new_vad_state in await self._vad_analyze(audio_frames):
+            if (
+                new_vad_state != vad_state
+                and new_vad_state != VADState.STARTING
+                and new_vad_state != VADState.STOPPING
+            ):
+                frame = None
+                if new_vad_state == VADState.SPEAKING:
+                    frame = UserStartedSpeakingFrame()
+                elif new_vad_state == VADState.QUIET:
+                    frame = UserStoppedSpeakingFrame()
+
+                if frame:
+                    await self._handle_interruptions(frame)
+
+                vad_state = new_vad_state
         return vad_state
 
     async def _audio_task_handler(self):
@@ -159,6 +173,7 @@ class BaseInputTransport(FrameProcessor):
         while True:
             try:
                 frame: AudioRawFrame = await self._audio_in_queue.get()
+                await self.push_queue_metrics(self._audio_in_queue)
 
                 audio_passthrough = True
 
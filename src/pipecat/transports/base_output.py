@@ -7,14 +7,17 @@
 
 import asyncio
 import itertools
+import time
 
 from PIL import Image
 from typing import List
 
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, frame_handler
 from pipecat.frames.frames import (
     AudioRawFrame,
     BotSpeakingFrame,
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
     CancelFrame,
     MetricsFrame,
     SpriteFrame,
@@ -25,8 +28,13 @@ from pipecat.frames.frames import (
     StartInterruptionFrame,
     StopInterruptionFrame,
     SystemFrame,
-    TransportMessageFrame)
+    TransportMessageFrame,
+    TTSStoppedFrame)
 from pipecat.transports.base_transport import TransportParams
+from pipecat.utils.audio import AudioChunker
+from pipecat.utils.audio_pacer import AudioPacer
+from pipecat.utils.frame_queue import FrameQueue
+from pipecat.utils.frame_worker import FrameQueueWorker
 
 from loguru import logger
 
@@ -43,16 +51,39 @@ class BaseOutputTransport(FrameProcessor):
         self._camera_images = None
 
         # We will write 20ms audio at a time. If we receive long audio frames we
-        # will chunk them. This will help with interruption handling.
+        # will chunk them. This will help with interruption handling. Chunks
+        # are slices of the original audio, so they are not copied.
         audio_bytes_10ms = int(self._params.audio_out_sample_rate / 100) * \
             self._params.audio_out_channels * 2
         self._audio_chunk_size = audio_bytes_10ms * 2
+        self._audio_chunker = AudioChunker(self._audio_chunk_size)
+        self._audio_chunk_secs = self._audio_chunk_size / \
+            (self._params.audio_out_sample_rate * self._params.audio_out_channels * 2)
+
+        # Audio is written following the clock, at most `audio_out_lead_secs`
+        # ahead of real time. Otherwise, if writing audio doesn't block, the
+        # other end would buffer audio that we can't stop if we get
+        # interrupted.
+        self._audio_pacer: AudioPacer | None = None
+        if self._params.audio_out_paced:
+            self._audio_pacer = AudioPacer(
+                lead=self._params.audio_out_lead_secs, processor=self.name)
+
+        # Bot speaking state. We push BotStartedSpeakingFrame and
+        # BotStoppedSpeakingFrame upstream when it changes and, while the bot
+        # is speaking, a BotSpeakingFrame every `bot_speaking_frame_interval`
+        # seconds.
+        self._bot_speaking = False
+        self._last_audio_time = 0.0
+        self._last_bot_speaking_time = 0.0
 
         self._stopped_event = asyncio.Event()
 
         # Create sink frame task. This is the task that will actually write
         # audio or video frames. We write audio/video in a task so we can keep
         # generating frames upstream while, for example, the audio is playing.
+        # Tasks are not recreated on interruptions, their queues are cleared
+        # instead (see `FrameQueueWorker`).
         self._create_sink_task()
 
         # Create push frame task. This is the task that will push frames in
@@ -82,7 +113,10 @@ class BaseOutputTransport(FrameProcessor):
     async def write_frame_to_camera(self, frame: ImageRawFrame):
         pass
 
-    async def write_raw_audio_frames(self, frames: bytes):
+    # Audio is written in 20ms chunks. `frames` is usually a memoryview that is
+    # only valid until this function returns, so it needs to be copied (e.g.
+    # with `bytes(frames)`) if it's kept.
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
         pass
 
     #
@@ -90,108 +124,151 @@ class BaseOutputTransport(FrameProcessor):
     #
 
     async def cleanup(self):
-        if self._sink_task:
-            self._sink_task.cancel()
-            await self._sink_task
-
-        self._push_frame_task.cancel()
-        await self._push_frame_task
-
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        await super().process_frame(frame, direction)
-
-        #
-        # Out-of-band frames like (CancelFrame or StartInterruptionFrame) are
-        # pushed immediately. Other frames require order so they are put in the
-        # sink queue.
-        #
-        if isinstance(frame, StartFrame):
-            await self.start(frame)
-            await self.push_frame(frame, direction)
-        # EndFrame is managed in the sink queue handler.
-        elif isinstance(frame, CancelFrame):
-            await self.stop()
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, StartInterruptionFrame) or isinstance(frame, StopInterruptionFrame):
-            await self._handle_interruptions(frame)
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, MetricsFrame):
-            await self.send_metrics(frame)
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, SystemFrame):
-            await self.push_frame(frame, direction)
-        elif isinstance(frame, AudioRawFrame):
-            await self._handle_audio(frame)
-        else:
-            await self._sink_queue.put(frame)
+        await self._sink_worker.stop()
+        await self._push_worker.stop()
 
-        # If we are finishing, wait here until we have stopped, otherwise we might
-        # close things too early upstream. We need this event because we don't
-        # know when the internal threads will finish.
-        if isinstance(frame, CancelFrame) or isinstance(frame, EndFrame):
-            await self._stopped_event.wait()
+    #
+    # Out-of-band frames like (CancelFrame or StartInterruptionFrame) are
+    # pushed immediately. Other frames require order so they are put in the
+    # sink queue.
+    #
+
+    @frame_handler(StartFrame)
+    async def _handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        await self.start(frame)
+        await self.push_frame(frame, direction)
+
+    @frame_handler(CancelFrame)
+    async def _handle_cancel_frame(self, frame: CancelFrame, direction: FrameDirection):
+        await self.stop()
+        await self.push_frame(frame, direction)
+        # Wait here until we have stopped, otherwise we might close things too
+        # early upstream. We need this event because we don't know when the
+        # internal threads will finish.
+        await self._stopped_event.wait()
+
+    @frame_handler(StartInterruptionFrame, StopInterruptionFrame)
+    async def _handle_interruption_frame(self, frame: Frame, direction: FrameDirection):
+        await self._handle_interruptions(frame)
+        await self.push_frame(frame, direction)
+
+    @frame_handler(MetricsFrame)
+    async def _handle_metrics_frame(self, frame: MetricsFrame, direction: FrameDirection):
+        await self.send_metrics(frame)
+        await self.push_frame(frame, direction)
+
+    @frame_handler(SystemFrame)
+    async def _handle_system_frame(self, frame: SystemFrame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+    @frame_handler(AudioRawFrame)
+    async def _handle_audio_frame(self, frame: AudioRawFrame, direction: FrameDirection):
+        await self._handle_audio(frame)
+
+    @frame_handler(EndFrame)
+    async def _handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        # EndFrame is managed in the sink queue handler. Wait until we have
+        # stopped (see CancelFrame).
+        await self._sink_queue.put(frame)
+        await self._stopped_event.wait()
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        await self._sink_queue.put(frame)
+
+    async def push_queue_metrics(self, queue: FrameQueue):
+        # We are at the end of the pipeline, so also send the metrics.
+        if self.metrics_enabled:
+            frame = queue.metrics_frame()
+            if frame:
+                await self._handle_metrics_frame(frame, FrameDirection.DOWNSTREAM)
 
     async def _handle_interruptions(self, frame: Frame):
         if not self.interruptions_allowed:
             return
 
         if isinstance(frame, StartInterruptionFrame):
-            # Stop sink task.
-            self._sink_task.cancel()
-            await self._sink_task
-            self._create_sink_task()
-            # Stop push task.
-            self._push_frame_task.cancel()
-            await self._push_frame_task
-            self._create_push_task()
+            # Discard queued frames. The sink task stops writing audio by itself
+            # as soon as the current chunk is written (see `_write_audio()`).
+            await self._sink_worker.interrupt()
+            self._audio_chunker.reset()
+            if self._audio_pacer:
+                # This also wakes up the sink task if it's waiting to write.
+                self._audio_pacer.end_stream()
+            if self._bot_speaking:
+                await self._bot_stopped_speaking()
+            # Discard frames waiting to be pushed.
+            await self._push_worker.interrupt()
 
     async def _handle_audio(self, frame: AudioRawFrame):
-        audio = frame.audio
-        for i in range(0, len(audio), self._audio_chunk_size):
-            chunk = AudioRawFrame(audio[i: i + self._audio_chunk_size],
-                                  sample_rate=frame.sample_rate, num_channels=frame.num_channels)
-            await self._sink_queue.put(chunk)
+        # Audio frames are queued as they are and chunked when they are
+        # written, so we don't need to create a frame per chunk.
+        await self._sink_queue.put(frame)
 
     def _create_sink_task(self):
-        loop = self.get_event_loop()
-        self._sink_queue = asyncio.Queue()
-        self._sink_task = loop.create_task(self._sink_task_handler())
+        self._sink_queue = FrameQueue(
+            self._params.sink_queue_params, processor=self.name, name="sink")
+        self._sink_worker = FrameQueueWorker(
+            self._sink_queue,
+            self._sink_task_handler,
+            get=self._next_sink_frame,
+            cancel_on_interrupt=False,
+            name=f"{self} sink",
+            loop=self.get_event_loop())
+        self._sink_worker.start()
+
+    async def _sink_task_handler(self, frame: Frame):
+        # Frames queued before an interruption are stale.
+        epoch = self._sink_queue.epoch
+        await self.push_queue_metrics(self._sink_queue)
+        if epoch != self._sink_queue.epoch:
+            return
 
-    async def _sink_task_handler(self):
-        # Audio accumlation buffer
-        buffer = bytearray()
-        while True:
-            try:
-                frame = await self._sink_queue.get()
-                if isinstance(frame, AudioRawFrame) and self._params.audio_out_enabled:
-                    buffer.extend(frame.audio)
-                    buffer = await self._maybe_send_audio(buffer)
-                elif isinstance(frame, ImageRawFrame) and self._params.camera_out_enabled:
-                    await self._set_camera_image(frame)
-                elif isinstance(frame, SpriteFrame) and self._params.camera_out_enabled:
-                    await self._set_camera_images(frame.images)
-                elif isinstance(frame, TransportMessageFrame):
-                    await self.send_message(frame)
-                else:
-                    await self._internal_push_frame(frame)
+        if isinstance(frame, AudioRawFrame) and self._params.audio_out_enabled:
+            await self._write_audio(frame, epoch)
+        elif isinstance(frame, ImageRawFrame) and self._params.camera_out_enabled:
+            await self._set_camera_image(frame)
+        elif isinstance(frame, SpriteFrame) and self._params.camera_out_enabled:
+            await self._set_camera_images(frame.images)
+        elif isinstance(frame, TransportMessageFrame):
+            await self.send_message(frame)
+        elif isinstance(frame, TTSStoppedFrame) and self._audio_pacer:
+            # Pauses after this are not underruns.
+            self._audio_pacer.end_stream()
+            await self._internal_push_frame(frame)
+        else:
+            await self._internal_push_frame(frame)
 
-                if isinstance(frame, EndFrame):
-                    await self.stop()
+        if isinstance(frame, EndFrame):
+            if self._bot_speaking:
+                await self._bot_stopped_speaking()
+            await self.stop()
 
-                self._sink_queue.task_done()
-            except asyncio.CancelledError:
-                break
-            except Exception as e:
-                logger.exception(f"{self} error processing sink queue: {e}")
+    async def _next_sink_frame(self) -> Frame:
+        # While the bot is speaking, wait for the next frame only until it's
+        # time to say the bot stopped speaking.
+        while self._bot_speaking:
+            stopped_time = self._last_audio_time + self._params.bot_stopped_speaking_secs
+            timeout = stopped_time - time.monotonic()
+            try:
+                return await asyncio.wait_for(self._sink_queue.get(), timeout=max(timeout, 0))
+            except asyncio.TimeoutError:
+                await self._bot_stopped_speaking()
+        return await self._sink_queue.get()
 
     #
     # Push frames task
     #
 
     def _create_push_task(self):
-        loop = self.get_event_loop()
-        self._push_queue = asyncio.Queue()
-        self._push_frame_task = loop.create_task(self._push_frame_task_handler())
+        self._push_queue = FrameQueue(
+            self._params.push_queue_params, processor=self.name, name="push")
+        self._push_worker = FrameQueueWorker(
+            self._push_queue,
+            self._push_frame_task_handler,
+            name=f"{self} push",
+            loop=self.get_event_loop())
+        self._push_worker.start()
 
     async def _internal_push_frame(
             self,
@@ -199,13 +276,10 @@ class BaseOutputTransport(FrameProcessor):
             direction: FrameDirection | None = FrameDirection.DOWNSTREAM):
         await self._push_queue.put((frame, direction))
 
-    async def _push_frame_task_handler(self):
-        while True:
-            try:
-                (frame, direction) = await self._push_queue.get()
-                await self.push_frame(frame, direction)
-            except asyncio.CancelledError:
-                break
+    async def _push_frame_task_handler(self, item):
+        (frame, direction) = item
+        await self.push_queue_metrics(self._push_queue)
+        await self.push_frame(frame, direction)
 
     #
     # Camera out
@@ -260,9 +334,43 @@ class BaseOutputTransport(FrameProcessor):
     async def send_audio(self, frame: AudioRawFrame):
         await self.process_frame(frame, FrameDirection.DOWNSTREAM)
 
-    async def _maybe_send_audio(self, buffer: bytearray) -> bytearray:
-        if len(buffer) >= self._audio_chunk_size:
-            await self.write_raw_audio_frames(bytes(buffer[:self._audio_chunk_size]))
-            buffer = buffer[self._audio_chunk_size:]
+    async def _write_audio(self, frame: AudioRawFrame, epoch: int):
+        # If we get interrupted (i.e. the sink queue epoch changes) we stop
+        # writing in the middle of the frame. We check before resuming the
+        # chunker, since it has been reset.
+        for chunk in self._audio_chunker.chunks(frame.audio):
+            if self._audio_pacer:
+                await self._audio_pacer.wait(self._audio_chunk_secs)
+            if epoch != self._sink_queue.epoch:
+                break
+            await self.write_raw_audio_frames(chunk)
+            if epoch != self._sink_queue.epoch:
+                break
+            await self._bot_speaking_audio_written()
+            if self._tracer:
+                metrics = self._tracer.audio_written(self)
+                if metrics:
+                    await self._handle_metrics_frame(metrics, FrameDirection.DOWNSTREAM)
+            if self._audio_pacer and self.metrics_enabled:
+                metrics = self._audio_pacer.metrics_frame()
+                if metrics:
+                    await self._handle_metrics_frame(metrics, FrameDirection.DOWNSTREAM)
+            if epoch != self._sink_queue.epoch:
+                break
+
+    async def _bot_speaking_audio_written(self):
+        now = time.monotonic()
+        self._last_audio_time = now
+        if not self._bot_speaking:
+            self._bot_speaking = True
+            await self.push_frame(BotStartedSpeakingFrame(), FrameDirection.UPSTREAM)
+
+        interval = self._params.bot_speaking_frame_interval
+        if interval is not None and now - self._last_bot_speaking_time >= interval:
+            self._last_bot_speaking_time = now
             await self.push_frame(BotSpeakingFrame(), FrameDirection.UPSTREAM)
-        return buffer
+
+    async def _bot_stopped_speaking(self):
+        self._bot_speaking = False
+        self._last_bot_speaking_time = 0.0
+        await self.push_frame(BotStoppedSpeakingFrame(), FrameDirection.UPSTREAM)
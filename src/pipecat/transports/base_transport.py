@@ -13,6 +13,7 @@ from pydantic import ConfigDict
 from pydantic.main import BaseModel
 
 from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.utils.frame_queue import FrameQueueParams
 from pipecat.vad.vad_analyzer import VADAnalyzer
 
 from loguru import logger
@@ -31,12 +32,24 @@ class TransportParams(BaseModel):
     audio_out_enabled: bool = False
     audio_out_sample_rate: int = 16000
     audio_out_channels: int = 1
+    audio_out_paced: bool = True
+    audio_out_lead_secs: float = 0.08
+    # How often BotSpeakingFrame is pushed while the bot is speaking (None to
+    # only push BotStartedSpeakingFrame and BotStoppedSpeakingFrame).
+    bot_speaking_frame_interval: float | None = 0.2
+    # The bot is considered to have stopped speaking if no audio has been
+    # written for this long. This avoids stopping and starting between TTS
+    # sentences.
+    bot_stopped_speaking_secs: float = 0.35
     audio_in_enabled: bool = False
     audio_in_sample_rate: int = 16000
     audio_in_channels: int = 1
     vad_enabled: bool = False
     vad_audio_passthrough: bool = False
     vad_analyzer: VADAnalyzer | None = None
+    audio_in_queue_params: FrameQueueParams = FrameQueueParams()
+    push_queue_params: FrameQueueParams = FrameQueueParams()
+    sink_queue_params: FrameQueueParams = FrameQueueParams()
 
 
 class BaseTransport(ABC):
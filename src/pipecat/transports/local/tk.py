@@ -6,8 +6,6 @@
 
 import asyncio
 
-from concurrent.futures import ThreadPoolExecutor
-
 import numpy as np
 import tkinter as tk
 
@@ -16,6 +14,7 @@ from pipecat.processors.frame_processor import FrameProcessor
 from pipecat.transports.base_input import BaseInputTransport
 from pipecat.transports.base_output import BaseOutputTransport
 from pipecat.transports.base_transport import BaseTransport, TransportParams
+from pipecat.utils.executors import AUDIO_IO_EXECUTOR, get_executor
 
 from loguru import logger
 
@@ -78,8 +77,6 @@ class TkOutputTransport(BaseOutputTransport):
     def __init__(self, tk_root: tk.Tk, py_audio: pyaudio.PyAudio, params: TransportParams):
         super().__init__(params)
 
-        self._executor = ThreadPoolExecutor(max_workers=5)
-
         self._out_stream = py_audio.open(
             format=py_audio.get_format_from_width(2),
             channels=params.audio_out_channels,
@@ -105,8 +102,10 @@ class TkOutputTransport(BaseOutputTransport):
             await asyncio.sleep(0.1)
         self._out_stream.close()
 
-    async def write_raw_audio_frames(self, frames: bytes):
-        await self.get_event_loop().run_in_executor(self._executor, self._out_stream.write, frames)
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
+        # PyAudio writes from another thread, so we need our own copy.
+        await self.get_event_loop().run_in_executor(
+            get_executor(AUDIO_IO_EXECUTOR), self._out_stream.write, bytes(frames))
 
     async def write_frame_to_camera(self, frame: ImageRawFrame):
         self.get_event_loop().call_soon(self._write_frame_to_tk, frame)
@@ -88,7 +88,7 @@ class FastAPIWebsocketOutputTransport(BaseOutputTransport):
         self._params = params
         self._audio_buffer = bytes()
 
-    async def write_raw_audio_frames(self, frames: bytes):
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
         self._audio_buffer += frames
         while len(self._audio_buffer) >= self._params.audio_frame_size:
             frame = AudioRawFrame(
@@ -10,7 +10,6 @@ import time
 
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, Mapping, Optional
-from concurrent.futures import ThreadPoolExecutor
 
 from daily import (
     CallClient,
@@ -23,7 +22,6 @@ from pydantic.main import BaseModel
 
 from pipecat.frames.frames import (
     AudioRawFrame,
-    Frame,
     ImageRawFrame,
     InterimTranscriptionFrame,
     MetricsFrame,
@@ -33,10 +31,11 @@ from pipecat.frames.frames import (
     TransportMessageFrame,
     UserImageRawFrame,
     UserImageRequestFrame)
-from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, frame_handler
 from pipecat.transports.base_input import BaseInputTransport
 from pipecat.transports.base_output import BaseOutputTransport
 from pipecat.transports.base_transport import BaseTransport, TransportParams
+from pipecat.utils.executors import BLOCKING_SDK_EXECUTOR, get_executor
 from pipecat.vad.vad_analyzer import VADAnalyzer, VADParams
 
 from loguru import logger
@@ -52,7 +51,7 @@ except ModuleNotFoundError as e:
 VAD_RESET_PERIOD_MS = 2000
 
 
-@dataclass
+@dataclass(slots=True)
 class DailyTransportMessageFrame(TransportMessageFrame):
     participant_id: str | None = None
 
@@ -75,7 +74,7 @@ class WebRTCVADAnalyzer(VADAnalyzer):
     def voice_confidence(self, buffer) -> float:
         confidence = 0
         if len(buffer) > 0:
-            confidence = self._webrtc_vad.analyze_frames(buffer)
+            confidence = self._webrtc_vad.analyze_frames(bytes(buffer))
         return confidence
 
 
@@ -168,8 +167,6 @@ class DailyTransportClient(EventHandler):
         self._joining = False
         self._leaving = False
 
-        self._executor = ThreadPoolExecutor(max_workers=5)
-
         self._client: CallClient = CallClient(event_handler=self)
 
         self._camera: VirtualCameraDevice = Daily.create_camera_device(
@@ -227,9 +224,9 @@ class DailyTransportClient(EventHandler):
             await asyncio.sleep(0.01)
             return None
 
-    async def write_raw_audio_frames(self, frames: bytes):
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
         future = self._loop.create_future()
-        self._mic.write_frames(frames, completion=completion_callback(future))
+        self._mic.write_frames(bytes(frames), completion=completion_callback(future))
         await future
 
     async def write_frame_to_camera(self, frame: ImageRawFrame):
@@ -368,7 +365,7 @@ class DailyTransportClient(EventHandler):
         return await asyncio.wait_for(future, timeout=10)
 
     async def cleanup(self):
-        await self._loop.run_in_executor(self._executor, self._cleanup)
+        await self._loop.run_in_executor(get_executor(BLOCKING_SDK_EXECUTOR), self._cleanup)
 
     def _cleanup(self):
         if self._client:
@@ -549,11 +546,13 @@ class DailyInputTransport(BaseInputTransport):
     # FrameProcessor
     #
 
-    async def process_frame(self, frame: Frame, direction: FrameDirection):
-        await super().process_frame(frame, direction)
-
-        if isinstance(frame, UserImageRequestFrame):
-            self.request_participant_image(frame.user_id)
+    @frame_handler(UserImageRequestFrame)
+    async def _handle_user_image_request_frame(
+            self,
+            frame: UserImageRequestFrame,
+            direction: FrameDirection):
+        await self._internal_push_frame(frame, direction)
+        self.request_participant_image(frame.user_id)
 
     #
     # Frames
@@ -664,11 +663,19 @@ class DailyOutputTransport(BaseOutputTransport):
             "metrics": {
                 "ttfb": frame.ttfb or [],
                 "processing": frame.processing or [],
+                "queues": frame.queues or [],
+                "latency": frame.latency or [],
+                "loop_health": frame.loop_health or [],
+                "executors": frame.executors or [],
+                "playout": frame.playout or [],
+                "first_audio": frame.first_audio or [],
+                "tts_cache": frame.tts_cache or [],
+                "startup": frame.startup or [],
             },
         })
         await self._client.send_message(message)
 
-    async def write_raw_audio_frames(self, frames: bytes):
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
         await self._client.write_raw_audio_frames(frames)
 
     async def write_frame_to_camera(self, frame: ImageRawFrame):
@@ -5,8 +5,14 @@
 #
 
 import audioop
+import functools
+import math
 import numpy as np
-import pyloudnorm as pyln
+
+from enum import Enum
+from typing import Iterator, Tuple
+
+from scipy.signal import lfilter
 
 
 def normalize_value(value, min_value, max_value):
@@ -15,19 +21,185 @@ def normalize_value(value, min_value, max_value):
     return normalized_clamped
 
 
-def calculate_audio_volume(audio: bytes, sample_rate: int) -> float:
-    audio_np = np.frombuffer(audio, dtype=np.int16)
-    audio_float = audio_np.astype(np.float64)
-
-    block_size = audio_np.size / sample_rate
-    meter = pyln.Meter(sample_rate, block_size=block_size)
-    loudness = meter.integrated_loudness(audio_float)
+class VolumeMode(str, Enum):
+    # K-weighted loudness (ITU-R BS.1770), the same measure pyloudnorm uses.
+    LOUDNESS = "loudness"
+    # Unweighted RMS level (i.e. dBFS), cheaper but it gives more weight to low
+    # frequency noise.
+    RMS = "rms"
+
+
+@functools.lru_cache(maxsize=None)
+def k_weighting_filters(sample_rate: int) -> Tuple[Tuple[np.ndarray, np.ndarray], ...]:
+    """Returns the K-weighting filter (ITU-R BS.1770 high shelf followed by a
+    high pass) for the given sample rate as a list of float32 biquad `(b, a)`
+    coefficients. The result is cached and shared, so it should not be
+    modified.
+
+    """
+    def biquad(filter_type: str, G: float, Q: float, fc: float):
+        A = 10 ** (G / 40.0)
+        w0 = 2.0 * math.pi * (fc / sample_rate)
+        alpha = math.sin(w0) / (2.0 * Q)
+        cos_w0 = math.cos(w0)
+        if filter_type == "high_shelf":
+            b0 = A * ((A + 1) + (A - 1) * cos_w0 + 2 * math.sqrt(A) * alpha)
+            b1 = -2 * A * ((A - 1) + (A + 1) * cos_w0)
+            b2 = A * ((A + 1) + (A - 1) * cos_w0 - 2 * math.sqrt(A) * alpha)
+            a0 = (A + 1) - (A - 1) * cos_w0 + 2 * math.sqrt(A) * alpha
+            a1 = 2 * ((A - 1) - (A + 1) * cos_w0)
+            a2 = (A + 1) - (A - 1) * cos_w0 - 2 * math.sqrt(A) * alpha
+        else:
+            b0 = (1 + cos_w0) / 2
+            b1 = -(1 + cos_w0)
+            b2 = (1 + cos_w0) / 2
+            a0 = 1 + alpha
+            a1 = -2 * cos_w0
+            a2 = 1 - alpha
+        return (np.array([b0 / a0, b1 / a0, b2 / a0], dtype=np.float32),
+                np.array([1.0, a1 / a0, a2 / a0], dtype=np.float32))
+
+    return (
+        biquad("high_shelf", G=4.0, Q=1 / math.sqrt(2.0), fc=1500.0),
+        biquad("high_pass", G=0.0, Q=0.5, fc=38.0),
+    )
+
+
+def _normalized_loudness(samples: np.ndarray) -> float:
+    mean_square = float(np.dot(samples, samples)) / samples.size
+    if mean_square <= 0:
+        return 0.0
+
+    loudness = -0.691 + 10 * math.log10(mean_square)
+
+    # Absolute gating (same as pyloudnorm).
+    if loudness < -70:
+        return 0.0
 
     # Loudness goes from -20 to 80 (more or less), where -20 is quiet and 80 is
     # loud.
-    loudness = normalize_value(loudness, -20, 80)
+    return normalize_value(loudness, -20, 80)
+
 
-    return loudness
+def calculate_audio_volume(audio: bytes, sample_rate: int) -> float:
+    """Returns the loudness of the given audio normalized between 0 and 1. The
+    audio is analyzed on its own, use `AudioVolumeEstimator` to measure the
+    volume of a stream.
+
+    """
+    samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32)
+    if samples.size == 0:
+        return 0.0
+    for (b, a) in k_weighting_filters(sample_rate):
+        samples = lfilter(b, a, samples)
+    return _normalized_loudness(samples)
+
+
+class AudioVolumeEstimator:
+    """Calculates the volume (normalized between 0 and 1) of consecutive chunks
+    of a 16-bit audio stream. The K-weighting filter state is kept between
+    chunks, so the filter doesn't need to settle at the beginning of each chunk
+    (as happens with `calculate_audio_volume()`).
+
+    """
+
+    def __init__(self, sample_rate: int, mode: VolumeMode = VolumeMode.LOUDNESS):
+        self._sample_rate = sample_rate
+        self._mode = mode
+        self._filters = k_weighting_filters(sample_rate)
+        self._zi = np.zeros((len(self._filters), 2), dtype=np.float32)
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def mode(self) -> VolumeMode:
+        return self._mode
+
+    def volume(self, audio) -> float:
+        samples = np.frombuffer(audio, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return 0.0
+        if self._mode == VolumeMode.LOUDNESS:
+            # We filter each biquad separately (instead of using a single
+            # higher order filter) for numerical stability in float32.
+            for (i, (b, a)) in enumerate(self._filters):
+                (samples, self._zi[i]) = lfilter(b, a, samples, zi=self._zi[i])
+            # During silence the filter state decays towards denormal numbers,
+            # which are very slow to operate with. Anything this small doesn't
+            # matter with 16-bit samples anyway.
+            self._zi[np.abs(self._zi) < 1e-6] = 0
+        return _normalized_loudness(samples)
+
+    def reset(self):
+        self._zi.fill(0)
+
+
+class AudioChunker:
+    """Splits consecutive pieces of an audio stream into chunks of
+    `chunk_size` bytes without copying them. Chunks are memoryview slices of
+    the given audio, except for chunks that span two pieces: those bytes are
+    copied into a small preallocated ring of chunk buffers. Bytes that don't
+    fill a chunk are kept until the next piece (or until `reset()`).
+
+    Chunks are only valid until the next call to `chunks()`, so they need to be
+    copied if they are kept.
+
+    """
+
+    def __init__(self, chunk_size: int, num_buffers: int = 2):
+        self._chunk_size = chunk_size
+        self._buffers = [bytearray(chunk_size) for _ in range(num_buffers)]
+        self._buffer_index = 0
+        self._buffered = 0
+        self._bytes_copied = 0
+
+    @property
+    def chunk_size(self) -> int:
+        return self._chunk_size
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes waiting for the next piece to fill a chunk."""
+        return self._buffered
+
+    @property
+    def bytes_copied(self) -> int:
+        return self._bytes_copied
+
+    def chunks(self, audio) -> Iterator[memoryview]:
+        view = memoryview(audio).cast("B")
+        size = len(view)
+        chunk_size = self._chunk_size
+        offset = 0
+
+        # Complete the chunk that was left from the previous piece.
+        if self._buffered:
+            buffer = self._buffers[self._buffer_index]
+            offset = min(chunk_size - self._buffered, size)
+            buffer[self._buffered:self._buffered + offset] = view[:offset]
+            self._buffered += offset
+            self._bytes_copied += offset
+            if self._buffered < chunk_size:
+                return
+            self._buffered = 0
+            self._buffer_index = (self._buffer_index + 1) % len(self._buffers)
+            yield memoryview(buffer)
+
+        end = offset + (size - offset) // chunk_size * chunk_size
+        for i in range(offset, end, chunk_size):
+            yield view[i:i + chunk_size]
+
+        # Keep what's left for the next piece.
+        if end < size:
+            buffer = self._buffers[self._buffer_index]
+            buffer[:size - end] = view[end:]
+            self._buffered = size - end
+            self._bytes_copied += size - end
+
+    def reset(self):
+        self._buffered = 0
 
 
 def exp_smoothing(value: float, prev_value: float, factor: float) -> float:
@@ -0,0 +1,160 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+
+from typing import Any, Mapping
+
+from pipecat.frames.frames import MetricsFrame
+
+
+class AudioPacer:
+    """Paces audio writes with the monotonic clock so audio is never written
+    more than `lead` seconds ahead of real time. This keeps what the receiving
+    end has buffered (and can't be recalled if we get interrupted) bounded,
+    even if writing audio doesn't block (e.g. websockets). If writes already
+    block (e.g. audio devices) the pacer has no effect.
+
+    The pacer also keeps track of:
+
+    - jitter: how late chunks are written with respect to the time they were
+      scheduled (e.g. because the event loop is busy).
+    - underruns: how many times (and for how long) the receiving end ran out
+      of audio in the middle of a stream, because audio was not written in
+      time. A stream ends with `end_stream()`, so pauses between streams are
+      not underruns.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            lead: float = 0.08,
+            underrun_threshold: float = 0.02,
+            processor: str = "",
+            report_interval: float = 1.0):
+        self._lead = lead
+        self._underrun_threshold = underrun_threshold
+        self._processor = processor
+        self._report_interval = report_interval
+
+        # Current stream (`_start_time` is None if there's no stream).
+        self._start_time: float | None = None
+        self._written = 0.0
+        self._waiter: asyncio.Future | None = None
+
+        # Metrics
+        self._chunks = 0
+        self._underruns = 0
+        self._underrun_time = 0.0
+        self._paced_chunks = 0
+        self._total_jitter = 0.0
+        self._max_jitter = 0.0
+        self._metrics_changed = False
+        self._last_report_time = 0.0
+
+    @property
+    def lead(self) -> float:
+        return self._lead
+
+    @property
+    def underruns(self) -> int:
+        return self._underruns
+
+    def buffered(self) -> float:
+        """Seconds of audio written that have not been played yet (assuming
+        the receiving end plays audio in real time)."""
+        if self._start_time is None:
+            return 0.0
+        return max(0.0, self._start_time + self._written - time.monotonic())
+
+    async def wait(self, duration: float):
+        """Waits until a chunk of `duration` seconds can be written."""
+        now = time.monotonic()
+        if self._start_time is None:
+            self._start_time = now
+            self._written = 0.0
+        else:
+            # When the audio we wrote should finish playing.
+            playout_end = self._start_time + self._written
+            if now > playout_end:
+                gap = now - playout_end
+                if gap > self._underrun_threshold:
+                    self._underruns += 1
+                    self._underrun_time += gap
+                # We can't recover the time we lost, start counting again.
+                self._start_time = now
+                self._written = 0.0
+            else:
+                scheduled_time = playout_end - self._lead
+                if now < scheduled_time:
+                    await self._sleep(scheduled_time - now)
+                    if self._start_time is None:
+                        # The stream ended while we were waiting.
+                        return
+                    jitter = max(0.0, time.monotonic() - scheduled_time)
+                    self._paced_chunks += 1
+                    self._total_jitter += jitter
+                    self._max_jitter = max(self._max_jitter, jitter)
+
+        self._written += duration
+        self._chunks += 1
+        self._metrics_changed = True
+
+    def end_stream(self):
+        """Indicates there's no more audio in the current stream (e.g. the bot
+        stopped speaking or was interrupted). If someone is waiting to write,
+        it's woken up right away.
+
+        """
+        self._start_time = None
+        self._written = 0.0
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def _sleep(self, delay: float):
+        # Like asyncio.sleep() but it can be woken up by `end_stream()`.
+        loop = asyncio.get_running_loop()
+        self._waiter = loop.create_future()
+        handle = loop.call_later(delay, self._wake_up, self._waiter)
+        try:
+            await self._waiter
+        finally:
+            handle.cancel()
+            self._waiter = None
+
+    def _wake_up(self, waiter: asyncio.Future):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    def metrics(self) -> Mapping[str, Any]:
+        return {
+            "processor": self._processor,
+            "lead": self._lead,
+            "chunks": self._chunks,
+            "underruns": self._underruns,
+            "underrun_time": self._underrun_time,
+            "avg_jitter": self._total_jitter / self._paced_chunks if self._paced_chunks else 0.0,
+            "max_jitter": self._max_jitter,
+        }
+
+    def metrics_frame(self) -> MetricsFrame | None:
+        """Returns a MetricsFrame with the pacing metrics if they changed since
+        the last report (and at most once every `report_interval` seconds),
+        otherwise None.
+
+        """
+        if not self._metrics_changed:
+            return None
+
+        now = time.monotonic()
+        if now - self._last_report_time < self._report_interval:
+            return None
+
+        self._metrics_changed = False
+        self._last_report_time = now
+        return MetricsFrame(playout=[self.metrics()])
@@ -0,0 +1,179 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import os
+import threading
+import time
+
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping
+
+from loguru import logger
+
+#
+# Process-wide executors shared by all the sessions in the process, instead of
+# a thread pool per component. Each pool is created (with a bounded number of
+# threads) the first time it's used.
+#
+
+# VAD analysis (CPU bound).
+VAD_EXECUTOR = "vad"
+# Blocking audio device reads and writes (e.g. PyAudio).
+AUDIO_IO_EXECUTOR = "audio-io"
+# Audio/video encoding and decoding (CPU bound).
+CODEC_EXECUTOR = "codec"
+# Blocking calls to third-party SDKs (e.g. leaving a Daily call).
+BLOCKING_SDK_EXECUTOR = "blocking-sdk"
+# Blocking file writes (e.g. the TTS cache disk tier).
+DISK_IO_EXECUTOR = "disk-io"
+
+_CPU_COUNT = os.cpu_count() or 1
+
+_MAX_WORKERS: Dict[str, int] = {
+    VAD_EXECUTOR: _CPU_COUNT,
+    AUDIO_IO_EXECUTOR: 16,
+    CODEC_EXECUTOR: _CPU_COUNT,
+    BLOCKING_SDK_EXECUTOR: 32,
+    DISK_IO_EXECUTOR: 4,
+}
+
+
+class ExecutorPool(Executor):
+    """A named, bounded thread pool that keeps track of its queue depth (work
+    submitted but not started yet) and how long work waits in the queue before
+    it starts. See `metrics()`.
+
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self._name = name
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"pipecat-{name}")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._total_wait_time = 0.0
+        self._max_wait_time = 0.0
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    def submit(self, fn: Callable, /, *args, **kwargs) -> Future:
+        with self._lock:
+            self._queued += 1
+        return self._executor.submit(self._run, time.monotonic(), fn, args, kwargs)
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False):
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def metrics(self) -> Mapping[str, Any]:
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                "executor": self._name,
+                "max_workers": self._max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "avg_wait_time": self._total_wait_time / started if started else 0.0,
+                "max_wait_time": self._max_wait_time,
+            }
+
+    def _run(self, submit_time: float, fn: Callable, args, kwargs):
+        wait_time = time.monotonic() - submit_time
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._total_wait_time += wait_time
+            self._max_wait_time = max(self._max_wait_time, wait_time)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    def __str__(self):
+        return self._name
+
+
+_EXECUTORS: Dict[str, ExecutorPool] = {}
+_EXECUTORS_LOCK = threading.Lock()
+_NUM_USERS = 0
+
+
+def configure_executor(name: str, max_workers: int):
+    """Sets the maximum number of threads of the given pool. This only has an
+    effect if the pool has not been created yet.
+
+    """
+    with _EXECUTORS_LOCK:
+        if name in _EXECUTORS:
+            logger.warning(f"Executor {name} already created, max_workers not changed")
+        _MAX_WORKERS[name] = max_workers
+
+
+def get_executor(name: str) -> ExecutorPool:
+    """Returns the process-wide executor with the given name (e.g.
+    `VAD_EXECUTOR`), creating it if needed.
+
+    """
+    executor = _EXECUTORS.get(name)
+    if executor:
+        return executor
+    with _EXECUTORS_LOCK:
+        executor = _EXECUTORS.get(name)
+        if not executor:
+            max_workers = _MAX_WORKERS.get(name, _CPU_COUNT)
+            logger.debug(f"Creating executor {name} ({max_workers} threads)")
+            executor = ExecutorPool(name, max_workers)
+            _EXECUTORS[name] = executor
+        return executor
+
+
+def executor_metrics() -> List[Mapping[str, Any]]:
+    return [executor.metrics() for executor in list(_EXECUTORS.values())]
+
+
+def shutdown_executors(wait: bool = True):
+    """Shuts down all the executors. They will be created again if they are
+    used after this.
+
+    """
+    with _EXECUTORS_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+    for executor in executors:
+        logger.debug(f"Shutting down executor {executor}")
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def acquire_executors():
+    """Registers a user (e.g. a `PipelineRunner`) of the executors. Executors
+    are shut down when the last user calls `release_executors()`.
+
+    """
+    global _NUM_USERS
+    with _EXECUTORS_LOCK:
+        _NUM_USERS += 1
+
+
+def release_executors() -> bool:
+    """Unregisters a user of the executors and returns True if the executors
+    need to be shut down (i.e. there are no users left).
+
+    """
+    global _NUM_USERS
+    with _EXECUTORS_LOCK:
+        _NUM_USERS = max(0, _NUM_USERS - 1)
+        return _NUM_USERS == 0
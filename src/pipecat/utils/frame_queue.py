@@ -0,0 +1,228 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import collections
+import time
+
+from enum import Enum
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+from pipecat.frames.frames import EndFrame, Frame, MetricsFrame, SystemFrame
+
+
+class OverflowPolicy(str, Enum):
+    # Wait until there's space in the queue (backpressure).
+    BLOCK = "block"
+    # Drop the oldest queued frame of the same type (e.g. old audio).
+    DROP_OLDEST = "drop_oldest"
+    # Drop the frame being queued.
+    DROP_NEWEST = "drop_newest"
+    # Replace the most recent queued frame of the same type with the new one.
+    COALESCE = "coalesce"
+
+
+class FrameQueueParams(BaseModel):
+    """Bounds and overflow policies of a frame queue. A `max_size` of 0 means
+    the queue is unbounded. Policies are looked up through the frame's MRO
+    (e.g. `{AudioRawFrame: OverflowPolicy.DROP_OLDEST}`), frames without a
+    policy use `default_policy`.
+
+    """
+    max_size: int = 0
+    default_policy: OverflowPolicy = OverflowPolicy.BLOCK
+    policies: Dict[Type[Frame], OverflowPolicy] = {}
+
+
+class FrameQueue(asyncio.Queue):
+    """An asyncio.Queue of frames (or tuples whose first element is a frame)
+    that applies the overflow policies in `FrameQueueParams` when it's full. It
+    also keeps drop and high-watermark counters that can be reported with a
+    MetricsFrame.
+
+    System frames, EndFrames and None items are always queued, even if the
+    queue is full, since they are needed to stop or interrupt the pipeline.
+
+    The queue also has an epoch (a generation counter) that is incremented every
+    time the queue is cleared. Whoever is processing an item can check if the
+    epoch changed to know the item is stale (e.g. there was an interruption).
+
+    """
+
+    def __init__(
+            self,
+            params: FrameQueueParams = FrameQueueParams(),
+            *,
+            processor: str = "",
+            name: str = "",
+            report_interval: float = 1.0):
+        # The base queue is unbounded, we do the bounding ourselves so we can
+        # let some frames through.
+        super().__init__()
+        self._max_size = params.max_size
+        self._default_policy = params.default_policy
+        self._policies = params.policies
+        self._policies_cache: Dict[type, tuple] = {}
+        self._processor = processor
+        self._name = name
+        self._report_interval = report_interval
+        self._space_available = asyncio.Event()
+        self._epoch = 0
+
+        # Metrics
+        self._high_watermark = 0
+        self._dropped = 0
+        self._coalesced = 0
+        self._metrics_changed = False
+        self._last_report_time = 0.0
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    @property
+    def high_watermark(self) -> int:
+        return self._high_watermark
+
+    @property
+    def dropped(self) -> int:
+        return self._dropped
+
+    @property
+    def coalesced(self) -> int:
+        return self._coalesced
+
+    def is_over_limit(self) -> bool:
+        return self._max_size > 0 and self.qsize() >= self._max_size
+
+    async def put(self, item: Any):
+        if self.is_over_limit():
+            frame = self._item_frame(item)
+            if frame is not None and not self._always_queued(frame):
+                (frame_type, policy) = self._resolve_policy(type(frame))
+                if policy == OverflowPolicy.DROP_NEWEST:
+                    self._add_dropped()
+                    return
+                elif policy == OverflowPolicy.DROP_OLDEST:
+                    index = self._find_item(frame_type, reverse=False)
+                    if index is not None:
+                        del self._queue[index]
+                        self._add_dropped()
+                        # The dropped item will never be processed.
+                        self.task_done()
+                elif policy == OverflowPolicy.COALESCE:
+                    index = self._find_item(frame_type, reverse=True)
+                    if index is not None:
+                        self._queue[index] = item
+                        self._coalesced += 1
+                        self._metrics_changed = True
+                        return
+
+                # BLOCK, or nothing to drop or coalesce with.
+                epoch = self._epoch
+                while self.is_over_limit():
+                    self._space_available.clear()
+                    await self._space_available.wait()
+                    # The queue was cleared while we were waiting, so this
+                    # frame is stale.
+                    if self._epoch != epoch:
+                        return
+
+        self.put_nowait(item)
+
+    def clear(self):
+        """Removes all the queued items in O(1), starts a new epoch and wakes up
+        anyone waiting to queue frames (their frames are discarded). This is
+        used on interruptions.
+
+        """
+        self._epoch += 1
+        dropped = len(self._queue)
+        if dropped:
+            self._queue = collections.deque()
+            self._unfinished_tasks -= dropped
+            if self._unfinished_tasks == 0:
+                self._finished.set()
+        self._space_available.set()
+
+    def metrics_frame(self) -> MetricsFrame | None:
+        """Returns a MetricsFrame with the queue counters if they changed since
+        the last report (and at most once every `report_interval` seconds),
+        otherwise None.
+
+        """
+        if not self._metrics_changed:
+            return None
+
+        now = time.monotonic()
+        if now - self._last_report_time < self._report_interval:
+            return None
+
+        self._metrics_changed = False
+        self._last_report_time = now
+        queue = {
+            "processor": self._processor,
+            "queue": self._name,
+            "max_size": self._max_size,
+            "high_watermark": self._high_watermark,
+            "dropped": self._dropped,
+            "coalesced": self._coalesced,
+        }
+        return MetricsFrame(queues=[queue])
+
+    #
+    # asyncio.Queue
+    #
+
+    def _put(self, item):
+        super()._put(item)
+        size = len(self._queue)
+        if size > self._high_watermark:
+            self._high_watermark = size
+            self._metrics_changed = True
+
+    def _get(self):
+        item = super()._get()
+        if not self.is_over_limit():
+            self._space_available.set()
+        return item
+
+    #
+    # Internal
+    #
+
+    def _item_frame(self, item: Any) -> Frame | None:
+        return item[0] if isinstance(item, tuple) else item
+
+    def _always_queued(self, frame: Frame) -> bool:
+        return isinstance(frame, (SystemFrame, EndFrame))
+
+    def _resolve_policy(self, frame_type: type) -> tuple:
+        try:
+            return self._policies_cache[frame_type]
+        except KeyError:
+            pass
+        result = (frame_type, self._default_policy)
+        for t in frame_type.__mro__:
+            policy = self._policies.get(t)
+            if policy:
+                result = (t, policy)
+                break
+        self._policies_cache[frame_type] = result
+        return result
+
+    def _find_item(self, frame_type: type, reverse: bool) -> int | None:
+        indexes = range(len(self._queue))
+        for i in (reversed(indexes) if reverse else indexes):
+            if isinstance(self._item_frame(self._queue[i]), frame_type):
+                return i
+        return None
+
+    def _add_dropped(self):
+        self._dropped += 1
+        self._metrics_changed = True
@@ -0,0 +1,119 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+
+from typing import Any, Awaitable, Callable
+
+from pipecat.utils.frame_queue import FrameQueue
+
+from loguru import logger
+
+
+class FrameQueueWorker:
+    """A long-lived task that takes items from a `FrameQueue` and processes
+    them, one at a time, with `handler`.
+
+    Interruptions don't tear the task down. `interrupt()` discards the queued
+    items in O(1) (see `FrameQueue.clear()`) and, if the worker is in the
+    middle of an item, only that item is cancelled. If `cancel_on_interrupt` is
+    False the current item is not cancelled, the handler is expected to check
+    `FrameQueue.epoch` and stop by itself (e.g. between audio chunks).
+
+    """
+
+    def __init__(
+            self,
+            queue: FrameQueue,
+            handler: Callable[[Any], Awaitable[None]],
+            *,
+            get: Callable[[], Awaitable[Any]] | None = None,
+            cancel_on_interrupt: bool = True,
+            name: str = "",
+            loop: asyncio.AbstractEventLoop | None = None):
+        self._queue = queue
+        self._handler = handler
+        self._get = get or queue.get
+        self._cancel_on_interrupt = cancel_on_interrupt
+        self._name = name
+        self._loop = loop or asyncio.get_running_loop()
+        self._task: asyncio.Task | None = None
+        self._busy = False
+        self._stopping = False
+        # Set while we wait for the worker to cancel the current item.
+        self._interrupted: asyncio.Future | None = None
+        self._interruptions = 0
+
+    @property
+    def queue(self) -> FrameQueue:
+        return self._queue
+
+    @property
+    def busy(self) -> bool:
+        return self._busy
+
+    @property
+    def interruptions(self) -> int:
+        return self._interruptions
+
+    def start(self):
+        if not self._task:
+            self._stopping = False
+            self._task = self._loop.create_task(self._worker_task_handler())
+
+    async def stop(self):
+        if self._task:
+            self._stopping = True
+            self._task.cancel()
+            await self._task
+            self._task = None
+
+    async def interrupt(self):
+        """Discards the queued items and cancels the item being processed (if
+        `cancel_on_interrupt`). When this returns nothing queued before the
+        interruption will be processed any more, except for the current item
+        if it's not cancelled.
+
+        """
+        self._interruptions += 1
+        self._queue.clear()
+        # We can't wait for ourselves (e.g. if the handler interrupts us).
+        if asyncio.current_task() is self._task:
+            return
+        if self._cancel_on_interrupt and self._busy and self._task and not self._interrupted:
+            self._interrupted = self._loop.create_future()
+            self._task.cancel()
+            await self._interrupted
+
+    async def _worker_task_handler(self):
+        while True:
+            got_item = False
+            try:
+                item = await self._get()
+                got_item = True
+                self._busy = True
+                await self._handler(item)
+            except asyncio.CancelledError:
+                if self._stopping or not self._interrupted:
+                    break
+                # Only the current item was cancelled, keep going.
+            except Exception as e:
+                logger.exception(f"{self._name} error processing queue: {e}")
+            finally:
+                self._busy = False
+                if got_item:
+                    self._queue.task_done()
+                if self._interrupted:
+                    self._interrupt_done()
+
+    def _interrupt_done(self):
+        # The cancellation was for the current item only, not for the task.
+        uncancel = getattr(self._task, "uncancel", None)
+        if uncancel:
+            uncancel()
+        if not self._interrupted.done():
+            self._interrupted.set_result(None)
+        self._interrupted = None
@@ -0,0 +1,186 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+
+from collections import Counter, deque
+from typing import Any, Dict, List, Mapping, Tuple
+
+from pipecat.utils.loop_lag import LoopLagMonitor
+
+from loguru import logger
+
+#
+# Slow callbacks are detected by timing every callback run by the event loop.
+# To do this we wrap asyncio.Handle._run() (only while there are monitors
+# running). This works with the default asyncio event loop but not with other
+# implementations (e.g. uvloop). Every callback goes through all the monitors
+# of its loop, so tasks and runners share monitors (see
+# `acquire_loop_health_monitor()`) instead of installing one each.
+#
+
+_ORIGINAL_HANDLE_RUN = asyncio.events.Handle._run
+_MONITORS: Dict[asyncio.AbstractEventLoop, List["LoopHealthMonitor"]] = {}
+
+
+def _timed_handle_run(handle: asyncio.events.Handle):
+    start_time = time.perf_counter()
+    _ORIGINAL_HANDLE_RUN(handle)
+    duration = time.perf_counter() - start_time
+    monitors = _MONITORS.get(handle._loop)
+    if monitors:
+        owner = None
+        for monitor in monitors:
+            if duration >= monitor.slow_callback_threshold:
+                if owner is None:
+                    owner = _callback_owner(handle)
+                    logger.warning(
+                        f"Slow callback in {owner} blocked the event loop for {duration:.3f}s")
+                monitor._add_slow_callback(owner, duration)
+
+
+def _add_monitor(monitor: "LoopHealthMonitor", loop: asyncio.AbstractEventLoop):
+    _MONITORS.setdefault(loop, []).append(monitor)
+    asyncio.events.Handle._run = _timed_handle_run
+
+
+def _remove_monitor(monitor: "LoopHealthMonitor", loop: asyncio.AbstractEventLoop):
+    monitors = _MONITORS.get(loop, [])
+    if monitor in monitors:
+        monitors.remove(monitor)
+    if not monitors:
+        _MONITORS.pop(loop, None)
+    if not _MONITORS:
+        asyncio.events.Handle._run = _ORIGINAL_HANDLE_RUN
+
+
+def task_owner(task: asyncio.Task) -> str:
+    """Returns the name of the object that created the given task (e.g. the
+    frame processor that runs the task handler), or the coroutine name if it's
+    not a method.
+
+    """
+    coro = task.get_coro()
+    frame = getattr(coro, "cr_frame", None)
+    if frame:
+        owner = frame.f_locals.get("self")
+        if owner is not None:
+            return getattr(owner, "name", None) or owner.__class__.__name__
+    return getattr(coro, "__qualname__", None) or task.get_name()
+
+
+def _callback_owner(handle: asyncio.events.Handle) -> str:
+    callback = handle._callback
+    target = getattr(callback, "__self__", None)
+    if isinstance(target, asyncio.Task):
+        return task_owner(target)
+    if target is not None:
+        return getattr(target, "name", None) or target.__class__.__name__
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class LoopHealthMonitor:
+    """Monitors the health of an event loop: scheduling lag, callbacks that
+    take more than `slow_callback_threshold` seconds (together with the frame
+    processor, or object, that owns them) and the number of live tasks per
+    processor. Use `snapshot()` to get the current state. Slow callbacks are
+    not tracked if `slow_callback_threshold` is None.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            slow_callback_threshold: float | None = 0.05,
+            max_slow_callbacks: int = 100,
+            lag_interval: float = 0.1,
+            loop: asyncio.AbstractEventLoop | None = None):
+        self._loop = loop or asyncio.get_running_loop()
+        self.slow_callback_threshold = slow_callback_threshold
+        self._lag_monitor = LoopLagMonitor(interval=lag_interval, loop=self._loop)
+        self._slow_callbacks: deque = deque(maxlen=max_slow_callbacks)
+        self._slow_callback_counts: Counter = Counter()
+        self._running = False
+
+    @property
+    def lag(self) -> float:
+        return self._lag_monitor.lag
+
+    @property
+    def max_lag(self) -> float:
+        return self._lag_monitor.max_lag
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        if not self._running:
+            self._running = True
+            self._lag_monitor.start()
+            if self.slow_callback_threshold is not None:
+                _add_monitor(self, self._loop)
+
+    async def stop(self):
+        if self._running:
+            self._running = False
+            _remove_monitor(self, self._loop)
+            await self._lag_monitor.stop()
+
+    def tasks_per_owner(self) -> Mapping[str, int]:
+        return dict(Counter(task_owner(t) for t in asyncio.all_tasks(self._loop)))
+
+    def snapshot(self) -> Mapping[str, Any]:
+        tasks = self.tasks_per_owner()
+        return {
+            "loop_lag": self.lag,
+            "max_loop_lag": self.max_lag,
+            "num_tasks": sum(tasks.values()),
+            "tasks": tasks,
+            "slow_callbacks": list(self._slow_callbacks),
+            "slow_callback_counts": dict(self._slow_callback_counts),
+        }
+
+    def _add_slow_callback(self, owner: str, duration: float):
+        self._slow_callbacks.append({"owner": owner, "duration": duration, "time": time.time()})
+        self._slow_callback_counts[owner] += 1
+
+
+# (loop, slow callback threshold) -> [monitor, number of users]
+_SHARED_MONITORS: Dict[Tuple[asyncio.AbstractEventLoop, float | None], List] = {}
+
+
+def acquire_loop_health_monitor(
+        *,
+        slow_callback_threshold: float | None = 0.05,
+        loop: asyncio.AbstractEventLoop | None = None) -> LoopHealthMonitor:
+    """Returns a running monitor shared by everyone that uses the same event
+    loop and `slow_callback_threshold`. It's stopped when all of them have
+    called `release_loop_health_monitor()`.
+
+    """
+    loop = loop or asyncio.get_running_loop()
+    key = (loop, slow_callback_threshold)
+    shared = _SHARED_MONITORS.get(key)
+    if shared:
+        shared[1] += 1
+    else:
+        monitor = LoopHealthMonitor(slow_callback_threshold=slow_callback_threshold, loop=loop)
+        monitor.start()
+        shared = _SHARED_MONITORS[key] = [monitor, 1]
+    return shared[0]
+
+
+async def release_loop_health_monitor(monitor: LoopHealthMonitor):
+    key = (monitor._loop, monitor.slow_callback_threshold)
+    shared = _SHARED_MONITORS.get(key)
+    if not shared or shared[0] is not monitor:
+        return
+    shared[1] -= 1
+    if shared[1] == 0:
+        del _SHARED_MONITORS[key]
+        await monitor.stop()
@@ -0,0 +1,71 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+
+from pipecat.utils.utils import exp_smoothing
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a callback scheduled every
+    `interval` seconds. If a session blocks the loop (or there are too many
+    sessions in it) this lag grows for every session in the process.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            interval: float = 0.1,
+            smoothing_factor: float = 0.2,
+            loop: asyncio.AbstractEventLoop | None = None):
+        self._interval = interval
+        self._smoothing_factor = smoothing_factor
+        self._loop = loop or asyncio.get_running_loop()
+        self._lag = 0.0
+        self._max_lag = 0.0
+        self._monitor_task: asyncio.Task | None = None
+
+    @property
+    def lag(self) -> float:
+        """Exponentially smoothed lag (in seconds)."""
+        return self._lag
+
+    @property
+    def max_lag(self) -> float:
+        return self._max_lag
+
+    @property
+    def running(self) -> bool:
+        return self._monitor_task is not None
+
+    def start(self):
+        if not self._monitor_task:
+            self._monitor_task = self._loop.create_task(self._monitor_task_handler())
+
+    async def stop(self):
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                # The task was cancelled before it started.
+                pass
+            self._monitor_task = None
+
+    def reset_max_lag(self):
+        self._max_lag = 0.0
+
+    async def _monitor_task_handler(self):
+        while True:
+            try:
+                start_time = self._loop.time()
+                await asyncio.sleep(self._interval)
+                lag = max(self._loop.time() - start_time - self._interval, 0.0)
+                self._lag = exp_smoothing(lag, self._lag, self._smoothing_factor)
+                self._max_lag = max(self._max_lag, lag)
+            except asyncio.CancelledError:
+                break
@@ -0,0 +1,75 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import resource
+import sys
+import threading
+import time
+
+from typing import Any, Callable, Dict, Hashable, Mapping
+
+from loguru import logger
+
+# Models shared by all the sessions in the process, so when running multiple
+# pipelines in the same process (see `PipelineRunner`) each model is only
+# loaded once. Models might be loaded from executor threads, hence the lock.
+_MODELS: Dict[Hashable, Any] = {}
+_MODELS_STATS: Dict[Hashable, Mapping[str, float]] = {}
+_MODELS_LOCK = threading.Lock()
+
+
+def resident_memory() -> int:
+    """Returns the resident memory (RSS) of the process in bytes. On platforms
+    without /proc this is the peak resident memory instead.
+
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS.
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_shared_model(key: Hashable, loader: Callable[[], Any]) -> Any:
+    """Returns the model registered with the given key, calling `loader` to
+    load it the first time. Only share models that are safe to use from
+    multiple sessions at the same time (i.e. models without per-stream
+    state).
+
+    """
+    with _MODELS_LOCK:
+        model = _MODELS.get(key)
+        if model is None:
+            logger.debug(f"Loading shared model {key}")
+            memory = resident_memory()
+            start_time = time.perf_counter()
+            model = loader()
+            load_time = time.perf_counter() - start_time
+            memory = max(0, resident_memory() - memory)
+            _MODELS[key] = model
+            _MODELS_STATS[key] = {"load_time": load_time, "memory": memory}
+            logger.debug(f"Loaded shared model {key} in {load_time:.3f}s ({memory / 1e6:.1f} MB)")
+        return model
+
+
+def has_shared_model(key: Hashable) -> bool:
+    return key in _MODELS
+
+
+def shared_model_stats() -> Mapping[Hashable, Mapping[str, float]]:
+    """Returns the load time (in seconds) and the resident memory increase (in
+    bytes) while loading each shared model.
+
+    """
+    return dict(_MODELS_STATS)
+
+
+def clear_shared_models():
+    with _MODELS_LOCK:
+        _MODELS.clear()
+        _MODELS_STATS.clear()
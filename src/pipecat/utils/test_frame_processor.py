@@ -1,11 +1,25 @@
 from typing import List
-from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.frames.frames import Frame
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
 
 
 class TestException(Exception):
     pass
 
 
+class FrameCollector(FrameProcessor):
+    """Keeps all the frames it receives and pushes them along."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        self.frames.append(frame)
+        await self.push_frame(frame, direction)
+
+
 class TestFrameProcessor(FrameProcessor):
     def __init__(self, test_frames):
         self.test_frames = test_frames
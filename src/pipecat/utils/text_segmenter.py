@@ -0,0 +1,229 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable, List
+
+SENTENCE_TERMINATORS = ".?!"
+CLAUSE_TERMINATORS = ",;:"
+# Characters that can follow a terminator and still belong to the same
+# segment, e.g. `"Really?!"` or `(see above.)`.
+CLOSING_CHARS = "\"')]}»”’"
+OPENING_CHARS = "\"'([{«“‘"
+
+DEFAULT_ABBREVIATIONS = frozenset([
+    "Mr", "Mrs", "Ms", "Dr", "Prof", "Sr", "Jr", "St", "Mt", "Ft", "Lt",
+    "Col", "Gen", "Capt", "Sgt", "Gov", "Sen", "Rep", "Rev", "Hon",
+    "vs", "approx", "dept", "vol", "Vol",
+    "Jan", "Feb", "Mar", "Apr", "Jun", "Jul", "Aug", "Sep", "Sept", "Oct", "Nov", "Dec",
+    "e.g", "i.e", "a.m", "p.m", "U.S", "U.K",
+])
+
+# Abbreviations that are also common words, so they are only abbreviations
+# if a number follows (`No. 5` but not `No. That is wrong.`).
+DEFAULT_NUMBER_ABBREVIATIONS = frozenset(["No", "Nos", "Fig", "Figs"])
+
+# We only need the end of a word to check for abbreviations.
+MAX_WORD_LENGTH = 16
+
+
+class TextSegmenter(ABC):
+    """Splits streamed text (e.g. LLM tokens) into segments that can be sent
+    to a TTS service.
+
+    """
+
+    @abstractmethod
+    def push(self, text: str) -> List[str]:
+        """Adds text and returns the segments that are complete (if any)."""
+        pass
+
+    @abstractmethod
+    def flush(self) -> str:
+        """Returns the text that has not been returned yet (e.g. at the end of
+        an LLM response) and clears it."""
+        pass
+
+    @abstractmethod
+    def reset(self):
+        """Discards the pending text and prepares for a new response."""
+        pass
+
+
+class SentenceSegmenter(TextSegmenter):
+    """Splits text into sentences incrementally: each character is looked at
+    only once, so the cost of `push()` is proportional to the text pushed and
+    not to the length of the current sentence.
+
+    A sentence ends with `.`, `?` or `!` (optionally followed by closing quotes
+    or brackets) followed by whitespace. Waiting for the whitespace means
+    decimals (`3.5`) and dotted abbreviations (`e.g.`) are not split, and the
+    words before a `.` are checked against `abbreviations` (`Mr.`, `Dr.`) and
+    list numbers (`1. First`). Some checks also need the first character of
+    the next word, so the sentence end is confirmed a bit later:
+    `number_abbreviations` need a number (`No. 5`) and single letter initials
+    need a capitalized word (`J. R. R. Tolkien`). Initials also need to start
+    the segment or follow a lowercase word, another initial or an
+    abbreviation, so `Plan A. Plan B.` are two sentences.
+
+    If `first_clause_fast` is enabled, the first segment of each response (see
+    `reset()`) also ends at a `,`, `;` or `:` once it has
+    `first_chunk_min_words` words, or at the first word boundary after
+    `first_chunk_max_words` words. This way TTS can start before the whole
+    first sentence has been generated.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            abbreviations: Iterable[str] = DEFAULT_ABBREVIATIONS,
+            number_abbreviations: Iterable[str] = DEFAULT_NUMBER_ABBREVIATIONS,
+            first_clause_fast: bool = False,
+            first_chunk_min_words: int = 3,
+            first_chunk_max_words: int | None = 10):
+        self._abbreviations = frozenset(abbreviations)
+        self._number_abbreviations = frozenset(number_abbreviations)
+        self._first_clause_fast = first_clause_fast
+        self._first_chunk_min_words = first_chunk_min_words
+        self._first_chunk_max_words = first_chunk_max_words
+        self.reset()
+
+    @property
+    def first_clause_fast(self) -> bool:
+        return self._first_clause_fast
+
+    def push(self, text: str) -> List[str]:
+        segments = []
+        start = 0
+        for i, c in enumerate(text):
+            if c.isspace():
+                if self._pending_end and not self._continues:
+                    # The segment ends right before this whitespace.
+                    self._parts.append(text[start:i])
+                    segments.append(self._next_segment())
+                    start = i
+                elif self._word:
+                    if self._pending_end:
+                        # It depends on the next word (e.g. `No. 5`), so
+                        # remember where the segment would end.
+                        self._parts.append(text[start:i])
+                        start = i
+                        self._end_parts = len(self._parts)
+                        self._pending_end = False
+                    self._words += 1
+                    self._line_words += 1
+                    self._prev_word = self._word
+                    self._word = ""
+                    if self._first_chunk_full():
+                        self._parts.append(text[start:i])
+                        segments.append(self._next_segment())
+                        start = i
+                if c == "\n":
+                    self._line_words = 0
+                continue
+
+            if self._end_parts:
+                if not self._continues(c):
+                    self._parts.append(text[start:i])
+                    segments.append(self._next_segment(self._end_parts))
+                    start = i
+                self._end_parts = 0
+                self._continues = None
+
+            if self._pending_end:
+                if c in SENTENCE_TERMINATORS or c in CLOSING_CHARS:
+                    # E.g. `?!` or `."`, still the same segment.
+                    if c != ".":
+                        self._continues = None
+                    continue
+                # E.g. `3.5` or `e.g.`, it was not the end.
+                self._pending_end = False
+                self._continues = None
+
+            if c in SENTENCE_TERMINATORS:
+                self._pending_end = c != "." or self._is_sentence_end()
+            elif c in CLAUSE_TERMINATORS and self._first_chunk:
+                self._pending_end = self._words + 1 >= self._first_chunk_min_words
+
+            if len(self._word) < MAX_WORD_LENGTH:
+                self._word += c
+
+        if start < len(text):
+            self._parts.append(text[start:])
+        return segments
+
+    def flush(self) -> str:
+        text = "".join(self._parts)
+        self.reset()
+        return text
+
+    def reset(self):
+        self._parts: List[str] = []
+        # Current word (up to MAX_WORD_LENGTH characters) and number of
+        # complete words in the current segment and line.
+        self._word = ""
+        self._prev_word = ""
+        self._words = 0
+        self._line_words = 0
+        # Whether we have seen the end of a segment and we are waiting for
+        # whitespace to confirm it.
+        self._pending_end = False
+        # If set, the end also depends on the first character of the next
+        # word: the segment continues if it returns True. `_end_parts` is the
+        # number of parts of the segment while we wait for it.
+        self._continues: Callable[[str], bool] | None = None
+        self._end_parts = 0
+        self._first_chunk = self._first_clause_fast
+
+    def _is_sentence_end(self) -> bool:
+        word = self._word.lstrip(OPENING_CHARS)
+        if not word:
+            return True
+        if word in self._abbreviations:
+            return False
+        if word in self._number_abbreviations:
+            self._continues = str.isdigit
+            return True
+        # Initials, e.g. `J. R. R. Tolkien`.
+        if len(word) == 1 and word.isupper() and self._may_precede_initial():
+            self._continues = str.isupper
+            return True
+        # List numbers, e.g. `1. First`.
+        if word.isdigit() and self._line_words == 0:
+            return False
+        return True
+
+    def _may_precede_initial(self) -> bool:
+        if self._words == 0:
+            return True
+        word = self._prev_word.lstrip(OPENING_CHARS)
+        # E.g. `by J. Smith`, `J. R. Tolkien` or `Dr. J. Smith`.
+        return (word[:1].islower() or
+                (len(word) == 2 and word[0].isupper() and word[1] == ".") or
+                (word.endswith(".") and word[:-1] in self._abbreviations))
+
+    def _first_chunk_full(self) -> bool:
+        return (self._first_chunk and
+                self._first_chunk_max_words is not None and
+                self._words >= self._first_chunk_max_words)
+
+    def _next_segment(self, num_parts: int | None = None) -> str:
+        """Returns the segment made of the first `num_parts` parts (all of them
+        by default) and keeps the rest for the next segment.
+
+        """
+        segment = "".join(self._parts[:num_parts])
+        self._parts = self._parts[num_parts:] if num_parts is not None else []
+        self._word = ""
+        self._prev_word = ""
+        self._words = 0
+        self._line_words = 0
+        self._pending_end = False
+        self._continues = None
+        self._end_parts = 0
+        self._first_chunk = False
+        return segment
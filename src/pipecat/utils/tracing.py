@@ -0,0 +1,204 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import json
+import time
+
+from collections import deque
+from typing import Any, Dict, List, Mapping
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    Frame,
+    LLMFullResponseStartFrame,
+    MetricsFrame,
+    TTSStartedFrame,
+    TextFrame,
+    TranscriptionFrame,
+    UserStoppedSpeakingFrame)
+
+from loguru import logger
+
+
+# Stages of a turn, in order. Each stage latency is measured from the previous
+# stage that has been seen.
+TURN_STAGES = ["stt", "llm", "tts", "output"]
+
+
+class LatencyTracer:
+    """Records a monotonic timestamp every time a frame is pushed by a
+    processor and splits the voice-to-voice latency of each user turn into
+    stages:
+
+      - vad_stop: the user stopped speaking (UserStoppedSpeakingFrame), this
+        starts a new turn.
+      - stt: the last transcription before or the first one after vad_stop.
+      - llm: the first text pushed by the processor that started the LLM
+        response (LLMFullResponseStartFrame).
+      - tts: the first audio pushed by the processor that started the TTS
+        response (TTSStartedFrame).
+      - output: the first audio written by the output transport.
+
+    Frames don't carry a lineage, so the tracer only measures the latest turn:
+    a new UserStoppedSpeakingFrame replaces the current turn (which is dropped
+    if its audio was not written yet) and each push is recorded with the turn
+    that was current at the time. To avoid counting frames that are still in
+    flight from a previous turn (e.g. after a barge-in), the llm and tts
+    stages only count responses that started in the latest turn and, once a
+    TTS response has been seen, the output stage waits for the tts stage.
+
+    When the turn audio is first written, a MetricsFrame with the turn
+    latencies is returned. The last `max_turns` completed turns and the last
+    `max_events` pushes are kept so they can be exported as a Chrome trace
+    (chrome://tracing or https://ui.perfetto.dev).
+
+    """
+
+    def __init__(self, *, max_events: int = 100000, max_turns: int = 1000):
+        self._start_time = time.monotonic_ns()
+        self._events: deque = deque(maxlen=max_events)
+        self._turns: deque = deque(maxlen=max_turns)
+        self._turn_id = 0
+        self._turn: Dict[str, Any] | None = None
+        self._last_transcription_id: int | None = None
+        self._last_transcription_time: int | None = None
+        self._llm_processor: str | None = None
+        self._tts_processor: str | None = None
+        self._tts_seen = False
+
+    @property
+    def turn_id(self) -> int:
+        return self._turn_id
+
+    @property
+    def turns(self) -> List[Dict[str, Any]]:
+        """Returns the latencies of the last completed turns."""
+        return [self._turn_latency(turn) for turn in self._turns]
+
+    def frame_pushed(self, processor, frame: Frame, direction):
+        now = time.monotonic_ns()
+
+        # Only the first push of a UserStoppedSpeakingFrame starts a turn.
+        if isinstance(frame, UserStoppedSpeakingFrame) and (
+                not self._turn or self._turn["frame"] != frame.id):
+            self._start_turn(frame, now)
+
+        self._events.append((now, processor.name, frame.name, direction.name, self._turn_id))
+
+        if isinstance(frame, TranscriptionFrame):
+            # Only the STT service push counts, not the following ones.
+            if frame.id == self._last_transcription_id:
+                return
+            self._last_transcription_id = frame.id
+            if self._turn and "stt" not in self._turn:
+                self._turn["stt"] = now
+            else:
+                self._last_transcription_time = now
+        elif not self._turn:
+            return
+        elif isinstance(frame, LLMFullResponseStartFrame):
+            if not self._llm_processor:
+                self._llm_processor = processor.name
+        elif isinstance(frame, TTSStartedFrame):
+            if not self._tts_processor:
+                self._tts_processor = processor.name
+                self._tts_seen = True
+        elif isinstance(frame, AudioRawFrame):
+            if processor.name == self._tts_processor and "tts" not in self._turn:
+                self._turn["tts"] = now
+        elif isinstance(frame, TextFrame):
+            if processor.name == self._llm_processor and "llm" not in self._turn:
+                self._turn["llm"] = now
+
+    def audio_written(self, processor) -> MetricsFrame | None:
+        """Should be called by output transports every time they write audio.
+        Returns a MetricsFrame with the turn latencies the first time audio is
+        written after a turn starts.
+
+        """
+        if not self._turn or "output" in self._turn:
+            return None
+
+        # Audio from a previous turn might still be written.
+        if self._tts_seen and "tts" not in self._turn:
+            return None
+
+        now = time.monotonic_ns()
+        self._turn["output"] = now
+        self._events.append((now, processor.name, "audio_written", "DOWNSTREAM", self._turn_id))
+
+        self._turns.append(self._turn)
+        latency = self._turn_latency(self._turn)
+        logger.debug(f"Turn {self._turn_id} latency: {latency}")
+        return MetricsFrame(latency=[latency])
+
+    def chrome_trace(self) -> Mapping[str, Any]:
+        """Returns the recorded events in Chrome trace event format. Each
+        processor is shown as a thread with an instant event per pushed frame,
+        and each turn stage is shown as a span.
+
+        """
+        events = []
+        for (ts, processor, frame, direction, turn) in self._events:
+            events.append({
+                "name": frame,
+                "cat": direction.lower(),
+                "ph": "i",
+                "s": "t",
+                "ts": self._to_us(ts),
+                "pid": 1,
+                "tid": processor,
+                "args": {"turn": turn},
+            })
+        for turn in self._turns:
+            prev = turn["start"]
+            for stage in TURN_STAGES:
+                end = turn.get(stage)
+                if end is None:
+                    continue
+                events.append({
+                    "name": stage,
+                    "cat": "turn",
+                    "ph": "X",
+                    "ts": self._to_us(prev),
+                    "dur": max(end - prev, 0) / 1000,
+                    "pid": 1,
+                    "tid": f"turn#{turn['id']}",
+                })
+                prev = max(prev, end)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+    def _start_turn(self, frame: UserStoppedSpeakingFrame, now: int):
+        if self._turn and "output" not in self._turn:
+            logger.debug(f"Turn {self._turn_id} dropped, a new turn started")
+        self._turn_id += 1
+        self._turn = {"id": self._turn_id, "frame": frame.id, "start": now}
+        self._llm_processor = None
+        self._tts_processor = None
+        # The final transcription might arrive before the VAD stops.
+        if self._last_transcription_time:
+            self._turn["stt"] = self._last_transcription_time
+            self._last_transcription_time = None
+
+    def _turn_latency(self, turn: Dict[str, Any]) -> Dict[str, Any]:
+        latency = {"turn": turn["id"]}
+        prev = turn["start"]
+        for stage in TURN_STAGES:
+            timestamp = turn.get(stage)
+            if timestamp is None:
+                latency[stage] = None
+            else:
+                latency[stage] = max(timestamp - prev, 0) / 1e9
+                prev = max(prev, timestamp)
+        latency["total"] = (turn["output"] - turn["start"]) / 1e9
+        return latency
+
+    def _to_us(self, ns: int) -> float:
+        return (ns - self._start_time) / 1000
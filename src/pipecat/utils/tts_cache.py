@@ -0,0 +1,334 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import collections
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import unicodedata
+
+from concurrent.futures import Future, wait
+from typing import Any, Dict, Iterator, Mapping, Set, Tuple
+
+from pipecat.frames.frames import AudioRawFrame, MetricsFrame
+from pipecat.utils.executors import DISK_IO_EXECUTOR, get_executor
+
+from loguru import logger
+
+# Disk entries are a header (magic, sample rate, number of channels) followed
+# by the raw audio.
+DISK_HEADER = struct.Struct("<4sII")
+DISK_MAGIC = b"PTTS"
+
+# When the disk tier goes over `max_disk_bytes`, files are removed until it's
+# below this fraction of it, so the directory is not scanned on every write.
+DISK_EVICTION_TARGET = 0.9
+
+
+class CachedAudio:
+    """Audio of a cached TTS conversion. `audio` is either bytes (memory tier)
+    or a memory-mapped file (disk tier).
+
+    """
+
+    def __init__(self, audio: bytes | memoryview, sample_rate: int, num_channels: int):
+        self.audio = audio
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+
+    def __len__(self) -> int:
+        return len(self.audio)
+
+    def frames(self, chunk_secs: float) -> Iterator[AudioRawFrame]:
+        """Returns the audio in frames of `chunk_secs` seconds."""
+        # At least one sample per frame (e.g. for very small `chunk_secs`).
+        chunk_size = max(1, int(self.sample_rate * chunk_secs)) * self.num_channels * 2
+        for i in range(0, len(self.audio), chunk_size):
+            audio = bytes(self.audio[i:i + chunk_size])
+            yield AudioRawFrame(audio, self.sample_rate, self.num_channels)
+
+
+class TTSCache:
+    """A cache of TTS audio that can be shared by many TTS services (see
+    `TTSService` `tts_cache`). Keys are built from the service settings that
+    change the audio (e.g. voice and model) and the normalized text.
+
+    Audio is kept in an in-memory LRU of at most `max_memory_bytes`. If
+    `cache_dir` is given, audio is also stored on disk and read with `mmap`, so
+    worker processes using the same directory share it (and the OS page
+    cache). Files are written atomically in the `DISK_IO_EXECUTOR` executor,
+    so `put()` doesn't block the event loop (see `wait_disk_writes()`). The
+    size of the directory is tracked as files are written, and when it goes
+    over `max_disk_bytes` the least recently written files are removed. Cached
+    audio is sent in frames of `chunk_secs` seconds.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            max_memory_bytes: int = 32 * 1024 * 1024,
+            cache_dir: str | None = None,
+            max_disk_bytes: int | None = None,
+            chunk_secs: float = 0.02):
+        self._max_memory_bytes = max_memory_bytes
+        self._cache_dir = cache_dir
+        self._max_disk_bytes = max_disk_bytes
+        self._chunk_secs = chunk_secs
+        self._memory: collections.OrderedDict[str, CachedAudio] = collections.OrderedDict()
+        self._memory_bytes = 0
+
+        # Disk tier. The size is an estimate (other processes might write to
+        # the same directory), corrected every time we evict files.
+        self._disk_lock = threading.Lock()
+        self._disk_writes: Set[Future] = set()
+        self._disk_bytes: int | None = None
+        self._disk_evicting = False
+
+        # Stats
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @property
+    def chunk_secs(self) -> float:
+        return self._chunk_secs
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._memory_bytes
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        # Different whitespace or unicode forms produce the same audio.
+        return " ".join(unicodedata.normalize("NFKC", text).split())
+
+    def key(self, params: Tuple, text: str) -> str:
+        data = repr((params, self.normalize_text(text))).encode()
+        return hashlib.sha256(data).hexdigest()
+
+    def contains(self, key: str) -> bool:
+        """Whether the key is cached (this doesn't count as a hit or a miss)."""
+        if key in self._memory:
+            return True
+        return bool(self._cache_dir) and os.path.exists(self._disk_path(key))
+
+    def get(self, key: str) -> CachedAudio | None:
+        audio = self._memory.get(key)
+        if audio:
+            self._memory.move_to_end(key)
+            self._memory_hits += 1
+        else:
+            audio = self._disk_get(key)
+            if not audio:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._memory_put(key, audio)
+        self._bytes_saved += len(audio)
+        return audio
+
+    def put(self, key: str, audio: bytes, sample_rate: int, num_channels: int):
+        if not audio:
+            return
+        cached = CachedAudio(audio, sample_rate, num_channels)
+        self._memory_put(key, cached)
+        if self._cache_dir:
+            future = get_executor(DISK_IO_EXECUTOR).submit(self._disk_put, key, cached)
+            with self._disk_lock:
+                self._disk_writes.add(future)
+            future.add_done_callback(self._disk_write_done)
+
+    def wait_disk_writes(self, timeout: float | None = None):
+        """Blocks until the pending disk writes (see `put()`) are done."""
+        with self._disk_lock:
+            futures = list(self._disk_writes)
+        wait(futures, timeout=timeout)
+
+    def clear(self):
+        """Clears the memory tier (the disk tier is left alone)."""
+        self._memory.clear()
+        self._memory_bytes = 0
+
+    def stats(self) -> Mapping[str, Any]:
+        hits = self._memory_hits + self._disk_hits
+        lookups = hits + self._misses
+        return {
+            "memory_hits": self._memory_hits,
+            "disk_hits": self._disk_hits,
+            "misses": self._misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "bytes_saved": self._bytes_saved,
+            "memory_bytes": self._memory_bytes,
+            "memory_entries": len(self._memory),
+        }
+
+    #
+    # Memory tier
+    #
+
+    def _memory_put(self, key: str, audio: CachedAudio):
+        size = len(audio)
+        if size > self._max_memory_bytes:
+            return
+        if not isinstance(audio.audio, bytes):
+            # Don't keep memory maps open.
+            audio = CachedAudio(bytes(audio.audio), audio.sample_rate, audio.num_channels)
+        old = self._memory.pop(key, None)
+        if old:
+            self._memory_bytes -= len(old)
+        self._memory[key] = audio
+        self._memory_bytes += size
+        while self._memory_bytes > self._max_memory_bytes:
+            (_, evicted) = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    #
+    # Disk tier
+    #
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.pcm")
+
+    def _disk_get(self, key: str) -> CachedAudio | None:
+        if not self._cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                m = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # ValueError: the file is empty.
+            return None
+        except OSError as e:
+            logger.warning(f"Unable to read cached TTS audio: {e}")
+            return None
+
+        if len(m) < DISK_HEADER.size:
+            return None
+        (magic, sample_rate, num_channels) = DISK_HEADER.unpack_from(m)
+        if magic != DISK_MAGIC:
+            return None
+        return CachedAudio(memoryview(m)[DISK_HEADER.size:], sample_rate, num_channels)
+
+    def _disk_put(self, key: str, audio: CachedAudio):
+        # Runs in the disk I/O executor.
+        try:
+            # Write to a temporary file and rename it, so other processes never
+            # see a partial file.
+            (fd, tmp_path) = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(DISK_HEADER.pack(DISK_MAGIC, audio.sample_rate, audio.num_channels))
+                f.write(audio.audio)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError as e:
+            logger.warning(f"Unable to write cached TTS audio: {e}")
+            return
+        if self._max_disk_bytes is None:
+            return
+        with self._disk_lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes += DISK_HEADER.size + len(audio)
+            # The first write scans the directory to know its size.
+            evict = (not self._disk_evicting and
+                     (self._disk_bytes is None or self._disk_bytes > self._max_disk_bytes))
+            self._disk_evicting = self._disk_evicting or evict
+        if evict:
+            try:
+                self._disk_evict()
+            finally:
+                with self._disk_lock:
+                    self._disk_evicting = False
+
+    def _disk_write_done(self, future: Future):
+        with self._disk_lock:
+            self._disk_writes.discard(future)
+
+    def _disk_evict(self):
+        entries = []
+        total = 0
+        with os.scandir(self._cache_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".pcm"):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        if total > self._max_disk_bytes:
+            target = self._max_disk_bytes * DISK_EVICTION_TARGET
+            entries.sort()
+            for (_, size, path) in entries:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    # Another process removed it.
+                    pass
+                total -= size
+        with self._disk_lock:
+            self._disk_bytes = total
+
+
+class TTSCacheMetrics:
+    """Cache hits and misses of a single TTS service, reported with a
+    MetricsFrame at most once every `report_interval` seconds.
+
+    """
+
+    def __init__(self, *, processor: str = "", report_interval: float = 1.0):
+        self._processor = processor
+        self._report_interval = report_interval
+        self._hits = 0
+        self._misses = 0
+        self._bytes_saved = 0
+        self._metrics_changed = False
+        self._last_report_time = 0.0
+
+    def hit(self, num_bytes: int):
+        self._hits += 1
+        self._bytes_saved += num_bytes
+        self._metrics_changed = True
+
+    def miss(self):
+        self._misses += 1
+        self._metrics_changed = True
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self._hits + self._misses
+        return {
+            "processor": self._processor,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "bytes_saved": self._bytes_saved,
+        }
+
+    def metrics_frame(self) -> MetricsFrame | None:
+        """Returns a MetricsFrame with the cache counters if they changed since
+        the last report (and at most once every `report_interval` seconds),
+        otherwise None.
+
+        """
+        if not self._metrics_changed:
+            return None
+
+        now = time.monotonic()
+        if now - self._last_report_time < self._report_interval:
+            return None
+
+        self._metrics_changed = False
+        self._last_report_time = now
+        return MetricsFrame(tts_cache=[self.metrics()])
@@ -4,31 +4,28 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
-from threading import Lock
+import itertools
 
+# Calling next() on an itertools.count is atomic (it's implemented in C and
+# holds the GIL), so we don't need any locks here. This matters because every
+# frame (e.g. every 20ms audio chunk) asks for an id and a count.
 _COUNTS = {}
-_COUNTS_MUTEX = Lock()
 
-_ID = 0
-_ID_MUTEX = Lock()
+_ID = itertools.count(1)
 
 
 def obj_id() -> int:
-    global _ID, _ID_MUTEX
-    with _ID_MUTEX:
-        _ID += 1
-        return _ID
+    return next(_ID)
 
 
 def obj_count(obj) -> int:
-    global _COUNTS, COUNTS_MUTEX
     name = obj.__class__.__name__
-    with _COUNTS_MUTEX:
-        if name not in _COUNTS:
-            _COUNTS[name] = 0
-        else:
-            _COUNTS[name] += 1
-        return _COUNTS[name]
+    counter = _COUNTS.get(name)
+    if counter is None:
+        # setdefault() is also atomic, so if two threads race here they will
+        # both end up with the same counter.
+        counter = _COUNTS.setdefault(name, itertools.count())
+    return next(counter)
 
 
 def exp_smoothing(value: float, prev_value: float, factor: float) -> float:
@@ -0,0 +1,101 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import math
+
+import numpy as np
+
+from pipecat.vad.vad_analyzer import VADAnalyzer, VADParams
+
+# Energy above the noise floor (in dB) below which a window is never speech and
+# above which the energy alone counts as speech.
+_MIN_SNR_DB = 3.0
+_MAX_SNR_DB = 12.0
+
+# Spectral flatness goes from 0 (a pure tone) to 1 (white noise). Voiced speech
+# is harmonic, so it has a low flatness.
+_SPEECH_FLATNESS = 0.2
+_NOISE_FLATNESS = 0.5
+
+# Fraction of samples that cross zero. Voiced speech has a low zero-crossing
+# rate, white noise is around 0.5.
+_SPEECH_ZCR = 0.25
+_NOISE_ZCR = 0.5
+
+# How fast the noise floor follows the energy when it goes down, when there's
+# no speech and when there's speech (so we eventually adapt to louder noise).
+_NOISE_FLOOR_DOWN = 0.3
+_NOISE_FLOOR_UP = 0.05
+_NOISE_FLOOR_UP_SPEECH = 0.002
+
+# Lowest noise floor (RMS of ~10 in 16-bit samples), so we don't trigger with
+# very low level noise after digital silence.
+_MIN_NOISE_FLOOR_DB = 20.0
+
+
+def _score(value: float, zero: float, one: float) -> float:
+    return min(1.0, max(0.0, (value - zero) / (one - zero)))
+
+
+class EnergyVADAnalyzer(VADAnalyzer):
+    """A lightweight VAD analyzer that only needs numpy. Each 20ms window is
+    considered speech if its energy is high enough above an adaptive noise
+    floor and it looks like voiced speech (low spectral flatness in the speech
+    band and low zero-crossing rate). It is not as accurate as Silero, but it
+    costs a small fraction of the CPU, which makes it a good fit for cheap
+    sessions (e.g. 8 kHz telephony).
+
+    """
+
+    def __init__(self, *, sample_rate: int = 16000, params: VADParams = VADParams()):
+        super().__init__(sample_rate=sample_rate, num_channels=1, params=params)
+
+        num_frames = self.num_frames_required()
+        self._fft_window = np.hanning(num_frames).astype(np.float32)
+        freqs = np.fft.rfftfreq(num_frames, 1.0 / sample_rate)
+        self._speech_bins = (freqs >= 100) & (freqs <= 4000)
+
+        self._noise_floor_db: float | None = None
+
+    @property
+    def noise_floor(self) -> float | None:
+        """The current noise floor in dB (relative to one 16-bit step)."""
+        return self._noise_floor_db
+
+    def num_frames_required(self) -> int:
+        return int(self.sample_rate * 0.02)
+
+    def voice_confidence(self, buffer) -> float:
+        samples = np.frombuffer(buffer, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return 0.0
+
+        energy_db = 10 * math.log10(float(np.dot(samples, samples)) / samples.size + 1e-10)
+
+        signs = np.signbit(samples)
+        zcr = np.count_nonzero(signs[1:] != signs[:-1]) / max(1, samples.size - 1)
+
+        power = np.abs(np.fft.rfft(samples * self._fft_window)[self._speech_bins]) ** 2 + 1e-10
+        flatness = math.exp(float(np.mean(np.log(power)))) / float(np.mean(power))
+
+        if self._noise_floor_db is None:
+            self._noise_floor_db = max(energy_db, _MIN_NOISE_FLOOR_DB)
+        snr_db = energy_db - self._noise_floor_db
+
+        energy_score = _score(snr_db, _MIN_SNR_DB, _MAX_SNR_DB)
+        flatness_score = _score(flatness, _NOISE_FLATNESS, _SPEECH_FLATNESS)
+        zcr_score = _score(zcr, _NOISE_ZCR, _SPEECH_ZCR)
+        confidence = energy_score * (0.6 * flatness_score + 0.4 * zcr_score)
+
+        if snr_db < 0:
+            rate = _NOISE_FLOOR_DOWN
+        elif confidence < 0.5:
+            rate = _NOISE_FLOOR_UP
+        else:
+            rate = _NOISE_FLOOR_UP_SPEECH
+        self._noise_floor_db = max(self._noise_floor_db + rate * snr_db, _MIN_NOISE_FLOOR_DB)
+
+        return confidence
@@ -4,13 +4,22 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import os
+import threading
 import time
+import weakref
+
+from concurrent.futures import Executor
+from typing import Any, List, Sequence, Tuple
 
 import numpy as np
 
 from pipecat.frames.frames import AudioRawFrame, Frame, UserStartedSpeakingFrame, UserStoppedSpeakingFrame
 from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.utils.executors import VAD_EXECUTOR, get_executor
+from pipecat.utils.shared_models import get_shared_model
 from pipecat.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+from pipecat.vad.vad_inference import VADBatchModel, VADInferenceService
 
 from loguru import logger
 
@@ -31,30 +40,266 @@ except ModuleNotFoundError as e:
 _MODEL_RESET_STATES_TIME = 5.0
 
 
+def _load_silero_model(
+        version: str,
+        model_path: str | None = None,
+        allow_download: bool = False):
+    """Loads the Silero VAD model from `model_path` (a `silero_vad.jit` file)
+    or from the torch hub cache. If the model is not cached it's only
+    downloaded from GitHub with `allow_download=True`, otherwise a
+    `FileNotFoundError` is raised.
+
+    """
+    if model_path:
+        logger.debug(f"Loading Silero VAD model from {model_path}...")
+        model = torch.jit.load(model_path)
+    else:
+        # This is where torch.hub caches the repository, loading it as a local
+        # repository avoids checking for updates on GitHub.
+        repo_dir = os.path.join(torch.hub.get_dir(), f"snakers4_silero-vad_{version}")
+        if os.path.isdir(repo_dir):
+            logger.debug(f"Loading Silero VAD model from {repo_dir}...")
+            (model, _) = torch.hub.load(repo_or_dir=repo_dir, model="silero_vad", source="local")
+        elif not allow_download:
+            raise FileNotFoundError(
+                f"Silero VAD model {version} not found in the torch hub cache ({repo_dir}), "
+                f"use `model_path` or `allow_download=True`")
+        else:
+            logger.debug(f"Downloading Silero VAD model {version}...")
+            (model, _) = torch.hub.load(repo_or_dir=f"snakers4/silero-vad:{version}",
+                                        model="silero_vad",
+                                        force_reload=False,
+                                        trust_repo=True)
+
+    logger.debug("Loaded Silero VAD")
+
+    return model
+
+
+def _supports_shared_model(version: str) -> bool:
+    # Older versions keep the model state in a way we can't swap.
+    return not version.startswith(("v3", "v4"))
+
+
+# Internals of the Silero v5 TorchScript model that `SileroBatchModel` swaps.
+_MODEL_STATE_ATTRIBUTES = ("_state", "_context", "_last_sr", "_last_batch_size")
+
+
+class SileroBatchModel(VADBatchModel):
+    """Runs the Silero VAD model on a batch of streams. The model keeps the
+    state of the last call (for the whole batch) internally, so we swap the
+    state of the streams in the batch in and out of the model on every call.
+    This allows sharing the model between streams. Requires Silero VAD v5.
+
+    The state lives in private attributes of the TorchScript model, so a
+    `ValueError` is raised if the model doesn't have them.
+
+    """
+
+    def __init__(self, model, sample_rate: int):
+        if hasattr(model, "reset_states"):
+            # The state attributes are created when the state is reset.
+            model.reset_states()
+        missing = [a for a in _MODEL_STATE_ATTRIBUTES if not hasattr(model, a)]
+        if missing:
+            raise ValueError(
+                f"Shared Silero VAD models require Silero VAD v5 (missing {', '.join(missing)})")
+
+        self._model = model
+        self._sample_rate = sample_rate
+        # Silero v5 prepends the end of the previous window to each window.
+        self._context_size = 64 if sample_rate == 16000 else 32
+        # The model might be used from multiple threads (e.g. the executors of
+        # different transports).
+        self._lock = threading.Lock()
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    def new_state(self) -> Any:
+        return (torch.zeros((2, 1, 128)), torch.zeros((1, self._context_size)))
+
+    def new_stream(self) -> "SileroVADStream":
+        return SileroVADStream(self)
+
+    def infer(self, windows: np.ndarray, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        batch_size = windows.shape[0]
+        with self._lock:
+            self._model._state = torch.cat([state for (state, _) in states], dim=1)
+            self._model._context = torch.cat([context for (_, context) in states], dim=0)
+            self._model._last_sr = self._sample_rate
+            self._model._last_batch_size = batch_size
+
+            with torch.no_grad():
+                confidences = self._model(torch.from_numpy(windows), self._sample_rate)
+
+            new_states = list(zip(torch.split(self._model._state, 1, dim=1),
+                                  torch.split(self._model._context, 1, dim=0)))
+        return (confidences.reshape(batch_size).numpy(), new_states)
+
+
+def get_silero_vad_model(
+        *,
+        version: str = "v5.0",
+        sample_rate: int = 16000,
+        model_path: str | None = None,
+        allow_download: bool = False) -> SileroBatchModel:
+    """Returns the Silero VAD model for the given version and sample rate. The
+    model is loaded once per process (see `get_shared_model()`) and shared by
+    all the streams, each stream only has its own state (see
+    `SileroBatchModel.new_stream()`). Call it before starting sessions (or
+    forking workers) to preload the model. The model is loaded from
+    `model_path` or the torch hub cache and is only downloaded with
+    `allow_download=True`.
+
+    """
+    if sample_rate != 16000 and sample_rate != 8000:
+        raise ValueError("Silero VAD sample rate needs to be 16000 or 8000")
+
+    return get_shared_model(
+        ("silero_vad", version, sample_rate, model_path),
+        lambda: SileroBatchModel(
+            _load_silero_model(version, model_path, allow_download), sample_rate))
+
+
+class SileroVADStream:
+    """The model state of an audio stream analyzed with a shared Silero VAD
+    model.
+
+    """
+
+    def __init__(self, model: SileroBatchModel):
+        self._model = model
+        self._state = model.new_state()
+
+    def voice_confidence(self, buffer) -> float:
+        # Divide by 32768 because we have signed 16-bit data.
+        window = np.frombuffer(buffer, dtype=np.int16).astype(np.float32) / 32768.0
+        (confidences, [self._state]) = self._model.infer(window[np.newaxis], [self._state])
+        return float(confidences[0])
+
+    def reset(self):
+        self._state = self._model.new_state()
+
+
+class _InferenceServiceStream:
+
+    def __init__(self, service: VADInferenceService):
+        self._service = service
+        self._stream = service.open_stream()
+        weakref.finalize(self, service.close_stream, self._stream)
+
+    def voice_confidence(self, buffer) -> float:
+        return self._service.voice_confidence(self._stream, buffer)
+
+    async def voice_confidence_async(self, buffer) -> float:
+        return await self._service.voice_confidence_async(self._stream, buffer)
+
+    def reset(self):
+        self._service.reset_stream(self._stream)
+
+
+class _ModelStream:
+    """A stream with its own model (older Silero versions)."""
+
+    def __init__(self, model, sample_rate: int):
+        self._model = model
+        self._sample_rate = sample_rate
+
+    def voice_confidence(self, buffer) -> float:
+        audio_int16 = np.frombuffer(buffer, np.int16)
+        # Divide by 32768 because we have signed 16-bit data.
+        audio_float32 = np.frombuffer(audio_int16, dtype=np.int16).astype(np.float32) / 32768.0
+        return self._model(torch.from_numpy(audio_float32), self._sample_rate).item()
+
+    def reset(self):
+        self._model.reset_states()
+
+
+class SileroVADInferenceService(VADInferenceService):
+    """A `VADInferenceService` with a Silero VAD model. Create one per process
+    (and sample rate) and pass it to all the `SileroVADAnalyzer` so their
+    windows are analyzed in batches.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            sample_rate: int = 16000,
+            version: str = "v5.0",
+            model_path: str | None = None,
+            allow_download: bool = False,
+            **kwargs):
+        model = get_silero_vad_model(
+            version=version,
+            sample_rate=sample_rate,
+            model_path=model_path,
+            allow_download=allow_download)
+        super().__init__(model, **kwargs)
+
+    @property
+    def sample_rate(self) -> int:
+        return self._model.sample_rate
+
+
 class SileroVADAnalyzer(VADAnalyzer):
+    """Silero VAD analyzer. By default each analyzer loads its own model. With
+    `shared_model=True` the model is shared by all the analyzers in the
+    process with the same version and sample rate (see
+    `get_silero_vad_model()`), so creating an analyzer is cheap. Sharing swaps
+    the model state in and out of private attributes of the TorchScript model,
+    so if the model doesn't have them (e.g. Silero versions before v5) the
+    analyzer falls back to its own model. If an `inference_service` is given
+    the model runs there, batched with other analyzers.
+
+    Models are loaded from `model_path` or the torch hub cache. If the model
+    is not cached it's downloaded from GitHub, unless `allow_download` is
+    False.
+
+    """
 
     def __init__(
             self,
             *,
             sample_rate: int = 16000,
             version: str = "v5.0",
-            params: VADParams = VADParams()):
+            params: VADParams = VADParams(),
+            inference_service: SileroVADInferenceService | None = None,
+            shared_model: bool = False,
+            model_path: str | None = None,
+            allow_download: bool = True):
         super().__init__(sample_rate=sample_rate, num_channels=1, params=params)
 
         if sample_rate != 16000 and sample_rate != 8000:
             raise ValueError("Silero VAD sample rate needs to be 16000 or 8000")
 
-        logger.debug("Loading Silero VAD model...")
-
-        (self._model, _) = torch.hub.load(repo_or_dir=f"snakers4/silero-vad:{version}",
-                                          model="silero_vad",
-                                          force_reload=False,
-                                          trust_repo=True)
+        if inference_service:
+            if inference_service.sample_rate != sample_rate:
+                raise ValueError(
+                    f"Silero VAD inference service sample rate "
+                    f"({inference_service.sample_rate}) doesn't match {sample_rate}")
+            self._stream = _InferenceServiceStream(inference_service)
+        else:
+            self._stream = None
+            if shared_model and _supports_shared_model(version):
+                try:
+                    model = get_silero_vad_model(
+                        version=version,
+                        sample_rate=sample_rate,
+                        model_path=model_path,
+                        allow_download=allow_download)
+                    self._stream = model.new_stream()
+                except ValueError as e:
+                    logger.warning(
+                        f"Unable to share Silero VAD model, using a model per analyzer: {e}")
+            if not self._stream:
+                model = _load_silero_model(version, model_path, allow_download)
+                self._stream = _ModelStream(model, sample_rate)
 
         self._last_reset_time = 0
 
-        logger.debug("Loaded Silero VAD")
-
     #
     # VADAnalyzer
     #
@@ -64,25 +309,42 @@ class SileroVADAnalyzer(VADAnalyzer):
 
     def voice_confidence(self, buffer) -> float:
         try:
-            audio_int16 = np.frombuffer(buffer, np.int16)
-            # Divide by 32768 because we have signed 16-bit data.
-            audio_float32 = np.frombuffer(audio_int16, dtype=np.int16).astype(np.float32) / 32768.0
-            new_confidence = self._model(torch.from_numpy(audio_float32), self.sample_rate).item()
-
-            # We need to reset the model from time to time because it doesn't
-            # really need all the data and memory will keep growing otherwise.
-            curr_time = time.time()
-            diff_time = curr_time - self._last_reset_time
-            if diff_time >= _MODEL_RESET_STATES_TIME:
-                self._model.reset_states()
-                self._last_reset_time = curr_time
-
+            new_confidence = self._stream.voice_confidence(buffer)
+            self._maybe_reset()
             return new_confidence
         except Exception as e:
             # This comes from an empty audio array
             logger.exception(f"Error analyzing audio with Silero VAD: {e}")
             return 0
 
+    async def analyze_audio_windows_async(
+            self, buffer, executor: Executor | None = None) -> List[VADState]:
+        if not isinstance(self._stream, _InferenceServiceStream):
+            return await super().analyze_audio_windows_async(buffer, executor)
+
+        # The model runs in the inference service thread, so we just wait for
+        # the confidence of each window.
+        self._append_audio(buffer)
+        states = []
+        for window in self._windows():
+            try:
+                confidence = await self._stream.voice_confidence_async(window)
+                self._maybe_reset()
+            except Exception as e:
+                logger.exception(f"Error analyzing audio with Silero VAD: {e}")
+                confidence = 0
+            states.append(self._update_state(confidence, window))
+        return states
+
+    def _maybe_reset(self):
+        # We need to reset the model from time to time because it doesn't
+        # really need all the data and memory will keep growing otherwise.
+        curr_time = time.time()
+        diff_time = curr_time - self._last_reset_time
+        if diff_time >= _MODEL_RESET_STATES_TIME:
+            self._stream.reset()
+            self._last_reset_time = curr_time
+
 
 class SileroVAD(FrameProcessor):
 
@@ -92,11 +354,21 @@ class SileroVAD(FrameProcessor):
             sample_rate: int = 16000,
             version: str = "v5.0",
             vad_params: VADParams = VADParams(),
-            audio_passthrough: bool = False):
+            audio_passthrough: bool = False,
+            inference_service: SileroVADInferenceService | None = None,
+            shared_model: bool = False,
+            model_path: str | None = None,
+            allow_download: bool = True):
         super().__init__()
 
         self._vad_analyzer = SileroVADAnalyzer(
-            sample_rate=sample_rate, version=version, params=vad_params)
+            sample_rate=sample_rate,
+            version=version,
+            params=vad_params,
+            inference_service=inference_service,
+            shared_model=shared_model,
+            model_path=model_path,
+            allow_download=allow_download)
         self._audio_passthrough = audio_passthrough
 
         self._processor_vad_state: VADState = VADState.QUIET
@@ -118,15 +390,21 @@ class SileroVAD(FrameProcessor):
     async def _analyze_audio(self, frame: AudioRawFrame):
         # Check VAD and push event if necessary. We just care about changes
         # from QUIET to SPEAKING and vice versa.
-        new_vad_state = self._vad_analyzer.analyze_audio(frame.audio)
-        if new_vad_state != self._processor_vad_state and new_vad_state != VADState.STARTING and new_vad_state != VADState.STOPPING:
-            new_frame = None
-
-            if new_vad_state == VADState.SPEAKING:
-                new_frame = UserStartedSpeakingFrame()
-            elif new_vad_state == VADState.QUIET:
-                new_frame = UserStoppedSpeakingFrame()
-
-            if new_frame:
-                await self.push_frame(new_frame)
-                self._processor_vad_state = new_vad_state
+        states = await self._vad_analyzer.analyze_audio_windows_async(
+            frame.audio, get_executor(VAD_EXECUTOR))
+        for new_vad_state in states:
+            if (
+                new_vad_state != self._processor_vad_state
+                and new_vad_state != VADState.STARTING
+                and new_vad_state != VADState.STOPPING
+            ):
+                new_frame = None
+
+                if new_vad_state == VADState.SPEAKING:
+                    new_frame = UserStartedSpeakingFrame()
+                elif new_vad_state == VADState.QUIET:
+                    new_frame = UserStoppedSpeakingFrame()
+
+                if new_frame:
+                    await self.push_frame(new_frame)
+                    self._processor_vad_state = new_vad_state
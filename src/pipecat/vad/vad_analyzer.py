@@ -4,12 +4,16 @@
 # SPDX-License-Identifier: BSD 2-Clause License
 #
 
+import asyncio
+
 from abc import abstractmethod
+from concurrent.futures import Executor
 from enum import Enum
+from typing import Iterator, List
 
 from pydantic.main import BaseModel
 
-from pipecat.utils.audio import calculate_audio_volume, exp_smoothing
+from pipecat.utils.audio import AudioVolumeEstimator, VolumeMode, exp_smoothing
 
 
 class VADState(Enum):
@@ -24,6 +28,7 @@ class VADParams(BaseModel):
     start_secs: float = 0.2
     stop_secs: float = 0.8
     min_volume: float = 0.6
+    volume_mode: VolumeMode = VolumeMode.LOUDNESS
 
 
 class VADAnalyzer:
@@ -32,8 +37,17 @@ class VADAnalyzer:
         self._sample_rate = sample_rate
         self._num_channels = num_channels
         self._params = params
+        self._vad_state: VADState = VADState.QUIET
+        self._init_analysis()
+
+    def _init_analysis(self):
+        """Creates the window buffer, state counters and volume estimator used
+        to analyze audio in this process. Analyzers that analyze audio
+        somewhere else (e.g. `ProcessVADAnalyzer`) don't need them.
+
+        """
         self._vad_frames = self.num_frames_required()
-        self._vad_frames_num_bytes = self._vad_frames * num_channels * 2
+        self._vad_frames_num_bytes = self._vad_frames * self._num_channels * 2
 
         vad_frames_per_sec = self._vad_frames / self._sample_rate
 
@@ -41,11 +55,18 @@ class VADAnalyzer:
         self._vad_stop_frames = round(self._params.stop_secs / vad_frames_per_sec)
         self._vad_starting_count = 0
         self._vad_stopping_count = 0
-        self._vad_state: VADState = VADState.QUIET
 
-        self._vad_buffer = b""
+        # Audio is accumulated in a preallocated buffer. Windows are analyzed
+        # directly from the buffer (using memoryviews) and the remaining audio
+        # (less than a window) is only moved back to the beginning when we
+        # reach the end of the buffer.
+        self._vad_buffer = bytearray(self._vad_frames_num_bytes * 8)
+        self._vad_buffer_view = memoryview(self._vad_buffer)
+        self._vad_buffer_start = 0
+        self._vad_buffer_end = 0
 
         # Volume exponential smoothing
+        self._volume_estimator = AudioVolumeEstimator(self._sample_rate, self._params.volume_mode)
         self._smoothing_factor = 0.2
         self._prev_volume = 0
 
@@ -53,30 +74,107 @@ class VADAnalyzer:
     def sample_rate(self):
         return self._sample_rate
 
+    @property
+    def num_channels(self):
+        return self._num_channels
+
+    @property
+    def params(self) -> VADParams:
+        return self._params
+
     @abstractmethod
     def num_frames_required(self) -> int:
         pass
 
     @abstractmethod
     def voice_confidence(self, buffer) -> float:
+        """Returns the voice confidence of a window of audio. `buffer` is a
+        memoryview that is only valid during the call, so analyzers that need
+        to keep the audio (or need bytes) should copy it.
+
+        """
+        pass
+
+    def close(self):
+        """Releases the resources of the analyzer (e.g. a worker stream). Input
+        transports call it when they are cleaned up.
+
+        """
         pass
 
     def _get_smoothed_volume(self, audio: bytes) -> float:
-        volume = calculate_audio_volume(audio, self._sample_rate)
+        volume = self._volume_estimator.volume(audio)
         return exp_smoothing(volume, self._prev_volume, self._smoothing_factor)
 
     def analyze_audio(self, buffer) -> VADState:
-        self._vad_buffer += buffer
+        """Analyzes all the complete windows available (including the given
+        audio) and returns the final state.
+
+        """
+        self.analyze_audio_windows(buffer)
+        return self._vad_state
 
+    def analyze_audio_windows(self, buffer) -> List[VADState]:
+        """Analyzes all the complete windows available (including the given
+        audio) and returns the state after each one of them. If there's not
+        enough audio for a window the list is empty.
+
+        """
+        self._append_audio(buffer)
+        return [self._analyze_window(window) for window in self._windows()]
+
+    async def analyze_audio_windows_async(
+            self, buffer, executor: Executor | None = None) -> List[VADState]:
+        """Same as `analyze_audio_windows()` but without blocking the event
+        loop. By default the analysis runs in the given executor. Analyzers
+        whose model runs somewhere else (e.g. in a `VADInferenceService`)
+        override it to just wait for the confidence of each window.
+
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, self.analyze_audio_windows, buffer)
+
+    def _append_audio(self, buffer):
+        size = len(buffer)
+        capacity = len(self._vad_buffer)
+        start = self._vad_buffer_start
+        end = self._vad_buffer_end
+        if end + size > capacity:
+            pending = end - start
+            if pending + size > capacity:
+                # We need a bigger buffer (e.g. we got a long audio chunk).
+                new_buffer = bytearray(max(capacity * 2, pending + size))
+                new_buffer[:pending] = self._vad_buffer_view[start:end]
+                self._vad_buffer = new_buffer
+                self._vad_buffer_view = memoryview(new_buffer)
+            else:
+                # Move the remaining audio to the beginning.
+                self._vad_buffer[:pending] = self._vad_buffer[start:end]
+            self._vad_buffer_start = 0
+            self._vad_buffer_end = pending
+
+        self._vad_buffer_view[self._vad_buffer_end:self._vad_buffer_end + size] = buffer
+        self._vad_buffer_end += size
+
+    def _windows(self) -> Iterator[memoryview]:
+        """Yields the complete windows in the buffer. Each window is only
+        valid until the next one is requested.
+
+        """
         num_required_bytes = self._vad_frames_num_bytes
-        if len(self._vad_buffer) < num_required_bytes:
-            return self._vad_state
+        view = self._vad_buffer_view
+        while self._vad_buffer_end - self._vad_buffer_start >= num_required_bytes:
+            start = self._vad_buffer_start
+            self._vad_buffer_start = start + num_required_bytes
+            yield view[start:self._vad_buffer_start]
 
-        audio_frames = self._vad_buffer[:num_required_bytes]
-        self._vad_buffer = self._vad_buffer[num_required_bytes:]
+        if self._vad_buffer_start == self._vad_buffer_end:
+            self._vad_buffer_start = self._vad_buffer_end = 0
 
-        confidence = self.voice_confidence(audio_frames)
+    def _analyze_window(self, audio_frames) -> VADState:
+        return self._update_state(self.voice_confidence(audio_frames), audio_frames)
 
+    def _update_state(self, confidence: float, audio_frames) -> VADState:
         volume = self._get_smoothed_volume(audio_frames)
         self._prev_volume = volume
 
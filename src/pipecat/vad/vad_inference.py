@@ -0,0 +1,252 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import itertools
+import threading
+import time
+
+from abc import abstractmethod
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from pipecat.utils.utils import obj_count, obj_id
+
+from loguru import logger
+
+
+class VADBatchModel:
+    """A VAD model that can analyze windows of many streams at once. Each
+    stream has its own model state, which is created with `new_state()` and
+    passed (and returned updated) in `infer()`.
+
+    """
+
+    @abstractmethod
+    def new_state(self) -> Any:
+        pass
+
+    @abstractmethod
+    def infer(self, windows: np.ndarray, states: Sequence[Any]) -> Tuple[np.ndarray, List[Any]]:
+        """Analyzes a batch of windows (a float32 array of shape `(streams,
+        samples)`, one window per stream) and returns the voice confidence of
+        each window and the new state of each stream.
+
+        """
+        pass
+
+
+class _Request:
+    __slots__ = ("stream", "window", "future")
+
+    def __init__(self, stream: int, window: np.ndarray, future: Future):
+        self.stream = stream
+        self.window = window
+        self.future = future
+
+
+class VADInferenceService:
+    """Runs a `VADBatchModel` for many audio streams (e.g. the VAD analyzers of
+    all the sessions in the process) in a dedicated thread. Windows submitted
+    by different streams are collected and analyzed in a single batched call
+    to the model, which is much cheaper than calling the model once per
+    window. Requests wait at most `max_batch_delay` seconds for other requests
+    to be batched with.
+
+    Each stream is opened with `open_stream()` and its windows are analyzed in
+    order with `submit()`, which returns a future with the voice confidence
+    (or awaited with `voice_confidence_async()`).
+
+    """
+
+    def __init__(
+            self,
+            model: VADBatchModel,
+            *,
+            max_batch_size: int = 64,
+            max_batch_delay: float = 0.002,
+            name: str | None = None):
+        self.id: int = obj_id()
+        self.name: str = name or f"{self.__class__.__name__}#{obj_count(self)}"
+
+        self._model = model
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+
+        self._states: Dict[int, Any] = {}
+        self._stream_ids = itertools.count()
+        self._requests: deque = deque()
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._running = False
+
+        self._num_batches = 0
+        self._num_windows = 0
+        self._max_batch_size_seen = 0
+        self._inference_time = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._thread_handler, name=self.name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stops the inference thread after analyzing the pending windows."""
+        with self._condition:
+            if not self._running:
+                return
+            self._running = False
+            self._condition.notify_all()
+        self._thread.join()
+        self._thread = None
+
+    def open_stream(self) -> int:
+        """Creates the model state of a new stream and returns its id. The
+        service is started if needed.
+
+        """
+        self.start()
+        with self._condition:
+            stream = next(self._stream_ids)
+            self._states[stream] = self._model.new_state()
+            return stream
+
+    def close_stream(self, stream: int):
+        with self._condition:
+            self._states.pop(stream, None)
+
+    def reset_stream(self, stream: int):
+        """Resets the model state of the stream. Should not be called while a
+        window of the stream is being analyzed.
+
+        """
+        with self._condition:
+            if stream in self._states:
+                self._states[stream] = self._model.new_state()
+
+    def submit(self, stream: int, buffer) -> Future:
+        """Submits a window of 16-bit audio of the given stream to be analyzed
+        and returns a future with its voice confidence. The audio is copied, so
+        the buffer can be reused right away.
+
+        """
+        # Divide by 32768 because we have signed 16-bit data.
+        window = np.frombuffer(buffer, dtype=np.int16).astype(np.float32) / 32768.0
+        future = Future()
+        with self._condition:
+            if not self._running:
+                raise RuntimeError(f"{self} is not running")
+            if stream not in self._states:
+                raise ValueError(f"{self} unknown stream {stream}")
+            self._requests.append(_Request(stream, window, future))
+            self._condition.notify()
+        return future
+
+    def voice_confidence(self, stream: int, buffer) -> float:
+        """Analyzes a window and waits for the result, blocking the calling
+        thread. From the event loop use `voice_confidence_async()`.
+
+        """
+        return self.submit(stream, buffer).result()
+
+    async def voice_confidence_async(self, stream: int, buffer) -> float:
+        """Analyzes a window and waits for the result without blocking the
+        event loop (or a thread).
+
+        """
+        return await asyncio.wrap_future(self.submit(stream, buffer))
+
+    def stats(self) -> Mapping[str, Any]:
+        return {
+            "streams": len(self._states),
+            "batches": self._num_batches,
+            "windows": self._num_windows,
+            "avg_batch_size": self._num_windows / self._num_batches if self._num_batches else 0.0,
+            "max_batch_size": self._max_batch_size_seen,
+            "inference_time": self._inference_time,
+        }
+
+    def _next_batch(self) -> List[Tuple[_Request, Any]] | None:
+        with self._condition:
+            while not self._requests:
+                if not self._running:
+                    return None
+                self._condition.wait()
+
+            # Give other streams a chance to submit their windows.
+            batch_full = len(self._requests) >= self._max_batch_size
+            if self._max_batch_delay > 0 and self._running and not batch_full:
+                self._condition.wait_for(
+                    lambda: len(self._requests) >= self._max_batch_size or not self._running,
+                    timeout=self._max_batch_delay)
+
+            # Only one window per stream, since the windows of a stream need
+            # to be analyzed in order.
+            batch: List[_Request] = []
+            deferred: List[_Request] = []
+            streams = set()
+            while self._requests and len(batch) < self._max_batch_size:
+                request = self._requests.popleft()
+                if request.stream in streams:
+                    deferred.append(request)
+                elif request.stream not in self._states:
+                    request.future.set_exception(
+                        ValueError(f"{self} stream {request.stream} closed"))
+                else:
+                    streams.add(request.stream)
+                    batch.append(request)
+            self._requests.extendleft(reversed(deferred))
+
+            return [(request, self._states[request.stream]) for request in batch]
+
+    def _thread_handler(self):
+        logger.debug(f"{self} started")
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                break
+            if not batch:
+                continue
+
+            windows = np.stack([request.window for (request, _) in batch])
+            states = [state for (_, state) in batch]
+            try:
+                start_time = time.perf_counter()
+                (confidences, new_states) = self._model.infer(windows, states)
+                self._inference_time += time.perf_counter() - start_time
+            except Exception as e:
+                logger.exception(f"{self} error analyzing audio: {e}")
+                for (request, _) in batch:
+                    request.future.set_exception(e)
+                continue
+
+            with self._condition:
+                for ((request, _), state) in zip(batch, new_states):
+                    # The stream might have been closed in the meantime.
+                    if request.stream in self._states:
+                        self._states[request.stream] = state
+
+            for ((request, _), confidence) in zip(batch, confidences):
+                request.future.set_result(float(confidence))
+
+            self._num_batches += 1
+            self._num_windows += len(batch)
+            self._max_batch_size_seen = max(self._max_batch_size_seen, len(batch))
+        logger.debug(f"{self} stopped")
+
+    def __str__(self):
+        return self.name
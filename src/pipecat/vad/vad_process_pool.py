@@ -0,0 +1,414 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import functools
+import itertools
+import multiprocessing
+import signal
+import threading
+
+from concurrent.futures import Executor, Future
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Dict, List, Mapping
+
+from pipecat.utils.utils import obj_count, obj_id
+from pipecat.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+from loguru import logger
+
+# Creates the analyzer of a stream inside the worker process. It needs to be
+# picklable (e.g. a class or `functools.partial(SileroVADAnalyzer, ...)`).
+VADAnalyzerFactory = Callable[[], VADAnalyzer]
+
+
+class _Worker:
+
+    def __init__(self, worker_id: int):
+        self.id = worker_id
+        self.process: multiprocessing.Process | None = None
+        self.conn: Connection | None = None
+        self.send_lock = threading.Lock()
+        self.reader: threading.Thread | None = None
+        self.pending: Dict[int, Future] = {}
+        self.num_streams = 0
+        self.num_requests = 0
+        self.restarts = 0
+
+    def send(self, message):
+        with self.send_lock:
+            self.conn.send(message)
+
+
+class VADProcessPool:
+    """A pool of worker processes to run VAD analyzers outside of the main
+    process, so the analysis (model inference, volume...) doesn't compete for
+    the GIL with the event loop. A pool can be shared by all the sessions in
+    the process, use `ProcessVADAnalyzer` to run an analyzer in the pool.
+
+    Each stream (i.e. analyzer) lives in a single worker, so its state stays
+    there. Audio is passed to the worker through a shared memory ring buffer
+    per stream, only small control messages go through the worker pipes.
+
+    Workers are started with the "spawn" method by default, since forking
+    after loading some libraries (e.g. torch) is not safe. A worker that dies
+    is restarted and the analyzers of its streams are created again (their
+    VAD state is lost), requests in flight fail.
+
+    """
+
+    def __init__(
+            self,
+            *,
+            num_workers: int | None = None,
+            ring_buffer_size: int = 64000,
+            start_method: str = "spawn",
+            name: str | None = None):
+        self.id: int = obj_id()
+        self.name: str = name or f"{self.__class__.__name__}#{obj_count(self)}"
+
+        self._num_workers = num_workers or multiprocessing.cpu_count()
+        self._ring_buffer_size = ring_buffer_size
+        self._context = multiprocessing.get_context(start_method)
+        self._workers: List[_Worker] = [_Worker(i) for i in range(self._num_workers)]
+        self._request_ids = itertools.count()
+        self._stream_ids = itertools.count()
+        self._streams: Dict[int, "_Stream"] = {}
+        self._started = False
+        self._lock = threading.Lock()
+
+    @property
+    def ring_buffer_size(self) -> int:
+        return self._ring_buffer_size
+
+    def start(self):
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for worker in self._workers:
+                self._start_worker(worker)
+
+    def stop(self):
+        with self._lock:
+            if not self._started:
+                return
+            self._started = False
+        for worker in self._workers:
+            try:
+                worker.send(("stop", None))
+            except (OSError, ValueError):
+                pass
+        for worker in self._workers:
+            worker.process.join()
+            worker.reader.join()
+            worker.conn.close()
+        # Streams of analyzers that were not closed.
+        for stream in list(self._streams.values()):
+            self._close_stream(stream)
+
+    def stats(self) -> List[Mapping[str, Any]]:
+        return [{
+            "worker": w.id,
+            "pid": w.process.pid if w.process else None,
+            "alive": w.process is not None and w.process.is_alive(),
+            "streams": w.num_streams,
+            "requests": w.num_requests,
+            "restarts": w.restarts,
+        } for w in self._workers]
+
+    #
+    # Streams (used by ProcessVADAnalyzer)
+    #
+
+    def _open_stream(self, factory: VADAnalyzerFactory) -> "_Stream":
+        self.start()
+        # Pin the stream to the worker with less streams.
+        worker = min(self._workers, key=lambda w: w.num_streams)
+        stream_id = next(self._stream_ids)
+        shm = SharedMemory(create=True, size=self._ring_buffer_size)
+        try:
+            (sample_rate, num_channels, num_frames, params) = self._request(
+                worker, ("open", stream_id, factory, shm.name)).result()
+        except Exception:
+            shm.close()
+            shm.unlink()
+            raise
+        worker.num_streams += 1
+        stream = _Stream(
+            self, worker, stream_id, factory, shm, sample_rate, num_channels, num_frames, params)
+        self._streams[stream_id] = stream
+        return stream
+
+    def _close_stream(self, stream: "_Stream"):
+        if self._streams.pop(stream.id, None) is None:
+            return
+        worker = stream.worker
+        worker.num_streams -= 1
+        try:
+            worker.send(("close", None, stream.id))
+        except (OSError, ValueError):
+            pass
+        stream.shm.close()
+        stream.shm.unlink()
+
+    def _request(self, worker: _Worker, message) -> Future:
+        future = Future()
+        request_id = next(self._request_ids)
+        worker.pending[request_id] = future
+        worker.num_requests += 1
+        try:
+            worker.send((message[0], request_id, *message[1:]))
+        except (OSError, ValueError) as e:
+            worker.pending.pop(request_id, None)
+            future.set_exception(RuntimeError(f"{self} worker {worker.id} is not running: {e}"))
+        return future
+
+    #
+    # Worker management
+    #
+
+    def _start_worker(self, worker: _Worker):
+        (parent_conn, child_conn) = self._context.Pipe()
+        worker.process = self._context.Process(
+            target=_worker_main,
+            name=f"{self.name}-worker-{worker.id}",
+            args=(child_conn,),
+            daemon=True)
+        worker.process.start()
+        child_conn.close()
+        worker.conn = parent_conn
+        worker.reader = threading.Thread(
+            target=self._reader_thread_handler, args=(worker,),
+            name=f"{self.name}-reader-{worker.id}", daemon=True)
+        worker.reader.start()
+        logger.debug(f"{self} started worker {worker.id} (pid {worker.process.pid})")
+
+    def _reader_thread_handler(self, worker: _Worker):
+        while True:
+            try:
+                (request_id, result, error) = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+            future = worker.pending.pop(request_id, None)
+            if future:
+                if error:
+                    future.set_exception(RuntimeError(error))
+                else:
+                    future.set_result(result)
+
+        for future in list(worker.pending.values()):
+            future.set_exception(RuntimeError(f"{self} worker {worker.id} stopped"))
+        worker.pending.clear()
+
+        with self._lock:
+            if self._started:
+                self._restart_worker(worker)
+
+    def _restart_worker(self, worker: _Worker):
+        streams = [s for s in list(self._streams.values()) if s.worker is worker]
+        logger.error(
+            f"{self} worker {worker.id} died (exit code: {worker.process.exitcode}), "
+            f"restarting with {len(streams)} streams")
+        worker.process.join()
+        worker.conn.close()
+        worker.restarts += 1
+        # Hold the send lock so the streams are open again before any other
+        # request reaches the new worker.
+        with worker.send_lock:
+            self._start_worker(worker)
+            for stream in streams:
+                request_id = next(self._request_ids)
+                future = Future()
+                future.add_done_callback(functools.partial(self._stream_reopened, stream))
+                worker.pending[request_id] = future
+                try:
+                    worker.conn.send(
+                        ("open", request_id, stream.id, stream.factory, stream.shm.name))
+                except (OSError, ValueError) as e:
+                    worker.pending.pop(request_id, None)
+                    future.set_exception(e)
+
+    def _stream_reopened(self, stream: "_Stream", future: Future):
+        if future.exception():
+            logger.error(f"{self} unable to reopen stream {stream.id}: {future.exception()}")
+
+    def __str__(self):
+        return self.name
+
+
+class _Stream:
+
+    def __init__(
+            self,
+            pool: VADProcessPool,
+            worker: _Worker,
+            stream_id: int,
+            factory: VADAnalyzerFactory,
+            shm: SharedMemory,
+            sample_rate: int,
+            num_channels: int,
+            num_frames: int,
+            params: VADParams):
+        self.pool = pool
+        self.worker = worker
+        self.id = stream_id
+        self.factory = factory
+        self.shm = shm
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.num_frames = num_frames
+        self.params = params
+        self._write_pos = 0
+
+    def submit(self, buffer, command: str = "analyze") -> Future:
+        """Writes the audio into the ring buffer and asks the worker to analyze
+        it (or just get the voice confidence with the "confidence" command).
+        The previous request needs to be finished, so the worker is done
+        reading the ring buffer, and the audio can't be bigger than the ring
+        buffer.
+
+        """
+        size = len(buffer)
+        capacity = len(self.shm.buf)
+        offset = self._write_pos
+        first = min(size, capacity - offset)
+        self.shm.buf[offset:offset + first] = buffer[:first]
+        if first < size:
+            self.shm.buf[:size - first] = buffer[first:]
+        self._write_pos = (offset + size) % capacity
+        return self.pool._request(self.worker, (command, self.id, offset, size))
+
+
+class ProcessVADAnalyzer(VADAnalyzer):
+    """Runs the analyzer created by `analyzer_factory` in a worker of the
+    given `VADProcessPool`. It can be used as any other `VADAnalyzer`, but
+    `analyze_audio_windows_async()` (used by the input transports) doesn't need
+    an executor thread. Creating the analyzer blocks until the worker has
+    created the remote analyzer, whose parameters are used (see `params`).
+
+    The windows and the VAD state live in the worker, so no audio is buffered
+    in this process. Call `close()` (input transports do it on cleanup) to
+    release the remote analyzer.
+
+    """
+
+    def __init__(self, pool: VADProcessPool, analyzer_factory: VADAnalyzerFactory):
+        self._pool = pool
+        self._stream = pool._open_stream(analyzer_factory)
+        super().__init__(
+            sample_rate=self._stream.sample_rate,
+            num_channels=self._stream.num_channels,
+            params=self._stream.params)
+
+    def close(self):
+        if self._stream:
+            self._pool._close_stream(self._stream)
+            self._stream = None
+
+    def num_frames_required(self) -> int:
+        return self._stream.num_frames
+
+    def voice_confidence(self, buffer) -> float:
+        """Returns the voice confidence of a window computed by the remote
+        analyzer (a round-trip to the worker). This uses the same model state
+        as the analysis of the stream.
+
+        """
+        return self._stream.submit(buffer, "confidence").result()
+
+    def analyze_audio_windows(self, buffer) -> List[VADState]:
+        states = []
+        for chunk in self._chunks(buffer):
+            states.extend(self._stream.submit(chunk).result())
+        return self._set_states(states)
+
+    async def analyze_audio_windows_async(
+            self, buffer, executor: Executor | None = None) -> List[VADState]:
+        states = []
+        for chunk in self._chunks(buffer):
+            states.extend(await asyncio.wrap_future(self._stream.submit(chunk)))
+        return self._set_states(states)
+
+    def _init_analysis(self):
+        # Windows are analyzed in the worker.
+        pass
+
+    def _chunks(self, buffer):
+        view = memoryview(buffer).cast("B")
+        size = self._pool.ring_buffer_size
+        return [view[i:i + size] for i in range(0, len(view), size)]
+
+    def _set_states(self, states: List[int]) -> List[VADState]:
+        vad_states = [VADState(state) for state in states]
+        if vad_states:
+            self._vad_state = vad_states[-1]
+        return vad_states
+
+
+#
+# Worker process
+#
+
+def _worker_main(conn: Connection):
+    # The parent process handles signals.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    streams: Dict[int, Any] = {}
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            # The parent is gone.
+            break
+
+        match message:
+            case ("analyze", request_id, stream_id, offset, size):
+                try:
+                    (analyzer, shm) = streams[stream_id]
+                    capacity = len(shm.buf)
+                    first = min(size, capacity - offset)
+                    with shm.buf[offset:offset + first] as view:
+                        states = analyzer.analyze_audio_windows(view)
+                    if first < size:
+                        with shm.buf[:size - first] as view:
+                            states += analyzer.analyze_audio_windows(view)
+                    conn.send((request_id, [state.value for state in states], None))
+                except Exception as e:
+                    conn.send((request_id, None, f"error analyzing audio: {e}"))
+            case ("confidence", request_id, stream_id, offset, size):
+                try:
+                    (analyzer, shm) = streams[stream_id]
+                    capacity = len(shm.buf)
+                    if offset + size <= capacity:
+                        with shm.buf[offset:offset + size] as view:
+                            confidence = analyzer.voice_confidence(view)
+                    else:
+                        # The window wraps around the ring buffer.
+                        window = bytes(shm.buf[offset:]) + bytes(shm.buf[:offset + size - capacity])
+                        confidence = analyzer.voice_confidence(window)
+                    conn.send((request_id, float(confidence), None))
+                except Exception as e:
+                    conn.send((request_id, None, f"error analyzing audio: {e}"))
+            case ("open", request_id, stream_id, factory, shm_name):
+                try:
+                    analyzer = factory()
+                    streams[stream_id] = (analyzer, SharedMemory(name=shm_name))
+                    result = (analyzer.sample_rate, analyzer.num_channels,
+                              analyzer.num_frames_required(), analyzer.params)
+                    conn.send((request_id, result, None))
+                except Exception as e:
+                    conn.send((request_id, None, f"error creating VAD analyzer: {e}"))
+            case ("close", request_id, stream_id):
+                stream = streams.pop(stream_id, None)
+                if stream:
+                    stream[1].close()
+            case ("stop", request_id):
+                break
+
+    for (_, shm) in streams.values():
+        shm.close()
@@ -0,0 +1,62 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+import numpy as np
+
+from pipecat.utils.audio import AudioVolumeEstimator, VolumeMode, calculate_audio_volume
+
+
+def noise(num_samples: int, amplitude: float, seed: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    audio = rng.standard_normal(num_samples) * amplitude
+    return np.clip(audio, -32768, 32767).astype(np.int16).tobytes()
+
+
+class TestAudioVolume(unittest.TestCase):
+
+    def test_silence(self):
+        silence = np.zeros(512, dtype=np.int16).tobytes()
+        self.assertEqual(calculate_audio_volume(silence, 16000), 0.0)
+        self.assertEqual(calculate_audio_volume(b"", 16000), 0.0)
+        for mode in VolumeMode:
+            self.assertEqual(AudioVolumeEstimator(16000, mode).volume(silence), 0.0)
+
+    def test_louder_is_higher(self):
+        volumes = [calculate_audio_volume(noise(512, amplitude), 16000) for amplitude in [10, 100, 1000]]
+        self.assertEqual(volumes, sorted(volumes))
+        self.assertGreater(volumes[0], 0.0)
+        self.assertLess(volumes[-1], 1.0)
+
+    def test_loudness_reference(self):
+        # Value computed with pyloudnorm (Meter(16000, block_size=0.032)).
+        self.assertAlmostEqual(calculate_audio_volume(noise(512, 100), 16000), 0.6277, places=4)
+
+    def test_streaming(self):
+        audio = noise(16000, 1000)
+        estimator = AudioVolumeEstimator(16000)
+        for i in range(0, len(audio), 1024):
+            chunk = audio[i:i + 1024]
+            # The first chunk is the same because the filter starts from zero.
+            # After that it's close, only the start of the chunk changes.
+            if i == 0:
+                self.assertAlmostEqual(estimator.volume(chunk), calculate_audio_volume(chunk, 16000))
+            else:
+                self.assertAlmostEqual(estimator.volume(chunk), calculate_audio_volume(chunk, 16000), delta=0.01)
+
+        estimator.reset()
+        self.assertAlmostEqual(estimator.volume(audio[:1024]), calculate_audio_volume(audio[:1024], 16000))
+
+    def test_rms(self):
+        estimator = AudioVolumeEstimator(16000, VolumeMode.RMS)
+        # A full scale square wave: 10 * log10(32767^2) - 0.691 = 89.6 (above
+        # the normalized range).
+        square = np.tile(np.array([32767, -32767], dtype=np.int16), 256).tobytes()
+        self.assertEqual(estimator.volume(square), 1.0)
+        # RMS of 100 -> 10 * log10(100^2) - 0.691 = 39.3
+        constant = np.full(512, 100, dtype=np.int16).tobytes()
+        self.assertAlmostEqual(estimator.volume(constant), (39.309 + 20) / 100, places=3)
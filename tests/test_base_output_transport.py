@@ -0,0 +1,233 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+import unittest
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    BotSpeakingFrame,
+    BotStartedSpeakingFrame,
+    BotStoppedSpeakingFrame,
+    EndFrame,
+    Frame,
+    MetricsFrame,
+    StartInterruptionFrame,
+    TTSStoppedFrame)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+from pipecat.utils.audio import AudioChunker
+from pipecat.utils.audio_pacer import AudioPacer
+
+
+class UpstreamCollector(FrameProcessor):
+
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if direction == FrameDirection.UPSTREAM:
+            self.frames.append(frame)
+        await self.push_frame(frame, direction)
+
+    def count(self, frame_type: type) -> int:
+        return len([f for f in self.frames if isinstance(f, frame_type)])
+
+
+class MockOutputTransport(BaseOutputTransport):
+
+    def __init__(
+            self,
+            write_delay: float = 0,
+            lead: float = 0.08,
+            bot_speaking_frame_interval: float | None = 0.2,
+            bot_stopped_speaking_secs: float = 0.35,
+            **kwargs):
+        params = TransportParams(
+            audio_out_enabled=True,
+            audio_out_lead_secs=lead,
+            bot_speaking_frame_interval=bot_speaking_frame_interval,
+            bot_stopped_speaking_secs=bot_stopped_speaking_secs)
+        super().__init__(params, **kwargs)
+        self.write_delay = write_delay
+        self.written = []
+        self.metrics = []
+
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
+        self.written.append(bytes(frames))
+        await asyncio.sleep(self.write_delay)
+
+    async def send_metrics(self, frame: MetricsFrame):
+        self.metrics.append(frame)
+
+
+class TestAudioChunker(unittest.TestCase):
+
+    def test_aligned_audio_is_not_copied(self):
+        chunker = AudioChunker(4)
+        audio = bytes(range(12))
+        chunks = list(chunker.chunks(audio))
+        self.assertEqual([bytes(c) for c in chunks], [audio[0:4], audio[4:8], audio[8:12]])
+        self.assertTrue(all(c.obj is audio for c in chunks))
+        self.assertEqual(chunker.bytes_copied, 0)
+
+    def test_unaligned_audio(self):
+        chunker = AudioChunker(4)
+        audio = bytes(range(20))
+        pieces = [audio[0:3], audio[3:4], audio[4:6], audio[6:15], audio[15:20]]
+        chunks = []
+        for piece in pieces:
+            chunks += [bytes(c) for c in chunker.chunks(piece)]
+        self.assertEqual(b"".join(chunks), audio)
+        self.assertTrue(all(len(c) == 4 for c in chunks))
+        self.assertEqual(chunker.buffered, 0)
+        self.assertLess(chunker.bytes_copied, len(audio))
+
+    def test_reset(self):
+        chunker = AudioChunker(4)
+        self.assertEqual(list(chunker.chunks(b"\x01\x02")), [])
+        self.assertEqual(chunker.buffered, 2)
+        chunker.reset()
+        self.assertEqual([bytes(c) for c in chunker.chunks(b"\x03\x04\x05\x06")], [b"\x03\x04\x05\x06"])
+
+
+class TestAudioPacer(unittest.IsolatedAsyncioTestCase):
+
+    async def test_lead(self):
+        pacer = AudioPacer(lead=0.04)
+        start_time = time.monotonic()
+        for _ in range(10):
+            await pacer.wait(0.02)
+        # The first 40ms are written right away.
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.14)
+        self.assertLessEqual(pacer.buffered(), 0.06)
+        self.assertEqual(pacer.underruns, 0)
+
+    async def test_underruns(self):
+        pacer = AudioPacer(lead=0.04)
+        await pacer.wait(0.02)
+        await asyncio.sleep(0.06)
+        await pacer.wait(0.02)
+        self.assertEqual(pacer.underruns, 1)
+
+        # Pauses between streams are not underruns.
+        pacer.end_stream()
+        await asyncio.sleep(0.06)
+        await pacer.wait(0.02)
+        self.assertEqual(pacer.underruns, 1)
+
+        playout = pacer.metrics_frame().playout[0]
+        self.assertEqual(playout["chunks"], 3)
+        self.assertEqual(playout["underruns"], 1)
+        self.assertGreater(playout["underrun_time"], 0.02)
+        self.assertIsNone(pacer.metrics_frame())
+
+
+class TestBaseOutputTransport(unittest.IsolatedAsyncioTestCase):
+
+    async def test_audio_chunks(self):
+        output = MockOutputTransport()
+        task = PipelineTask(Pipeline([output]))
+        # 20ms at 16000 is 640 bytes.
+        audio = bytes(range(256)) * 10
+        await task.queue_frames([
+            AudioRawFrame(audio[:1000], 16000, 1),
+            AudioRawFrame(audio[1000:], 16000, 1),
+            EndFrame()])
+        await task.run()
+        self.assertEqual([len(c) for c in output.written], [640] * 4)
+        self.assertEqual(b"".join(output.written), audio[:2560])
+
+    async def test_interruption_stops_audio(self):
+        output = MockOutputTransport(write_delay=0.02)
+        task = PipelineTask(Pipeline([output]), PipelineParams(allow_interruptions=True))
+        runner = asyncio.create_task(task.run())
+
+        await task.queue_frame(AudioRawFrame(b"\x00" * 640 * 50, 16000, 1))
+        await asyncio.sleep(0.1)
+        await output.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        written = len(output.written)
+        self.assertLess(written, 50)
+        await asyncio.sleep(0.1)
+        self.assertEqual(len(output.written), written)
+
+        # Audio that didn't fill a chunk is discarded.
+        await task.queue_frame(AudioRawFrame(b"\x00" * 100, 16000, 1))
+        await asyncio.sleep(0.05)
+        await output.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        await task.queue_frames([AudioRawFrame(b"\x01" * 640, 16000, 1), EndFrame()])
+        await runner
+        self.assertEqual(output.written[written:], [b"\x01" * 640])
+
+    async def test_non_blocking_writes_are_paced(self):
+        output = MockOutputTransport(lead=0.04)
+        task = PipelineTask(Pipeline([output]), PipelineParams(allow_interruptions=True, enable_metrics=True))
+        runner = asyncio.create_task(task.run())
+
+        # One second of audio.
+        await task.queue_frames([AudioRawFrame(b"\x00" * 640 * 50, 16000, 1), TTSStoppedFrame()])
+        await asyncio.sleep(0.2)
+        # 200ms of audio plus the lead (and some slack for the first chunk).
+        self.assertLessEqual(len(output.written), 13)
+        self.assertGreaterEqual(len(output.written), 9)
+
+        await output.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        await task.queue_frame(EndFrame())
+        await runner
+        self.assertLess(len(output.written), 50)
+
+        playout = [m.playout[0] for m in output.metrics if m.playout]
+        self.assertTrue(playout)
+        self.assertEqual(playout[0]["underruns"], 0)
+
+    async def test_bot_speaking_frames(self):
+        collector = UpstreamCollector()
+        output = MockOutputTransport(lead=0.02, bot_speaking_frame_interval=0.1)
+        task = PipelineTask(Pipeline([collector, output]), PipelineParams(allow_interruptions=True))
+        runner = asyncio.create_task(task.run())
+
+        # 300ms of audio.
+        await task.queue_frame(AudioRawFrame(b"\x00" * 640 * 15, 16000, 1))
+        await asyncio.sleep(0.4)
+        self.assertEqual(collector.count(BotStartedSpeakingFrame), 1)
+        self.assertEqual(collector.count(BotStoppedSpeakingFrame), 0)
+        self.assertIn(collector.count(BotSpeakingFrame), [3, 4])
+        await asyncio.sleep(0.4)
+        self.assertEqual(collector.count(BotStoppedSpeakingFrame), 1)
+
+        # Interruptions stop the bot right away.
+        await task.queue_frame(AudioRawFrame(b"\x00" * 640 * 15, 16000, 1))
+        await asyncio.sleep(0.1)
+        await output.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        await asyncio.sleep(0.01)
+        self.assertEqual(collector.count(BotStartedSpeakingFrame), 2)
+        self.assertEqual(collector.count(BotStoppedSpeakingFrame), 2)
+
+        await task.queue_frame(EndFrame())
+        await runner
+
+    async def test_bot_stopped_speaking_secs(self):
+        collector = UpstreamCollector()
+        output = MockOutputTransport(lead=0.02, bot_stopped_speaking_secs=0.05)
+        task = PipelineTask(Pipeline([collector, output]))
+        runner = asyncio.create_task(task.run())
+
+        # Two 100ms chunks with a 150ms gap are two bot turns.
+        await task.queue_frame(AudioRawFrame(b"\x00" * 640 * 5, 16000, 1))
+        await asyncio.sleep(0.25)
+        await task.queue_frame(AudioRawFrame(b"\x00" * 640 * 5, 16000, 1))
+        await asyncio.sleep(0.25)
+        self.assertEqual(collector.count(BotStartedSpeakingFrame), 2)
+        self.assertEqual(collector.count(BotStoppedSpeakingFrame), 2)
+
+        await task.queue_frame(EndFrame())
+        await runner
@@ -0,0 +1,60 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+import numpy as np
+
+from pipecat.vad.energy import EnergyVADAnalyzer
+from pipecat.vad.vad_analyzer import VADState
+
+
+def speech(secs: float, sample_rate: int, level: float = 3000) -> np.ndarray:
+    """A harmonic signal with a moving pitch (like voiced speech)."""
+    t = np.arange(int(secs * sample_rate)) / sample_rate
+    f0 = 110 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / sample_rate
+    signal = sum(np.sin(k * phase) / k for k in range(1, 23))
+    return signal * level / np.std(signal)
+
+
+def noise(secs: float, sample_rate: int, level: float) -> np.ndarray:
+    return np.random.default_rng(0).standard_normal(int(secs * sample_rate)) * level
+
+
+def to_bytes(audio: np.ndarray) -> bytes:
+    return np.clip(audio, -32768, 32767).astype(np.int16).tobytes()
+
+
+class TestEnergyVADAnalyzer(unittest.TestCase):
+
+    def test_speech_over_noise(self):
+        for sample_rate in [8000, 16000]:
+            analyzer = EnergyVADAnalyzer(sample_rate=sample_rate)
+            self.assertEqual(analyzer.num_frames_required(), sample_rate // 50)
+
+            self.assertEqual(analyzer.analyze_audio(to_bytes(noise(1, sample_rate, 30))), VADState.QUIET)
+            audio = speech(1, sample_rate) + noise(1, sample_rate, 30)
+            self.assertEqual(analyzer.analyze_audio(to_bytes(audio)), VADState.SPEAKING)
+            self.assertEqual(analyzer.analyze_audio(to_bytes(noise(1, sample_rate, 30))), VADState.QUIET)
+
+    def test_adapts_to_louder_noise(self):
+        analyzer = EnergyVADAnalyzer(sample_rate=8000)
+        analyzer.analyze_audio(to_bytes(noise(1, 8000, 30)))
+        quiet_floor = analyzer.noise_floor
+
+        # White noise doesn't look like speech, even if it's 20dB louder.
+        states = analyzer.analyze_audio_windows(to_bytes(noise(2, 8000, 300)))
+        self.assertNotIn(VADState.SPEAKING, states)
+        self.assertGreater(analyzer.noise_floor, quiet_floor + 15)
+
+        audio = speech(1, 8000, 2000) + noise(1, 8000, 300)
+        self.assertEqual(analyzer.analyze_audio(to_bytes(audio)), VADState.SPEAKING)
+
+    def test_silence(self):
+        analyzer = EnergyVADAnalyzer(sample_rate=16000)
+        self.assertEqual(analyzer.voice_confidence(bytes(640)), 0.0)
+        self.assertEqual(analyzer.voice_confidence(b""), 0.0)
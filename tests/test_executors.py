@@ -0,0 +1,73 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import threading
+import unittest
+
+from pipecat.frames.frames import EndFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.utils.executors import (
+    VAD_EXECUTOR,
+    configure_executor,
+    executor_metrics,
+    get_executor,
+    shutdown_executors)
+
+
+class TestExecutors(unittest.IsolatedAsyncioTestCase):
+
+    def tearDown(self):
+        shutdown_executors()
+
+    def test_named_executors(self):
+        self.assertIs(get_executor(VAD_EXECUTOR), get_executor(VAD_EXECUTOR))
+        self.assertIsNot(get_executor(VAD_EXECUTOR), get_executor("test"))
+        self.assertEqual(get_executor(VAD_EXECUTOR).name, VAD_EXECUTOR)
+
+    def test_queue_metrics(self):
+        configure_executor("test-bounded", 2)
+        executor = get_executor("test-bounded")
+        event = threading.Event()
+        futures = [executor.submit(event.wait) for _ in range(5)]
+
+        metrics = executor.metrics()
+        self.assertEqual(metrics["max_workers"], 2)
+        self.assertEqual(metrics["running"] + metrics["queued"], 5)
+        self.assertGreaterEqual(metrics["queued"], 3)
+
+        event.set()
+        for future in futures:
+            future.result()
+        metrics = executor.metrics()
+        self.assertEqual(metrics["queued"], 0)
+        self.assertEqual(metrics["completed"], 5)
+        self.assertGreater(metrics["max_wait_time"], 0)
+        self.assertIn(metrics, executor_metrics())
+
+    def test_shutdown(self):
+        executor = get_executor(VAD_EXECUTOR)
+        shutdown_executors()
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+        # A new executor is created if needed.
+        self.assertIsNot(get_executor(VAD_EXECUTOR), executor)
+
+    async def test_runner_shuts_down_executors(self):
+        executor = get_executor(VAD_EXECUTOR)
+        await asyncio.get_running_loop().run_in_executor(executor, sum, [1, 2])
+
+        runner = PipelineRunner(handle_sigint=False)
+        task = PipelineTask(Pipeline([FrameProcessor()]))
+        await task.queue_frame(EndFrame())
+        await runner.run(task)
+
+        self.assertEqual(executor_metrics(), [])
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
@@ -0,0 +1,111 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+from typing import AsyncGenerator
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    DataFrame,
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    TextFrame,
+    TranscriptionFrame)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor, frame_handler
+from pipecat.services.ai_services import TTSService
+from pipecat.utils.test_frame_processor import FrameCollector
+
+
+class DispatchProcessor(FrameProcessor):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.handled = []
+
+    @frame_handler(TextFrame)
+    async def _handle_text_frame(self, frame: Frame, direction: FrameDirection):
+        self.handled.append(("text", frame))
+
+    @frame_handler(DataFrame)
+    async def _handle_data_frame(self, frame: Frame, direction: FrameDirection):
+        self.handled.append(("data", frame))
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        self.handled.append(("frame", frame))
+
+
+class OverrideProcessor(DispatchProcessor):
+
+    async def _handle_text_frame(self, frame: Frame, direction: FrameDirection):
+        self.handled.append(("override", frame))
+
+
+class MockTTSService(TTSService):
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        yield AudioRawFrame(text.encode(), 16000, 1)
+
+
+class TestFrameHandlers(unittest.IsolatedAsyncioTestCase):
+
+    async def test_closest_type_wins(self):
+        processor = DispatchProcessor()
+        await processor.process_frame(TranscriptionFrame("hi", "", ""), FrameDirection.DOWNSTREAM)
+        await processor.process_frame(AudioRawFrame(b"", 16000, 1), FrameDirection.DOWNSTREAM)
+        await processor.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
+        self.assertEqual([h for (h, _) in processor.handled], ["text", "data", "frame"])
+
+    async def test_override_by_name(self):
+        processor = OverrideProcessor()
+        await processor.process_frame(TextFrame("hi"), FrameDirection.DOWNSTREAM)
+        await processor.process_frame(AudioRawFrame(b"", 16000, 1), FrameDirection.DOWNSTREAM)
+        self.assertEqual([h for (h, _) in processor.handled], ["override", "data"])
+
+    async def test_instance_handlers(self):
+        processor = DispatchProcessor()
+        handled = []
+
+        async def handle_audio(frame: Frame, direction: FrameDirection):
+            handled.append(frame)
+
+        processor.register_frame_handler(AudioRawFrame, handle_audio)
+        audio = AudioRawFrame(b"", 16000, 1)
+        await processor.process_frame(audio, FrameDirection.DOWNSTREAM)
+        await processor.process_frame(TextFrame("hi"), FrameDirection.DOWNSTREAM)
+        self.assertEqual(handled, [audio])
+        self.assertEqual([h for (h, _) in processor.handled], ["text"])
+
+    async def test_tts_service(self):
+        collector = FrameCollector()
+        task = PipelineTask(Pipeline([MockTTSService(), collector]))
+        await task.queue_frames([
+            TextFrame("Hello"),
+            TextFrame(" there."),
+            LLMFullResponseEndFrame(),
+            EndFrame()
+        ])
+        await task.run()
+
+        types = [type(f) for f in collector.frames]
+        self.assertEqual(types[2:], [
+            TTSStartedFrame,
+            AudioRawFrame,
+            TTSStoppedFrame,
+            TextFrame,
+            LLMFullResponseEndFrame,
+            EndFrame])
+        self.assertEqual(collector.frames[3].audio, b"Hello there.")
+
+
+if __name__ == "__main__":
+    unittest.main()
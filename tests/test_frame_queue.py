@@ -0,0 +1,129 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import unittest
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame, ImageRawFrame, StartInterruptionFrame, TextFrame
+from pipecat.pipeline.task import PipelineParams
+from pipecat.processors.frame_processor import FrameDirection
+from pipecat.utils.frame_queue import FrameQueue, FrameQueueParams, OverflowPolicy
+
+
+def audio_frame(value: int) -> AudioRawFrame:
+    return AudioRawFrame(bytes([value, 0]), 16000, 1)
+
+
+class TestFrameQueue(unittest.IsolatedAsyncioTestCase):
+
+    async def test_unbounded(self):
+        queue = FrameQueue()
+        for i in range(100):
+            await queue.put(TextFrame(str(i)))
+        self.assertEqual(queue.qsize(), 100)
+        self.assertEqual(queue.high_watermark, 100)
+        self.assertEqual(queue.dropped, 0)
+
+    async def test_drop_oldest_audio(self):
+        params = FrameQueueParams(max_size=2, policies={AudioRawFrame: OverflowPolicy.DROP_OLDEST})
+        queue = FrameQueue(params)
+        for i in range(5):
+            await queue.put(audio_frame(i))
+        self.assertEqual(queue.dropped, 3)
+        self.assertEqual(queue.high_watermark, 2)
+        self.assertEqual([queue.get_nowait().audio[0] for _ in range(2)], [3, 4])
+
+    async def test_drop_newest(self):
+        params = FrameQueueParams(max_size=2, default_policy=OverflowPolicy.DROP_NEWEST)
+        queue = FrameQueue(params)
+        for i in range(5):
+            await queue.put(TextFrame(str(i)))
+        self.assertEqual(queue.dropped, 3)
+        self.assertEqual([queue.get_nowait().text for _ in range(2)], ["0", "1"])
+
+    async def test_coalesce(self):
+        params = FrameQueueParams(max_size=2, policies={ImageRawFrame: OverflowPolicy.COALESCE})
+        queue = FrameQueue(params)
+        await queue.put((ImageRawFrame(b"1", (1, 1), "RGB"), FrameDirection.DOWNSTREAM))
+        await queue.put((TextFrame("hello"), FrameDirection.DOWNSTREAM))
+        await queue.put((ImageRawFrame(b"2", (1, 1), "RGB"), FrameDirection.DOWNSTREAM))
+        self.assertEqual(queue.coalesced, 1)
+        (frame, _) = queue.get_nowait()
+        self.assertEqual(frame.image, b"2")
+
+    async def test_block(self):
+        queue = FrameQueue(FrameQueueParams(max_size=1))
+        await queue.put(TextFrame("1"))
+        put_task = asyncio.create_task(queue.put(TextFrame("2")))
+        await asyncio.sleep(0.01)
+        self.assertFalse(put_task.done())
+        self.assertEqual(queue.get_nowait().text, "1")
+        await put_task
+        self.assertEqual(queue.get_nowait().text, "2")
+
+    async def test_clear_unblocks(self):
+        queue = FrameQueue(FrameQueueParams(max_size=1))
+        await queue.put(TextFrame("1"))
+        put_task = asyncio.create_task(queue.put(TextFrame("2")))
+        await asyncio.sleep(0.01)
+        queue.clear()
+        await asyncio.wait_for(put_task, timeout=1.0)
+        # The frame that was waiting is stale, so it's discarded.
+        self.assertTrue(queue.empty())
+
+    async def test_clear_starts_new_epoch(self):
+        queue = FrameQueue()
+        for i in range(100):
+            await queue.put(TextFrame(str(i)))
+        self.assertEqual(queue.epoch, 0)
+        queue.clear()
+        self.assertEqual(queue.epoch, 1)
+        self.assertTrue(queue.empty())
+        await asyncio.wait_for(queue.join(), timeout=1.0)
+        await queue.put(TextFrame("new"))
+        self.assertEqual(queue.get_nowait().text, "new")
+
+    async def test_system_and_end_frames_are_always_queued(self):
+        params = FrameQueueParams(max_size=1, default_policy=OverflowPolicy.DROP_NEWEST)
+        queue = FrameQueue(params)
+        await queue.put(TextFrame("1"))
+        await queue.put(StartInterruptionFrame())
+        await queue.put(EndFrame())
+        await queue.put(None)
+        self.assertEqual(queue.qsize(), 4)
+        self.assertEqual(queue.dropped, 0)
+
+    async def test_join_after_drop(self):
+        params = FrameQueueParams(max_size=1, policies={AudioRawFrame: OverflowPolicy.DROP_OLDEST})
+        queue = FrameQueue(params)
+        await queue.put(audio_frame(0))
+        await queue.put(audio_frame(1))
+        queue.get_nowait()
+        queue.task_done()
+        await asyncio.wait_for(queue.join(), timeout=1.0)
+
+    async def test_metrics_frame(self):
+        params = FrameQueueParams(max_size=1, default_policy=OverflowPolicy.DROP_NEWEST)
+        queue = FrameQueue(params, processor="processor", name="queue", report_interval=0)
+        self.assertIsNone(queue.metrics_frame())
+        await queue.put(TextFrame("1"))
+        await queue.put(TextFrame("2"))
+        frame = queue.metrics_frame()
+        self.assertEqual(frame.queues, [{
+            "processor": "processor",
+            "queue": "queue",
+            "max_size": 1,
+            "high_watermark": 1,
+            "dropped": 1,
+            "coalesced": 0,
+        }])
+        # Nothing changed since the last report.
+        self.assertIsNone(queue.metrics_frame())
+
+    def test_pipeline_params(self):
+        params = PipelineParams(queue_params=FrameQueueParams(
+            max_size=10, policies={AudioRawFrame: "drop_oldest"}))
+        self.assertEqual(params.queue_params.policies[AudioRawFrame], OverflowPolicy.DROP_OLDEST)
@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import unittest
+
+from pipecat.frames.frames import TextFrame
+from pipecat.utils.frame_queue import FrameQueue
+from pipecat.utils.frame_worker import FrameQueueWorker
+
+
+class TestFrameQueueWorker(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.queue = FrameQueue()
+        self.started = []
+        self.processed = []
+
+    async def handler(self, frame: TextFrame):
+        self.started.append(frame.text)
+        await asyncio.sleep(0.05)
+        self.processed.append(frame.text)
+
+    async def test_interrupt_keeps_task(self):
+        worker = FrameQueueWorker(self.queue, self.handler)
+        worker.start()
+        task = worker._task
+        for text in ["a", "b", "c"]:
+            await self.queue.put(TextFrame(text))
+        await asyncio.sleep(0.01)
+        self.assertTrue(worker.busy)
+
+        await worker.interrupt()
+        # "a" was cancelled, "b" and "c" were discarded.
+        self.assertFalse(worker.busy)
+        self.assertIs(worker._task, task)
+        self.assertFalse(task.done())
+        self.assertEqual(self.queue.epoch, 1)
+
+        await self.queue.put(TextFrame("d"))
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.started, ["a", "d"])
+        self.assertEqual(self.processed, ["d"])
+        await worker.stop()
+        self.assertTrue(task.done())
+
+    async def test_interrupt_without_cancel(self):
+        worker = FrameQueueWorker(self.queue, self.handler, cancel_on_interrupt=False)
+        worker.start()
+        for text in ["a", "b"]:
+            await self.queue.put(TextFrame(text))
+        await asyncio.sleep(0.01)
+        await worker.interrupt()
+        await asyncio.sleep(0.1)
+        # The current item is finished, the queued one is discarded.
+        self.assertEqual(self.processed, ["a"])
+        await worker.stop()
+
+    async def test_interrupt_idle(self):
+        worker = FrameQueueWorker(self.queue, self.handler)
+        worker.start()
+        await worker.interrupt()
+        await self.queue.put(TextFrame("a"))
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.processed, ["a"])
+        self.assertEqual(worker.interruptions, 1)
+        await worker.stop()
@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import threading
+import unittest
+
+from pipecat.frames.frames import AudioRawFrame, TextFrame
+
+
+class TestFrameIdentity(unittest.TestCase):
+
+    def test_ids_are_unique_across_threads(self):
+        ids = []
+
+        def create():
+            ids.extend(TextFrame("hello").id for _ in range(10000))
+
+        threads = [threading.Thread(target=create) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(ids), len(set(ids)))
+
+    def test_names_are_per_class(self):
+        text1 = TextFrame("hello")
+        text2 = TextFrame("world")
+        audio = AudioRawFrame(b"\x00\x00", 16000, 1)
+
+        (text_class, text_count1) = text1.name.split("#")
+        (_, text_count2) = text2.name.split("#")
+        (audio_class, _) = audio.name.split("#")
+
+        self.assertEqual(text_class, "TextFrame")
+        self.assertEqual(audio_class, "AudioRawFrame")
+        self.assertEqual(int(text_count2), int(text_count1) + 1)
+
+    def test_name_can_be_overridden(self):
+        frame = TextFrame("hello")
+        frame.name = "custom"
+        self.assertEqual(frame.name, "custom")
+        self.assertEqual(str(frame), "custom(text: hello)")
+
+
+class TestFrameSlots(unittest.TestCase):
+
+    def test_frames_have_no_dict(self):
+        frame = AudioRawFrame(b"\x00" * 640, 16000, 1)
+        self.assertFalse(hasattr(frame, "__dict__"))
+        with self.assertRaises(AttributeError):
+            frame.foo = "bar"
+
+    def test_audio_num_frames(self):
+        frame = AudioRawFrame(b"\x00" * 640, 16000, 2)
+        self.assertEqual(frame.num_frames, 160)
+
+    def test_subclasses_without_slots(self):
+        class CustomFrame(TextFrame):
+            pass
+
+        frame = CustomFrame("hello")
+        frame.foo = "bar"
+        self.assertEqual(frame.foo, "bar")
+        self.assertTrue(frame.name.startswith("CustomFrame#"))
+
+
+if __name__ == "__main__":
+    unittest.main()
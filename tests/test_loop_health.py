@@ -0,0 +1,109 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+import unittest
+
+from pipecat.frames.frames import EndFrame, MetricsFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameProcessor
+from pipecat.utils import loop_health
+from pipecat.utils.loop_health import (
+    LoopHealthMonitor,
+    acquire_loop_health_monitor,
+    release_loop_health_monitor)
+from pipecat.utils.test_frame_processor import FrameCollector
+
+
+class BlockingProcessor(FrameProcessor):
+
+    def __init__(self, **kwargs):
+        super().__init__(name="BlockingProcessor", **kwargs)
+        self._task = self.get_event_loop().create_task(self._task_handler())
+
+    async def _task_handler(self):
+        await asyncio.sleep(0.01)
+        # Block the event loop.
+        time.sleep(0.1)
+        await asyncio.sleep(10)
+
+    async def cleanup(self):
+        self._task.cancel()
+
+
+class TestLoopHealthMonitor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_slow_callbacks(self):
+        monitor = LoopHealthMonitor(slow_callback_threshold=0.05, lag_interval=0.01)
+        monitor.start()
+        processor = BlockingProcessor()
+        await asyncio.sleep(0.2)
+
+        snapshot = monitor.snapshot()
+        self.assertEqual(snapshot["slow_callback_counts"], {"BlockingProcessor": 1})
+        self.assertGreaterEqual(snapshot["slow_callbacks"][0]["duration"], 0.1)
+        self.assertEqual(snapshot["tasks"]["BlockingProcessor"], 1)
+        self.assertGreater(snapshot["max_loop_lag"], 0.05)
+
+        await processor.cleanup()
+        await monitor.stop()
+        self.assertFalse(monitor.running)
+
+    async def test_pipeline_task_health_metrics(self):
+        collector = FrameCollector()
+        task = PipelineTask(
+            Pipeline([collector]),
+            PipelineParams(enable_health_metrics=True, health_metrics_interval=0.05))
+
+        async def end_task():
+            await asyncio.sleep(0.2)
+            self.assertIsNotNone(task.health())
+            await task.queue_frame(EndFrame())
+
+        await asyncio.gather(task.run(), end_task())
+
+        health = [f.loop_health[0] for f in collector.frames
+                  if isinstance(f, MetricsFrame) and f.loop_health]
+        self.assertGreater(len(health), 0)
+        self.assertEqual(health[0]["processor"], task.name)
+        self.assertIn("loop_lag", health[0])
+        self.assertGreater(health[0]["num_tasks"], 0)
+
+    async def test_runner_health(self):
+        runner = PipelineRunner(handle_sigint=False, slow_callback_threshold=0.05)
+        task = PipelineTask(Pipeline([FrameCollector()]))
+        await runner.start_task(task)
+        health = runner.health()
+        self.assertEqual(health["pipeline_tasks"], 1)
+        await task.queue_frame(EndFrame())
+        await runner.wait()
+
+    async def test_shared_monitor(self):
+        monitor1 = acquire_loop_health_monitor(slow_callback_threshold=0.05)
+        monitor2 = acquire_loop_health_monitor(slow_callback_threshold=0.05)
+        self.assertIs(monitor1, monitor2)
+        self.assertEqual(len(loop_health._MONITORS[asyncio.get_running_loop()]), 1)
+        await release_loop_health_monitor(monitor1)
+        self.assertTrue(monitor1.running)
+        await release_loop_health_monitor(monitor2)
+        self.assertFalse(monitor1.running)
+        self.assertIs(asyncio.events.Handle._run, loop_health._ORIGINAL_HANDLE_RUN)
+
+    async def test_pipeline_task_cancelled(self):
+        tasks = [PipelineTask(Pipeline([FrameCollector()]), PipelineParams(enable_health_metrics=True))
+                 for _ in range(3)]
+        runs = [asyncio.create_task(t.run()) for t in tasks]
+        await asyncio.sleep(0.05)
+        # All the tasks share a single monitor.
+        self.assertEqual(len(loop_health._MONITORS[asyncio.get_running_loop()]), 1)
+        for run in runs:
+            run.cancel()
+        await asyncio.gather(*runs, return_exceptions=True)
+        self.assertNotIn(asyncio.get_running_loop(), loop_health._MONITORS)
+        self.assertIs(asyncio.events.Handle._run, loop_health._ORIGINAL_HANDLE_RUN)
@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import unittest
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    EndFrame,
+    Frame,
+    StartFrame,
+    StartInterruptionFrame,
+    TextFrame)
+from pipecat.pipeline.parallel_pipeline import FanOutTracker, ParallelPipeline
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.filters.frame_filter import FrameFilter
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.utils.test_frame_processor import FrameCollector
+
+
+class SlowProcessor(FrameProcessor):
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        if isinstance(frame, TextFrame):
+            await asyncio.sleep(0.05)
+        await self.push_frame(frame, direction)
+
+
+class TestFanOutTracker(unittest.TestCase):
+
+    def test_push_once(self):
+        tracker = FanOutTracker(num_pipelines=2, max_frames=10)
+        frame = TextFrame("hello")
+        tracker.add(frame)
+        self.assertTrue(tracker.should_push(frame))
+        self.assertFalse(tracker.should_push(frame))
+        self.assertEqual(len(tracker), 0)
+
+    def test_untracked_frames_are_pushed(self):
+        tracker = FanOutTracker(num_pipelines=2, max_frames=10)
+        self.assertTrue(tracker.should_push(TextFrame("hello")))
+
+    def test_bounded(self):
+        tracker = FanOutTracker(num_pipelines=2, max_frames=10)
+        for _ in range(100):
+            # Frames dropped by the pipelines never come out.
+            tracker.add(TextFrame("hello"))
+        self.assertEqual(len(tracker), 10)
+
+
+class TestParallelPipeline(unittest.IsolatedAsyncioTestCase):
+
+    async def run_parallel_pipeline(self, use_workers: bool):
+        collector = FrameCollector()
+        parallel = ParallelPipeline(
+            [FrameFilter([TextFrame, EndFrame])],
+            [FrameFilter([AudioRawFrame, EndFrame])],
+            [],
+            use_workers=use_workers,
+            max_queue_size=4)
+        task = PipelineTask(Pipeline([parallel, collector]))
+
+        frames = []
+        for i in range(50):
+            frames.append(TextFrame(f"{i}"))
+            frames.append(AudioRawFrame(b"\x00\x00", 16000, 1))
+        await task.queue_frames(frames + [EndFrame()])
+        await task.run()
+
+        ids = [f.id for f in collector.frames]
+        self.assertEqual(len(ids), len(set(ids)))
+        texts = [f.text for f in collector.frames if isinstance(f, TextFrame)]
+        self.assertEqual(texts, [f"{i}" for i in range(50)])
+        self.assertEqual(len([f for f in collector.frames if isinstance(f, AudioRawFrame)]), 50)
+        self.assertIsInstance(collector.frames[-1], EndFrame)
+
+    async def test_gather(self):
+        await self.run_parallel_pipeline(use_workers=False)
+
+    async def test_workers(self):
+        await self.run_parallel_pipeline(use_workers=True)
+
+    async def test_workers_interruption(self):
+        collector = FrameCollector()
+        parallel = ParallelPipeline([SlowProcessor()], use_workers=True)
+        parallel.link(collector)
+        await parallel.process_frame(StartFrame(), FrameDirection.DOWNSTREAM)
+        for i in range(10):
+            await parallel.process_frame(TextFrame(f"{i}"), FrameDirection.DOWNSTREAM)
+        await asyncio.sleep(0.01)
+        await parallel.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        await parallel.process_frame(TextFrame("after"), FrameDirection.DOWNSTREAM)
+        await parallel.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
+
+        # The queued frames (and the one being processed) were discarded.
+        texts = [f.text for f in collector.frames if isinstance(f, TextFrame)]
+        self.assertEqual(texts, ["after"])
+        self.assertTrue(any(isinstance(f, StartInterruptionFrame) for f in collector.frames))
+
+
+if __name__ == "__main__":
+    unittest.main()
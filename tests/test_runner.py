@@ -0,0 +1,143 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import unittest
+
+from pipecat.frames.frames import EndFrame, TextFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.runner import PipelineRunner
+from pipecat.pipeline.task import PipelineTask
+from pipecat.utils.loop_lag import LoopLagMonitor
+from pipecat.utils.shared_models import clear_shared_models, get_shared_model, shared_model_stats
+from pipecat.utils.test_frame_processor import FrameCollector
+
+
+class FailingProcessor(FrameCollector):
+
+    async def cleanup(self):
+        raise Exception("cleanup failed")
+
+
+class TestPipelineRunner(unittest.IsolatedAsyncioTestCase):
+
+    async def test_multiple_tasks(self):
+        runner = PipelineRunner(handle_sigint=False)
+        collectors = [FrameCollector() for _ in range(10)]
+        for collector in collectors:
+            task = PipelineTask(Pipeline([collector]))
+            await task.queue_frames([TextFrame("hello"), EndFrame()])
+            self.assertTrue(await runner.start_task(task))
+        await runner.wait()
+        self.assertEqual(runner.num_tasks, 0)
+        for collector in collectors:
+            self.assertTrue(any(isinstance(f, TextFrame) for f in collector.frames))
+
+    async def test_failure_isolation(self):
+        runner = PipelineRunner(handle_sigint=False)
+        good = FrameCollector()
+        good_task = PipelineTask(Pipeline([good]))
+        bad_task = PipelineTask(Pipeline([FailingProcessor()]))
+        await bad_task.queue_frame(EndFrame())
+        await runner.start_task(bad_task)
+        await runner.start_task(good_task)
+        await asyncio.sleep(0.05)
+        await good_task.queue_frames([TextFrame("hello"), EndFrame()])
+        await runner.wait()
+        self.assertTrue(good_task.has_finished())
+        self.assertTrue(any(isinstance(f, TextFrame) for f in good.frames))
+
+    async def test_max_tasks(self):
+        runner = PipelineRunner(handle_sigint=False, max_tasks=1)
+        task1 = PipelineTask(Pipeline([FrameCollector()]))
+        task2 = PipelineTask(Pipeline([FrameCollector()]))
+        self.assertTrue(await runner.start_task(task1))
+        self.assertFalse(await runner.start_task(task2))
+        await task1.queue_frame(EndFrame())
+        await runner.wait()
+        self.assertTrue(runner.can_accept_task())
+
+    async def test_max_loop_lag(self):
+        runner = PipelineRunner(handle_sigint=False, max_loop_lag=0.01)
+        task = PipelineTask(Pipeline([FrameCollector()]))
+        await runner.start_task(task)
+        for _ in range(5):
+            await asyncio.sleep(0.1)
+            # Block the event loop.
+            sum(range(5_000_000))
+        await asyncio.sleep(0.2)
+        self.assertGreater(runner.loop_lag, 0.01)
+        self.assertFalse(runner.can_accept_task())
+        await task.queue_frame(EndFrame())
+        await runner.wait()
+
+    async def test_monitor_released_without_wait(self):
+        runner = PipelineRunner(handle_sigint=False)
+        task = PipelineTask(Pipeline([FrameCollector()]))
+        await runner.start_task(task)
+        self.assertIn("loop_lag", runner.health())
+        await task.queue_frame(EndFrame())
+        await runner.wait_for_task(task)
+        self.assertEqual(runner.num_tasks, 0)
+        self.assertNotIn("loop_lag", runner.health())
+        # Releasing again is a no-op.
+        await runner.wait()
+        self.assertNotIn("loop_lag", runner.health())
+
+
+class TestPipelineRunnerWithoutLoop(unittest.TestCase):
+
+    def test_create_outside_event_loop(self):
+        runner = PipelineRunner(handle_sigint=False)
+        self.assertEqual(runner.loop_lag, 0.0)
+
+        async def run():
+            task = PipelineTask(Pipeline([FrameCollector()]))
+            await task.queue_frame(EndFrame())
+            await runner.run(task)
+
+        asyncio.run(run())
+        self.assertEqual(runner.num_tasks, 0)
+
+
+class TestLoopLagMonitor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_lag(self):
+        monitor = LoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        # Block the event loop.
+        sum(range(5_000_000))
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        self.assertGreater(monitor.max_lag, 0.01)
+        self.assertFalse(monitor.running)
+
+
+class TestSharedModels(unittest.TestCase):
+
+    def test_load_once(self):
+        clear_shared_models()
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return object()
+
+        model1 = get_shared_model(("test", "model"), loader)
+        model2 = get_shared_model(("test", "model"), loader)
+        self.assertIs(model1, model2)
+        self.assertEqual(len(loads), 1)
+        clear_shared_models()
+
+    def test_stats(self):
+        clear_shared_models()
+        get_shared_model(("test", "big"), lambda: bytearray(b"1" * 50_000_000))
+        stats = shared_model_stats()[("test", "big")]
+        self.assertGreater(stats["load_time"], 0)
+        self.assertGreater(stats["memory"], 40_000_000)
+        clear_shared_models()
+        self.assertEqual(shared_model_stats(), {})
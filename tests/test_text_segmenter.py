@@ -0,0 +1,80 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+from pipecat.utils.text_segmenter import SentenceSegmenter
+
+
+def segment(segmenter: SentenceSegmenter, tokens):
+    segments = []
+    for token in tokens:
+        segments += segmenter.push(token)
+    last = segmenter.flush()
+    if last:
+        segments.append(last)
+    return [s.strip() for s in segments]
+
+
+class TestSentenceSegmenter(unittest.TestCase):
+
+    def test_sentences(self):
+        tokens = ["Hello", " there", ".", " How", " are", " you", "?!", " Fine"]
+        self.assertEqual(segment(SentenceSegmenter(), tokens),
+                         ["Hello there.", "How are you?!", "Fine"])
+
+    def test_abbreviations(self):
+        tokens = ["I", " met", " Mr", ".", " Smith", " and", " Dr", ". ", "J", ". R", ". R", ". Tolkien", ". ", "Bye."]
+        self.assertEqual(segment(SentenceSegmenter(), tokens),
+                         ["I met Mr. Smith and Dr. J. R. R. Tolkien.", "Bye."])
+
+    def test_abbreviations_that_are_words(self):
+        self.assertEqual(segment(SentenceSegmenter(), ["The", " answer", " is", " no", ".", " I", " checked", " twice", "."]),
+                         ["The answer is no.", "I checked twice."])
+        self.assertEqual(segment(SentenceSegmenter(), ["No", ".", " That", " is", " wrong", "."]),
+                         ["No.", "That is wrong."])
+        # Only an abbreviation if a number follows.
+        self.assertEqual(segment(SentenceSegmenter(), ["See", " No", ".", " 5", " and", " Fig", ". ", "2", ". ", "Done."]),
+                         ["See No. 5 and Fig. 2.", "Done."])
+
+    def test_single_letters(self):
+        segmenter = SentenceSegmenter()
+        self.assertEqual([s.strip() for s in segmenter.push("Plan A. Plan B. ")], ["Plan A.", "Plan B."])
+        self.assertEqual(segment(SentenceSegmenter(), ["Written", " by", " J", ".", " K", ".", " Rowling", ". ", "Yes."]),
+                         ["Written by J. K. Rowling.", "Yes."])
+        self.assertEqual(segment(SentenceSegmenter(), ["Take", " Vitamin", " C", ".", " Then", " rest", "."]),
+                         ["Take Vitamin C.", "Then rest."])
+
+    def test_numbers(self):
+        tokens = ["It", " costs", " 3", ".", "5", " dollars", " (", "e", ".g", ". ", "today", ")", ".", " Then:",
+                  "\n", "1", ".", " First", "."]
+        self.assertEqual(segment(SentenceSegmenter(), tokens),
+                         ["It costs 3.5 dollars (e.g. today).", "Then:\n1. First."])
+
+    def test_closing_quotes(self):
+        tokens = ['He', ' said', ' "', 'Stop', '."', ' Then', ' left', '.']
+        self.assertEqual(segment(SentenceSegmenter(), tokens), ['He said "Stop."', 'Then left.'])
+
+    def test_first_clause_fast(self):
+        segmenter = SentenceSegmenter(first_clause_fast=True, first_chunk_min_words=3, first_chunk_max_words=6)
+        text = "Well, I think that, in general, this is fine. And, this one, too."
+        self.assertEqual(segment(segmenter, text.split(" ")[:1] + [" " + t for t in text.split(" ")[1:]]),
+                         ["Well, I think that,", "in general, this is fine.", "And, this one, too."])
+
+        # Numbers with commas are not split.
+        self.assertEqual(segment(segmenter, ["About", " 1,000", " people", " came", " here", " today", " and"]),
+                         ["About 1,000 people came here today", "and"])
+
+        # Only the first chunk after a reset.
+        segmenter.reset()
+        self.assertEqual(segmenter.push("One two three four five six seven "), ["One two three four five six"])
+        self.assertEqual(segmenter.push("one two three four five six seven "), [])
+
+    def test_reset(self):
+        segmenter = SentenceSegmenter()
+        segmenter.push("Hello there")
+        segmenter.reset()
+        self.assertEqual(segment(segmenter, ["Bye", "."]), ["Bye."])
@@ -0,0 +1,149 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import json
+import os
+import tempfile
+import unittest
+
+from typing import AsyncGenerator
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    MetricsFrame,
+    TTSStartedFrame,
+    TextFrame,
+    TranscriptionFrame,
+    UserStoppedSpeakingFrame)
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+from pipecat.utils.tracing import LatencyTracer
+
+
+class MockLLMService(FrameProcessor):
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        await self.push_frame(frame, direction)
+        if isinstance(frame, TranscriptionFrame):
+            await self.push_frame(LLMFullResponseStartFrame())
+            await self.push_frame(TextFrame("Hello there."))
+            await self.push_frame(LLMFullResponseEndFrame())
+
+
+class MockTTSService(TTSService):
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        yield AudioRawFrame(b"\x00" * 1280, 16000, 1)
+
+
+class MockOutputTransport(BaseOutputTransport):
+
+    def __init__(self, **kwargs):
+        super().__init__(TransportParams(audio_out_enabled=True), **kwargs)
+        self.metrics = []
+
+    async def send_metrics(self, frame: MetricsFrame):
+        self.metrics.append(frame)
+
+
+class TestLatencyTracer(unittest.IsolatedAsyncioTestCase):
+
+    async def run_turn(self, params: PipelineParams):
+        output = MockOutputTransport()
+        pipeline = Pipeline([MockLLMService(), MockTTSService(), output])
+        task = PipelineTask(pipeline, params)
+        await task.queue_frames([
+            UserStoppedSpeakingFrame(),
+            TranscriptionFrame("Hi", "user", ""),
+            EndFrame()])
+        await task.run()
+        return (task, output)
+
+    async def test_turn_latency(self):
+        (task, output) = await self.run_turn(PipelineParams(enable_tracing=True))
+
+        turns = task.tracer.turns
+        self.assertEqual(len(turns), 1)
+        latency = turns[0]
+        self.assertEqual(latency["turn"], 1)
+        for stage in ["stt", "llm", "tts", "output", "total"]:
+            self.assertIsNotNone(latency[stage])
+            self.assertGreaterEqual(latency[stage], 0)
+
+        latency_frames = [m for m in output.metrics if m.latency]
+        self.assertEqual(len(latency_frames), 1)
+        self.assertEqual(latency_frames[0].latency, [latency])
+
+    async def test_chrome_trace(self):
+        (task, _) = await self.run_turn(PipelineParams(enable_tracing=True))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "trace.json")
+            task.tracer.export_chrome_trace(path)
+            with open(path) as f:
+                trace = json.load(f)
+
+        events = trace["traceEvents"]
+        spans = [e["name"] for e in events if e["ph"] == "X"]
+        self.assertEqual(spans, ["stt", "llm", "tts", "output"])
+        self.assertTrue(any(e["name"].startswith("UserStoppedSpeakingFrame") for e in events))
+
+    async def test_disabled_by_default(self):
+        (task, output) = await self.run_turn(PipelineParams())
+        self.assertIsNone(task.tracer)
+        self.assertFalse(any(m.latency for m in output.metrics))
+
+    async def test_max_turns(self):
+        tracer = LatencyTracer(max_turns=3)
+        processor = FrameProcessor()
+        for _ in range(10):
+            tracer.frame_pushed(processor, UserStoppedSpeakingFrame(), FrameDirection.DOWNSTREAM)
+            tracer.audio_written(processor)
+        self.assertEqual([t["turn"] for t in tracer.turns], [8, 9, 10])
+
+    async def test_overlapping_turns(self):
+        tracer = LatencyTracer()
+        stt = FrameProcessor(name="stt")
+        llm = FrameProcessor(name="llm")
+        tts = FrameProcessor(name="tts")
+        output = FrameProcessor(name="output")
+        down = FrameDirection.DOWNSTREAM
+
+        tracer.frame_pushed(stt, UserStoppedSpeakingFrame(), down)
+        tracer.frame_pushed(stt, TranscriptionFrame("Hi", "user", ""), down)
+        tracer.frame_pushed(llm, LLMFullResponseStartFrame(), down)
+        tracer.frame_pushed(llm, TextFrame("Hello"), down)
+        tracer.frame_pushed(tts, TTSStartedFrame(), down)
+
+        # The user barges in before the first turn audio is written.
+        tracer.frame_pushed(stt, UserStoppedSpeakingFrame(), down)
+        tracer.frame_pushed(stt, TranscriptionFrame("Wait", "user", ""), down)
+
+        # Frames still in flight from the first turn don't count.
+        tracer.frame_pushed(llm, TextFrame("there."), down)
+        tracer.frame_pushed(tts, AudioRawFrame(b"\x00" * 320, 16000, 1), down)
+        self.assertIsNone(tracer.audio_written(output))
+
+        tracer.frame_pushed(llm, LLMFullResponseStartFrame(), down)
+        tracer.frame_pushed(llm, TextFrame("Sure."), down)
+        tracer.frame_pushed(tts, TTSStartedFrame(), down)
+        tracer.frame_pushed(tts, AudioRawFrame(b"\x00" * 320, 16000, 1), down)
+        metrics = tracer.audio_written(output)
+
+        self.assertIsNotNone(metrics)
+        self.assertEqual([t["turn"] for t in tracer.turns], [2])
+        self.assertEqual(metrics.latency, tracer.turns)
+        for stage in ["stt", "llm", "tts", "output"]:
+            self.assertIsNotNone(metrics.latency[0][stage])
@@ -0,0 +1,96 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import os
+import tempfile
+import unittest
+
+from pipecat.utils.tts_cache import TTSCache
+
+
+class TestTTSCache(unittest.TestCase):
+
+    def test_keys(self):
+        cache = TTSCache()
+        key = cache.key(("voice", 1), "Hello  there.")
+        self.assertEqual(key, cache.key(("voice", 1), " Hello\nthere. "))
+        self.assertNotEqual(key, cache.key(("voice", 2), "Hello there."))
+        self.assertNotEqual(key, cache.key(("voice", 1), "hello there."))
+
+    def test_memory_lru(self):
+        cache = TTSCache(max_memory_bytes=300)
+        for key in ["a", "b", "c"]:
+            cache.put(key, b"\x00" * 100, 16000, 1)
+        # "a" is now the most recently used.
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("d", b"\x00" * 100, 16000, 1)
+        self.assertIsNone(cache.get("b"))
+        for key in ["a", "c", "d"]:
+            self.assertIsNotNone(cache.get(key))
+        self.assertEqual(cache.memory_bytes, 300)
+
+        # Too big to be cached.
+        cache.put("e", b"\x00" * 301, 16000, 1)
+        self.assertIsNone(cache.get("e"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["memory_hits"], 4)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["bytes_saved"], 400)
+
+    def test_frames(self):
+        cache = TTSCache(chunk_secs=0.02)
+        cache.put("a", b"\x01" * 1500, 16000, 1)
+        frames = list(cache.get("a").frames(cache.chunk_secs))
+        self.assertEqual([len(f.audio) for f in frames], [640, 640, 220])
+        self.assertTrue(all(f.sample_rate == 16000 and f.num_channels == 1 for f in frames))
+
+        # Chunks are at least one sample.
+        frames = list(cache.get("a").frames(0.00001))
+        self.assertEqual(len(frames), 750)
+
+    def test_disk_shared(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # E.g. two worker processes.
+            cache1 = TTSCache(cache_dir=cache_dir)
+            cache2 = TTSCache(cache_dir=cache_dir)
+            cache1.put("a", b"\x01\x02" * 100, 24000, 1)
+            cache1.wait_disk_writes()
+
+            audio = cache2.get("a")
+            self.assertEqual(bytes(audio.audio), b"\x01\x02" * 100)
+            self.assertEqual(audio.sample_rate, 24000)
+            # It's now also in memory.
+            self.assertIsNotNone(cache2.get("a"))
+            stats = cache2.stats()
+            self.assertEqual((stats["disk_hits"], stats["memory_hits"]), (1, 1))
+
+    def test_disk_eviction(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = TTSCache(cache_dir=cache_dir, max_memory_bytes=0, max_disk_bytes=500)
+            for i, key in enumerate(["a", "b", "c"]):
+                cache.put(key, b"\x00" * 200, 16000, 1)
+                cache.wait_disk_writes()
+                # Make sure modification times are different.
+                path = os.path.join(cache_dir, f"{key}.pcm")
+                os.utime(path, (i, i))
+            self.assertIsNone(cache.get("a"))
+            self.assertIsNotNone(cache.get("b"))
+            self.assertIsNotNone(cache.get("c"))
+
+    def test_disk_size_tracked(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = TTSCache(cache_dir=cache_dir, max_memory_bytes=0, max_disk_bytes=10000)
+            for i in range(20):
+                cache.put(str(i), b"\x00" * 988, 16000, 1)
+                cache.wait_disk_writes()
+                os.utime(os.path.join(cache_dir, f"{i}.pcm"), (i, i))
+            # Files are removed when the tracked size goes over the limit, until
+            # it's below 90% of it.
+            files = [f for f in os.listdir(cache_dir) if f.endswith(".pcm")]
+            self.assertLessEqual(len(files) * 1000, 10000)
+            self.assertGreaterEqual(len(files), 8)
+            self.assertIsNotNone(cache.get("19"))
@@ -0,0 +1,213 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import unittest
+
+from typing import AsyncGenerator
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    EndFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    MetricsFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    TextFrame)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+from pipecat.utils.text_segmenter import SentenceSegmenter
+from pipecat.utils.tts_cache import TTSCache
+
+
+class Collector(FrameProcessor):
+
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        self.frames.append(frame)
+
+
+class MockTTSService(TTSService):
+
+    def __init__(self, voice: str = "voice", **kwargs):
+        super().__init__(**kwargs)
+        self._voice = voice
+        self.texts = []
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        self.texts.append(text)
+        await asyncio.sleep(0.01)
+        yield AudioRawFrame(b"\x00" * 320, 16000, 1)
+
+
+class SlowTTSService(TTSService):
+    """Takes `delays[text]` seconds to convert text, in two audio frames."""
+
+    def __init__(self, delays, **kwargs):
+        super().__init__(**kwargs)
+        self.delays = delays
+        self.running = 0
+        self.max_running = 0
+        self.cancelled = 0
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delays[text] / 2)
+            yield AudioRawFrame(text.encode(), 16000, 1)
+            await asyncio.sleep(self.delays[text] / 2)
+            yield AudioRawFrame(text.encode(), 16000, 1)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.running -= 1
+
+
+class TestTTSService(unittest.IsolatedAsyncioTestCase):
+
+    async def run_tts(self, tts: TTSService, frames):
+        collector = Collector()
+        tts.link(collector)
+        await tts.process_frame(StartFrame(enable_metrics=True), FrameDirection.DOWNSTREAM)
+        for frame in frames:
+            await tts.process_frame(frame, FrameDirection.DOWNSTREAM)
+        return collector.frames
+
+    async def test_sentences(self):
+        tts = MockTTSService()
+        await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("Hi"), TextFrame(" Mr"), TextFrame("."), TextFrame(" Smith"), TextFrame("."),
+            TextFrame(" How"), TextFrame(" are"), TextFrame(" you"),
+            LLMFullResponseEndFrame()])
+        # The last sentence is synthesized at the end of the response.
+        self.assertEqual(tts.texts, ["Hi Mr. Smith.", "How are you"])
+
+    async def test_first_clause_fast(self):
+        tts = MockTTSService(text_segmenter=SentenceSegmenter(first_clause_fast=True))
+        await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("Well"), TextFrame(" you"), TextFrame(" know"), TextFrame(","), TextFrame(" it"),
+            TextFrame(" depends"), TextFrame(","), TextFrame(" really"), TextFrame("."),
+            LLMFullResponseEndFrame(),
+            LLMFullResponseStartFrame(),
+            TextFrame("Sure"), TextFrame(" I"), TextFrame(" can"), TextFrame(","), TextFrame(" ok"),
+            LLMFullResponseEndFrame()])
+        self.assertEqual(tts.texts, ["Well you know,", "it depends, really.", "Sure I can,", "ok"])
+
+    async def test_no_aggregation(self):
+        tts = MockTTSService(aggregate_sentences=False)
+        await self.run_tts(tts, [TextFrame("Hi"), TextFrame(" there")])
+        self.assertEqual(tts.texts, ["Hi", "there"])
+
+    async def test_first_audio_metrics(self):
+        tts = MockTTSService()
+        frames = await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("One"), TextFrame("."), TextFrame(" Two"), TextFrame("."),
+            LLMFullResponseEndFrame()])
+        metrics = [f.first_audio[0] for f in frames if isinstance(f, MetricsFrame) and f.first_audio]
+        # Only the first audio of the response is reported.
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(metrics[0]["processor"], tts.name)
+        self.assertGreaterEqual(metrics[0]["value"], 0.01)
+
+    async def test_first_audio_metrics_lookahead(self):
+        tts = MockTTSService(lookahead=1)
+        frames = await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("One"), TextFrame("."), TextFrame(" Two"), TextFrame("."),
+            LLMFullResponseEndFrame(),
+            EndFrame()])
+        await tts.cleanup()
+        # The response has ended before the first audio is played out.
+        metrics = [f.first_audio[0] for f in frames if isinstance(f, MetricsFrame) and f.first_audio]
+        self.assertEqual(len(metrics), 1)
+        self.assertGreaterEqual(metrics[0]["value"], 0.01)
+
+    async def test_lookahead_order(self):
+        delays = {"One.": 0.3, "Two.": 0.1, "Three.": 0.1, "Four.": 0.1}
+        tts = SlowTTSService(delays, lookahead=2)
+        start_time = asyncio.get_running_loop().time()
+        frames = await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("One. Two. Three. Four."),
+            LLMFullResponseEndFrame(),
+            EndFrame()])
+        elapsed = asyncio.get_running_loop().time() - start_time
+        await tts.cleanup()
+
+        frames = [f for f in frames if not isinstance(f, (StartFrame, MetricsFrame))]
+        expected = [LLMFullResponseStartFrame]
+        for _ in delays:
+            expected += [TTSStartedFrame, AudioRawFrame, AudioRawFrame, TTSStoppedFrame, TextFrame]
+        # Frames are not pushed before the audio that was converted before them.
+        expected += [LLMFullResponseEndFrame, EndFrame]
+        self.assertEqual([type(f) for f in frames], expected)
+        texts = [f.audio.decode() for f in frames if isinstance(f, AudioRawFrame)]
+        self.assertEqual(texts, ["One.", "One.", "Two.", "Two.", "Three.", "Three.", "Four.", "Four."])
+
+        # Conversions overlap, but at most `lookahead` are ahead of the one
+        # being played out.
+        self.assertEqual(tts.max_running, 3)
+        self.assertLess(elapsed, sum(delays.values()))
+
+    async def test_lookahead_interruption(self):
+        delays = {"One.": 0.1, "Two.": 0.2, "Three.": 0.2}
+        tts = SlowTTSService(delays, lookahead=1)
+        collector = Collector()
+        tts.link(collector)
+        await tts.process_frame(StartFrame(allow_interruptions=True), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(TextFrame("One. Two. Three."), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+        await asyncio.sleep(0.15)
+
+        await tts.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        self.assertEqual(tts.running, 0)
+        self.assertEqual(tts.cancelled, 2)
+        num_frames = len(collector.frames)
+        self.assertIsInstance(collector.frames[-1], StartInterruptionFrame)
+
+        # Nothing else is played out.
+        await asyncio.sleep(0.3)
+        self.assertEqual(len(collector.frames), num_frames)
+        texts = [f.audio.decode() for f in collector.frames if isinstance(f, AudioRawFrame)]
+        self.assertEqual(texts, ["One.", "One.", "Two."])
+        await tts.cleanup()
+
+    async def test_cache(self):
+        cache = TTSCache(chunk_secs=0.005)
+        tts = MockTTSService(tts_cache=cache)
+        frames = await self.run_tts(tts, [
+            TextFrame("Hello there. "), TextFrame("One moment. "), TextFrame("Hello  there. ")])
+        await tts.say("One moment.")
+        self.assertEqual(tts.texts, ["Hello there.", "One moment."])
+
+        # Cached audio is sent in `chunk_secs` frames.
+        audio = [f for f in frames if isinstance(f, AudioRawFrame)]
+        self.assertEqual([len(f.audio) for f in audio], [320, 320, 160, 160, 160, 160])
+
+        metrics = [f.tts_cache[0] for f in frames if isinstance(f, MetricsFrame) and f.tts_cache]
+        self.assertEqual(metrics[0]["processor"], tts.name)
+        self.assertEqual(cache.stats()["bytes_saved"], 640)
+
+        # Another voice is a different entry.
+        tts2 = MockTTSService(voice="other", tts_cache=cache)
+        await tts2.say("Hello there.")
+        self.assertEqual(tts2.texts, ["Hello there."])
@@ -0,0 +1,47 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+import unittest
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.processors.user_idle_processor import UserIdleProcessor
+from pipecat.transports.base_output import BaseOutputTransport
+from pipecat.transports.base_transport import TransportParams
+
+
+class MockOutputTransport(BaseOutputTransport):
+
+    async def write_raw_audio_frames(self, frames: bytes | memoryview):
+        pass
+
+
+class TestUserIdleProcessor(unittest.IsolatedAsyncioTestCase):
+
+    async def test_not_idle_while_bot_speaks(self):
+        idle_times = []
+
+        async def user_idle_callback(user_idle: UserIdleProcessor):
+            idle_times.append(time.monotonic())
+
+        # Only BotStartedSpeakingFrame and BotStoppedSpeakingFrame are pushed.
+        params = TransportParams(audio_out_enabled=True, bot_speaking_frame_interval=None)
+        user_idle = UserIdleProcessor(callback=user_idle_callback, timeout=0.15)
+        task = PipelineTask(Pipeline([user_idle, MockOutputTransport(params)]))
+        runner = asyncio.create_task(task.run())
+
+        # 600ms of audio.
+        start_time = time.monotonic()
+        await task.queue_frame(AudioRawFrame(b"\x00" * 640 * 30, 16000, 1))
+        await asyncio.sleep(1.2)
+        await task.queue_frame(EndFrame())
+        await runner
+
+        self.assertTrue(idle_times)
+        self.assertGreater(idle_times[0] - start_time, 0.6)
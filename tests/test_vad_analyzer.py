@@ -0,0 +1,61 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import unittest
+
+import numpy as np
+
+from pipecat.vad.vad_analyzer import VADAnalyzer, VADParams, VADState
+
+
+class MockVADAnalyzer(VADAnalyzer):
+    """Voice confidence is 1.0 if the first sample of the window is not 0. It
+    also keeps a copy of all the windows analyzed."""
+
+    def __init__(self, **kwargs):
+        super().__init__(sample_rate=16000, num_channels=1, **kwargs)
+        self.windows = []
+
+    def num_frames_required(self) -> int:
+        return 160
+
+    def voice_confidence(self, buffer) -> float:
+        self.windows.append(bytes(buffer))
+        return 1.0 if np.frombuffer(buffer, dtype=np.int16)[0] != 0 else 0.0
+
+
+def audio(num_windows: int, value: int = 0) -> bytes:
+    return np.full(num_windows * 160, value, dtype=np.int16).tobytes()
+
+
+class TestVADAnalyzer(unittest.TestCase):
+
+    def setUp(self):
+        # 2 windows to start speaking and 3 windows to stop.
+        params = VADParams(start_secs=0.02, stop_secs=0.03, min_volume=0.0)
+        self.analyzer = MockVADAnalyzer(params=params)
+
+    def test_partial_window(self):
+        self.assertEqual(self.analyzer.analyze_audio_windows(audio(1)[:100]), [])
+        self.assertEqual(self.analyzer.analyze_audio_windows(audio(1)[100:]), [VADState.QUIET])
+
+    def test_all_windows_analyzed(self):
+        states = self.analyzer.analyze_audio_windows(audio(4, 1000) + audio(4))
+        self.assertEqual(states, [
+            VADState.STARTING, VADState.SPEAKING, VADState.SPEAKING, VADState.SPEAKING,
+            VADState.STOPPING, VADState.STOPPING, VADState.QUIET, VADState.QUIET])
+        self.assertEqual(self.analyzer.analyze_audio(b""), VADState.QUIET)
+
+    def test_windows_content(self):
+        data = np.arange(160 * 50, dtype=np.int16).tobytes()
+        # Chunks that don't match the window size, including one bigger than
+        # the internal buffer.
+        offset = 0
+        for size in [100, 500, 333, 7000, 20, 2000, 6047]:
+            self.analyzer.analyze_audio(data[offset:offset + size])
+            offset += size
+        self.assertEqual(offset, len(data))
+        self.assertEqual(b"".join(self.analyzer.windows), data)
@@ -0,0 +1,107 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import threading
+import unittest
+
+import numpy as np
+
+from pipecat.vad.vad_inference import VADBatchModel, VADInferenceService
+
+
+class SumBatchModel(VADBatchModel):
+    """The state of each stream is the sum of the first sample of all its
+    windows, which is also returned as confidence.
+
+    """
+
+    def __init__(self):
+        self.batch_sizes = []
+        self.entered = threading.Event()
+        self.event = threading.Event()
+        self.event.set()
+
+    def new_state(self):
+        return 0.0
+
+    def infer(self, windows, states):
+        self.entered.set()
+        self.event.wait()
+        self.batch_sizes.append(len(states))
+        new_states = [state + window[0] for (state, window) in zip(states, windows)]
+        return (np.array(new_states), new_states)
+
+
+def window(value: int) -> bytes:
+    return np.full(512, value * 32768 // 100, dtype=np.int16).tobytes()
+
+
+class TestVADInferenceService(unittest.TestCase):
+
+    def setUp(self):
+        self.model = SumBatchModel()
+        self.service = VADInferenceService(self.model, max_batch_size=8)
+
+    def tearDown(self):
+        self.service.stop()
+
+    def test_per_stream_state(self):
+        stream1 = self.service.open_stream()
+        stream2 = self.service.open_stream()
+        self.assertAlmostEqual(self.service.voice_confidence(stream1, window(10)), 0.1, places=3)
+        self.assertAlmostEqual(self.service.voice_confidence(stream2, window(20)), 0.2, places=3)
+        self.assertAlmostEqual(self.service.voice_confidence(stream1, window(10)), 0.2, places=3)
+        self.service.reset_stream(stream1)
+        self.assertAlmostEqual(self.service.voice_confidence(stream1, window(10)), 0.1, places=3)
+        self.assertAlmostEqual(self.service.voice_confidence(stream2, window(20)), 0.4, places=3)
+
+    def test_batching(self):
+        streams = [self.service.open_stream() for _ in range(20)]
+
+        # Block the model with the first window so all the other windows are
+        # pending.
+        self.model.event.clear()
+        first = self.service.submit(streams[0], window(1))
+        self.model.entered.wait()
+        futures = [self.service.submit(stream, window(1)) for stream in streams[1:]]
+        self.model.event.set()
+
+        first.result()
+        self.assertTrue(all(round(f.result(), 2) == 0.01 for f in futures))
+        self.assertEqual(self.model.batch_sizes, [1, 8, 8, 3])
+        self.assertEqual(self.service.stats()["max_batch_size"], 8)
+
+    def test_stream_windows_in_order(self):
+        stream = self.service.open_stream()
+        self.model.event.clear()
+        futures = [self.service.submit(stream, window(10)) for _ in range(3)]
+        self.model.event.set()
+        # Windows of the same stream are never in the same batch.
+        self.assertEqual([round(f.result(), 2) for f in futures], [0.1, 0.2, 0.3])
+        self.assertEqual(self.model.batch_sizes, [1, 1, 1])
+
+    def test_closed_stream(self):
+        stream = self.service.open_stream()
+        self.service.close_stream(stream)
+        with self.assertRaises(ValueError):
+            self.service.submit(stream, window(10))
+
+    def test_voice_confidence_async(self):
+        streams = [self.service.open_stream() for _ in range(20)]
+
+        async def analyze():
+            # The windows are awaited from the event loop, so they are batched
+            # without a thread per stream.
+            self.model.event.clear()
+            tasks = [asyncio.create_task(self.service.voice_confidence_async(stream, window(1))) for stream in streams]
+            await asyncio.sleep(0.05)
+            self.model.event.set()
+            return await asyncio.gather(*tasks)
+
+        confidences = asyncio.run(analyze())
+        self.assertTrue(all(round(c, 2) == 0.01 for c in confidences))
+        self.assertLess(len(self.model.batch_sizes), 20)
@@ -0,0 +1,117 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import functools
+import os
+import signal
+import time
+import unittest
+
+import numpy as np
+
+from pipecat.vad.energy import EnergyVADAnalyzer
+from pipecat.vad.vad_analyzer import VADParams
+from pipecat.vad.vad_process_pool import ProcessVADAnalyzer, VADProcessPool
+
+
+def speech_and_silence(sample_rate: int) -> bytes:
+    t = np.arange(sample_rate) / sample_rate
+    speech = sum(np.sin(2 * np.pi * k * 120 * t) / k for k in range(1, 20)) * 3000
+    noise = np.random.default_rng(0).standard_normal(sample_rate * 3) * 30
+    audio = np.concatenate([noise[:sample_rate], speech + noise[sample_rate:2 * sample_rate], noise[2 * sample_rate:]])
+    return np.clip(audio, -32768, 32767).astype(np.int16).tobytes()
+
+
+class TestVADProcessPool(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # A small ring buffer so the audio wraps around.
+        cls.pool = VADProcessPool(num_workers=2, ring_buffer_size=1000)
+        cls.pool.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.stop()
+
+    async def test_same_states_as_local(self):
+        params = VADParams(start_secs=0.1, stop_secs=0.2)
+        factory = functools.partial(EnergyVADAnalyzer, sample_rate=8000, params=params)
+        local = factory()
+        remote = ProcessVADAnalyzer(self.pool, factory)
+        self.assertEqual(remote.num_frames_required(), local.num_frames_required())
+        self.assertEqual(remote.sample_rate, 8000)
+
+        audio = speech_and_silence(8000)
+        local_states = []
+        remote_states = []
+        for i in range(0, len(audio), 700):
+            chunk = audio[i:i + 700]
+            local_states += local.analyze_audio_windows(chunk)
+            remote_states += await remote.analyze_audio_windows_async(chunk)
+        self.assertEqual(remote_states, local_states)
+        self.assertEqual(remote.analyze_audio(b""), local.analyze_audio(b""))
+
+        # Chunks bigger than the ring buffer and the blocking version.
+        self.assertEqual(len(remote.analyze_audio_windows(audio[:8000])), 8000 // 320)
+        remote.close()
+
+    async def test_voice_confidence(self):
+        params = VADParams(confidence=0.5)
+        factory = functools.partial(EnergyVADAnalyzer, sample_rate=16000, params=params)
+        local = factory()
+        remote = ProcessVADAnalyzer(self.pool, factory)
+        # The parameters of the remote analyzer.
+        self.assertEqual(remote.params, params)
+
+        audio = speech_and_silence(16000)
+        window_size = local.num_frames_required() * 2
+        # The ring buffer is smaller than two windows, so windows wrap around.
+        for i in range(0, 5 * window_size, window_size):
+            window = audio[16000 + i:16000 + i + window_size]
+            self.assertAlmostEqual(remote.voice_confidence(window), local.voice_confidence(window), places=5)
+        remote.close()
+
+    async def test_streams_pinned_to_workers(self):
+        factory = functools.partial(EnergyVADAnalyzer, sample_rate=16000)
+        analyzers = [ProcessVADAnalyzer(self.pool, factory) for _ in range(4)]
+        self.assertEqual([s["streams"] for s in self.pool.stats()], [2, 2])
+        for analyzer in analyzers:
+            analyzer.close()
+        self.assertEqual([s["streams"] for s in self.pool.stats()], [0, 0])
+
+    async def test_factory_error(self):
+        with self.assertRaises(RuntimeError):
+            ProcessVADAnalyzer(self.pool, functools.partial(EnergyVADAnalyzer, sample_rate="invalid"))
+
+    async def test_restart_dead_worker(self):
+        pool = VADProcessPool(num_workers=1)
+        pool.start()
+        try:
+            factory = functools.partial(EnergyVADAnalyzer, sample_rate=8000)
+            analyzer = ProcessVADAnalyzer(pool, factory)
+            audio = speech_and_silence(8000)
+            self.assertTrue(await analyzer.analyze_audio_windows_async(audio[:3200]))
+
+            pid = pool.stats()[0]["pid"]
+            os.kill(pid, signal.SIGKILL)
+            deadline = time.monotonic() + 10
+            while pool.stats()[0]["restarts"] == 0 or not pool.stats()[0]["alive"]:
+                self.assertLess(time.monotonic(), deadline)
+                await asyncio.sleep(0.05)
+
+            self.assertNotEqual(pool.stats()[0]["pid"], pid)
+            # The stream was opened again in the new worker.
+            self.assertTrue(await analyzer.analyze_audio_windows_async(audio[:3200]))
+            # New streams are placed in the new worker too.
+            other = ProcessVADAnalyzer(pool, factory)
+            self.assertTrue(await other.analyze_audio_windows_async(audio[:3200]))
+            self.assertEqual(pool.stats()[0]["streams"], 2)
+            analyzer.close()
+            other.close()
+        finally:
+            pool.stop()
@@ -0,0 +1,150 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import time
+import unittest
+
+from typing import AsyncGenerator
+
+import aiohttp
+
+from pipecat.frames.frames import AudioRawFrame, EndFrame, Frame, MetricsFrame, StartFrame
+from pipecat.pipeline.parallel_pipeline import ParallelPipeline
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineParams, PipelineTask
+from pipecat.processors.frame_processor import FrameDirection, frame_handler
+from pipecat.services.ai_services import AIService, TTSService
+from pipecat.services.elevenlabs import ElevenLabsTTSService
+from pipecat.utils.test_frame_processor import FrameCollector
+from pipecat.utils.tts_cache import TTSCache
+
+
+class SlowService(AIService):
+
+    def __init__(self, delay: float, fail: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.delay = delay
+        self.fail = fail
+        self.warm = False
+        self.warm_on_start = None
+
+    async def warmup(self):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise Exception("warm-up failed")
+        self.warm = True
+
+    async def start(self, frame: StartFrame):
+        self.warm_on_start = self.warm
+
+    async def _handle_start_frame(self, frame: StartFrame, direction: FrameDirection):
+        await super()._handle_start_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+    async def _handle_end_frame(self, frame: EndFrame, direction: FrameDirection):
+        await super()._handle_end_frame(frame, direction)
+        await self.push_frame(frame, direction)
+
+    @frame_handler(Frame)
+    async def _handle_frame(self, frame: Frame, direction: FrameDirection):
+        await self.push_frame(frame, direction)
+
+
+class MockTTSService(TTSService):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.texts = []
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        self.texts.append(text)
+        yield AudioRawFrame(b"\x00" * 320, 16000, 1)
+
+
+class OfflineElevenLabsTTSService(ElevenLabsTTSService):
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.texts = []
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        self.texts.append(text)
+        yield AudioRawFrame(b"\x00" * 320, 16000, 1)
+
+
+class TestWarmup(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_warmup(self):
+        services = [SlowService(0.2), SlowService(0.2), SlowService(0.1, fail=True)]
+        collector = FrameCollector()
+        pipeline = Pipeline([
+            services[0],
+            ParallelPipeline([services[1]], [services[2]]),
+            collector])
+        task = PipelineTask(pipeline, PipelineParams(enable_metrics=True))
+        await task.queue_frame(EndFrame())
+
+        start_time = time.monotonic()
+        await task.run()
+        self.assertLess(time.monotonic() - start_time, 0.35)
+
+        self.assertEqual([s.warm_on_start for s in services], [True, True, False])
+        startup = [f.startup for f in collector.frames if isinstance(f, MetricsFrame) and f.startup][0]
+        names = [m["processor"] for m in startup]
+        self.assertEqual(names, [s.name for s in services] + [task.name])
+        self.assertGreaterEqual(startup[-1]["value"], 0.2)
+
+    async def test_warmup_timeout(self):
+        service = SlowService(1.0)
+        task = PipelineTask(Pipeline([service]), PipelineParams(warmup_timeout=0.1))
+        await task.queue_frame(EndFrame())
+        start_time = time.monotonic()
+        await task.run()
+        self.assertLess(time.monotonic() - start_time, 0.5)
+        self.assertFalse(service.warm_on_start)
+
+    async def test_warmup_timeout_partial_results(self):
+        services = [SlowService(0.01), SlowService(1.0), SlowService(0.02), SlowService(1.0)]
+        collector = FrameCollector()
+        pipeline = Pipeline([
+            services[0],
+            services[1],
+            ParallelPipeline([services[2]], [services[3]]),
+            collector])
+        task = PipelineTask(pipeline, PipelineParams(enable_metrics=True, warmup_timeout=0.1))
+        await task.queue_frame(EndFrame())
+        start_time = time.monotonic()
+        await task.run()
+        self.assertLess(time.monotonic() - start_time, 0.5)
+
+        self.assertEqual([s.warm_on_start for s in services], [True, False, True, False])
+        startup = [f.startup for f in collector.frames if isinstance(f, MetricsFrame) and f.startup][0]
+        self.assertEqual([m["processor"] for m in startup], [s.name for s in services] + [task.name])
+        self.assertEqual([m.get("timeout", False) for m in startup], [False, True, False, True, False])
+
+    async def test_tts_warmup_phrases(self):
+        tts = MockTTSService(tts_cache=TTSCache(), warmup_phrases=["Hello there! How are you?", "Bye."])
+        tts.link(FrameCollector())
+        await tts.warmup()
+        self.assertEqual(sorted(tts.texts), ["Bye.", "Hello there!", "How are you?"])
+
+        # Cached phrases are not converted again.
+        await tts.warmup()
+        await tts.say("Hello there! How are you?")
+        self.assertEqual(len(tts.texts), 3)
+
+    async def test_tts_warmup_network_error(self):
+        # Requests fail because the session is closed.
+        session = aiohttp.ClientSession()
+        await session.close()
+        tts = OfflineElevenLabsTTSService(
+            aiohttp_session=session, api_key="key", voice_id="voice",
+            tts_cache=TTSCache(), warmup_phrases=["Hello."])
+        tts.link(FrameCollector())
+        await tts.warmup()
+        # Phrases are still converted.
+        self.assertEqual(tts.texts, ["Hello."])
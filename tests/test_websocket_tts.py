@@ -0,0 +1,329 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import base64
+import unittest
+
+from typing import AsyncGenerator
+
+from aiohttp import web
+
+from pipecat.frames.frames import (
+    AudioRawFrame,
+    EndFrame,
+    ErrorFrame,
+    Frame,
+    LLMFullResponseEndFrame,
+    LLMFullResponseStartFrame,
+    MetricsFrame,
+    StartFrame,
+    StartInterruptionFrame,
+    TTSStartedFrame,
+    TTSStoppedFrame,
+    TextFrame)
+from pipecat.processors.frame_processor import FrameDirection, FrameProcessor
+from pipecat.services.ai_services import TTSService
+from pipecat.services.elevenlabs import ElevenLabsWebsocketConnection
+from pipecat.services.websocket_tts import WebsocketTTSContext
+
+try:
+    from pipecat.services.cartesia import CartesiaWebsocketConnection
+except ModuleNotFoundError:
+    # The Cartesia SDK is not installed.
+    CartesiaWebsocketConnection = None
+
+OUTPUT_FORMAT = {"container": "raw", "encoding": "pcm_s16le", "sample_rate": 16000}
+
+
+class StandInServer:
+    """A local stand-in for the Cartesia and ElevenLabs websocket APIs. The
+    audio of some text is the text itself. Audio is sent as soon as text is
+    received, and cancelled contexts (closed without being flushed) still get
+    one more (late) chunk.
+
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+        self._websockets = []
+
+    async def start(self) -> int:
+        app = web.Application()
+        app.router.add_get("/tts/websocket", self._cartesia_handler)
+        app.router.add_get("/v1/text-to-speech/{voice_id}/multi-stream-input", self._elevenlabs_handler)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        return site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self.disconnect()
+        await self._runner.cleanup()
+
+    async def disconnect(self):
+        for ws in self._websockets:
+            await ws.close()
+
+    async def _websocket(self, request: web.Request) -> web.WebSocketResponse:
+        self.connections += 1
+        self.request = request
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._websockets.append(ws)
+        return ws
+
+    async def _cartesia_handler(self, request: web.Request) -> web.WebSocketResponse:
+        ws = await self._websocket(request)
+        async for message in ws:
+            message = message.json()
+            self.messages.append(message)
+            context_id = message["context_id"]
+            if message.get("cancel"):
+                await ws.send_json({"type": "chunk", "context_id": context_id, "data": self._audio("late"), "done": False})
+            elif message["transcript"]:
+                await ws.send_json({"type": "chunk", "context_id": context_id, "data": self._audio(message["transcript"]), "done": False})
+            elif not message["continue"]:
+                await ws.send_json({"type": "done", "context_id": context_id, "done": True})
+        return ws
+
+    async def _elevenlabs_handler(self, request: web.Request) -> web.WebSocketResponse:
+        ws = await self._websocket(request)
+        flushed = set()
+        async for message in ws:
+            message = message.json()
+            self.messages.append(message)
+            if message.get("close_socket"):
+                break
+            context_id = message["context_id"]
+            if message.get("text"):
+                await ws.send_json({"audio": self._audio(message["text"]), "isFinal": None, "contextId": context_id})
+            elif message.get("flush"):
+                flushed.add(context_id)
+            elif message.get("close_context"):
+                if context_id not in flushed:
+                    await ws.send_json({"audio": self._audio("late"), "isFinal": None, "contextId": context_id})
+                await ws.send_json({"isFinal": True, "contextId": context_id})
+        return ws
+
+    def _audio(self, text: str) -> str:
+        return base64.b64encode(text.encode()).decode()
+
+
+async def context_audio(context: WebsocketTTSContext) -> bytes:
+    audio = b""
+    async for frame in context.frames():
+        if isinstance(frame, AudioRawFrame):
+            audio += frame.audio
+    return audio
+
+
+class Collector(FrameProcessor):
+
+    def __init__(self):
+        super().__init__()
+        self.frames = []
+
+    async def process_frame(self, frame: Frame, direction: FrameDirection):
+        await super().process_frame(frame, direction)
+        self.frames.append(frame)
+
+
+class StreamingTTSService(TTSService):
+
+    def can_generate_metrics(self) -> bool:
+        return True
+
+    async def run_tts(self, text: str) -> AsyncGenerator[Frame, None]:
+        raise AssertionError("text should be streamed")
+        yield
+
+
+class TestWebsocketTTS(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = StandInServer()
+        port = await self.server.start()
+        self.url = f"http://127.0.0.1:{port}"
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    def elevenlabs(self) -> ElevenLabsWebsocketConnection:
+        return ElevenLabsWebsocketConnection(
+            api_key="key", voice_id="voice", model="model", url=f"{self.url}/v1/text-to-speech")
+
+    @unittest.skipIf(CartesiaWebsocketConnection is None, "the Cartesia SDK is not installed")
+    async def test_cartesia_context(self):
+        connection = CartesiaWebsocketConnection(
+            api_key="key",
+            voice_id="voice",
+            model_id="model",
+            output_format=OUTPUT_FORMAT,
+            url=f"{self.url}/tts/websocket")
+        context = await connection.create_context()
+        await connection.send_text(context, "Hello")
+        await connection.send_text(context, " world.")
+        await connection.end_context(context)
+        self.assertEqual(await context_audio(context), b"Hello world.")
+        self.assertEqual(context.text, "Hello world.")
+        await connection.close()
+
+        self.assertEqual(self.server.request.query["api_key"], "key")
+        self.assertEqual(
+            [(m["context_id"], m["transcript"], m["continue"]) for m in self.server.messages],
+            [(context.context_id, "Hello", True), (context.context_id, " world.", True), (context.context_id, "", False)])
+        self.assertEqual(self.server.messages[0]["voice"], {"mode": "id", "id": "voice"})
+        self.assertEqual(self.server.messages[0]["output_format"], OUTPUT_FORMAT)
+
+    async def test_demux(self):
+        connection = self.elevenlabs()
+        first = await connection.create_context()
+        second = await connection.create_context()
+        await connection.send_text(first, "one ")
+        await connection.send_text(second, "two ")
+        await connection.send_text(first, "three")
+        await connection.end_context(second)
+        await connection.end_context(first)
+        (first_audio, second_audio) = await asyncio.gather(context_audio(first), context_audio(second))
+        self.assertEqual(first_audio, b"one three")
+        self.assertEqual(second_audio, b"two ")
+        await connection.close()
+        # A single websocket for both contexts.
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_cancel(self):
+        connection = self.elevenlabs()
+        cancelled = await connection.create_context()
+        await connection.send_text(cancelled, "Hello")
+        await cancelled.cancel()
+        self.assertTrue(cancelled.done)
+
+        # Late audio of the cancelled context is discarded.
+        context = await connection.create_context()
+        await connection.send_text(context, "Bye")
+        await connection.end_context(context)
+        self.assertEqual(await context_audio(context), b"Bye")
+        self.assertNotIn(b"late", await context_audio(cancelled))
+        await connection.close()
+        self.assertIn({"context_id": cancelled.context_id, "close_context": True}, self.server.messages)
+
+    async def test_reconnect(self):
+        connection = self.elevenlabs()
+        context = await connection.create_context()
+        await connection.send_text(context, "Hello")
+        await self.server.disconnect()
+        frames = [f async for f in context.frames()]
+        self.assertIsInstance(frames[-1], ErrorFrame)
+
+        context = await connection.create_context()
+        await connection.send_text(context, "Again")
+        await connection.end_context(context)
+        self.assertEqual(await context_audio(context), b"Again")
+        await connection.close()
+        self.assertEqual(self.server.connections, 2)
+
+    async def test_connection_error(self):
+        await self.server.stop()
+        connection = self.elevenlabs()
+        context = await connection.create_context()
+        frames = [f async for f in context.frames()]
+        self.assertEqual(len(frames), 1)
+        self.assertIsInstance(frames[0], ErrorFrame)
+        await connection.close()
+        # asyncTearDown stops it again.
+        await self.server.start()
+
+    async def test_elevenlabs_context(self):
+        connection = self.elevenlabs()
+        context = await connection.create_context()
+        await connection.send_text(context, "Hello ")
+        await connection.send_text(context, "world. ")
+        await connection.end_context(context)
+        self.assertEqual(await context_audio(context), b"Hello world. ")
+        await connection.close()
+
+        self.assertEqual(self.server.request.headers["xi-api-key"], "key")
+        self.assertEqual(self.server.request.query["output_format"], "pcm_16000")
+        context_id = context.context_id
+        self.assertEqual(self.server.messages, [
+            {"context_id": context_id, "text": "Hello "},
+            {"context_id": context_id, "text": "world. "},
+            {"context_id": context_id, "text": "", "flush": True},
+            {"context_id": context_id, "close_context": True},
+            {"close_socket": True},
+        ])
+
+    async def run_tts(self, tts: TTSService, frames, enable_metrics: bool = False):
+        collector = Collector()
+        tts.link(collector)
+        await tts.process_frame(StartFrame(enable_metrics=enable_metrics), FrameDirection.DOWNSTREAM)
+        for frame in frames:
+            await tts.process_frame(frame, FrameDirection.DOWNSTREAM)
+        return collector.frames
+
+    async def test_tts_service_streaming(self):
+        tts = StreamingTTSService(connection=self.elevenlabs())
+        self.assertTrue(tts.streaming)
+        frames = await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("Hi"), TextFrame(" Mr"), TextFrame("."), TextFrame(" Smith"),
+            LLMFullResponseEndFrame(),
+            EndFrame()])
+
+        # Tokens are sent as they arrive, in a single context.
+        texts = [m["text"] for m in self.server.messages if "text" in m]
+        self.assertEqual(texts, ["Hi", " Mr", ".", " Smith", ""])
+        self.assertEqual(len({m["context_id"] for m in self.server.messages if "context_id" in m}), 1)
+
+        types = [type(f) for f in frames]
+        self.assertEqual(types, [
+            StartFrame, LLMFullResponseStartFrame, TTSStartedFrame,
+            AudioRawFrame, AudioRawFrame, AudioRawFrame, AudioRawFrame,
+            TTSStoppedFrame, TextFrame, LLMFullResponseEndFrame, EndFrame])
+        self.assertEqual(b"".join(f.audio for f in frames if isinstance(f, AudioRawFrame)), b"Hi Mr. Smith")
+        self.assertEqual(frames[8].text, "Hi Mr. Smith")
+
+    async def test_tts_service_first_audio_metrics(self):
+        tts = StreamingTTSService(connection=self.elevenlabs())
+        frames = await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("Hi"), TextFrame(" there."),
+            LLMFullResponseEndFrame(),
+            EndFrame()], enable_metrics=True)
+        metrics = [f.first_audio[0] for f in frames if isinstance(f, MetricsFrame) and f.first_audio]
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(metrics[0]["processor"], tts.name)
+
+    async def test_tts_service_interruption(self):
+        tts = StreamingTTSService(connection=self.elevenlabs())
+        frames = await self.run_tts(tts, [
+            LLMFullResponseStartFrame(),
+            TextFrame("Hello"),
+        ])
+        # Wait for the first audio.
+        while not any(isinstance(f, AudioRawFrame) for f in frames):
+            await asyncio.sleep(0.01)
+        await tts.process_frame(StartInterruptionFrame(), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(TextFrame(" there"), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(LLMFullResponseEndFrame(), FrameDirection.DOWNSTREAM)
+        await tts.process_frame(EndFrame(), FrameDirection.DOWNSTREAM)
+
+        contexts = []
+        for m in self.server.messages:
+            if "context_id" in m and m["context_id"] not in contexts:
+                contexts.append(m["context_id"])
+        self.assertEqual(len(contexts), 2)
+        self.assertIn({"context_id": contexts[0], "close_context": True}, self.server.messages)
+
+        # The late audio of the first context is not played, and its text is
+        # not pushed.
+        audio = b"".join(f.audio for f in frames if isinstance(f, AudioRawFrame))
+        self.assertEqual(audio, b"Hello there")
+        texts = [f.text for f in frames if isinstance(f, TextFrame)]
+        self.assertEqual(texts, ["there"])
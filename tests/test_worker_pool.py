@@ -0,0 +1,72 @@
+#
+# Copyright (c) 2024, Daily
+#
+# SPDX-License-Identifier: BSD 2-Clause License
+#
+
+import asyncio
+import os
+import signal
+import unittest
+
+from pipecat.frames.frames import EndFrame
+from pipecat.pipeline.pipeline import Pipeline
+from pipecat.pipeline.task import PipelineTask
+from pipecat.pipeline.worker_pool import PipelineWorkerPool
+from pipecat.processors.frame_processor import FrameProcessor
+
+
+async def session_factory(seconds: float) -> PipelineTask:
+    task = PipelineTask(Pipeline([FrameProcessor()]))
+
+    async def end_session():
+        await asyncio.sleep(seconds)
+        await task.queue_frame(EndFrame())
+
+    asyncio.create_task(end_session())
+    return task
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    loop = asyncio.get_running_loop()
+    end_time = loop.time() + timeout
+    while not condition():
+        if loop.time() > end_time:
+            raise TimeoutError()
+        await asyncio.sleep(0.05)
+
+
+class TestPipelineWorkerPool(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.pool = PipelineWorkerPool(
+            session_factory, num_workers=2, report_interval=0.1, supervise_interval=0.1)
+        await self.pool.start()
+
+    async def asyncTearDown(self):
+        await self.pool.stop()
+
+    async def test_least_loaded(self):
+        sessions = [await self.pool.start_session(10) for _ in range(4)]
+        self.assertTrue(all(sessions))
+        self.assertEqual([s["sessions"] for s in self.pool.stats()], [2, 2])
+
+    async def test_sessions_finish(self):
+        await self.pool.start_session(0.1)
+        await wait_for(lambda: sum(s["sessions"] for s in self.pool.stats()) == 0)
+
+    async def test_restart_crashed_worker(self):
+        session1 = await self.pool.start_session(10)
+        session2 = await self.pool.start_session(10)
+        worker1 = self.pool.worker_of(session1)
+        worker2 = self.pool.worker_of(session2)
+        self.assertNotEqual(worker1, worker2)
+
+        os.kill(self.pool.stats()[worker1]["pid"], signal.SIGKILL)
+        await wait_for(lambda: self.pool.stats()[worker1]["restarts"] == 1
+                       and self.pool.stats()[worker1]["alive"])
+
+        # The session in the other worker is still running.
+        self.assertIsNone(self.pool.worker_of(session1))
+        self.assertEqual(self.pool.worker_of(session2), worker2)
+        self.assertIsNotNone(await self.pool.start_session(10))